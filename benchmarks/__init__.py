@@ -0,0 +1,10 @@
+"""视觉检测基准测试套件.
+
+在带标注的截图语料上测量模板匹配各策略、场景检测和OCR的单次调用延迟
+（p50/p95/p99）、吞吐量以及精确率/召回率，并输出JSON和Markdown报告。
+
+用法::
+
+    python -m benchmarks --output reports/benchmarks
+    python -m benchmarks --baseline reports/benchmarks/benchmark.json --fail-on-regression
+"""
@@ -0,0 +1,95 @@
+"""视觉检测基准测试入口."""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from .corpus import MANIFEST_NAME, PROJECT_ROOT, load_corpus, synthesize_corpus
+from .report import build_report, compare_reports, render_markdown, write_report
+from .vision import STRATEGIES, bench_ocr, bench_scene_detection, bench_template_matching
+
+DEFAULT_CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+DEFAULT_OUTPUT_DIR = PROJECT_ROOT / "reports" / "benchmarks"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """解析命令行参数."""
+    parser = argparse.ArgumentParser(description="视觉检测基准测试")
+    parser.add_argument(
+        "--corpus", type=Path, default=DEFAULT_CORPUS_DIR,
+        help="语料目录（含manifest.json），不存在时自动合成",
+    )
+    parser.add_argument("--synthesize", action="store_true", help="重新合成语料")
+    parser.add_argument("--frames", type=int, default=16, help="合成语料的帧数")
+    parser.add_argument("--seed", type=int, default=0, help="合成语料的随机种子")
+    parser.add_argument(
+        "--strategies", nargs="+", choices=sorted(STRATEGIES), default=list(STRATEGIES),
+        help="要测量的匹配策略",
+    )
+    parser.add_argument("--threshold", type=float, default=0.8, help="匹配阈值")
+    parser.add_argument("--tolerance", type=int, default=5, help="位置容差（像素）")
+    parser.add_argument("--repeat", type=int, default=1, help="每次调用重复次数")
+    parser.add_argument("--skip-scene", action="store_true", help="跳过场景检测基准")
+    parser.add_argument("--skip-ocr", action="store_true", help="跳过OCR基准")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT_DIR, help="报告输出目录")
+    parser.add_argument("--baseline", type=Path, help="用于对比的基线JSON报告")
+    parser.add_argument(
+        "--fail-on-regression", action="store_true", help="相对基线出现回退时返回非零退出码"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """运行基准测试并写出报告."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    # assets/templates中的占位图无法解码，加载时的警告与基准无关
+    logging.getLogger("src.core.game_detector").setLevel(logging.ERROR)
+
+    if args.synthesize or not (args.corpus / MANIFEST_NAME).exists():
+        print(f"合成语料: {args.corpus}")
+        corpus = synthesize_corpus(args.corpus, frames=args.frames, seed=args.seed)
+    else:
+        corpus = load_corpus(args.corpus)
+    if not corpus.frames:
+        print("❌ 语料中没有截图帧")
+        return 1
+    corpus.load_images()
+
+    print(f"模板匹配: {len(corpus.frames)} 帧 x {len(corpus.template_names)} 个模板")
+    template_matching = bench_template_matching(
+        corpus, args.strategies, args.threshold, args.tolerance, args.repeat
+    )
+    scene_detection = None
+    if not args.skip_scene:
+        print("场景检测...")
+        scene_detection = {
+            "full": bench_scene_detection(corpus, incremental=False, repeat=args.repeat),
+            "incremental": bench_scene_detection(corpus, incremental=True, repeat=args.repeat),
+        }
+    ocr = None if args.skip_ocr else bench_ocr(corpus, repeat=args.repeat)
+
+    report = build_report(
+        corpus.describe(),
+        {"threshold": args.threshold, "tolerance": args.tolerance, "repeat": args.repeat},
+        template_matching,
+        scene_detection,
+        ocr,
+    )
+    regressions = None
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_reports(report, baseline)
+
+    paths = write_report(report, args.output, regressions)
+    print(render_markdown(report, regressions))
+    print(f"报告已写入 {paths['json']} 和 {paths['markdown']}")
+    if regressions and args.fail_on_regression:
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+"""带标注的截图语料.
+
+语料目录包含截图和manifest.json，格式::
+
+    {
+      "version": 1,
+      "templates_dir": "../../assets/templates",
+      "frames": [
+        {
+          "file": "frame_000.png",
+          "scene": "main_menu",
+          "objects": [{"template": "main_menu_start_button", "box": [x, y, w, h]}],
+          "texts": [{"text": "CLAIM", "box": [x, y, w, h]}]
+        }
+      ]
+    }
+
+模板名与GameDetector加载assets/templates时的命名一致（子目录中的模板为
+"目录名_文件名"）。帧中未列出的模板视为不存在，用于统计误检。录制的真实
+截图可按同样格式手工标注；没有录制语料时可用synthesize_corpus()把模板
+贴到背景截图上生成。
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.core.game_detector import TemplateBank
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_TEMPLATES_DIR = PROJECT_ROOT / "assets" / "templates"
+DEFAULT_BACKGROUNDS = [
+    PROJECT_ROOT / "data" / "screenshots",
+    PROJECT_ROOT / "game_screenshot.png",
+]
+MANIFEST_NAME = "manifest.json"
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp"}
+
+# 模板所在子目录对应的场景标注
+SCENE_BY_PREFIX = {"main_menu_": "main_menu", "combat_": "game_play"}
+# 模拟不同分辨率客户端时模板的缩放比例
+SCALED_FACTORS = [0.75, 1.25]
+OCR_WORDS = ["CLAIM", "START", "CONFIRM", "CANCEL", "SHOP", "MAIL", "BAG", "EXIT"]
+
+Box = Tuple[int, int, int, int]
+
+
+@dataclass
+class LabeledObject:
+    """帧中一个模板实例的标注."""
+
+    template: str
+    box: Box
+
+
+@dataclass
+class LabeledText:
+    """帧中一段文本的标注."""
+
+    text: str
+    box: Box
+
+
+@dataclass
+class LabeledFrame:
+    """带标注的截图帧."""
+
+    path: Path
+    scene: str = "unknown"
+    objects: List[LabeledObject] = field(default_factory=list)
+    texts: List[LabeledText] = field(default_factory=list)
+    _image: Optional[np.ndarray] = field(default=None, repr=False)
+
+    @property
+    def name(self) -> str:
+        """帧文件名."""
+        return self.path.name
+
+    @property
+    def image(self) -> np.ndarray:
+        """帧图像（首次访问时读取）."""
+        if self._image is None:
+            image = cv2.imread(str(self.path))
+            if image is None:
+                raise ValueError(f"无法读取语料帧: {self.path}")
+            self._image = image
+        return self._image
+
+    def box_for(self, template: str) -> Optional[Box]:
+        """获取模板在帧中的标注框，不存在返回None."""
+        for obj in self.objects:
+            if obj.template == template:
+                return obj.box
+        return None
+
+
+@dataclass
+class Corpus:
+    """截图语料."""
+
+    root: Path
+    templates_dir: Path
+    frames: List[LabeledFrame]
+
+    @property
+    def template_names(self) -> List[str]:
+        """语料中至少出现一次的模板名."""
+        return sorted({obj.template for frame in self.frames for obj in frame.objects})
+
+    def load_images(self) -> None:
+        """预先读取所有帧，避免磁盘读取计入延迟."""
+        for frame in self.frames:
+            _ = frame.image
+
+    def describe(self) -> Dict[str, Any]:
+        """语料概况."""
+        shapes = {frame.image.shape[:2] for frame in self.frames}
+        return {
+            "root": str(self.root),
+            "frames": len(self.frames),
+            "templates": self.template_names,
+            "objects": sum(len(frame.objects) for frame in self.frames),
+            "texts": sum(len(frame.texts) for frame in self.frames),
+            "frame_sizes": sorted(f"{w}x{h}" for h, w in shapes),
+        }
+
+
+def load_corpus(root: Path) -> Corpus:
+    """读取语料目录.
+
+    Args:
+        root: 包含manifest.json的目录
+
+    Returns:
+        Corpus: 语料
+
+    Raises:
+        FileNotFoundError: manifest.json不存在
+    """
+    root = Path(root)
+    manifest = json.loads((root / MANIFEST_NAME).read_text(encoding="utf-8"))
+    templates_dir = manifest.get("templates_dir")
+    templates_dir = (root / templates_dir).resolve() if templates_dir else DEFAULT_TEMPLATES_DIR
+    frames = [
+        LabeledFrame(
+            path=root / item["file"],
+            scene=item.get("scene", "unknown"),
+            objects=[
+                LabeledObject(obj["template"], tuple(obj["box"]))
+                for obj in item.get("objects", [])
+            ],
+            texts=[LabeledText(text["text"], tuple(text["box"])) for text in item.get("texts", [])],
+        )
+        for item in manifest.get("frames", [])
+    ]
+    return Corpus(root=root, templates_dir=templates_dir, frames=frames)
+
+
+def _load_backgrounds(sources: Sequence[Path]) -> List[np.ndarray]:
+    """读取背景截图."""
+    backgrounds = []
+    for source in sources:
+        source = Path(source)
+        if not source.exists():
+            continue
+        paths = sorted(source.iterdir()) if source.is_dir() else [source]
+        for path in paths:
+            if path.suffix.lower() in IMAGE_SUFFIXES:
+                image = cv2.imread(str(path))
+                if image is not None:
+                    backgrounds.append(image)
+    return backgrounds
+
+
+def _scene_for(templates: Sequence[str]) -> str:
+    """按帧中出现的模板标注场景，主菜单优先."""
+    for prefix, scene in SCENE_BY_PREFIX.items():
+        if any(name.startswith(prefix) for name in templates):
+            return scene
+    return "unknown"
+
+
+def _home_positions(
+    rng: np.random.Generator,
+    sizes: List[Tuple[int, int]],
+    frame_size: Tuple[int, int],
+    margin: int,
+) -> List[Tuple[int, int]]:
+    """为每个元素在不同网格单元中选择固定位置，模拟位置稳定的UI."""
+    width, height = frame_size
+    columns, rows = 4, 3
+    cell_w, cell_h = width // columns, height // rows
+    cells = rng.permutation(columns * rows)
+    positions = []
+    for (w, h), cell in zip(sizes, cells):
+        col, row = divmod(int(cell), rows)
+        x_range = max(1, cell_w - w - 2 * margin)
+        y_range = max(1, cell_h - h - 2 * margin)
+        positions.append((
+            col * cell_w + margin + int(rng.integers(0, x_range)),
+            row * cell_h + margin + int(rng.integers(0, y_range)),
+        ))
+    return positions
+
+
+def synthesize_corpus(
+    output_dir: Path,
+    templates_dir: Path = DEFAULT_TEMPLATES_DIR,
+    backgrounds: Sequence[Path] = DEFAULT_BACKGROUNDS,
+    frames: int = 16,
+    frame_size: Tuple[int, int] = (960, 540),
+    presence: float = 0.7,
+    jitter: int = 6,
+    scaled_ratio: float = 0.15,
+    seed: int = 0,
+) -> Corpus:
+    """把模板贴到背景截图上生成带标注的语料.
+
+    每个模板在语料中有固定的"常驻位置"，每帧以presence的概率出现并在常驻
+    位置附近抖动，部分帧中以SCALED_FACTORS中的比例缩放出现；整帧再叠加亮度变化和噪声。
+
+    Args:
+        output_dir: 输出目录
+        templates_dir: 模板目录
+        backgrounds: 背景截图文件或目录，均不可用时使用随机纹理
+        frames: 帧数
+        frame_size: 帧尺寸 (width, height)
+        presence: 每个模板在一帧中出现的概率
+        jitter: 位置抖动（像素）
+        scaled_ratio: 模板以非原始尺寸出现的概率
+        seed: 随机种子
+
+    Returns:
+        Corpus: 生成的语料
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    width, height = frame_size
+
+    bank = TemplateBank(scale_factors=[1.0], pyramid_levels=1)
+    entries = sorted(
+        (entry for entry in bank.load_directory(str(templates_dir)) if entry.color.ndim == 3),
+        key=lambda entry: entry.name,
+    )
+    if not entries:
+        raise ValueError(f"模板目录中没有可用的模板: {templates_dir}")
+
+    sources = _load_backgrounds(backgrounds)
+    if not sources:
+        noise = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+        sources = [cv2.GaussianBlur(noise, (0, 0), 4)]
+
+    margin = jitter + 2
+    text_size = (120, 36)
+    sizes = [entry.color.shape[1::-1] for entry in entries] + [text_size]
+    largest = max(SCALED_FACTORS)
+    homes = _home_positions(
+        rng, [(int(w * largest), int(h * largest)) for w, h in sizes], frame_size, margin
+    )
+    text_home = homes.pop()
+
+    manifest_frames = []
+    for index in range(frames):
+        source = sources[index % len(sources)]
+        src_h, src_w = source.shape[:2]
+        crop_w = int(src_w * rng.uniform(0.6, 1.0))
+        crop_h = min(src_h, int(crop_w * height / width))
+        x0 = int(rng.integers(0, src_w - crop_w + 1))
+        y0 = int(rng.integers(0, src_h - crop_h + 1))
+        frame = cv2.resize(source[y0:y0 + crop_h, x0:x0 + crop_w], (width, height))
+
+        objects = []
+        for entry, (home_x, home_y) in zip(entries, homes):
+            if rng.random() >= presence:
+                continue
+            template = entry.color
+            if rng.random() < scaled_ratio:
+                scale = float(rng.choice(SCALED_FACTORS))
+                template = cv2.resize(
+                    template, (round(template.shape[1] * scale), round(template.shape[0] * scale))
+                )
+            t_h, t_w = template.shape[:2]
+            x = int(np.clip(home_x + rng.integers(-jitter, jitter + 1), 0, width - t_w))
+            y = int(np.clip(home_y + rng.integers(-jitter, jitter + 1), 0, height - t_h))
+            frame[y:y + t_h, x:x + t_w] = template
+            objects.append({"template": entry.name, "box": [x, y, t_w, t_h]})
+
+        texts = []
+        if rng.random() < presence:
+            word = str(rng.choice(OCR_WORDS))
+            x, y = text_home
+            t_w, t_h = text_size
+            cv2.rectangle(frame, (x, y), (x + t_w - 1, y + t_h - 1), (30, 30, 30), -1)
+            cv2.putText(frame, word, (x + 8, y + 26), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (240, 240, 240), 2)
+            texts.append({"text": word, "box": [x, y, t_w, t_h]})
+
+        # 亮度变化和传感器噪声
+        gain = rng.uniform(0.92, 1.08)
+        noisy = frame.astype(np.float32) * gain + rng.normal(0, 2.0, frame.shape)
+        frame = np.clip(noisy, 0, 255).astype(np.uint8)
+
+        file_name = f"frame_{index:03d}.png"
+        cv2.imwrite(str(output_dir / file_name), frame)
+        manifest_frames.append({
+            "file": file_name,
+            "scene": _scene_for([obj["template"] for obj in objects]),
+            "objects": objects,
+            "texts": texts,
+        })
+
+    manifest = {
+        "version": 1,
+        "templates_dir": Path(os.path.relpath(templates_dir, output_dir)).as_posix(),
+        "synthetic": {"seed": seed, "frame_size": [width, height], "presence": presence},
+        "frames": manifest_frames,
+    }
+    (output_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+    return load_corpus(output_dir)
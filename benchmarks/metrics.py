@@ -0,0 +1,97 @@
+"""延迟统计和检测准确率统计."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+@dataclass
+class LatencyRecorder:
+    """记录单次调用耗时（秒）并汇总为百分位数."""
+
+    samples: List[float] = field(default_factory=list)
+
+    def add(self, seconds: float) -> None:
+        """记录一次调用耗时."""
+        self.samples.append(seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        """汇总延迟和吞吐量.
+
+        Returns:
+            Dict[str, Any]: calls、p50/p95/p99/mean/max（毫秒）和每秒调用数
+        """
+        if not self.samples:
+            return {
+                "calls": 0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0,
+                "mean_ms": 0.0, "max_ms": 0.0, "throughput_per_s": 0.0,
+            }
+        values = np.asarray(self.samples) * 1000.0
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        total = float(np.sum(self.samples))
+        return {
+            "calls": len(self.samples),
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+            "mean_ms": round(float(values.mean()), 3),
+            "max_ms": round(float(values.max()), 3),
+            "throughput_per_s": round(len(self.samples) / total, 2) if total > 0 else 0.0,
+        }
+
+
+@dataclass
+class DetectionCounts:
+    """检测结果计数.
+
+    找到且位置正确为TP；找到但目标不存在或位置错误为FP（位置错误时同时
+    计一次FN）；目标存在但未找到为FN；目标不存在且未找到为TN。
+    """
+
+    tp: int = 0
+    fp: int = 0
+    fn: int = 0
+    tn: int = 0
+
+    def record(self, found: bool, present: bool, correct: bool) -> None:
+        """记录一次检测.
+
+        Args:
+            found: 是否报告找到
+            present: 目标是否存在
+            correct: 报告的位置是否与标注一致
+        """
+        if found and present and correct:
+            self.tp += 1
+        elif found:
+            self.fp += 1
+            if present:
+                self.fn += 1
+        elif present:
+            self.fn += 1
+        else:
+            self.tn += 1
+
+    @property
+    def precision(self) -> float:
+        """精确率，没有任何报告时为1.0."""
+        reported = self.tp + self.fp
+        return self.tp / reported if reported else 1.0
+
+    @property
+    def recall(self) -> float:
+        """召回率，没有任何目标时为1.0."""
+        relevant = self.tp + self.fn
+        return self.tp / relevant if relevant else 1.0
+
+    def summary(self) -> Dict[str, Any]:
+        """汇总计数、精确率和召回率."""
+        return {
+            "tp": self.tp,
+            "fp": self.fp,
+            "fn": self.fn,
+            "tn": self.tn,
+            "precision": round(self.precision, 4),
+            "recall": round(self.recall, 4),
+        }
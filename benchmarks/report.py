@@ -0,0 +1,208 @@
+"""基准测试报告：JSON/Markdown输出和与基线的对比."""
+
+import json
+import platform
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+REPORT_JSON = "benchmark.json"
+REPORT_MARKDOWN = "benchmark.md"
+
+
+def environment_info() -> Dict[str, Any]:
+    """运行环境信息，对比不同机器上的报告时使用."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "cv2_threads": cv2.getNumThreads(),
+    }
+
+
+def build_report(
+    corpus: Dict[str, Any],
+    settings: Dict[str, Any],
+    template_matching: Dict[str, Dict[str, Any]],
+    scene_detection: Optional[Dict[str, Dict[str, Any]]] = None,
+    ocr: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """组装报告.
+
+    Args:
+        corpus: 语料概况
+        settings: 基准参数（阈值、容差、重复次数）
+        template_matching: 各匹配策略的结果
+        scene_detection: 场景检测结果（full/incremental）
+        ocr: OCR结果
+
+    Returns:
+        Dict[str, Any]: 报告
+    """
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": environment_info(),
+        "corpus": corpus,
+        "settings": settings,
+        "template_matching": template_matching,
+        "scene_detection": scene_detection or {},
+        "ocr": ocr or {},
+    }
+
+
+def compare_reports(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    max_latency_increase: float = 0.2,
+    max_quality_drop: float = 0.02,
+) -> List[str]:
+    """找出相对基线的性能回退.
+
+    p95延迟增加超过max_latency_increase（比例），或精确率/召回率/准确率
+    下降超过max_quality_drop（绝对值）时视为回退。
+
+    Args:
+        report: 本次报告
+        baseline: 基线报告
+        max_latency_increase: 允许的p95延迟增幅
+        max_quality_drop: 允许的准确率降幅
+
+    Returns:
+        List[str]: 回退描述，没有回退时为空列表
+    """
+    regressions = []
+    sections = [("template_matching", "匹配策略"), ("scene_detection", "场景检测")]
+    for section, label in sections:
+        for name, current in (report.get(section) or {}).items():
+            previous = (baseline.get(section) or {}).get(name)
+            if not previous:
+                continue
+            regressions.extend(_compare_entry(
+                f"{label} {name}", current, previous, max_latency_increase, max_quality_drop
+            ))
+    ocr, previous_ocr = report.get("ocr") or {}, baseline.get("ocr") or {}
+    if ocr.get("available") and previous_ocr.get("available"):
+        regressions.extend(_compare_entry(
+            "OCR", ocr, previous_ocr, max_latency_increase, max_quality_drop
+        ))
+    return regressions
+
+
+def _compare_entry(
+    label: str,
+    current: Dict[str, Any],
+    previous: Dict[str, Any],
+    max_latency_increase: float,
+    max_quality_drop: float,
+) -> List[str]:
+    """比较单个条目的p95延迟和准确率指标."""
+    regressions = []
+    old_p95, new_p95 = previous.get("p95_ms", 0.0), current.get("p95_ms", 0.0)
+    if old_p95 > 0 and new_p95 > old_p95 * (1.0 + max_latency_increase):
+        regressions.append(
+            f"{label}: p95 {old_p95:.2f}ms -> {new_p95:.2f}ms (+{new_p95 / old_p95 - 1.0:.0%})"
+        )
+    for metric in ("precision", "recall", "accuracy"):
+        if metric in previous and metric in current:
+            if current[metric] < previous[metric] - max_quality_drop:
+                regressions.append(
+                    f"{label}: {metric} {previous[metric]:.3f} -> {current[metric]:.3f}"
+                )
+    return regressions
+
+
+def render_markdown(report: Dict[str, Any], regressions: Optional[List[str]] = None) -> str:
+    """把报告渲染为Markdown.
+
+    Args:
+        report: 报告
+        regressions: 与基线对比得到的回退，None表示未对比
+
+    Returns:
+        str: Markdown文本
+    """
+    corpus = report["corpus"]
+    settings = report["settings"]
+    environment = report["environment"]
+    lines = [
+        "# 视觉检测基准报告",
+        "",
+        f"- 生成时间: {report['generated_at']}",
+        f"- 环境: Python {environment['python']} / OpenCV {environment['opencv']} / "
+        f"{environment['processor']}",
+        f"- 语料: {corpus['frames']} 帧 ({', '.join(corpus['frame_sizes'])}), "
+        f"{corpus['objects']} 个模板实例, {corpus['texts']} 段文本",
+        f"- 模板: {', '.join(corpus['templates'])}",
+        f"- 阈值 {settings['threshold']}, 位置容差 {settings['tolerance']}px, "
+        f"重复 {settings['repeat']} 次",
+        "",
+        "## 模板匹配策略",
+        "",
+        "| 策略 | 调用 | p50 (ms) | p95 (ms) | p99 (ms) | 吞吐 (次/秒) | 精确率 | 召回率 |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for name, stats in report["template_matching"].items():
+        lines.append(
+            f"| {name} | {stats['calls']} | {stats['p50_ms']:.2f} | {stats['p95_ms']:.2f} | "
+            f"{stats['p99_ms']:.2f} | {stats['throughput_per_s']:.1f} | "
+            f"{stats['precision']:.3f} | {stats['recall']:.3f} |"
+        )
+
+    if report.get("scene_detection"):
+        lines += [
+            "",
+            "## 场景检测 (GameDetector.detect_scene)",
+            "",
+            "| 模式 | 调用 | p50 (ms) | p95 (ms) | p99 (ms) | 吞吐 (帧/秒) | 准确率 |",
+            "|---|---:|---:|---:|---:|---:|---:|",
+        ]
+        for name, stats in report["scene_detection"].items():
+            lines.append(
+                f"| {name} | {stats['calls']} | {stats['p50_ms']:.2f} | {stats['p95_ms']:.2f} | "
+                f"{stats['p99_ms']:.2f} | {stats['throughput_per_s']:.1f} | {stats['accuracy']:.3f} |"
+            )
+
+    ocr = report.get("ocr") or {}
+    if ocr:
+        lines += ["", "## OCR (OCRDetector.recognize_text)", ""]
+        if ocr.get("available"):
+            lines += [
+                "| 调用 | p50 (ms) | p95 (ms) | p99 (ms) | 吞吐 (次/秒) | 精确率 | 召回率 |",
+                "|---:|---:|---:|---:|---:|---:|---:|",
+                f"| {ocr['calls']} | {ocr['p50_ms']:.2f} | {ocr['p95_ms']:.2f} | {ocr['p99_ms']:.2f} | "
+                f"{ocr['throughput_per_s']:.1f} | {ocr['precision']:.3f} | {ocr['recall']:.3f} |",
+            ]
+        else:
+            lines.append(f"未运行: {ocr.get('reason', 'OCR不可用')}")
+
+    if regressions is not None:
+        lines += ["", "## 与基线对比", ""]
+        lines += [f"- ⚠ {item}" for item in regressions] or ["未发现回退。"]
+    return "\n".join(lines) + "\n"
+
+
+def write_report(
+    report: Dict[str, Any], output_dir: Path, regressions: Optional[List[str]] = None
+) -> Dict[str, Path]:
+    """写出JSON和Markdown报告.
+
+    Args:
+        report: 报告
+        output_dir: 输出目录
+        regressions: 与基线对比得到的回退
+
+    Returns:
+        Dict[str, Path]: 写出的文件路径
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    json_path = output_dir / REPORT_JSON
+    markdown_path = output_dir / REPORT_MARKDOWN
+    json_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    markdown_path.write_text(render_markdown(report, regressions), encoding="utf-8")
+    return {"json": json_path, "markdown": markdown_path}
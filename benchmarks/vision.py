@@ -0,0 +1,226 @@
+"""视觉检测基准：模板匹配策略、场景检测和OCR."""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.core.frame_source import GeneratorFrameSource
+from src.core.game_detector import (
+    MATCH_MODE_COLOR,
+    MATCH_MODE_EDGE,
+    MATCH_MODE_GRAY,
+    GameDetector,
+    TemplateInfo,
+    TemplateMatcher,
+)
+
+from .corpus import Corpus, LabeledFrame
+from .metrics import DetectionCounts, LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MatchStrategy:
+    """模板匹配策略：TemplateMatcher的开关组合."""
+
+    name: str
+    pyramid: bool = False
+    multi_scale: bool = False
+    roi: bool = False
+    match_mode: str = MATCH_MODE_COLOR
+
+    def build_matcher(self, corpus: Corpus, threshold: float) -> TemplateMatcher:
+        """创建按本策略配置并加载了语料模板的匹配器.
+
+        Args:
+            corpus: 语料
+            threshold: 匹配阈值
+
+        Returns:
+            TemplateMatcher: 匹配器
+        """
+        matcher = TemplateMatcher()
+        matcher.enable_pyramid_matching = self.pyramid
+        matcher.enable_multi_scale = self.multi_scale
+        matcher.enable_roi_matching = self.roi
+        matcher.default_match_mode = self.match_mode
+        for entry in matcher.template_bank.load_directory(str(corpus.templates_dir), threshold):
+            matcher.template_info_cache[entry.name] = TemplateInfo(
+                name=entry.name,
+                image=entry.color,
+                threshold=threshold,
+                path=entry.path,
+                match_mode=self.match_mode,
+            )
+        return matcher
+
+
+STRATEGIES: Dict[str, MatchStrategy] = {
+    strategy.name: strategy
+    for strategy in [
+        MatchStrategy("pyramid", pyramid=True),
+        MatchStrategy("multi_scale", multi_scale=True),
+        MatchStrategy("single_scale"),
+        MatchStrategy("roi", pyramid=True, roi=True),
+        MatchStrategy("grayscale", pyramid=True, match_mode=MATCH_MODE_GRAY),
+        MatchStrategy("edge", match_mode=MATCH_MODE_EDGE),
+    ]
+}
+
+
+def _position_matches(position: Any, box: Any, tolerance: int) -> bool:
+    """判断匹配位置与标注框左上角的偏差是否在容差内."""
+    return abs(position[0] - box[0]) <= tolerance and abs(position[1] - box[1]) <= tolerance
+
+
+def bench_template_matching(
+    corpus: Corpus,
+    strategies: Iterable[str],
+    threshold: float = 0.8,
+    tolerance: int = 5,
+    repeat: int = 1,
+) -> Dict[str, Dict[str, Any]]:
+    """测量各匹配策略对语料中每个模板调用match_template的延迟和准确率.
+
+    帧按语料顺序处理，ROI策略因此能像实际运行时一样从前面的帧学习搜索窗口。
+
+    Args:
+        corpus: 语料
+        strategies: 策略名称
+        threshold: 匹配阈值
+        tolerance: 位置容差（像素）
+        repeat: 每次调用重复次数，只用最后一次的结果统计准确率
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 策略名到延迟、吞吐量和准确率统计的映射
+    """
+    results = {}
+    templates = corpus.template_names
+    for name in strategies:
+        matcher = STRATEGIES[name].build_matcher(corpus, threshold)
+        missing = [template for template in templates if template not in matcher.template_info_cache]
+        if missing:
+            logger.warning(f"策略 {name} 缺少模板: {missing}")
+        latency = LatencyRecorder()
+        counts = DetectionCounts()
+        for frame in corpus.frames:
+            image = frame.image
+            for template in templates:
+                element = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    element = matcher.match_template(image, template)
+                    latency.add(time.perf_counter() - start)
+                box = frame.box_for(template)
+                counts.record(
+                    found=element is not None,
+                    present=box is not None,
+                    correct=(
+                        element is not None and box is not None
+                        and _position_matches(element.position, box, tolerance)
+                    ),
+                )
+        results[name] = {**latency.summary(), **counts.summary()}
+        if name == "roi":
+            results[name]["search_windows"] = matcher.search_windows.get_stats()
+    return results
+
+
+def _scene_counts(frames: List[LabeledFrame], predictions: List[str]) -> Dict[str, Dict[str, Any]]:
+    """按场景统计精确率和召回率."""
+    scenes = sorted({frame.scene for frame in frames} | set(predictions))
+    per_scene = {}
+    for scene in scenes:
+        counts = DetectionCounts()
+        for frame, predicted in zip(frames, predictions):
+            found = predicted == scene
+            present = frame.scene == scene
+            counts.record(found=found, present=present, correct=found and present)
+        per_scene[scene] = counts.summary()
+    return per_scene
+
+
+def bench_scene_detection(
+    corpus: Corpus, incremental: bool = False, repeat: int = 1
+) -> Dict[str, Any]:
+    """测量GameDetector.detect_scene的延迟和场景识别准确率.
+
+    检测器使用自身加载的assets/templates模板，与实际运行时一致。
+
+    Args:
+        corpus: 语料
+        incremental: 是否使用帧差分增量检测
+        repeat: 每帧重复检测次数，只用最后一次的结果统计准确率
+
+    Returns:
+        Dict[str, Any]: 延迟统计、准确率和各场景的精确率/召回率
+    """
+    if not corpus.frames:
+        return {**LatencyRecorder().summary(), "accuracy": 1.0, "scenes": {}}
+    # 离线来源在创建时预读一帧，读到None会被视为已结束
+    current: Dict[str, Any] = {"image": corpus.frames[0].image}
+    detector = GameDetector(frame_source=GeneratorFrameSource(lambda: current["image"]))
+    latency = LatencyRecorder()
+    predictions = []
+    try:
+        for frame in corpus.frames:
+            current["image"] = frame.image
+            scene = None
+            for _ in range(repeat):
+                # 每次检测都视为新截图，排除帧缓存的影响
+                detector.frame_cache.invalidate()
+                start = time.perf_counter()
+                scene = detector.detect_scene(incremental=incremental)
+                latency.add(time.perf_counter() - start)
+            predictions.append(scene.value)
+    finally:
+        detector.stop_capture_pipeline()
+
+    correct = sum(frame.scene == predicted for frame, predicted in zip(corpus.frames, predictions))
+    return {
+        **latency.summary(),
+        "accuracy": round(correct / len(corpus.frames), 4),
+        "scenes": _scene_counts(corpus.frames, predictions),
+    }
+
+
+def bench_ocr(corpus: Corpus, repeat: int = 1) -> Dict[str, Any]:
+    """测量OCRDetector.recognize_text在标注文本区域上的延迟和识别准确率.
+
+    关闭识别结果缓存，测量的是每次实际识别的耗时。
+
+    Args:
+        corpus: 语料
+        repeat: 每个区域重复识别次数
+
+    Returns:
+        Dict[str, Any]: 延迟统计和精确率/召回率；OCR不可用时只包含原因
+    """
+    from src.core import ocr_detector
+
+    if ocr_detector.pytesseract is None:
+        return {"available": False, "reason": "pytesseract未安装"}
+
+    detector = ocr_detector.OCRDetector()
+    detector.enable_result_cache = False
+    latency = LatencyRecorder()
+    counts = DetectionCounts()
+    try:
+        for frame in corpus.frames:
+            for label in frame.texts:
+                text: Optional[str] = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    text = detector.recognize_text(screenshot_data=frame.image, region=label.box)
+                    latency.add(time.perf_counter() - start)
+                normalized = (text or "").strip().upper()
+                counts.record(
+                    found=bool(normalized),
+                    present=True,
+                    correct=normalized == label.text.upper(),
+                )
+    finally:
+        detector.close()
+    return {"available": True, **latency.summary(), **counts.summary()}
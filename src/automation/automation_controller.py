@@ -3,10 +3,11 @@
 提供自动化任务的控制和协调功能.
 """
 
+from contextlib import nullcontext
 from enum import Enum
 import logging
 import time
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, ContextManager, Dict, List, Optional, Callable, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import asyncio
@@ -23,6 +24,22 @@ except ImportError:
     TaskPriority = None
     AutomationError = Exception
     GameDetectionError = Exception
+try:
+    from src.core.frame_diff import FrameChange, FrameChangeDetector
+except ImportError:
+    FrameChange = None
+    FrameChangeDetector = None
+try:
+    from src.core.latency_model import DEFAULT_LATENCY_TABLE, UILatencyModel
+except ImportError:
+    DEFAULT_LATENCY_TABLE = None
+    UILatencyModel = None
+try:
+    from src.core.input_dispatcher import InputDispatcher, PyAutoGUIInputBackend, click_events
+except ImportError:
+    InputDispatcher = None
+    PyAutoGUIInputBackend = None
+    click_events = None
 
 
 class AutomationStatus(Enum):
@@ -102,8 +119,27 @@ class AutomationController(IAutomationController):
             'auto_restart_game': False,
             'max_continuous_failures': 5,
             'check_interval': 2.0,
-            'scene_detection_threshold': 0.7
+            'scene_detection_threshold': 0.7,
+            'capture_fps': 15.0  # 后台截图流水线帧率，0表示在检测时同步截图
         }
+        
+        # 帧差分：画面未变化时复用上次的场景检测结果，局部变化时只在变化区域重新匹配
+        self._frame_change_detector = FrameChangeDetector() if FrameChangeDetector else None
+        # 模板路径 -> (评估时的画面代数, 匹配结果)；画面变化一次代数加一
+        self._scene_match_cache: Dict[str, Tuple[int, Optional[Dict[str, Any]]]] = {}
+        self._scene_generation = 0
+        self._scene_generation_change: Optional['FrameChange'] = None
+        self._last_detected_scene: Optional[str] = None
+        
+        # 点击后按场景学习界面响应延迟，画面一变化即继续，不再固定等待0.5秒
+        self._latency_model = UILatencyModel(DEFAULT_LATENCY_TABLE) if UILatencyModel else None
+        self._click_response_timeout = 0.5
+        self._click_poll_interval = 0.02
+        
+        # 点击由专用派发线程注入，逐个领取奖励等独立点击批量提交
+        self._input_dispatcher = (
+            InputDispatcher(PyAutoGUIInputBackend(), name="AutomationInput") if InputDispatcher else None
+        )
 
     @property
     def status(self) -> AutomationStatus:
@@ -156,6 +192,10 @@ class AutomationController(IAutomationController):
 
             self._running = False
             self._status = AutomationStatus.STOPPED
+            if self._latency_model is not None:
+                self._latency_model.flush()
+            if self._input_dispatcher is not None:
+                self._input_dispatcher.stop()
             self._logger.info("自动化控制器已停止")
             return True
         except Exception as e:
@@ -623,6 +663,7 @@ class AutomationController(IAutomationController):
                 return True
             
             import asyncio
+            self._start_capture_pipeline()
             self._automation_loop_task = asyncio.create_task(self._automation_loop())
             self._logger.info("自动化主循环已启动")
             return True
@@ -651,6 +692,7 @@ class AutomationController(IAutomationController):
                         self._logger.warning(f"停止任务{task_id}失败: {e}")
             
             self._current_automation_tasks.clear()
+            self._stop_capture_pipeline()
             self._logger.info("自动化主循环已停止")
             return True
             
@@ -699,48 +741,161 @@ class AutomationController(IAutomationController):
         
         # 清理
         self._running = False
+        self._stop_capture_pipeline()
         self._logger.info("自动化循环已结束")
     
+    def _start_capture_pipeline(self):
+        """按配置启动检测器的后台截图流水线."""
+        fps = self._automation_config.get('capture_fps', 0)
+        start_pipeline = getattr(self._game_detector, 'start_capture_pipeline', None)
+        if not fps or not callable(start_pipeline):
+            return
+        try:
+            start_pipeline(target_fps=fps)
+        except Exception as e:
+            self._logger.warning(f"启动截图流水线失败，改为同步截图: {e}")
+    
+    def _stop_capture_pipeline(self):
+        """停止检测器的后台截图流水线."""
+        stop_pipeline = getattr(self._game_detector, 'stop_capture_pipeline', None)
+        if not callable(stop_pipeline):
+            return
+        try:
+            stop_pipeline()
+        except Exception as e:
+            self._logger.warning(f"停止截图流水线失败: {e}")
+    
     async def _detect_current_scene_async(self) -> str:
         """异步检测当前游戏场景.
         
+        截图读取和模板匹配都在工作线程中进行，不阻塞事件循环。
+        
         Returns:
             str: 场景名称
         """
         if not self._game_detector:
             return "unknown"
         
-        try:
-            # 截取游戏画面
-            screenshot = self._game_detector.capture_screen()
-            if screenshot is None:
-                return "unknown"
-            
-            # 检测各种UI元素来判断场景
-            scenes = {
-                "main_menu": "assets/templates/main_menu.png",
-                "world_map": "assets/templates/world_map.png", 
-                "battle": "assets/templates/battle_ui.png",
-                "mission_menu": "assets/templates/mission_menu.png",
-                "inventory": "assets/templates/inventory.png"
-            }
-            
-            threshold = self._automation_config.get('scene_detection_threshold', 0.7)
-            for scene_name, template_path in scenes.items():
-                try:
-                    result = self._game_detector.find_template(template_path, threshold=threshold)
-                    if result and result.get('found', False):
-                        self._logger.debug(f"检测到场景: {scene_name}")
-                        return scene_name
-                except Exception as e:
-                    self._logger.debug(f"检测场景{scene_name}失败: {e}")
-            
+        return await asyncio.to_thread(self._match_current_scene)
+    
+    def _match_current_scene(self) -> str:
+        """检测当前游戏场景（阻塞）.
+        
+        Returns:
+            str: 场景名称
+        """
+        if not self._game_detector:
             return "unknown"
+        
+        try:
+            # 同一检测周期内的截图和模板匹配共享同一帧
+            with self._detection_tick():
+                # 截取游戏画面（原始帧，无需PNG编码）
+                screenshot = self._game_detector.capture_frame()
+                if screenshot is None:
+                    return "unknown"
+                
+                # 画面与上一帧相同时直接复用上次的场景
+                change = self._detect_frame_change(screenshot)
+                if change is not None and not change.changed and self._last_detected_scene is not None:
+                    return self._last_detected_scene
+                if change is None or change.full_frame:
+                    self._scene_match_cache.clear()
+                if change is None or change.changed:
+                    self._scene_generation += 1
+                    self._scene_generation_change = change
+                
+                # 检测各种UI元素来判断场景
+                scenes = {
+                    "main_menu": "assets/templates/main_menu.png",
+                    "world_map": "assets/templates/world_map.png", 
+                    "battle": "assets/templates/battle_ui.png",
+                    "mission_menu": "assets/templates/mission_menu.png",
+                    "inventory": "assets/templates/inventory.png"
+                }
+                
+                threshold = self._automation_config.get('scene_detection_threshold', 0.7)
+                detected_scene = "unknown"
+                for scene_name, template_path in scenes.items():
+                    try:
+                        result = self._match_scene_template(template_path, threshold)
+                        if result and result.get('found', False):
+                            self._logger.debug(f"检测到场景: {scene_name}")
+                            detected_scene = scene_name
+                            break
+                    except Exception as e:
+                        self._logger.debug(f"检测场景{scene_name}失败: {e}")
+                
+                self._last_detected_scene = detected_scene
+                return detected_scene
             
         except Exception as e:
             self._logger.error(f"场景检测失败: {e}")
             return "unknown"
     
+    def _detect_frame_change(self, screenshot: Any) -> Optional['FrameChange']:
+        """将截图与上一帧比较.
+        
+        Args:
+            screenshot: 当前截图
+            
+        Returns:
+            Optional[FrameChange]: 帧差异，无法比较时返回None
+        """
+        if self._frame_change_detector is None:
+            return None
+        try:
+            return self._frame_change_detector.update(screenshot)
+        except Exception as e:
+            self._logger.debug(f"帧差分失败，改为全帧检测: {e}")
+            self._frame_change_detector.reset()
+            return None
+    
+    def _match_scene_template(self, template_path: str, threshold: float) -> Optional[Dict[str, Any]]:
+        """匹配场景模板，画面局部变化时复用或只在变化区域重新匹配.
+        
+        只有在上一代画面评估过的结果能按帧差异增量更新；更早评估的结果（如上次
+        检测到前面的场景后未评估的模板）已经过期，重新全帧匹配。
+        
+        Args:
+            template_path: 模板路径
+            threshold: 匹配阈值
+            
+        Returns:
+            Optional[Dict[str, Any]]: 匹配结果
+        """
+        generation = self._scene_generation
+        change = self._scene_generation_change
+        evaluated, previous = self._scene_match_cache.get(template_path, (None, None))
+        if evaluated == generation:
+            return previous
+        if evaluated != generation - 1 or change is None or change.full_frame:
+            result = self._game_detector.find_template(template_path, threshold=threshold)
+        else:
+            result = previous
+            box = None
+            if previous and previous.get('found') and previous.get('top_left') and previous.get('bottom_right'):
+                (left, top), (right, bottom) = previous['top_left'], previous['bottom_right']
+                box = (left, top, right - left, bottom - top)
+            if box is None or change.intersects(box):
+                # 上一代画面之后只有变化区域可能出现新的匹配
+                result = self._game_detector.find_template(
+                    template_path, threshold=threshold, region=change.bounds
+                )
+        self._scene_match_cache[template_path] = (generation, result)
+        return result
+    
+    def _detection_tick(self) -> ContextManager[Any]:
+        """创建检测周期，使周期内的多次模板匹配共享同一帧截图.
+        
+        Returns:
+            ContextManager[Any]: 检测周期上下文，检测器不支持时为空上下文
+        """
+        detection_tick = getattr(self._game_detector, 'detection_tick', None)
+        if callable(detection_tick):
+            return detection_tick()
+        return nullcontext()
+    
     async def _handle_scene(self, scene: str):
         """处理特定场景.
         
@@ -1225,6 +1380,11 @@ class AutomationController(IAutomationController):
             
             # 如果没有一键领取，逐个领取
             reward_buttons = await self._find_all_reward_buttons()
+            if self._input_dispatcher is not None and self._input_dispatcher.backend.is_available():
+                claimed = await self._click_locations_in_batch(reward_buttons, "claim_reward")
+                self._logger.info(f"已领取 {claimed} 个奖励")
+                return
+            
             for button in reward_buttons:
                 try:
                     await self._click_at_location(button)
@@ -1355,8 +1515,6 @@ class AutomationController(IAutomationController):
             List[tuple]: 奖励按钮位置列表
         """
         try:
-            reward_buttons = []
-            
             # 查找多个奖励按钮模板
             templates = [
                 "assets/templates/reward_button.png",
@@ -1364,15 +1522,7 @@ class AutomationController(IAutomationController):
                 "assets/templates/get_reward.png"
             ]
             
-            for template in templates:
-                try:
-                    result = self._game_detector.find_template(template, threshold=0.7)
-                    if result and result.get('found', False):
-                        reward_buttons.append(result['center'])
-                except Exception as e:
-                    self._logger.debug(f"查找模板 {template} 失败: {e}")
-            
-            return reward_buttons
+            return self._find_template_instances(templates)
             
         except Exception as e:
             self._logger.error(f"查找奖励按钮失败: {e}")
@@ -1385,8 +1535,6 @@ class AutomationController(IAutomationController):
             List[tuple]: 资源点位置列表
         """
         try:
-            resource_points = []
-            
             # 查找多个资源点模板
             templates = [
                 "assets/templates/resource_point.png",
@@ -1394,15 +1542,7 @@ class AutomationController(IAutomationController):
                 "assets/templates/treasure_chest.png"
             ]
             
-            for template in templates:
-                try:
-                    result = self._game_detector.find_template(template, threshold=0.7)
-                    if result and result.get('found', False):
-                        resource_points.append(result['center'])
-                except Exception as e:
-                    self._logger.debug(f"查找资源模板 {template} 失败: {e}")
-            
-            return resource_points
+            return self._find_template_instances(templates)
             
         except Exception as e:
             self._logger.error(f"查找资源点失败: {e}")
@@ -1593,8 +1733,6 @@ class AutomationController(IAutomationController):
             List[tuple]: 资源点位置列表
         """
         try:
-            resource_points = []
-            
             # 查找多种资源点模板
             templates = [
                 "assets/templates/gold_resource.png",
@@ -1603,15 +1741,7 @@ class AutomationController(IAutomationController):
                 "assets/templates/resource_point.png"
             ]
             
-            for template in templates:
-                try:
-                    result = self._game_detector.find_template(template, threshold=0.7)
-                    if result and result.get('found', False):
-                        resource_points.append(result['center'])
-                except Exception as e:
-                    self._logger.debug(f"查找资源模板 {template} 失败: {e}")
-            
-            return resource_points
+            return self._find_template_instances(templates)
             
         except Exception as e:
             self._logger.error(f"查找资源点失败: {e}")
@@ -1644,8 +1774,6 @@ class AutomationController(IAutomationController):
             List[tuple]: 技能按钮位置列表
         """
         try:
-            skill_positions = []
-            
             # 查找技能按钮模板
             templates = [
                 "assets/templates/skill1_ready.png",
@@ -1654,15 +1782,7 @@ class AutomationController(IAutomationController):
                 "assets/templates/skill_available.png"
             ]
             
-            for template in templates:
-                try:
-                    result = self._game_detector.find_template(template, threshold=0.7)
-                    if result and result.get('found', False):
-                        skill_positions.append(result['center'])
-                except Exception as e:
-                    self._logger.debug(f"查找技能模板 {template} 失败: {e}")
-            
-            return skill_positions
+            return self._find_template_instances(templates)
             
         except Exception as e:
             self._logger.error(f"查找可用技能失败: {e}")
@@ -1697,8 +1817,6 @@ class AutomationController(IAutomationController):
             List[tuple]: 完成按钮位置列表
         """
         try:
-            complete_positions = []
-            
             # 查找完成按钮模板
             templates = [
                 "assets/templates/mission_complete.png",
@@ -1706,15 +1824,7 @@ class AutomationController(IAutomationController):
                 "assets/templates/finish_button.png"
             ]
             
-            for template in templates:
-                try:
-                    result = self._game_detector.find_template(template, threshold=0.7)
-                    if result and result.get('found', False):
-                        complete_positions.append(result['center'])
-                except Exception as e:
-                    self._logger.debug(f"查找完成按钮模板 {template} 失败: {e}")
-            
-            return complete_positions
+            return self._find_template_instances(templates)
             
         except Exception as e:
             self._logger.error(f"查找完成按钮失败: {e}")
@@ -1731,11 +1841,14 @@ class AutomationController(IAutomationController):
         except Exception as e:
             self._logger.error(f"返回主菜单失败: {e}")
     
-    async def _click_at_location(self, location: tuple):
+    async def _click_at_location(self, location: tuple, target: Optional[str] = None):
         """在指定位置点击.
         
+        点击后等待画面开始变化，最多等待该目标学到的响应延迟。
+        
         Args:
             location: 点击位置坐标 (x, y)
+            target: 点击目标名称，用于按目标学习响应延迟，None时按当前场景学习
         """
         try:
             if not isinstance(location, (tuple, list)) or len(location) != 2:
@@ -1747,16 +1860,17 @@ class AutomationController(IAutomationController):
                 self._logger.error(f"坐标必须是数字: ({x}, {y})")
                 return False
             
-            # 尝试使用pyautogui进行点击
-            try:
-                import pyautogui
-                # 移动鼠标到目标位置
-                pyautogui.moveTo(x, y, duration=0.2)
-                # 点击
-                pyautogui.click(x, y)
+            latency_key = target or f"scene:{self._last_detected_scene or 'unknown'}"
+            before = self._capture_signature()
+            
+            # 优先通过输入派发器点击
+            if self._input_dispatcher is not None and self._input_dispatcher.backend.is_available():
+                result = await self._input_dispatcher.run_async(click_events(int(x), int(y)))
+                if not result.success:
+                    self._logger.error(f"点击操作失败: {result.error_message}")
+                    return False
                 self._logger.debug(f"已点击位置: ({x}, {y})")
-                
-            except ImportError:
+            else:
                 # 如果没有pyautogui，尝试使用其他方法
                 try:
                     import mouse
@@ -1767,14 +1881,144 @@ class AutomationController(IAutomationController):
                     # 模拟点击记录
                     self._logger.info(f"模拟点击位置: ({x}, {y}) (无可用点击库)")
             
-            import asyncio
-            await asyncio.sleep(0.5)
+            await self._wait_for_click_response(latency_key, before, time.monotonic())
             return True
             
         except Exception as e:
             self._logger.error(f"点击操作失败: {e}")
             return False
     
+    async def _click_locations_in_batch(self, locations: List[tuple], target: str) -> int:
+        """把相互独立的点击一次性提交给输入派发器.
+        
+        第一次点击单独提交并等待画面响应，按目标记录响应延迟；其余点击一次性提交，
+        相邻点击之间以及最后一次点击之后间隔该目标学到的响应延迟（样本不足时为
+        _click_response_timeout），由派发线程定时，不再每次点击各自等待。
+        
+        Args:
+            locations: 点击位置坐标列表
+            target: 点击目标名称，用于确定点击间隔和学习响应延迟
+            
+        Returns:
+            int: 成功点击的次数
+        """
+        if not locations:
+            return 0
+        
+        x, y = locations[0]
+        before = self._capture_signature()
+        results = [await self._input_dispatcher.run_async(click_events(int(x), int(y)))]
+        if results[0].success:
+            await self._wait_for_click_response(target, before, time.monotonic())
+        
+        interval = self._click_response_timeout
+        if self._latency_model is not None:
+            interval = self._latency_model.get_delay(target, interval)
+        
+        sequences = [
+            click_events(int(x), int(y), delay=interval if index else 0.0)
+            for index, (x, y) in enumerate(locations[1:])
+        ]
+        if sequences:
+            results.extend(await self._input_dispatcher.run_many_async(sequences))
+        clicked = sum(1 for result in results if result.success)
+        
+        latencies = [event.latency * 1000 for result in results for event in result.events]
+        self._logger.debug(
+            f"批量点击 {clicked}/{len(locations)} 成功, "
+            f"最大调度延迟 {max(latencies, default=0.0):.1f}ms"
+        )
+        for result in results:
+            if not result.success:
+                self._logger.error(f"批量点击失败: {result.error_message}")
+        
+        if sequences and clicked:
+            await asyncio.sleep(interval)
+        return clicked
+    
+    def _find_template_instances(self, templates: List[str], threshold: float = 0.7) -> List[tuple]:
+        """在同一帧上查找多个模板的所有实例.
+        
+        每个模板扫描一次即返回画面上的全部实例；不同模板命中同一位置时只保留
+        一个。结果按从上到下、从左到右排序。
+        
+        Args:
+            templates: 模板路径列表
+            threshold: 匹配阈值
+            
+        Returns:
+            List[tuple]: 实例中心坐标列表
+        """
+        found: List[Dict[str, Any]] = []
+        with self._detection_tick():
+            for template in templates:
+                try:
+                    for match in self._game_detector.find_all_templates(template, threshold=threshold):
+                        top_left, bottom_right = match['top_left'], match['bottom_right']
+                        # 与已有实例的框中心距离小于半个框尺寸时视为同一目标
+                        half_w = (bottom_right[0] - top_left[0]) / 2
+                        half_h = (bottom_right[1] - top_left[1]) / 2
+                        cx, cy = match['center']
+                        if any(abs(cx - other['center'][0]) < half_w and abs(cy - other['center'][1]) < half_h
+                               for other in found):
+                            continue
+                        found.append(match)
+                except Exception as e:
+                    self._logger.debug(f"查找模板 {template} 失败: {e}")
+        
+        found.sort(key=lambda match: (match['top_left'][1], match['top_left'][0]))
+        return [match['center'] for match in found]
+    
+    def _capture_signature(self):
+        """截取当前画面的缩略图签名，无法截图时返回None."""
+        if self._frame_change_detector is None or self._game_detector is None:
+            return None
+        try:
+            frame = self._game_detector.capture_frame(max_age=0)
+            if frame is None:
+                return None
+            return self._frame_change_detector.signature(frame)
+        except Exception as e:
+            self._logger.debug(f"截取画面签名失败: {e}")
+            return None
+    
+    async def _wait_for_click_response(self, latency_key: str, before, clicked_at: float) -> bool:
+        """等待点击后画面开始变化.
+        
+        最多等待该目标响应延迟的高分位数（样本不足时为_click_response_timeout），
+        检测到变化立即返回并记录本次延迟；超时记为截尾观测，之后观测到更慢的
+        真实变化时学到的延迟才会变长。无法截图时按学习到的延迟等待。
+        
+        Args:
+            latency_key: 延迟模型中的目标名称
+            before: 点击前的画面签名
+            clicked_at: 点击时间（time.monotonic()）
+            
+        Returns:
+            bool: 检测到画面变化返回True
+        """
+        timeout = self._click_response_timeout
+        if self._latency_model is not None:
+            timeout = self._latency_model.get_delay(latency_key, timeout)
+        deadline = clicked_at + timeout
+        
+        if before is None:
+            await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+            return False
+        
+        while True:
+            after = self._capture_signature()
+            if after is not None and self._frame_change_detector.compare(before, after).changed:
+                if self._latency_model is not None:
+                    self._latency_model.record(latency_key, time.monotonic() - clicked_at)
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                if self._latency_model is not None:
+                    self._latency_model.record_timeout(latency_key, time.monotonic() - clicked_at)
+                return False
+            await asyncio.sleep(min(self._click_poll_interval, remaining))
+    
     async def _press_key(self, key: str):
         """按下指定按键.
         
@@ -17,6 +17,15 @@ import cv2
 import numpy as np
 
 from .game_detector import GameDetector
+from .input_dispatcher import (
+    InputDispatcher,
+    InputEvent,
+    InputEventType,
+    InputSequenceResult,
+    PyAutoGUIInputBackend,
+    click_events,
+    key_press_events,
+)
 from .logger import get_logger
 
 
@@ -85,11 +94,13 @@ class ExecutionResult:
 class ActionExecutor:
     """动作执行器。"""
 
-    def __init__(self, game_detector: Optional[GameDetector] = None):
+    def __init__(self, game_detector: Optional[GameDetector] = None,
+                 input_dispatcher: Optional[InputDispatcher] = None):
         """初始化动作执行器。
         
         Args:
             game_detector: 游戏检测器实例
+            input_dispatcher: 输入派发器，None时创建基于pyautogui的派发器
         """
         self.logger = get_logger(__name__)
         self.game_detector = game_detector or GameDetector()
@@ -98,6 +109,11 @@ class ActionExecutor:
         pyautogui.FAILSAFE = True
         pyautogui.PAUSE = 0.1
         
+        # 鼠标和键盘动作由派发线程按事件序列注入，事件间隔不再叠加pyautogui.PAUSE
+        self.input_dispatcher = input_dispatcher or InputDispatcher(
+            PyAutoGUIInputBackend(lambda: pyautogui), name="ActionExecutorInput"
+        )
+        
         # 执行状态
         self.is_executing = False
         self.current_action = None
@@ -218,106 +234,162 @@ class ActionExecutor:
         
         return results
 
-    async def _execute_click(self, action_config: ActionConfig, result: ExecutionResult) -> None:
-        """执行点击操作。"""
-        params = action_config.parameters
-        x = params.get("x", 0)
-        y = params.get("y", 0)
-        button = params.get("button", "left")
+    async def execute_input_batch(self, actions: List[ActionConfig], interval: float = 0.0) -> List[ExecutionResult]:
+        """批量执行相互独立的输入动作。
         
-        # 确保坐标在屏幕范围内
-        screen_width, screen_height = pyautogui.size()
-        x = max(0, min(x, screen_width - 1))
-        y = max(0, min(y, screen_height - 1))
+        所有点击、按键、移动和滚轮动作一次性提交给输入派发器，按顺序执行且
+        互不影响，每个动作之间间隔interval秒。其他类型的动作在批量动作完成后
+        逐个执行。
         
-        pyautogui.click(x, y, button=button)
+        Args:
+            actions: 动作配置列表
+            interval: 相邻输入动作之间的等待时间（秒）
+            
+        Returns:
+            与actions一一对应的执行结果列表
+        """
+        results: List[Optional[ExecutionResult]] = [None] * len(actions)
+        batch = []
+        for index, action in enumerate(actions):
+            try:
+                built = self._build_input_events(action)
+            except ValueError as e:
+                now = datetime.now()
+                results[index] = ExecutionResult(
+                    action_config=action,
+                    status=ExecutionStatus.FAILED,
+                    start_time=now,
+                    end_time=now,
+                    error_message=str(e)
+                )
+                continue
+            if built is None:
+                continue
+            events, result_data = built
+            if batch and interval > 0:
+                events[0].delay += interval
+            batch.append((index, events, result_data))
         
-        result.result_data = {
-            "clicked_position": (x, y),
-            "button": button
-        }
+        start_time = datetime.now()
+        sequence_results = await self.input_dispatcher.run_many_async([events for _, events, _ in batch])
+        for (index, _, result_data), sequence_result in zip(batch, sequence_results):
+            result = ExecutionResult(
+                action_config=actions[index],
+                status=ExecutionStatus.COMPLETED if sequence_result.success else ExecutionStatus.FAILED,
+                start_time=start_time,
+                end_time=datetime.now(),
+                result_data=dict(result_data, **self._latency_data(sequence_result)),
+                error_message=sequence_result.error_message
+            )
+            results[index] = result
+        
+        for index, action in enumerate(actions):
+            if results[index] is None:
+                results[index] = await self.execute_action(action)
+        
+        failed = sum(1 for result in results if not result.success)
+        self.logger.info(f"批量输入动作完成: {len(actions) - failed}/{len(actions)} 成功")
+        return results
 
-    async def _execute_double_click(self, action_config: ActionConfig, result: ExecutionResult) -> None:
-        """执行双击操作。"""
-        params = action_config.parameters
-        x = params.get("x", 0)
-        y = params.get("y", 0)
-        
+    def _clamp_to_screen(self, x: int, y: int) -> Tuple[int, int]:
+        """把坐标限制在屏幕范围内。"""
         screen_width, screen_height = pyautogui.size()
-        x = max(0, min(x, screen_width - 1))
-        y = max(0, min(y, screen_height - 1))
-        
-        pyautogui.doubleClick(x, y)
+        return max(0, min(x, screen_width - 1)), max(0, min(y, screen_height - 1))
+
+    def _build_input_events(self, action_config: ActionConfig) -> Optional[Tuple[List[InputEvent], Dict[str, Any]]]:
+        """把输入类动作转换为输入事件序列。
         
-        result.result_data = {
-            "clicked_position": (x, y)
+        Args:
+            action_config: 动作配置
+            
+        Returns:
+            (事件序列, 结果数据)，不是输入类动作时返回None
+        """
+        params = action_config.parameters
+        action_type = action_config.action_type
+        
+        if action_type in (ActionType.CLICK, ActionType.DOUBLE_CLICK, ActionType.RIGHT_CLICK):
+            x, y = self._clamp_to_screen(params.get("x", 0), params.get("y", 0))
+            if action_type == ActionType.CLICK:
+                button = params.get("button", "left")
+                return click_events(x, y, button=button), {"clicked_position": (x, y), "button": button}
+            if action_type == ActionType.DOUBLE_CLICK:
+                return click_events(x, y, clicks=2), {"clicked_position": (x, y)}
+            return click_events(x, y, button="right"), {"clicked_position": (x, y)}
+        
+        if action_type == ActionType.KEY_PRESS:
+            key = params.get("key", "")
+            duration = params.get("duration", 0.1)
+            if not key:
+                raise ValueError("按键参数不能为空")
+            return key_press_events(key, hold=duration), {"key": key, "duration": duration}
+        
+        if action_type == ActionType.KEY_COMBINATION:
+            keys = params.get("keys", [])
+            if not keys:
+                raise ValueError("组合键参数不能为空")
+            return [InputEvent(InputEventType.HOTKEY, keys=tuple(keys))], {"keys": keys}
+        
+        if action_type == ActionType.MOUSE_MOVE:
+            x, y = self._clamp_to_screen(params.get("x", 0), params.get("y", 0))
+            duration = params.get("duration", 0.5)
+            events = [InputEvent(InputEventType.MOVE, x=x, y=y, duration=duration)]
+            return events, {"target_position": (x, y), "duration": duration}
+        
+        if action_type == ActionType.SCROLL:
+            x = params.get("x", None)
+            y = params.get("y", None)
+            clicks = params.get("clicks", 1)
+            has_position = x is not None and y is not None
+            events = [InputEvent(
+                InputEventType.SCROLL,
+                x=x if has_position else None,
+                y=y if has_position else None,
+                amount=clicks
+            )]
+            return events, {"position": (x, y) if has_position else None, "clicks": clicks}
+        
+        return None
+
+    @staticmethod
+    def _latency_data(sequence_result: InputSequenceResult) -> Dict[str, Any]:
+        """从派发结果中提取延迟信息。"""
+        return {
+            "queue_delay_ms": sequence_result.queue_delay * 1000,
+            "event_latencies_ms": [event.latency * 1000 for event in sequence_result.events]
         }
 
+    async def _dispatch_input(self, action_config: ActionConfig, result: ExecutionResult) -> None:
+        """通过输入派发器执行输入类动作，失败时抛出异常以触发重试。"""
+        events, result_data = self._build_input_events(action_config)
+        sequence_result = await self.input_dispatcher.run_async(events)
+        if not sequence_result.success:
+            raise RuntimeError(sequence_result.error_message or "输入事件执行失败")
+        result.result_data = dict(result_data, **self._latency_data(sequence_result))
+
+    async def _execute_click(self, action_config: ActionConfig, result: ExecutionResult) -> None:
+        """执行点击操作。"""
+        await self._dispatch_input(action_config, result)
+
+    async def _execute_double_click(self, action_config: ActionConfig, result: ExecutionResult) -> None:
+        """执行双击操作。"""
+        await self._dispatch_input(action_config, result)
+
     async def _execute_right_click(self, action_config: ActionConfig, result: ExecutionResult) -> None:
         """执行右键点击操作。"""
-        params = action_config.parameters
-        x = params.get("x", 0)
-        y = params.get("y", 0)
-        
-        screen_width, screen_height = pyautogui.size()
-        x = max(0, min(x, screen_width - 1))
-        y = max(0, min(y, screen_height - 1))
-        
-        pyautogui.rightClick(x, y)
-        
-        result.result_data = {
-            "clicked_position": (x, y)
-        }
+        await self._dispatch_input(action_config, result)
 
     async def _execute_key_press(self, action_config: ActionConfig, result: ExecutionResult) -> None:
         """执行按键操作。"""
-        params = action_config.parameters
-        key = params.get("key", "")
-        duration = params.get("duration", 0.1)
-        
-        if not key:
-            raise ValueError("按键参数不能为空")
-        
-        pyautogui.keyDown(key)
-        await asyncio.sleep(duration)
-        pyautogui.keyUp(key)
-        
-        result.result_data = {
-            "key": key,
-            "duration": duration
-        }
+        await self._dispatch_input(action_config, result)
 
     async def _execute_key_combination(self, action_config: ActionConfig, result: ExecutionResult) -> None:
         """执行组合键操作。"""
-        params = action_config.parameters
-        keys = params.get("keys", [])
-        
-        if not keys:
-            raise ValueError("组合键参数不能为空")
-        
-        pyautogui.hotkey(*keys)
-        
-        result.result_data = {
-            "keys": keys
-        }
+        await self._dispatch_input(action_config, result)
 
     async def _execute_mouse_move(self, action_config: ActionConfig, result: ExecutionResult) -> None:
         """执行鼠标移动操作。"""
-        params = action_config.parameters
-        x = params.get("x", 0)
-        y = params.get("y", 0)
-        duration = params.get("duration", 0.5)
-        
-        screen_width, screen_height = pyautogui.size()
-        x = max(0, min(x, screen_width - 1))
-        y = max(0, min(y, screen_height - 1))
-        
-        pyautogui.moveTo(x, y, duration=duration)
-        
-        result.result_data = {
-            "target_position": (x, y),
-            "duration": duration
-        }
+        await self._dispatch_input(action_config, result)
 
     async def _execute_mouse_drag(self, action_config: ActionConfig, result: ExecutionResult) -> None:
         """执行鼠标拖拽操作。"""
@@ -346,20 +418,7 @@ class ActionExecutor:
 
     async def _execute_scroll(self, action_config: ActionConfig, result: ExecutionResult) -> None:
         """执行滚轮操作。"""
-        params = action_config.parameters
-        x = params.get("x", None)
-        y = params.get("y", None)
-        clicks = params.get("clicks", 1)
-        
-        if x is not None and y is not None:
-            pyautogui.scroll(clicks, x=x, y=y)
-        else:
-            pyautogui.scroll(clicks)
-        
-        result.result_data = {
-            "position": (x, y) if x is not None and y is not None else None,
-            "clicks": clicks
-        }
+        await self._dispatch_input(action_config, result)
 
     async def _execute_wait(self, action_config: ActionConfig, result: ExecutionResult) -> None:
         """执行等待操作。"""
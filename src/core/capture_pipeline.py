@@ -0,0 +1,226 @@
+"""异步截图流水线模块.
+
+独立的截图线程按目标帧率从FrameSource截图并以只读帧发布，
+消费者（场景监控、操作验证、等待器）无阻塞地读取最新帧，使截图延迟与
+模板匹配并行进行，也不会阻塞asyncio事件循环。
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from .frame_source import FrameSource
+from .raw_frame import RawFrame
+
+
+class CapturePipeline:
+    """截图流水线.
+
+    每次截图得到的新数组直接以只读视图发布，不复制也不复用缓冲区：来源不会
+    再写入已返回的数组，消费者也无法修改它，因此消费者持有的帧（包括其裁剪
+    视图）始终有效，持有多少帧都不会阻止截图。
+    """
+
+    def __init__(
+        self,
+        frame_source: FrameSource,
+        window_provider: Optional[Callable[[], Any]] = None,
+        target_fps: float = 30.0,
+    ):
+        """初始化截图流水线.
+
+        Args:
+            frame_source: 截图帧来源
+            window_provider: 返回当前游戏窗口的函数
+            target_fps: 目标帧率
+        """
+        if target_fps <= 0:
+            raise ValueError(f"目标帧率必须大于0: {target_fps}")
+        self.frame_source = frame_source
+        self.window_provider = window_provider or (lambda: None)
+        self.target_fps = target_fps
+        self.logger = logging.getLogger(__name__)
+
+        self._latest: Optional[RawFrame] = None
+        self._next_frame_id = 0
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[RawFrame], None]] = []
+
+        self._captured = 0
+        self._failed = 0
+        self._capture_time = 0.0
+        self._started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        """截图线程是否在运行."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """启动截图线程.
+
+        Returns:
+            bool: 启动成功（或已在运行）返回True
+        """
+        if self.running:
+            return True
+        try:
+            self._stop_event.clear()
+            self._started_at = time.monotonic()
+            self._thread = threading.Thread(
+                target=self._capture_loop, name="CapturePipeline", daemon=True
+            )
+            self._thread.start()
+            self.logger.info(f"截图流水线已启动，目标帧率 {self.target_fps} FPS")
+            return True
+        except Exception as e:
+            self.logger.error(f"启动截图流水线失败: {e}")
+            return False
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """停止截图线程.
+
+        Args:
+            timeout: 等待线程退出的超时时间（秒）
+        """
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.logger.info("截图流水线已停止")
+
+    def latest(self) -> Optional[RawFrame]:
+        """获取最新的一帧，不阻塞.
+
+        Returns:
+            Optional[RawFrame]: 最新帧，尚未截到任何帧时返回None
+        """
+        return self._latest
+
+    def wait_for_frame(
+        self, after_frame_id: Optional[int] = None, timeout: float = 1.0
+    ) -> Optional[RawFrame]:
+        """等待比指定帧更新的一帧.
+
+        Args:
+            after_frame_id: 帧ID，None表示等待当前最新帧之后的下一帧
+            timeout: 超时时间（秒）
+
+        Returns:
+            Optional[RawFrame]: 新帧，超时返回None
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            if after_frame_id is None:
+                after_frame_id = self._latest.frame_id if self._latest is not None else 0
+            while not self._stop_event.is_set():
+                frame = self._latest
+                if frame is not None and frame.frame_id > after_frame_id:
+                    return frame
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+        return None
+
+    async def wait_for_frame_async(
+        self, after_frame_id: Optional[int] = None, timeout: float = 1.0
+    ) -> Optional[RawFrame]:
+        """在事件循环中等待新帧，等待期间不阻塞事件循环.
+
+        Args:
+            after_frame_id: 帧ID，None表示等待当前最新帧之后的下一帧
+            timeout: 超时时间（秒）
+
+        Returns:
+            Optional[RawFrame]: 新帧，超时返回None
+        """
+        if after_frame_id is None:
+            latest = self._latest
+            after_frame_id = latest.frame_id if latest is not None else 0
+        return await asyncio.to_thread(self.wait_for_frame, after_frame_id, timeout)
+
+    def add_frame_listener(self, listener: Callable[[RawFrame], None]) -> None:
+        """添加新帧监听器，在截图线程中调用.
+
+        Args:
+            listener: 监听函数，接收新帧
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_frame_listener(self, listener: Callable[[RawFrame], None]) -> None:
+        """移除新帧监听器.
+
+        Args:
+            listener: 要移除的监听函数
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _capture_loop(self) -> None:
+        """截图线程主循环."""
+        interval = 1.0 / self.target_fps
+        next_due = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                self._capture_once()
+            except Exception as e:
+                self._failed += 1
+                self.logger.error(f"流水线截图失败: {e}")
+
+            next_due += interval
+            delay = next_due - time.monotonic()
+            if delay < 0:
+                # 截图耗时超过帧间隔时不追赶，从当前时刻重新计时
+                next_due = time.monotonic()
+                delay = 0
+            self._stop_event.wait(delay)
+
+    def _capture_once(self) -> None:
+        """截取一帧并以只读帧发布."""
+        start = time.monotonic()
+        image = self.frame_source.capture(self.window_provider())
+        if image is None:
+            self._failed += 1
+            return
+
+        data = image.view()
+        data.setflags(write=False)
+        self._capture_time += time.monotonic() - start
+
+        with self._condition:
+            self._next_frame_id += 1
+            frame = RawFrame.from_array(data, timestamp=start, frame_id=self._next_frame_id)
+            self._latest = frame
+            self._captured += 1
+            self._condition.notify_all()
+
+        for listener in list(self._listeners):
+            try:
+                listener(frame)
+            except Exception as e:
+                self.logger.error(f"新帧监听器执行失败: {e}")
+
+    def get_stats(self) -> dict:
+        """获取流水线统计信息.
+
+        Returns:
+            dict: 截图帧数、失败次数、实际帧率和平均截图耗时
+        """
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            'running': self.running,
+            'target_fps': self.target_fps,
+            'captured': self._captured,
+            'failed': self._failed,
+            'actual_fps': self._captured / elapsed if elapsed > 0 else 0.0,
+            'avg_capture_ms': self._capture_time / self._captured * 1000 if self._captured else 0.0,
+            'latest_frame_id': self._latest.frame_id if self._latest is not None else None,
+        }
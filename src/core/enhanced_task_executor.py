@@ -4,15 +4,15 @@
 """
 
 import asyncio
+import heapq
 import time
 import uuid
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from queue import PriorityQueue, Empty
-from typing import Any, Dict, List, Optional, Callable, Union
-from threading import Lock, Event
+from typing import Any, Dict, List, Optional, Callable, Set, Union
+from threading import Condition, Lock, Event
 import logging
 
 from .events import EventBus
@@ -53,6 +53,17 @@ class TaskStatus(Enum):
     RETRYING = "retrying"
 
 
+class ExecutionMode(Enum):
+    """任务执行模式枚举。
+
+    ASYNCIO模式下所有任务协程作为asyncio任务运行在引擎所在的事件循环上，
+    由信号量限制并发数，只有截图和模板匹配等阻塞调用交给专用线程池；
+    THREAD模式下每个任务在线程池中用独立的事件循环运行。
+    """
+    ASYNCIO = "asyncio"
+    THREAD = "thread"
+
+
 @dataclass
 class TaskConfig:
     """任务配置。"""
@@ -117,7 +128,12 @@ class TaskExecution:
 
 
 class TaskQueue:
-    """任务队列管理器。"""
+    """任务队列管理器。
+
+    基于heapq的优先级队列，同优先级按入队顺序出队。移除和修改优先级采用惰性
+    删除：旧堆项只标记为失效，出队时跳过，失效项过多时重建堆。task_id索引
+    指向每个任务当前有效的堆项，因此移除和修改优先级都是O(log n)。
+    """
     
     def __init__(self, max_size: int = 1000):
         """初始化任务队列。
@@ -126,9 +142,11 @@ class TaskQueue:
             max_size: 队列最大容量
         """
         self.max_size = max_size
-        self._queue = PriorityQueue(maxsize=max_size)
+        self._heap: List[list] = []
+        self._entries: Dict[str, list] = {}
+        self._sequence = 0
         self._lock = Lock()
-        self._task_map: Dict[str, TaskConfig] = {}
+        self._not_empty = Condition(self._lock)
         
     def put(self, task_config: TaskConfig) -> bool:
         """添加任务到队列。
@@ -137,45 +155,40 @@ class TaskQueue:
             task_config: 任务配置
             
         Returns:
-            是否添加成功
+            是否添加成功，任务已在队列中时返回False
+
+        Raises:
+            Exception: 队列已满
         """
-        try:
-            with self._lock:
-                if task_config.task_id in self._task_map:
-                    return False  # 任务已存在
-                
-                # 检查队列是否已满
-                if self._queue.qsize() >= self.max_size:
-                    raise Exception(f"队列已满，最大容量: {self.max_size}")
-                
-                self._queue.put_nowait((task_config.priority.value, time.time(), task_config))
-                self._task_map[task_config.task_id] = task_config
-                return True
-        except Exception as e:
-            if "队列已满" in str(e):
-                raise e  # 重新抛出队列满异常
-            return False
+        with self._not_empty:
+            if task_config.task_id in self._entries:
+                return False  # 任务已存在
+            
+            # 检查队列是否已满
+            if len(self._entries) >= self.max_size:
+                raise Exception(f"队列已满，最大容量: {self.max_size}")
+            
+            self._push(task_config, task_config.priority)
+            self._not_empty.notify()
+            return True
     
     def get(self, timeout: Optional[float] = None) -> Optional[TaskConfig]:
         """从队列获取任务。
         
         Args:
-            timeout: 超时时间
+            timeout: 超时时间，None表示不等待
             
         Returns:
             任务配置或None
         """
-        try:
-            if timeout is None:
-                _, _, task_config = self._queue.get_nowait()
-            else:
-                _, _, task_config = self._queue.get(timeout=timeout)
-            
-            with self._lock:
-                self._task_map.pop(task_config.task_id, None)
-            
-            return task_config
-        except Empty:
+        with self._not_empty:
+            if timeout is not None:
+                self._not_empty.wait_for(lambda: self._entries, timeout)
+            while self._heap:
+                _, _, task_config = heapq.heappop(self._heap)
+                if task_config is not None:
+                    del self._entries[task_config.task_id]
+                    return task_config
             return None
     
     def remove(self, task_id: str) -> bool:
@@ -188,24 +201,60 @@ class TaskQueue:
             是否移除成功
         """
         with self._lock:
-            if task_id in self._task_map:
-                del self._task_map[task_id]
-                # 注意：PriorityQueue不支持直接移除，这里只是从映射中移除
-                return True
-            return False
+            entry = self._entries.pop(task_id, None)
+            if entry is None:
+                return False
+            entry[2] = None
+            self._compact()
+            return True
+
+    def update_priority(self, task_id: str, priority: TaskPriority) -> bool:
+        """修改排队中任务的优先级。
+
+        Args:
+            task_id: 任务ID
+            priority: 新优先级
+
+        Returns:
+            任务是否在队列中
+        """
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is None:
+                return False
+            task_config = entry[2]
+            entry[2] = None
+            task_config.priority = priority
+            self._push(task_config, priority)
+            self._compact()
+            return True
     
     def size(self) -> int:
         """获取队列大小。"""
-        return self._queue.qsize()
+        with self._lock:
+            return len(self._entries)
     
     def is_empty(self) -> bool:
         """检查队列是否为空。"""
-        return self._queue.empty()
+        return self.size() == 0
     
     def contains(self, task_id: str) -> bool:
         """检查是否包含指定任务。"""
         with self._lock:
-            return task_id in self._task_map
+            return task_id in self._entries
+
+    def _push(self, task_config: TaskConfig, priority: TaskPriority) -> None:
+        """加入新的堆项并更新索引（调用方持有锁）。"""
+        self._sequence += 1
+        entry = [priority.value, self._sequence, task_config]
+        self._entries[task_config.task_id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _compact(self) -> None:
+        """失效堆项超过有效堆项时重建堆（调用方持有锁）。"""
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
 
 
 class TaskRunner:
@@ -264,14 +313,18 @@ class EnhancedTaskExecutor:
                  game_operator: Optional[GameOperator] = None,
                  event_bus: Optional[EventBus] = None,
                  max_workers: int = 4,
-                 max_queue_size: int = 1000):
+                 max_queue_size: int = 1000,
+                 execution_mode: ExecutionMode = ExecutionMode.ASYNCIO,
+                 vision_workers: int = 2):
         """初始化任务执行引擎。
         
         Args:
             game_operator: 游戏操作器实例
             event_bus: 事件总线实例
-            max_workers: 最大工作线程数
+            max_workers: 最大并发任务数（THREAD模式下为工作线程数）
             max_queue_size: 最大队列容量
+            execution_mode: 任务执行模式
+            vision_workers: ASYNCIO模式下视觉检测线程池的线程数
         """
         self.logger = get_logger(__name__)
         self.game_operator = game_operator or GameOperator()
@@ -281,16 +334,29 @@ class EnhancedTaskExecutor:
         # 任务队列和执行管理
         self.task_queue = TaskQueue(max_queue_size)
         self.active_executions: Dict[str, TaskExecution] = {}
+        # 排队中任务的task_id到执行对象的映射，出队时O(1)找到执行对象
+        self.queued_executions: Dict[str, TaskExecution] = {}
         self.completed_executions: Dict[str, TaskExecution] = {}
         
         # 任务运行器注册
         self.task_runners: Dict[TaskType, TaskRunner] = {}
         
         # 线程池和控制
+        self.execution_mode = execution_mode
+        self.max_workers = max_workers
+        self.vision_workers = vision_workers
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.vision_executor: Optional[ThreadPoolExecutor] = None
         self.is_running = False
         self.shutdown_event = Event()
         
+        # 事件循环内的调度状态，在start()中创建
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue_signal: Optional[asyncio.Event] = None
+        self._concurrency: Optional[asyncio.Semaphore] = None
+        self._processing_task: Optional[asyncio.Task] = None
+        self._running_tasks: Set[asyncio.Task] = set()
+        
         # 统计信息
         self.stats = {
             "total_tasks": 0,
@@ -348,6 +414,8 @@ class EnhancedTaskExecutor:
             success = self.task_queue.put(task_config)
             if not success:
                 raise RuntimeError("无法添加任务到队列")
+            self.queued_executions[task_config.task_id] = execution
+            self._notify_queue()
             
             self.stats["total_tasks"] += 1
             
@@ -382,6 +450,7 @@ class EnhancedTaskExecutor:
         
         # 如果执行引擎没有启动，直接执行任务
         if not self.is_running:
+            self._dequeue_execution(task_config.task_id)
             result = await self._execute_task(execution)
             return result
         
@@ -419,6 +488,9 @@ class EnhancedTaskExecutor:
                 task_execution.status = TaskStatus.CANCELLED
                 task_execution.end_time = datetime.now()
                 
+                # 从队列中移除，避免已取消的任务仍被取出执行
+                self._dequeue_execution(task_execution.task_id)
+                
                 # 移动到完成列表
                 self.completed_executions[execution_id] = task_execution
                 del self.active_executions[execution_id]
@@ -436,6 +508,38 @@ class EnhancedTaskExecutor:
         
         return False
     
+    async def set_task_priority(self, execution_id: str, priority: TaskPriority) -> bool:
+        """修改排队中任务的优先级。
+        
+        Args:
+            execution_id: 执行ID
+            priority: 新优先级
+            
+        Returns:
+            是否修改成功，任务不在队列中时返回False
+        """
+        task_execution = self.active_executions.get(execution_id)
+        if task_execution is None:
+            return False
+        
+        if not self.task_queue.update_priority(task_execution.task_id, priority):
+            return False
+        
+        self.logger.info(f"任务优先级已更新: {task_execution.task_config.name} -> {priority.name}")
+        return True
+    
+    def _dequeue_execution(self, task_id: str) -> Optional[TaskExecution]:
+        """从队列和排队映射中移除任务。
+        
+        Args:
+            task_id: 任务ID
+            
+        Returns:
+            排队中的执行对象，不在队列中时返回None
+        """
+        self.task_queue.remove(task_id)
+        return self.queued_executions.pop(task_id, None)
+    
     async def get_task_status(self, execution_id: str) -> Optional[TaskExecution]:
         """获取任务状态。
         
@@ -493,10 +597,16 @@ class EnhancedTaskExecutor:
         self.is_running = True
         self.shutdown_event.clear()
         
+        self._loop = asyncio.get_running_loop()
+        self._queue_signal = asyncio.Event()
+        if self.execution_mode == ExecutionMode.ASYNCIO:
+            self._concurrency = asyncio.Semaphore(self.max_workers)
+            self._attach_vision_executor()
+        
         # 启动任务处理循环
-        asyncio.create_task(self._task_processing_loop())
+        self._processing_task = asyncio.create_task(self._task_processing_loop())
         
-        self.logger.info("任务执行引擎已启动")
+        self.logger.info(f"任务执行引擎已启动，执行模式: {self.execution_mode.value}")
     
     async def stop(self):
         """停止任务执行引擎。"""
@@ -506,35 +616,120 @@ class EnhancedTaskExecutor:
         self.is_running = False
         self.shutdown_event.set()
         
+        # 唤醒并结束任务处理循环
+        if self._processing_task is not None:
+            self._processing_task.cancel()
+            await asyncio.gather(self._processing_task, return_exceptions=True)
+            self._processing_task = None
+        
         # 等待所有任务完成
+        if self._running_tasks:
+            await asyncio.gather(*list(self._running_tasks), return_exceptions=True)
         self.executor.shutdown(wait=True)
+        self._detach_vision_executor()
         
         self.logger.info("任务执行引擎已停止")
     
+    def _attach_vision_executor(self):
+        """为游戏操作器创建专用的视觉检测线程池。
+        
+        游戏操作器已有线程池时沿用，不覆盖调用方的设置。
+        """
+        if getattr(self.game_operator, "vision_executor", None) is not None:
+            return
+        self.vision_executor = ThreadPoolExecutor(
+            max_workers=self.vision_workers, thread_name_prefix="TaskVision"
+        )
+        self.game_operator.vision_executor = self.vision_executor
+    
+    def _detach_vision_executor(self):
+        """关闭由引擎创建的视觉检测线程池。"""
+        if self.vision_executor is None:
+            return
+        if getattr(self.game_operator, "vision_executor", None) is self.vision_executor:
+            self.game_operator.vision_executor = None
+        self.vision_executor.shutdown(wait=True)
+        self.vision_executor = None
+    
+    def _notify_queue(self):
+        """通知任务处理循环队列中有新任务，可从任意线程调用。"""
+        if self._loop is None or self._queue_signal is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._queue_signal.set)
+    
+    async def _next_task_config(self) -> Optional[TaskConfig]:
+        """等待并取出下一个任务，不阻塞事件循环。
+        
+        Returns:
+            任务配置，引擎停止时返回None
+        """
+        while self.is_running:
+            # 先清除信号再取任务，取空后入队的任务一定会再次设置信号
+            self._queue_signal.clear()
+            task_config = self.task_queue.get()
+            if task_config is not None:
+                return task_config
+            await self._queue_signal.wait()
+        return None
+    
     async def _task_processing_loop(self):
         """任务处理循环。"""
         while self.is_running and not self.shutdown_event.is_set():
             try:
+                if self.execution_mode == ExecutionMode.ASYNCIO:
+                    await self._dispatch_next_task()
+                    continue
+                
                 # 从队列获取任务
-                task_config = self.task_queue.get(timeout=1.0)
+                task_config = await self._next_task_config()
                 
                 if task_config:
                     # 查找对应的执行对象
-                    execution = None
-                    for exec_id, exec_obj in self.active_executions.items():
-                        if exec_obj.task_config.task_id == task_config.task_id:
-                            execution = exec_obj
-                            break
+                    execution = self.queued_executions.pop(task_config.task_id, None)
                     
                     if execution:
                         # 提交到线程池执行
                         future = self.executor.submit(self._execute_task_sync, execution)
                         # 不等待结果，让任务异步执行
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 self.logger.error(f"任务处理循环错误: {e}")
                 await asyncio.sleep(1.0)
     
+    async def _dispatch_next_task(self):
+        """取出下一个任务并在当前事件循环上启动（ASYNCIO模式）。
+        
+        先占用并发名额再出队，名额空出时按当时的优先级选择任务。
+        """
+        await self._concurrency.acquire()
+        started = False
+        try:
+            task_config = await self._next_task_config()
+            execution = self.queued_executions.pop(task_config.task_id, None) if task_config else None
+            if execution is not None:
+                task = asyncio.create_task(self._run_task(execution))
+                self._running_tasks.add(task)
+                task.add_done_callback(self._running_tasks.discard)
+                started = True
+        finally:
+            if not started:
+                self._concurrency.release()
+    
+    async def _run_task(self, task_execution: TaskExecution):
+        """在事件循环上执行任务，结束后归还并发名额（ASYNCIO模式）。
+        
+        Args:
+            task_execution: 任务执行对象
+        """
+        try:
+            await self._execute_task(task_execution)
+        except Exception as e:
+            self.logger.error(f"任务执行异常: {task_execution.task_config.name}, 错误: {e}")
+        finally:
+            self._concurrency.release()
+    
     def _execute_task_sync(self, task_execution: TaskExecution):
         """同步执行任务（在线程池中运行）。
         
@@ -642,7 +837,9 @@ class EnhancedTaskExecutor:
                 
                 # 如果执行引擎正在运行，重新提交到队列；否则直接递归重试
                 if self.is_running:
+                    self.queued_executions[task_execution.task_id] = task_execution
                     self.task_queue.put(task_execution.task_config)
+                    self._notify_queue()
                     return ExecutionResult(
                         status=task_execution.status.value,
                         result=task_execution.result,
@@ -667,8 +864,9 @@ class EnhancedTaskExecutor:
                 self.logger.error(f"任务执行失败: {task_execution.task_config.name}, 错误: {e}, 错误ID: {error_info.error_id}")
         
         finally:
-            # 移动到完成列表
-            if task_execution.execution_id in self.active_executions:
+            # 移动到完成列表（重新排队重试的任务仍是活跃任务）
+            if (task_execution.status != TaskStatus.RETRYING
+                    and task_execution.execution_id in self.active_executions):
                 self.completed_executions[task_execution.execution_id] = task_execution
                 del self.active_executions[task_execution.execution_id]
         
@@ -0,0 +1,171 @@
+"""帧缓存模块.
+
+提供按窗口句柄缓存截图帧的功能，使同一检测周期内的多次检测共享一次截图。
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+
+@dataclass
+class CachedFrame:
+    """缓存的截图帧."""
+
+    hwnd: Hashable
+    frame_id: int
+    image: Any  # numpy array
+    timestamp: float = field(default_factory=time.monotonic)
+
+    @property
+    def age(self) -> float:
+        """获取帧的存在时间（秒）."""
+        return time.monotonic() - self.timestamp
+
+
+class FrameCache:
+    """截图帧缓存.
+
+    以窗口句柄为键保存最近一次截图，并为每一帧分配单调递增的帧ID。
+    在max_age时间内的重复请求直接返回缓存帧，不再触发截图；
+    在hold()期间缓存帧不会过期，保证同一检测周期内的结果基于同一帧。
+    """
+
+    def __init__(self, max_age: float = 0.05):
+        """初始化帧缓存.
+
+        Args:
+            max_age: 缓存帧的最大有效时间（秒），0表示禁用缓存
+        """
+        self.max_age = max_age
+        self.logger = logging.getLogger(__name__)
+        self._frames: Dict[Hashable, CachedFrame] = {}
+        self._next_frame_id = 0
+        self._lock = threading.Lock()
+        self._hold_depth = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(
+        self, hwnd: Hashable, max_age: Optional[float] = None
+    ) -> Optional[CachedFrame]:
+        """获取仍在有效期内的缓存帧.
+
+        Args:
+            hwnd: 窗口句柄
+            max_age: 本次请求允许的最大帧龄，None表示使用默认值
+
+        Returns:
+            Optional[CachedFrame]: 有效的缓存帧，不存在或已过期返回None
+        """
+        limit = self.max_age if max_age is None else max_age
+        with self._lock:
+            frame = self._frames.get(hwnd)
+            if frame is not None and limit > 0 and (
+                self._hold_depth > 0 or frame.age <= limit
+            ):
+                self._hits += 1
+                return frame
+            self._misses += 1
+            return None
+
+    def put(self, hwnd: Hashable, image: Any) -> CachedFrame:
+        """写入新的截图帧.
+
+        Args:
+            hwnd: 窗口句柄
+            image: 截图图像
+
+        Returns:
+            CachedFrame: 新写入的缓存帧
+        """
+        with self._lock:
+            self._next_frame_id += 1
+            frame = CachedFrame(hwnd=hwnd, frame_id=self._next_frame_id, image=image)
+            self._frames[hwnd] = frame
+            return frame
+
+    def get_or_capture(
+        self,
+        hwnd: Hashable,
+        capture_func: Callable[[], Any],
+        max_age: Optional[float] = None,
+    ) -> Optional[CachedFrame]:
+        """获取缓存帧，过期时调用截图函数生成新帧.
+
+        Args:
+            hwnd: 窗口句柄
+            capture_func: 截图函数，返回None表示截图失败
+            max_age: 本次请求允许的最大帧龄，None表示使用默认值
+
+        Returns:
+            Optional[CachedFrame]: 截图帧，截图失败返回None
+        """
+        frame = self.get(hwnd, max_age)
+        if frame is not None:
+            return frame
+
+        image = capture_func()
+        if image is None:
+            return None
+        return self.put(hwnd, image)
+
+    def latest(self, hwnd: Hashable) -> Optional[CachedFrame]:
+        """获取最近一次的截图帧，不检查有效期.
+
+        Args:
+            hwnd: 窗口句柄
+
+        Returns:
+            Optional[CachedFrame]: 最近的截图帧
+        """
+        with self._lock:
+            return self._frames.get(hwnd)
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        """在上下文期间冻结缓存帧，使其不因超过max_age而过期.
+
+        进入时会清空现有缓存，因此周期内的第一次请求总会截取新帧。
+        """
+        with self._lock:
+            if self._hold_depth == 0:
+                self._frames.clear()
+            self._hold_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._hold_depth -= 1
+
+    def invalidate(self, hwnd: Optional[Hashable] = None) -> None:
+        """使缓存帧失效.
+
+        Args:
+            hwnd: 窗口句柄，None表示清空所有窗口的缓存
+        """
+        with self._lock:
+            if hwnd is None:
+                self._frames.clear()
+            else:
+                self._frames.pop(hwnd, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息.
+
+        Returns:
+            Dict[str, Any]: 命中次数、未命中次数和命中率
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / total if total else 0.0,
+                'cached_windows': len(self._frames),
+                'last_frame_id': self._next_frame_id,
+                'max_age': self.max_age,
+            }
@@ -0,0 +1,303 @@
+"""帧差分模块.
+
+将每一帧缩小为灰度缩略图并与参考帧按分块比较，判断画面是否变化以及哪些
+分块发生了变化。静止菜单和长时间的战斗动画中，检测结果可以直接复用，
+画面局部变化时只需在变化分块附近重新匹配。
+"""
+
+from dataclasses import dataclass, field
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+from .raw_frame import RawFrame
+
+
+Box = Tuple[int, int, int, int]
+
+
+@dataclass
+class FrameChange:
+    """相邻两帧的差异信息."""
+
+    changed: bool
+    # 与上一帧不可比较（首帧或尺寸变化），需要全帧检测
+    full_frame: bool
+    frame_size: Tuple[int, int]  # (width, height)
+    # 变化的分块 (x, y, width, height)，原图坐标
+    tiles: List[Box] = field(default_factory=list)
+    change_ratio: float = 0.0
+
+    @property
+    def bounds(self) -> Optional[Box]:
+        """变化分块的包围框 (x, y, width, height)，未变化时为None."""
+        if self.full_frame:
+            return (0, 0, *self.frame_size)
+        if not self.tiles:
+            return None
+        x0 = min(x for x, _, _, _ in self.tiles)
+        y0 = min(y for _, y, _, _ in self.tiles)
+        x1 = max(x + w for x, _, w, _ in self.tiles)
+        y1 = max(y + h for _, y, _, h in self.tiles)
+        return (x0, y0, x1 - x0, y1 - y0)
+
+    def intersects(self, box: Box) -> bool:
+        """判断区域是否与变化分块相交.
+
+        Args:
+            box: 区域 (x, y, width, height)
+
+        Returns:
+            bool: 相交返回True
+        """
+        if self.full_frame:
+            return True
+        x, y, w, h = box
+        return any(
+            x < tx + tw and tx < x + w and y < ty + th and ty < y + h
+            for tx, ty, tw, th in self.tiles
+        )
+
+    def search_region(self, padding: Tuple[int, int]) -> Optional[Box]:
+        """获取变化区域按模板尺寸扩展后的搜索区域.
+
+        与变化分块相交的匹配框都完整地落在该区域内。
+
+        Args:
+            padding: 四周扩展的宽度和高度，通常为模板尺寸
+
+        Returns:
+            Optional[Box]: 搜索区域 (x, y, width, height)，未变化时为None
+        """
+        bounds = self.bounds
+        if bounds is None:
+            return None
+        width, height = self.frame_size
+        x, y, w, h = bounds
+        pad_w, pad_h = padding
+        x0, y0 = max(0, x - pad_w), max(0, y - pad_h)
+        x1, y1 = min(width, x + w + pad_w), min(height, y + h + pad_h)
+        return (x0, y0, x1 - x0, y1 - y0)
+
+
+@dataclass
+class FrameSignature:
+    """帧签名：分块比较用的灰度缩略图."""
+
+    thumbnail: np.ndarray
+    frame_size: Tuple[int, int]  # (width, height)
+
+
+class FrameChangeDetector:
+    """分块帧差分检测器.
+
+    截图先缩小为 grid x cell 大小的灰度缩略图，每个分块对应缩略图中的
+    cell x cell 像素，分块内最大灰度差超过阈值即视为变化。
+
+    update比较的参考帧不是上一帧：每个分块只在被报告为变化时才更新为新帧的
+    内容，未报告变化的分块保留最后一次报告时的内容。渐变（淡入淡出、缓慢过渡、
+    数字递增）的差异因此会累积，直到超过阈值被报告，而不会每帧都低于阈值。
+    """
+
+    def __init__(
+        self,
+        grid: Tuple[int, int] = (16, 12),
+        cell_size: int = 8,
+        pixel_threshold: int = 12,
+    ):
+        """初始化帧差分检测器.
+
+        Args:
+            grid: 分块网格 (列数, 行数)
+            cell_size: 每个分块在缩略图中的边长（像素）
+            pixel_threshold: 缩略图像素灰度差的阈值
+        """
+        self.grid = grid
+        self.cell_size = cell_size
+        self.pixel_threshold = pixel_threshold
+        self.logger = logging.getLogger(__name__)
+        self._previous: Optional[np.ndarray] = None
+        self._previous_size: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self._frames = 0
+        self._unchanged_frames = 0
+        self._full_frames = 0
+        self._changed_tiles = 0
+
+    def update(self, frame: Any) -> FrameChange:
+        """将新帧与参考帧比较，并把变化的分块更新到参考帧.
+
+        Args:
+            frame: RawFrame或BGR/BGRA/灰度图像数组
+
+        Returns:
+            FrameChange: 差异信息
+        """
+        thumbnail, size = self._thumbnail(frame)
+
+        with self._lock:
+            previous, previous_size = self._previous, self._previous_size
+            self._frames += 1
+            if previous is None or previous_size != size:
+                change = self._diff(previous, previous_size, thumbnail, size)
+                self._previous, self._previous_size = thumbnail, size
+            else:
+                mask = self._tile_mask(previous, thumbnail)
+                change = self._change_from_mask(mask, size)
+                if change.changed:
+                    cells = np.repeat(np.repeat(mask, self.cell_size, axis=0), self.cell_size, axis=1)
+                    reference = previous.copy()
+                    reference[cells] = thumbnail[cells]
+                    self._previous = reference
+            if change.full_frame:
+                self._full_frames += 1
+            elif not change.changed:
+                self._unchanged_frames += 1
+            else:
+                self._changed_tiles += len(change.tiles)
+        return change
+
+    def signature(self, frame: Any) -> FrameSignature:
+        """生成帧签名，用于与之后的帧比较（不影响update的上一帧）.
+
+        Args:
+            frame: RawFrame或图像数组
+
+        Returns:
+            FrameSignature: 帧签名
+        """
+        thumbnail, size = self._thumbnail(frame)
+        return FrameSignature(thumbnail=thumbnail, frame_size=size)
+
+    def compare(self, before: FrameSignature, after: FrameSignature) -> FrameChange:
+        """比较两个帧签名.
+
+        Args:
+            before: 较早的帧签名
+            after: 较新的帧签名
+
+        Returns:
+            FrameChange: 差异信息
+        """
+        return self._diff(before.thumbnail, before.frame_size, after.thumbnail, after.frame_size)
+
+    def _diff(
+        self,
+        previous: Optional[np.ndarray],
+        previous_size: Optional[Tuple[int, int]],
+        thumbnail: np.ndarray,
+        size: Tuple[int, int],
+    ) -> FrameChange:
+        """按分块比较两张缩略图.
+
+        Args:
+            previous: 较早的缩略图，None表示不可比较
+            previous_size: 较早一帧的原图尺寸
+            thumbnail: 较新的缩略图
+            size: 较新一帧的原图尺寸
+
+        Returns:
+            FrameChange: 差异信息
+        """
+        if previous is None or previous_size != size:
+            return FrameChange(changed=True, full_frame=True, frame_size=size, change_ratio=1.0)
+        return self._change_from_mask(self._tile_mask(previous, thumbnail), size)
+
+    def _tile_mask(self, previous: np.ndarray, thumbnail: np.ndarray) -> np.ndarray:
+        """计算变化分块掩码.
+
+        Args:
+            previous: 较早的缩略图
+            thumbnail: 较新的缩略图
+
+        Returns:
+            np.ndarray: rows x columns 的布尔数组，True表示该分块变化
+        """
+        columns, rows = self.grid
+        diff = cv2.absdiff(thumbnail, previous)
+        tile_max = diff.reshape(rows, self.cell_size, columns, self.cell_size).max(axis=(1, 3))
+        return tile_max > self.pixel_threshold
+
+    def _change_from_mask(self, mask: np.ndarray, size: Tuple[int, int]) -> FrameChange:
+        """把变化分块掩码换算为原图坐标下的差异信息.
+
+        Args:
+            mask: 变化分块掩码
+            size: 原图尺寸 (width, height)
+
+        Returns:
+            FrameChange: 差异信息
+        """
+        columns, rows = self.grid
+        changed_rows, changed_columns = np.nonzero(mask)
+        if len(changed_rows) == 0:
+            return FrameChange(changed=False, full_frame=False, frame_size=size)
+
+        width, height = size
+        tiles = []
+        for row, column in zip(changed_rows.tolist(), changed_columns.tolist()):
+            x0, x1 = column * width // columns, (column + 1) * width // columns
+            y0, y1 = row * height // rows, (row + 1) * height // rows
+            tiles.append((x0, y0, x1 - x0, y1 - y0))
+        return FrameChange(
+            changed=True,
+            full_frame=False,
+            frame_size=size,
+            tiles=tiles,
+            change_ratio=len(tiles) / (columns * rows),
+        )
+
+    def _thumbnail(self, frame: Any) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """生成分块比较用的灰度缩略图.
+
+        Args:
+            frame: RawFrame或图像数组
+
+        Returns:
+            Tuple[np.ndarray, Tuple[int, int]]: 缩略图和原图尺寸 (width, height)
+        """
+        if cv2 is None:
+            raise RuntimeError("OpenCV未安装，无法进行帧差分")
+        if isinstance(frame, RawFrame):
+            gray = frame.gray
+        elif frame.ndim == 2:
+            gray = frame
+        else:
+            code = cv2.COLOR_BGRA2GRAY if frame.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            gray = cv2.cvtColor(frame, code)
+        height, width = gray.shape[:2]
+        columns, rows = self.grid
+        thumbnail = cv2.resize(
+            gray,
+            (columns * self.cell_size, rows * self.cell_size),
+            interpolation=cv2.INTER_AREA,
+        )
+        return thumbnail, (int(width), int(height))
+
+    def reset(self) -> None:
+        """丢弃参考帧，下一帧将被视为全帧变化."""
+        with self._lock:
+            self._previous = None
+            self._previous_size = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取差分统计信息.
+
+        Returns:
+            Dict[str, Any]: 帧数、未变化帧数及其比例、全帧检测次数等
+        """
+        with self._lock:
+            return {
+                'frames': self._frames,
+                'unchanged_frames': self._unchanged_frames,
+                'unchanged_rate': self._unchanged_frames / self._frames if self._frames else 0.0,
+                'full_frames': self._full_frames,
+                'changed_tiles': self._changed_tiles,
+            }
@@ -0,0 +1,264 @@
+"""截图帧来源模块.
+
+将截图后端抽象为FrameSource，GameDetector和SceneMonitor可以接收任意实现：
+Win32窗口截图、录制截图目录/视频的回放，以及内存中的帧生成器。回放和生成器
+不依赖真实窗口，可在Linux上全速回放录制的会话，用于基准测试和回归测试。
+"""
+
+from abc import ABC, abstractmethod
+import logging
+from pathlib import Path
+import time
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+
+IMAGE_SUFFIXES = {'.png', '.jpg', '.jpeg', '.bmp'}
+
+
+class FrameSource(ABC):
+    """截图帧来源基类.
+
+    capture()返回BGR图像数组，来源之后不会再写入已返回的数组；live为True的
+    来源需要真实的游戏窗口，其余来源自带虚拟窗口尺寸（frame_size()）。
+    """
+
+    live: bool = False
+
+    def __init__(self, name: str = "frame_source"):
+        """初始化帧来源.
+
+        Args:
+            name: 来源名称，离线来源用作虚拟窗口标题
+        """
+        self.name = name
+        self.logger = logging.getLogger(__name__)
+
+    @abstractmethod
+    def capture(self, window: Any = None) -> Optional[np.ndarray]:
+        """获取一帧截图.
+
+        Args:
+            window: 游戏窗口（仅实时来源使用）
+
+        Returns:
+            Optional[np.ndarray]: BGR图像，没有可用帧时返回None
+        """
+
+    def is_available(self) -> bool:
+        """判断是否还能提供帧."""
+        return True
+
+    def frame_size(self) -> Optional[Tuple[int, int]]:
+        """获取帧尺寸 (width, height)，未知时返回None."""
+        return None
+
+    def close(self) -> None:
+        """释放来源占用的资源."""
+
+    def __enter__(self) -> 'FrameSource':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class Win32FrameSource(FrameSource):
+    """Win32窗口截图来源（BitBlt），委托给WindowManager.capture_window."""
+
+    live = True
+
+    def __init__(self, window_manager: Any):
+        """初始化Win32截图来源.
+
+        Args:
+            window_manager: 窗口管理器
+        """
+        super().__init__(name="win32")
+        self.window_manager = window_manager
+
+    def capture(self, window: Any = None) -> Optional[np.ndarray]:
+        """截取窗口图像."""
+        window = window or self.window_manager.current_window
+        if window is None:
+            return None
+        return self.window_manager.capture_window(window)
+
+
+class OfflineFrameSource(FrameSource):
+    """离线帧来源基类.
+
+    按顺序逐帧读取，每次capture()前进一帧；fps为None时全速回放，
+    否则按帧率节流。支持预读一帧以获得帧尺寸。
+    """
+
+    def __init__(self, name: str, fps: Optional[float] = None):
+        """初始化离线帧来源.
+
+        Args:
+            name: 来源名称
+            fps: 回放帧率，None表示全速回放
+        """
+        super().__init__(name=name)
+        self.fps = fps
+        self.frames_read = 0
+        self._pending: Optional[np.ndarray] = None
+        self._exhausted = False
+        self._next_due: Optional[float] = None
+
+    @abstractmethod
+    def _read(self) -> Optional[np.ndarray]:
+        """读取下一帧，没有更多帧时返回None."""
+
+    def _peek(self) -> Optional[np.ndarray]:
+        """预读下一帧但不前进."""
+        if self._pending is None and not self._exhausted:
+            self._pending = self._read()
+            if self._pending is None:
+                self._exhausted = True
+        return self._pending
+
+    def capture(self, window: Any = None) -> Optional[np.ndarray]:
+        """返回下一帧."""
+        frame = self._peek()
+        self._pending = None
+        if frame is None:
+            return None
+
+        if self.fps:
+            now = time.monotonic()
+            if self._next_due is not None and now < self._next_due:
+                time.sleep(self._next_due - now)
+            self._next_due = max(now, self._next_due or now) + 1.0 / self.fps
+        self.frames_read += 1
+        return frame
+
+    def is_available(self) -> bool:
+        """判断是否还有未读取的帧."""
+        return self._peek() is not None
+
+    def frame_size(self) -> Optional[Tuple[int, int]]:
+        """获取下一帧的尺寸 (width, height)."""
+        frame = self._peek()
+        if frame is None:
+            return None
+        return (int(frame.shape[1]), int(frame.shape[0]))
+
+
+class ReplayFrameSource(OfflineFrameSource):
+    """录制会话回放来源：截图目录、单张图片或视频文件."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        loop: bool = False,
+        fps: Optional[float] = None,
+        preload: bool = False,
+    ):
+        """初始化回放来源.
+
+        Args:
+            path: 截图目录（按文件名排序）、图片文件或视频文件
+            loop: 回放结束后是否从头开始
+            fps: 回放帧率，None表示全速回放
+            preload: 是否预先把截图目录全部读入内存（排除磁盘读取耗时）
+        """
+        if cv2 is None:
+            raise RuntimeError("OpenCV未安装，无法回放截图")
+        self.path = Path(path)
+        super().__init__(name=f"replay:{self.path.name}", fps=fps)
+        self.loop = loop
+        self.current_name: Optional[str] = None
+        self._index = 0
+        self._video = None
+        self._images: List[Optional[np.ndarray]] = []
+
+        if self.path.is_dir():
+            self.files = sorted(
+                p for p in self.path.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES
+            )
+        elif self.path.suffix.lower() in IMAGE_SUFFIXES:
+            self.files = [self.path]
+        elif self.path.exists():
+            self.files = []
+            self._video = cv2.VideoCapture(str(self.path))
+            if not self._video.isOpened():
+                raise ValueError(f"无法打开视频文件: {self.path}")
+        else:
+            raise FileNotFoundError(f"回放路径不存在: {self.path}")
+
+        if preload:
+            self._images = [cv2.imread(str(p)) for p in self.files]
+
+    def _read(self) -> Optional[np.ndarray]:
+        """读取下一张截图或下一帧视频."""
+        if self._video is not None:
+            success, frame = self._video.read()
+            if not success and self.loop and self._index > 0:
+                self._video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                success, frame = self._video.read()
+            if not success:
+                return None
+            self.current_name = f"{self.path.name}#{self._index}"
+            self._index += 1
+            return frame
+
+        while self.files:
+            if self._index >= len(self.files):
+                if not self.loop:
+                    return None
+                self._index = 0
+            index = self._index
+            self._index += 1
+            frame = self._images[index] if self._images else cv2.imread(str(self.files[index]))
+            if frame is not None:
+                self.current_name = self.files[index].name
+                return frame
+            self.logger.warning(f"无法读取回放截图: {self.files[index]}")
+            if not self.loop and self._index >= len(self.files):
+                return None
+        return None
+
+    def close(self) -> None:
+        """释放视频句柄和预读的截图."""
+        if self._video is not None:
+            self._video.release()
+            self._video = None
+        self._images = []
+
+
+class GeneratorFrameSource(OfflineFrameSource):
+    """内存帧来源：从可迭代对象或生成函数获取帧."""
+
+    def __init__(
+        self,
+        frames: Union[Iterable[np.ndarray], Callable[[], Optional[np.ndarray]]],
+        fps: Optional[float] = None,
+        name: str = "generator",
+    ):
+        """初始化内存帧来源.
+
+        Args:
+            frames: 帧序列（列表、生成器等），或每次调用返回一帧、返回None表示结束的函数
+            fps: 回放帧率，None表示全速
+            name: 来源名称
+        """
+        super().__init__(name=name, fps=fps)
+        self._factory: Optional[Callable[[], Optional[np.ndarray]]] = None
+        self._iterator: Optional[Iterator[np.ndarray]] = None
+        if callable(frames):
+            self._factory = frames
+        else:
+            self._iterator = iter(frames)
+
+    def _read(self) -> Optional[np.ndarray]:
+        """生成下一帧."""
+        if self._factory is not None:
+            return self._factory()
+        return next(self._iterator, None)
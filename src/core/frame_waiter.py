@@ -0,0 +1,266 @@
+"""基于新帧通知的等待模块.
+
+等待UI元素出现/消失或场景切换时不再各自轮询截图：所有等待注册到同一个
+FrameWaiter，截图流水线每产生一帧就唤醒评估线程，对当前所有等待需要的
+元素只做一次（增量）检测，结果分发给各个等待。截图流水线未运行时，评估
+线程按poll_interval自行截图，同样在并发等待之间共享检测结果。
+"""
+
+from concurrent.futures import Future, InvalidStateError, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class FrameWait:
+    """一个已注册的等待.
+
+    kind为'appear'（元素出现）、'disappear'（元素消失）或'scene'（进入场景，
+    target为None表示任意场景）。
+    """
+
+    kind: str
+    target: Optional[str]
+    future: Future = field(default_factory=Future)
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class FrameWaiter:
+    """共享逐帧评估的等待器."""
+
+    def __init__(
+        self,
+        detector: Any,
+        poll_interval: float = 0.1,
+        idle_timeout: float = 2.0,
+    ):
+        """初始化等待器.
+
+        Args:
+            detector: 游戏检测器（GameDetector）
+            poll_interval: 截图流水线未运行时的截图间隔（秒）
+            idle_timeout: 没有等待时评估线程保留的时间（秒）
+        """
+        self.detector = detector
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._waits: List[FrameWait] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pipeline: Any = None
+
+        self._evaluations = 0
+        self._resolved = 0
+
+    def wait_for_element(self, element_name: str, timeout: float = 10.0) -> Optional[Any]:
+        """等待UI元素出现.
+
+        Args:
+            element_name: 元素名称
+            timeout: 超时时间（秒）
+
+        Returns:
+            Optional[UIElement]: 找到的元素，超时返回None
+        """
+        return self._wait(FrameWait('appear', element_name), timeout, None)
+
+    def wait_for_element_gone(self, element_name: str, timeout: float = 10.0) -> bool:
+        """等待UI元素消失.
+
+        Args:
+            element_name: 元素名称
+            timeout: 超时时间（秒）
+
+        Returns:
+            bool: 元素在超时前消失返回True
+        """
+        return self._wait(FrameWait('disappear', element_name), timeout, False)
+
+    def wait_for_scene(self, target_scene: Optional[str] = None, timeout: float = 10.0) -> Optional[Any]:
+        """等待进入指定场景.
+
+        Args:
+            target_scene: 场景名称（SceneType的值），None表示检测到任意场景即返回
+            timeout: 超时时间（秒）
+
+        Returns:
+            Optional[SceneType]: 检测到的场景，超时返回None
+        """
+        return self._wait(FrameWait('scene', target_scene), timeout, None)
+
+    async def wait_for_element_async(self, element_name: str, timeout: float = 10.0) -> Optional[Any]:
+        """在事件循环中等待UI元素出现，等待期间不阻塞事件循环.
+
+        Args:
+            element_name: 元素名称
+            timeout: 超时时间（秒）
+
+        Returns:
+            Optional[UIElement]: 找到的元素，超时返回None
+        """
+        return await self._wait_async(FrameWait('appear', element_name), timeout, None)
+
+    async def wait_for_element_gone_async(self, element_name: str, timeout: float = 10.0) -> bool:
+        """在事件循环中等待UI元素消失.
+
+        Args:
+            element_name: 元素名称
+            timeout: 超时时间（秒）
+
+        Returns:
+            bool: 元素在超时前消失返回True
+        """
+        return await self._wait_async(FrameWait('disappear', element_name), timeout, False)
+
+    async def wait_for_scene_async(self, target_scene: Optional[str] = None,
+                                   timeout: float = 10.0) -> Optional[Any]:
+        """在事件循环中等待进入指定场景.
+
+        Args:
+            target_scene: 场景名称，None表示检测到任意场景即返回
+            timeout: 超时时间（秒）
+
+        Returns:
+            Optional[SceneType]: 检测到的场景，超时返回None
+        """
+        return await self._wait_async(FrameWait('scene', target_scene), timeout, None)
+
+    def _wait(self, wait: FrameWait, timeout: float, default: Any) -> Any:
+        """注册等待并阻塞到结果或超时."""
+        self._register(wait)
+        try:
+            return wait.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            return default
+        finally:
+            self._discard(wait)
+
+    async def _wait_async(self, wait: FrameWait, timeout: float, default: Any) -> Any:
+        """注册等待并在事件循环中等待结果或超时."""
+        self._register(wait)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(wait.future), timeout)
+        except asyncio.TimeoutError:
+            return default
+        finally:
+            self._discard(wait)
+
+    def _register(self, wait: FrameWait) -> None:
+        """注册等待，必要时启动评估线程并立即唤醒评估."""
+        with self._lock:
+            self._waits.append(wait)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="FrameWaiter", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def _discard(self, wait: FrameWait) -> None:
+        """移除已结束的等待."""
+        wait.future.cancel()
+        with self._lock:
+            if wait in self._waits:
+                self._waits.remove(wait)
+
+    def _run(self) -> None:
+        """评估线程主循环：每次被新帧或新等待唤醒时评估一次."""
+        while True:
+            with self._lock:
+                self._waits = [wait for wait in self._waits if not wait.future.done()]
+                waits = list(self._waits)
+            if not waits:
+                if not self._wakeup.wait(self.idle_timeout):
+                    with self._lock:
+                        if not self._waits:
+                            self._thread = None
+                            self._attach_pipeline(None)
+                            return
+                self._wakeup.clear()
+                continue
+
+            pipeline = getattr(self.detector, 'capture_pipeline', None)
+            self._attach_pipeline(pipeline if getattr(pipeline, 'running', False) else None)
+            self._evaluate(waits)
+
+            # 有截图流水线时由新帧唤醒，否则按轮询间隔自行截图
+            self._wakeup.wait(self.poll_interval if self._pipeline is None else 1.0)
+            self._wakeup.clear()
+
+    def _attach_pipeline(self, pipeline: Any) -> None:
+        """订阅截图流水线的新帧通知."""
+        if pipeline is self._pipeline:
+            return
+        if self._pipeline is not None:
+            self._pipeline.remove_frame_listener(self._on_frame)
+        self._pipeline = pipeline
+        if pipeline is not None:
+            pipeline.add_frame_listener(self._on_frame)
+
+    def _on_frame(self, frame: Any) -> None:
+        """新帧回调，在截图线程中执行，只唤醒评估线程."""
+        self._wakeup.set()
+
+    def _evaluate(self, waits: List[FrameWait]) -> None:
+        """在最新一帧上为所有等待做一次检测并分发结果.
+
+        Args:
+            waits: 当前未完成的等待
+        """
+        element_names = sorted({
+            wait.target for wait in waits if wait.kind in ('appear', 'disappear')
+        })
+        need_scene = any(wait.kind == 'scene' for wait in waits)
+        try:
+            self.detector.invalidate_frame_cache()
+            with self.detector.detection_tick():
+                found: Dict[str, Any] = {}
+                if element_names:
+                    found = {
+                        element.name: element
+                        for element in self.detector.detect_ui_elements_incremental(element_names)
+                    }
+                scene = self.detector.detect_scene(incremental=True) if need_scene else None
+            self._evaluations += 1
+        except Exception as e:
+            self.logger.error(f"等待条件评估失败: {e}")
+            return
+
+        for wait in waits:
+            if wait.kind == 'appear':
+                satisfied, result = wait.target in found, found.get(wait.target)
+            elif wait.kind == 'disappear':
+                satisfied, result = wait.target not in found, True
+            else:
+                satisfied = scene is not None and (
+                    wait.target is None or getattr(scene, 'value', scene) == wait.target
+                )
+                result = scene
+            if satisfied:
+                try:
+                    wait.future.set_result(result)
+                    self._resolved += 1
+                except InvalidStateError:
+                    pass  # 等待已超时或被取消
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取等待器统计信息.
+
+        Returns:
+            Dict[str, Any]: 当前等待数、评估次数和已满足的等待数
+        """
+        with self._lock:
+            pending = len(self._waits)
+        return {
+            'pending_waits': pending,
+            'evaluations': self._evaluations,
+            'resolved': self._resolved,
+            'event_driven': self._pipeline is not None,
+        }
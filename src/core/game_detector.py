@@ -2,13 +2,16 @@
 
 提供游戏窗口检测、UI元素识别等功能。"""
 
-from dataclasses import dataclass
+import asyncio
+from collections import deque
+from dataclasses import dataclass, replace
 from enum import Enum
 import logging
+import numbers
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-import io
+from typing import Any, Callable, ContextManager, Deque, Dict, List, Optional, Tuple
+import threading
 import time
 
 import cv2
@@ -41,6 +44,14 @@ except ImportError:
 from src.config.config_manager import ConfigManager
 from src.interfaces.automation_interface import IGameDetector
 
+from .capture_pipeline import CapturePipeline
+from .frame_cache import FrameCache
+from .frame_diff import FrameChange, FrameChangeDetector
+from .frame_source import FrameSource, Win32FrameSource
+from .frame_waiter import FrameWaiter
+from .multi_match import find_instances, sort_by_position
+from .raw_frame import RawFrame
+
 # 设置日志记录器
 logger = logging.getLogger(__name__)
 
@@ -144,6 +155,10 @@ class TemplateInfo:
     image: Any  # numpy array
     threshold: float
     path: str
+    # 配置的搜索区域，相对截图尺寸的比例 (x, y, width, height)
+    roi: Optional[Tuple[float, float, float, float]] = None
+    # 匹配模式：color为三通道匹配，gray/edge在单通道图上匹配并用颜色校验结果
+    match_mode: str = "color"
 
     def __hash__(self) -> int:
         """计算哈希值."""
@@ -160,6 +175,912 @@ class TemplateInfo:
         )
 
 
+# 多尺度匹配的默认缩放序列
+DEFAULT_SCALE_SWEEP: List[float] = [0.5, 0.75, 1.0, 1.25, 1.5, 2.0]
+
+# 粗匹配时模板在金字塔顶层的最小边长
+MIN_COARSE_TEMPLATE_SIZE = 16
+
+# 模板匹配模式
+MATCH_MODE_COLOR = "color"
+MATCH_MODE_GRAY = "gray"
+MATCH_MODE_EDGE = "edge"
+MATCH_MODES = (MATCH_MODE_COLOR, MATCH_MODE_GRAY, MATCH_MODE_EDGE)
+
+# 边缘模式的Canny阈值
+EDGE_LOW_THRESHOLD = 50
+EDGE_HIGH_THRESHOLD = 150
+
+
+def _build_image_pyramid(image: Any, levels: int = 3) -> List[Any]:
+    """构建图像金字塔.
+
+    Args:
+        image: 输入图像
+        levels: 金字塔层数
+
+    Returns:
+        图像金字塔列表，第0层为原图
+    """
+    pyramid = [image]
+    current = image
+
+    for _ in range(levels - 1):
+        # 每层缩小一半
+        if len(current.shape) >= 2:
+            height, width = current.shape[:2]
+            if height < 32 or width < 32:  # 避免图像过小
+                break
+            current = cv2.pyrDown(current)
+            pyramid.append(current)
+        else:
+            break
+
+    return pyramid
+
+
+class TemplateEntry:
+    """模板库条目.
+
+    保存模板的彩色图及其派生数据（灰度图、金字塔、缩放变体）。
+    派生数据在首次使用时生成并缓存，prepare()可在启动时提前生成。
+    """
+
+    __slots__ = (
+        "name", "path", "color", "threshold",
+        "_gray", "_pyramid", "_scaled", "_gray_pyramids", "_spectra", "_channels",
+    )
+
+    def __init__(self, name: str, path: str, color: Any, threshold: float = 0.8):
+        """初始化模板条目.
+
+        Args:
+            name: 模板名称
+            path: 模板文件路径
+            color: BGR彩色模板图像
+            threshold: 匹配阈值
+        """
+        self.name = name
+        self.path = path
+        self.color = color
+        self.threshold = threshold
+        self._gray: Optional[Any] = None
+        self._pyramid: List[Any] = []
+        self._scaled: Dict[float, Any] = {}
+        self._gray_pyramids: Dict[Tuple[int, float], List[Any]] = {}
+        self._spectra: Dict[Tuple[Any, ...], Tuple[Any, float]] = {}
+        self._channels: Dict[Tuple[str, float], Optional[Any]] = {}
+
+    @property
+    def gray(self) -> Any:
+        """获取灰度模板图像."""
+        if self._gray is None:
+            if len(self.color.shape) == 3:
+                self._gray = cv2.cvtColor(self.color, cv2.COLOR_BGR2GRAY)
+            else:
+                self._gray = self.color
+        return self._gray
+
+    def pyramid(self, levels: int) -> List[Any]:
+        """获取彩色模板金字塔.
+
+        Args:
+            levels: 金字塔层数
+
+        Returns:
+            List[Any]: 金字塔各层图像
+        """
+        if len(self._pyramid) < levels:
+            self._pyramid = _build_image_pyramid(self.color, levels)
+        return self._pyramid[:levels]
+
+    def gray_pyramid(self, levels: int, scale_factor: float = 1.0) -> List[Any]:
+        """获取（缩放后的）灰度模板金字塔.
+
+        与截图金字塔不同，模板金字塔允许缩小到MIN_COARSE_TEMPLATE_SIZE，
+        以便在截图金字塔的顶层进行粗匹配。
+
+        Args:
+            levels: 金字塔层数
+            scale_factor: 缩放因子
+
+        Returns:
+            List[Any]: 金字塔各层灰度图像，缩放尺寸无效时返回空列表
+        """
+        key = (levels, round(scale_factor, 4))
+        if key not in self._gray_pyramids:
+            base = self.scaled(scale_factor)
+            pyramid: List[Any] = []
+            if base is not None:
+                if len(base.shape) == 3:
+                    base = self.gray if scale_factor == 1.0 else cv2.cvtColor(base, cv2.COLOR_BGR2GRAY)
+                pyramid.append(base)
+                while len(pyramid) < levels:
+                    height, width = pyramid[-1].shape[:2]
+                    if min(height, width) // 2 < MIN_COARSE_TEMPLATE_SIZE:
+                        break
+                    pyramid.append(cv2.pyrDown(pyramid[-1]))
+            self._gray_pyramids[key] = pyramid
+        return self._gray_pyramids[key]
+
+    def spectrum(
+        self, level: int, scale_factor: float, frame_shape: Tuple[int, int]
+    ) -> Tuple[Any, float]:
+        """获取零均值灰度模板在指定截图尺寸下的频谱（用于FFT匹配）.
+
+        Args:
+            level: 金字塔层
+            scale_factor: 缩放因子
+            frame_shape: 截图该层的尺寸 (height, width)
+
+        Returns:
+            Tuple[Any, float]: 模板频谱的共轭及零均值模板的范数
+        """
+        key = (level, round(scale_factor, 4), tuple(frame_shape))
+        if key not in self._spectra:
+            template = self.gray_pyramid(level + 1, scale_factor)[level].astype(np.float64)
+            template -= template.mean()
+            spectrum = np.conj(np.fft.rfft2(template, s=frame_shape))
+            self._spectra[key] = (spectrum, float(np.sqrt((template ** 2).sum())))
+        return self._spectra[key]
+
+    def scaled(self, scale_factor: float) -> Optional[Any]:
+        """获取缩放后的彩色模板.
+
+        Args:
+            scale_factor: 缩放因子
+
+        Returns:
+            缩放后的模板图像，尺寸无效时返回None
+        """
+        if scale_factor == 1.0:
+            return self.color
+
+        key = round(scale_factor, 4)
+        if key not in self._scaled:
+            height, width = self.color.shape[:2]
+            new_height = int(height * scale_factor)
+            new_width = int(width * scale_factor)
+            if new_height <= 0 or new_width <= 0:
+                self._scaled[key] = None
+            else:
+                self._scaled[key] = cv2.resize(self.color, (new_width, new_height))
+        return self._scaled[key]
+
+    def channel(self, mode: str, scale_factor: float = 1.0) -> Optional[Any]:
+        """获取（缩放后的）单通道模板.
+
+        Args:
+            mode: 匹配模式，gray或edge
+            scale_factor: 缩放因子
+
+        Returns:
+            单通道模板图像，尺寸无效时返回None
+        """
+        key = (mode, round(scale_factor, 4))
+        if key not in self._channels:
+            if mode == MATCH_MODE_GRAY and scale_factor == 1.0:
+                self._channels[key] = self.gray
+            else:
+                base = self.scaled(scale_factor)
+                self._channels[key] = None if base is None else _single_channel(base, mode)
+        return self._channels[key]
+
+    def prepare(self, scale_factors: List[float], pyramid_levels: int) -> None:
+        """预先生成灰度图、金字塔和缩放变体.
+
+        Args:
+            scale_factors: 需要预生成的缩放因子
+            pyramid_levels: 金字塔层数
+        """
+        _ = self.gray
+        self.pyramid(pyramid_levels)
+        for scale_factor in scale_factors:
+            self.scaled(scale_factor)
+
+    @property
+    def nbytes(self) -> int:
+        """获取条目占用的图像内存（字节）."""
+        images = [self.color, self._gray, *self._pyramid[1:], *self._scaled.values()]
+        images.extend(image for image in self._channels.values() if image is not self._gray)
+        for pyramid in self._gray_pyramids.values():
+            images.extend(pyramid[1:])
+        return sum(image.nbytes for image in images if isinstance(image, np.ndarray))
+
+
+class TemplateBank:
+    """模板库.
+
+    启动时一次性加载并预处理所有模板，名称和文件路径都解析到同一条目，
+    使热路径上的模板查找不再读取磁盘。
+    """
+
+    def __init__(
+        self,
+        base_dir: Optional[str] = None,
+        scale_factors: Optional[List[float]] = None,
+        pyramid_levels: int = 3,
+    ):
+        """初始化模板库.
+
+        Args:
+            base_dir: 解析相对路径时使用的根目录，默认为项目根目录
+            scale_factors: 预生成的缩放因子
+            pyramid_levels: 预生成的金字塔层数
+        """
+        self.base_dir = base_dir or str(Path(__file__).parent.parent.parent)
+        self.scale_factors = list(scale_factors or DEFAULT_SCALE_SWEEP)
+        self.pyramid_levels = pyramid_levels
+        self.logger = logging.getLogger(__name__)
+        self._entries: Dict[str, TemplateEntry] = {}
+        self._path_index: Dict[str, TemplateEntry] = {}
+        self._lock = threading.RLock()
+        self.disk_reads = 0
+
+    def _normalize_path(self, path: str) -> str:
+        """规范化路径作为索引键."""
+        return os.path.normcase(os.path.abspath(path))
+
+    def add(
+        self,
+        name: str,
+        path: str,
+        image: Any,
+        threshold: float = 0.8,
+        precompute: bool = True,
+    ) -> TemplateEntry:
+        """添加已加载的模板图像.
+
+        Args:
+            name: 模板名称
+            path: 模板文件路径
+            image: BGR模板图像
+            threshold: 匹配阈值
+            precompute: 是否立即生成派生数据
+
+        Returns:
+            TemplateEntry: 模板条目
+        """
+        entry = TemplateEntry(name=name, path=path, color=image, threshold=threshold)
+        if precompute:
+            try:
+                entry.prepare(self.scale_factors, self.pyramid_levels)
+            except Exception as e:
+                self.logger.warning(f"模板预处理失败 {name}: {e}")
+
+        with self._lock:
+            self._entries[name] = entry
+            self._path_index[self._normalize_path(path)] = entry
+        return entry
+
+    def load_file(
+        self,
+        path: str,
+        name: Optional[str] = None,
+        threshold: float = 0.8,
+        precompute: bool = False,
+    ) -> Optional[TemplateEntry]:
+        """从文件加载模板，同一路径只读取一次磁盘.
+
+        Args:
+            path: 模板文件路径
+            name: 模板名称，默认为文件名（不含扩展名）
+            threshold: 匹配阈值
+            precompute: 是否立即生成派生数据
+
+        Returns:
+            Optional[TemplateEntry]: 模板条目，加载失败返回None
+        """
+        with self._lock:
+            entry = self._path_index.get(self._normalize_path(path))
+            if entry is not None:
+                return entry
+
+            if cv2 is None:
+                return None
+
+            self.disk_reads += 1
+            image = cv2.imread(path)
+            if image is None:
+                return None
+
+            name = name or os.path.splitext(os.path.basename(path))[0]
+            return self.add(name, path, image, threshold, precompute)
+
+    def load_directory(self, templates_dir: str, threshold: float = 0.8) -> List[TemplateEntry]:
+        """递归加载目录中的所有模板.
+
+        子目录中的模板以"目录名_文件名"命名以避免重名。
+
+        Args:
+            templates_dir: 模板目录
+            threshold: 匹配阈值
+
+        Returns:
+            List[TemplateEntry]: 加载成功的模板条目
+        """
+        entries: List[TemplateEntry] = []
+        root_dir = os.path.normpath(templates_dir)
+        for root, dirs, files in os.walk(templates_dir):
+            for file in files:
+                if not file.lower().endswith(('.png', '.jpg', '.jpeg')):
+                    continue
+
+                template_path = os.path.join(root, file)
+                template_name = Path(file).stem
+                if os.path.normpath(root) != root_dir:
+                    template_name = f"{Path(root).name}_{template_name}"
+
+                try:
+                    entry = self.load_file(
+                        template_path, template_name, threshold, precompute=True
+                    )
+                except Exception as e:
+                    self.logger.error(f"加载模板失败 {template_path}: {e}")
+                    continue
+
+                if entry is None:
+                    self.logger.warning(f"无法加载模板图像: {template_path}")
+                    continue
+
+                self.logger.debug(f"已加载模板: {template_name} from {template_path}")
+                entries.append(entry)
+        return entries
+
+    def get(self, name: str) -> Optional[TemplateEntry]:
+        """按名称获取模板条目.
+
+        Args:
+            name: 模板名称
+
+        Returns:
+            Optional[TemplateEntry]: 模板条目，不存在返回None
+        """
+        return self._entries.get(name)
+
+    def resolve(self, key: str) -> Optional[TemplateEntry]:
+        """将模板名称或路径解析为模板条目.
+
+        依次尝试模板名称、路径（相对当前目录或项目根目录）和文件名。
+
+        Args:
+            key: 模板名称或模板文件路径
+
+        Returns:
+            Optional[TemplateEntry]: 模板条目，未加载返回None
+        """
+        if not key:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        for candidate in (key, os.path.join(self.base_dir, key)):
+            entry = self._path_index.get(self._normalize_path(candidate))
+            if entry is not None:
+                return entry
+
+        return self._entries.get(Path(key).stem)
+
+    def names(self) -> List[str]:
+        """获取所有模板名称."""
+        return list(self._entries.keys())
+
+    def __contains__(self, key: str) -> bool:
+        return self.resolve(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取模板库统计信息.
+
+        Returns:
+            Dict[str, Any]: 模板数量、内存占用和磁盘读取次数
+        """
+        with self._lock:
+            return {
+                'templates': len(self._entries),
+                'memory_bytes': sum(entry.nbytes for entry in self._entries.values()),
+                'disk_reads': self.disk_reads,
+            }
+
+
+class SearchWindowTracker:
+    """模板搜索窗口跟踪器.
+
+    按截图尺寸归一化记录每个模板最近的匹配框，据此学习模板的搜索窗口(ROI)。
+    固定位置的按钮只需在其常见区域内匹配，未命中时再回退到全帧搜索。
+    """
+
+    def __init__(
+        self,
+        history_size: int = 20,
+        min_samples: int = 3,
+        margin: float = 0.5,
+        max_coverage: float = 0.6,
+    ):
+        """初始化搜索窗口跟踪器.
+
+        Args:
+            history_size: 每个模板保留的匹配记录数
+            min_samples: 学习搜索窗口所需的最少匹配次数
+            margin: 搜索窗口四周扩展的边距（模板尺寸的倍数）
+            max_coverage: 搜索窗口面积占全帧比例的上限，超过时直接全帧匹配
+        """
+        self.history_size = history_size
+        self.min_samples = min_samples
+        self.margin = margin
+        self.max_coverage = max_coverage
+        self._history: Dict[str, Deque[Tuple[float, float, float, float]]] = {}
+        self._roi_hits: Dict[str, int] = {}
+        self._fallbacks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        name: str,
+        frame_shape: Tuple[int, ...],
+        position: Tuple[int, int],
+        size: Tuple[int, int],
+    ) -> None:
+        """记录一次匹配位置.
+
+        Args:
+            name: 模板名称
+            frame_shape: 截图形状 (height, width, ...)
+            position: 匹配框左上角 (x, y)
+            size: 匹配框尺寸 (width, height)
+        """
+        values = (*frame_shape[:2], *position, *size)
+        if not all(isinstance(value, numbers.Real) for value in values):
+            return
+        frame_h, frame_w = frame_shape[:2]
+        if frame_w <= 0 or frame_h <= 0:
+            return
+        box = (
+            position[0] / frame_w,
+            position[1] / frame_h,
+            size[0] / frame_w,
+            size[1] / frame_h,
+        )
+        with self._lock:
+            history = self._history.get(name)
+            if history is None:
+                history = deque(maxlen=self.history_size)
+                self._history[name] = history
+            history.append(box)
+
+    def learned_roi(self, name: str) -> Optional[Tuple[float, float, float, float]]:
+        """获取根据匹配历史学习到的搜索区域.
+
+        Args:
+            name: 模板名称
+
+        Returns:
+            Optional[Tuple[float, float, float, float]]: 归一化的 (x, y, width, height)，
+                样本不足返回None
+        """
+        with self._lock:
+            history = self._history.get(name)
+            if not history or len(history) < self.min_samples:
+                return None
+            x0 = min(box[0] for box in history)
+            y0 = min(box[1] for box in history)
+            x1 = max(box[0] + box[2] for box in history)
+            y1 = max(box[1] + box[3] for box in history)
+        return (x0, y0, x1 - x0, y1 - y0)
+
+    def get_window(
+        self,
+        name: str,
+        frame_shape: Tuple[int, ...],
+        template_shape: Tuple[int, ...],
+        configured: Optional[Tuple[float, float, float, float]] = None,
+        max_scale: float = 1.0,
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """计算模板在当前截图中的搜索窗口.
+
+        Args:
+            name: 模板名称
+            frame_shape: 截图形状 (height, width, ...)
+            template_shape: 模板形状 (height, width, ...)
+            configured: 配置的归一化搜索区域，优先于学习结果
+            max_scale: 匹配时模板的最大缩放比例，窗口至少容纳缩放后的模板
+
+        Returns:
+            Optional[Tuple[int, int, int, int]]: 像素坐标 (x0, y0, x1, y1)，
+                无可用区域或窗口接近全帧时返回None
+        """
+        roi = configured if configured is not None else self.learned_roi(name)
+        if roi is None:
+            return None
+
+        frame_h, frame_w = frame_shape[:2]
+        template_h, template_w = template_shape[:2]
+        pad_x = int(template_w * self.margin)
+        pad_y = int(template_h * self.margin)
+        x0 = int(roi[0] * frame_w) - pad_x
+        y0 = int(roi[1] * frame_h) - pad_y
+        x1 = int(round((roi[0] + roi[2]) * frame_w)) + pad_x
+        y1 = int(round((roi[1] + roi[3]) * frame_h)) + pad_y
+
+        # 保证窗口能容纳最大缩放的模板
+        min_w = int(np.ceil(template_w * max_scale))
+        min_h = int(np.ceil(template_h * max_scale))
+        if x1 - x0 < min_w:
+            center = (x0 + x1) // 2
+            x0, x1 = center - min_w // 2, center - min_w // 2 + min_w
+        if y1 - y0 < min_h:
+            center = (y0 + y1) // 2
+            y0, y1 = center - min_h // 2, center - min_h // 2 + min_h
+
+        # 平移到帧内，而不是截断，尽量保持窗口尺寸
+        if x0 < 0:
+            x0, x1 = 0, x1 - x0
+        if y0 < 0:
+            y0, y1 = 0, y1 - y0
+        if x1 > frame_w:
+            x0, x1 = max(0, x0 - (x1 - frame_w)), frame_w
+        if y1 > frame_h:
+            y0, y1 = max(0, y0 - (y1 - frame_h)), frame_h
+
+        if x1 - x0 < min_w or y1 - y0 < min_h:
+            return None
+        if (x1 - x0) * (y1 - y0) > self.max_coverage * frame_w * frame_h:
+            return None
+        return (x0, y0, x1, y1)
+
+    def record_roi_hit(self, name: str) -> None:
+        """记录一次在搜索窗口内命中."""
+        with self._lock:
+            self._roi_hits[name] = self._roi_hits.get(name, 0) + 1
+
+    def record_fallback(self, name: str) -> None:
+        """记录一次搜索窗口未命中而回退到全帧匹配."""
+        with self._lock:
+            self._fallbacks[name] = self._fallbacks.get(name, 0) + 1
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """清除匹配历史.
+
+        Args:
+            name: 模板名称，None表示清除所有模板
+        """
+        with self._lock:
+            if name is None:
+                self._history.clear()
+            else:
+                self._history.pop(name, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取搜索窗口统计信息.
+
+        Returns:
+            Dict[str, Any]: 窗口内命中次数、全帧回退次数和命中率
+        """
+        with self._lock:
+            roi_hits = sum(self._roi_hits.values())
+            fallbacks = sum(self._fallbacks.values())
+            total = roi_hits + fallbacks
+            return {
+                'tracked_templates': len(self._history),
+                'roi_hits': roi_hits,
+                'fallbacks': fallbacks,
+                'roi_hit_rate': roi_hits / total if total else 0.0,
+            }
+
+
+class ScaleCalibrator:
+    """渲染缩放校准器.
+
+    游戏界面随客户区尺寸缩放，而模板只在某一分辨率下截取。每种截图尺寸只用
+    参考模板扫描一次缩放比例并缓存结果，之后的多尺度匹配只在校准比例附近的
+    小范围内进行，不再遍历完整的缩放序列。校准失败（例如参考模板当时不在画面
+    上）只在retry_interval秒内有效，之后该尺寸会重新校准。
+    """
+
+    def __init__(
+        self,
+        band: float = 0.05,
+        band_steps: int = 1,
+        min_confidence: float = 0.7,
+        fine_step: float = 0.025,
+        retry_interval: float = 5.0,
+    ):
+        """初始化缩放校准器.
+
+        Args:
+            band: 校准比例两侧相邻候选比例的间隔
+            band_steps: 校准比例每侧的候选比例个数
+            min_confidence: 校准结果可用的最低匹配置信度
+            fine_step: 粗扫描后在最佳比例附近细扫描的步长
+            retry_interval: 校准失败后再次校准同一尺寸前等待的秒数
+        """
+        self.band = band
+        self.band_steps = band_steps
+        self.min_confidence = min_confidence
+        self.fine_step = fine_step
+        self.retry_interval = retry_interval
+        self.reference_template: Optional[str] = None
+        # 截图尺寸 (width, height) -> 校准比例，None表示该尺寸校准失败
+        self._scales: Dict[Tuple[int, int], Optional[float]] = {}
+        self._confidences: Dict[Tuple[int, int], float] = {}
+        # 校准失败的尺寸 -> 失败时间（time.monotonic）
+        self._failed_at: Dict[Tuple[int, int], float] = {}
+        self._calibrations = 0
+        self._lock = threading.Lock()
+
+    def needs_calibration(self, size: Tuple[int, int]) -> bool:
+        """判断该截图尺寸是否需要校准.
+
+        Args:
+            size: 截图尺寸 (width, height)，见_image_size
+
+        Returns:
+            bool: 已配置参考模板，且该尺寸没有校准记录或上次校准失败已超过
+                retry_interval时返回True
+        """
+        with self._lock:
+            if self.reference_template is None:
+                return False
+            if size not in self._scales:
+                return True
+            failed_at = self._failed_at.get(size)
+            return failed_at is not None and time.monotonic() - failed_at >= self.retry_interval
+
+    def scale_for(self, size: Tuple[int, int]) -> Optional[float]:
+        """获取截图尺寸对应的校准比例.
+
+        Args:
+            size: 截图尺寸 (width, height)
+
+        Returns:
+            Optional[float]: 校准比例，未校准或校准失败返回None
+        """
+        with self._lock:
+            return self._scales.get(size)
+
+    def band_scales(self, scale: float) -> List[float]:
+        """获取校准比例附近的候选缩放比例.
+
+        Args:
+            scale: 校准比例
+
+        Returns:
+            List[float]: 按与校准比例的距离排序的候选比例
+        """
+        scales = [scale]
+        for step in range(1, self.band_steps + 1):
+            for candidate in (scale - step * self.band, scale + step * self.band):
+                if candidate > 0:
+                    scales.append(round(candidate, 4))
+        return scales
+
+    def calibrate(
+        self, size: Tuple[int, int], screenshot: Any, template: Any
+    ) -> Optional[float]:
+        """用参考模板扫描缩放比例并缓存结果.
+
+        先按DEFAULT_SCALE_SWEEP粗扫描，再在最佳比例两侧各半个粗步长内细扫描。
+
+        Args:
+            size: 截图尺寸 (width, height)
+            screenshot: 该尺寸下的截图
+            template: 参考模板图像
+
+        Returns:
+            Optional[float]: 校准比例，最佳置信度低于min_confidence时返回None
+        """
+        gray = _to_gray(screenshot)
+        template_gray = _to_gray(template)
+
+        def score(scale: float) -> float:
+            height, width = template_gray.shape[:2]
+            new_w, new_h = int(width * scale), int(height * scale)
+            if new_w <= 0 or new_h <= 0 or new_w > gray.shape[1] or new_h > gray.shape[0]:
+                return -1.0
+            scaled = template_gray if scale == 1.0 else cv2.resize(template_gray, (new_w, new_h))
+            result = cv2.matchTemplate(gray, scaled, cv2.TM_CCOEFF_NORMED)
+            return float(cv2.minMaxLoc(result)[1])
+
+        scores = {scale: score(scale) for scale in DEFAULT_SCALE_SWEEP}
+        best = max(scores, key=scores.get)
+        half_step = min(abs(best - other) for other in DEFAULT_SCALE_SWEEP if other != best) / 2
+        fine = best - half_step
+        while fine <= best + half_step + 1e-9:
+            fine = round(fine, 4)
+            if fine not in scores:
+                scores[fine] = score(fine)
+            fine += self.fine_step
+        best = max(scores, key=scores.get)
+        confidence = scores[best]
+
+        scale = best if confidence >= self.min_confidence else None
+        with self._lock:
+            self._scales[size] = scale
+            self._confidences[size] = confidence
+            if scale is None:
+                self._failed_at[size] = time.monotonic()
+            else:
+                self._failed_at.pop(size, None)
+            self._calibrations += 1
+        return scale
+
+    def invalidate(self, size: Optional[Tuple[int, int]] = None) -> None:
+        """清除校准记录.
+
+        Args:
+            size: 截图尺寸，None表示清除所有尺寸
+        """
+        with self._lock:
+            if size is None:
+                self._scales.clear()
+                self._confidences.clear()
+                self._failed_at.clear()
+            else:
+                self._scales.pop(size, None)
+                self._confidences.pop(size, None)
+                self._failed_at.pop(size, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取校准统计信息.
+
+        Returns:
+            Dict[str, Any]: 参考模板、校准次数及各截图尺寸的校准比例
+        """
+        with self._lock:
+            return {
+                'reference_template': self.reference_template,
+                'calibrations': self._calibrations,
+                'scales': {
+                    f"{width}x{height}": scale
+                    for (width, height), scale in self._scales.items()
+                },
+            }
+
+
+def _image_size(image: Any) -> Optional[Tuple[int, int]]:
+    """获取图像尺寸 (width, height)，作为缩放校准的键；不是图像时返回None."""
+    shape = getattr(image, 'shape', None)
+    if not isinstance(shape, tuple) or len(shape) < 2:
+        return None
+    return (int(shape[1]), int(shape[0]))
+
+
+def _to_gray(image: Any) -> Any:
+    """将BGR/BGRA图像转换为灰度图，已是灰度图时直接返回."""
+    if len(image.shape) == 2:
+        return image
+    code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    return cv2.cvtColor(image, code)
+
+
+def _single_channel(image: Any, mode: str) -> Any:
+    """按匹配模式生成单通道图像.
+
+    gray为灰度图；edge为Canny边缘图，再做一次3x3高斯模糊，
+    让相差一两个像素的边缘仍有相关性。
+
+    Args:
+        image: BGR/BGRA或灰度图像
+        mode: 匹配模式，gray或edge
+
+    Returns:
+        单通道uint8图像
+    """
+    gray = _to_gray(image)
+    if mode != MATCH_MODE_EDGE:
+        return gray
+    edges = cv2.Canny(gray, EDGE_LOW_THRESHOLD, EDGE_HIGH_THRESHOLD)
+    return cv2.GaussianBlur(edges, (3, 3), 0)
+
+
+class PreparedFrame:
+    """预处理后的截图帧.
+
+    批量匹配时灰度图、灰度金字塔以及FFT频谱和积分图只计算一次，
+    由所有模板共享。
+    """
+
+    def __init__(self, image: Any, levels: int = 3):
+        """初始化预处理帧.
+
+        Args:
+            image: BGR或灰度截图
+            levels: 金字塔层数
+        """
+        self.image = image
+        self.levels = levels
+        self._gray: Optional[Any] = None
+        self._pyramid: Optional[List[Any]] = None
+        self._fft: Dict[int, Tuple[Any, Any, Any]] = {}
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """原始截图形状."""
+        return self.image.shape
+
+    @property
+    def gray(self) -> Any:
+        """灰度截图."""
+        if self._gray is None:
+            if len(self.image.shape) == 3:
+                self._gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+            else:
+                self._gray = self.image
+        return self._gray
+
+    @property
+    def pyramid(self) -> List[Any]:
+        """灰度截图金字塔，第0层为原尺寸."""
+        if self._pyramid is None:
+            self._pyramid = _build_image_pyramid(self.gray, self.levels)
+        return self._pyramid
+
+    def fft(self, level: int) -> Tuple[Any, Any, Any]:
+        """获取指定金字塔层的频谱和积分图.
+
+        Args:
+            level: 金字塔层
+
+        Returns:
+            Tuple[Any, Any, Any]: (频谱, 像素和积分图, 像素平方和积分图)
+        """
+        if level not in self._fft:
+            image = self.pyramid[level]
+            spectrum = np.fft.rfft2(image.astype(np.float64))
+            integral, sq_integral = cv2.integral2(image, sdepth=cv2.CV_64F)
+            self._fft[level] = (spectrum, integral, sq_integral)
+        return self._fft[level]
+
+    def match_fft(self, level: int, template_shape: Tuple[int, int], spectrum: Any, norm: float) -> Any:
+        """使用共享频谱计算TM_CCOEFF_NORMED匹配结果.
+
+        Args:
+            level: 金字塔层
+            template_shape: 模板尺寸 (height, width)
+            spectrum: 零均值模板频谱的共轭
+            norm: 零均值模板的范数
+
+        Returns:
+            Any: 与cv2.matchTemplate(TM_CCOEFF_NORMED)形状相同的结果图
+        """
+        frame_spectrum, integral, sq_integral = self.fft(level)
+        height, width = self.pyramid[level].shape[:2]
+        t_h, t_w = template_shape
+        correlation = np.fft.irfft2(frame_spectrum * spectrum, s=(height, width))
+        correlation = correlation[:height - t_h + 1, :width - t_w + 1]
+
+        def window_sum(table: Any) -> Any:
+            return (
+                table[t_h:, t_w:] - table[:-t_h, t_w:]
+                - table[t_h:, :-t_w] + table[:-t_h, :-t_w]
+            )
+
+        count = t_h * t_w
+        sums = window_sum(integral)
+        variance = np.maximum(window_sum(sq_integral) - sums * sums / count, 0.0)
+        denominator = np.sqrt(variance) * norm
+        result = np.zeros_like(correlation)
+        np.divide(correlation, denominator, out=result, where=denominator > 1e-6)
+        return result.astype(np.float32)
+
+
+@dataclass
+class _BatchCandidate:
+    """批量匹配的候选位置."""
+
+    score: float
+    name: str
+    template_info: TemplateInfo
+    scale: float
+    level: int
+    location: Tuple[int, int]
+    in_window: bool = False
+
+
 class TemplateMatcher:
     """模板匹配器."""
 
@@ -178,12 +1099,36 @@ class TemplateMatcher:
         self.enable_rotation_matching: bool = False
         self.rotation_angles: List[float] = [-5, 0, 5]  # 旋转角度
         self.pyramid_levels: int = 3  # 金字塔层数
+        self.pyramid_candidates: int = 3  # 金字塔最小层保留的候选峰值数
+        self.pyramid_coarse_margin: float = 0.3  # 最小层候选允许低于阈值的幅度
         self.enable_ocr: bool = True
         self.ocr_config: str = '--psm 8 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
         # 性能优化配置
         self.max_scale_factors: int = 12  # 最大缩放因子数量
         self.early_exit_threshold: float = 0.95  # 早期退出阈值
         self.high_confidence_threshold: float = 0.98  # 高置信度阈值
+        # 单通道匹配：gray/edge模式的模板只用一种方法在单通道图上匹配，
+        # 颜色只用于校验最终候选（各通道均值之差不超过容差）
+        self.default_match_mode: str = MATCH_MODE_COLOR
+        self.single_channel_method: Optional[int] = cv2.TM_CCOEFF_NORMED if cv2 is not None else None
+        self.enable_color_verification: bool = True
+        self.color_verify_tolerance: float = 40.0
+        # 批量匹配：截图只预处理一次，所有模板共享灰度金字塔（可选FFT频谱）
+        self.enable_batch_matching: bool = True
+        self.enable_fft_matching: bool = False
+        self.batch_scale_factors: List[float] = [1.0]
+        self.batch_coarse_margin: float = 0.3  # 粗匹配分数低于阈值减该值的模板直接淘汰
+        self.batch_peaks_per_template: int = 3
+        # 搜索窗口：优先在模板的常见区域内匹配，未命中再全帧搜索
+        self.enable_roi_matching: bool = True
+        self.search_windows = SearchWindowTracker()
+        # 缩放校准：每种窗口尺寸校准一次渲染比例，多尺度匹配只在其附近进行
+        self.scale_calibrator = ScaleCalibrator()
+        # 模板库：模板只从磁盘读取一次，并预生成金字塔和缩放变体
+        self.template_bank = TemplateBank(
+            scale_factors=sorted(set(self.scale_factors) | set(DEFAULT_SCALE_SWEEP)),
+            pyramid_levels=self.pyramid_levels,
+        )
         # 初始化OCR检测器
         try:
             from .ocr_detector import OCRDetector
@@ -215,21 +1160,24 @@ class TemplateMatcher:
                 logger.error(f"模板文件不存在: {template_path}")
                 return None
                 
-            # 加载图像
-            image = cv2.imread(template_path)
-            if image is None:
-                logger.error(f"无法加载模板图像: {template_path}")
-                return None
-                
             # 获取模板名称（不包含扩展名）
             template_name = os.path.splitext(os.path.basename(template_path))[0]
             
+            # 通过模板库加载图像（同一路径只读取一次磁盘）
+            entry = self.template_bank.load_file(
+                template_path, template_name, threshold, precompute=True
+            )
+            if entry is None:
+                logger.error(f"无法加载模板图像: {template_path}")
+                return None
+            
             # 创建模板信息
             template_info = TemplateInfo(
                 name=template_name,
-                image=image,
+                image=entry.color,
                 threshold=threshold,
-                path=template_path
+                path=template_path,
+                match_mode=self.default_match_mode,
             )
             
             # 缓存模板信息
@@ -243,11 +1191,27 @@ class TemplateMatcher:
             return None
 
     def capture_screen(self) -> Optional[bytes]:
-        """截取游戏画面.
+        """截取游戏画面并编码为PNG，仅用于持久化.
         
         Returns:
             Optional[bytes]: 截图数据，失败返回None
         """
+        frame = self.capture_frame()
+        if frame is None:
+            return None
+        screenshot_data = frame.to_png_bytes()
+        if screenshot_data:
+            self.logger.debug(f"Screenshot captured: {len(screenshot_data)} bytes")
+        return screenshot_data
+
+    def capture_frame(self) -> Optional[RawFrame]:
+        """截取游戏画面的原始帧.
+        
+        直接在位图缓冲区上建立BGRA视图，不经过PIL和PNG编解码。
+        
+        Returns:
+            Optional[RawFrame]: 原始帧，失败返回None
+        """
         if not self.current_window:
             # 尝试检测游戏窗口
             self.current_window = self.detect_game_window()
@@ -285,20 +1249,14 @@ class TemplateMatcher:
                 bmpinfo = saveBitMap.GetInfo()
                 bmpstr = saveBitMap.GetBitmapBits(True)
                 
-                # 转换为PIL图像
-                img = Image.frombuffer(
-                    'RGB',
-                    (bmpinfo['bmWidth'], bmpinfo['bmHeight']),
-                    bmpstr, 'raw', 'BGRX', 0, 1
+                # 位图数据已复制到Python字节对象，释放DC后视图仍然有效
+                return RawFrame.from_buffer(
+                    bmpstr,
+                    bmpinfo['bmWidth'],
+                    bmpinfo['bmHeight'],
+                    stride=bmpinfo.get('bmWidthBytes'),
+                    pixel_format='BGRA',
                 )
-                
-                # 转换为字节数据
-                img_bytes = io.BytesIO()
-                img.save(img_bytes, format='PNG')
-                screenshot_data = img_bytes.getvalue()
-                
-                self.logger.debug(f"Screenshot captured: {len(screenshot_data)} bytes")
-                return screenshot_data
             else:
                 self.logger.error("Failed to capture window content")
                 return None
@@ -332,24 +1290,23 @@ class TemplateMatcher:
             
         try:
             # 获取当前截图
-            screenshot_data = self.capture_screen()
-            if not screenshot_data:
+            frame = self.capture_frame()
+            if frame is None:
                 self.logger.warning("Failed to capture screen for template matching")
                 return None
+            screenshot = frame.bgr
             
-            # 转换截图为OpenCV格式
-            img_pil = Image.open(io.BytesIO(screenshot_data))
-            screenshot = cv2.cvtColor(np.array(img_pil), cv2.COLOR_RGB2BGR)
-            
-            # 加载模板图像
-            if not os.path.exists(template_path):
-                self.logger.error(f"Template file not found: {template_path}")
-                return None
-                
-            template = cv2.imread(template_path)
-            if template is None:
-                self.logger.error(f"Failed to load template: {template_path}")
-                return None
+            # 从模板库获取模板图像
+            entry = self.template_bank.resolve(template_path)
+            if entry is None:
+                if not os.path.exists(template_path):
+                    self.logger.error(f"Template file not found: {template_path}")
+                    return None
+                entry = self.template_bank.load_file(template_path)
+                if entry is None:
+                    self.logger.error(f"Failed to load template: {template_path}")
+                    return None
+            template = entry.color
             
             # 多尺度和多方法匹配
             best_result = None
@@ -357,7 +1314,7 @@ class TemplateMatcher:
             
             if self.enable_multi_scale:
                 for scale in self.scale_factors:
-                    scaled_template = self._scale_template(template, scale)
+                    scaled_template = entry.scaled(scale)
                     if scaled_template is None:
                         continue
                     
@@ -403,34 +1360,232 @@ class TemplateMatcher:
                     self.logger.error(f"加载模板文件失败 {template_path}: {e}")
                     continue
 
-    def match_template(
-        self, screenshot: Any, template_name: str
+    def set_template_roi(
+        self, template_name: str, roi: Optional[Tuple[float, float, float, float]]
+    ) -> bool:
+        """设置模板的搜索区域.
+
+        Args:
+            template_name: 模板名称
+            roi: 相对截图尺寸的比例 (x, y, width, height)，None表示改用学习到的区域
+
+        Returns:
+            bool: 模板存在返回True
+        """
+        template_info = self.template_info_cache.get(template_name)
+        if template_info is None:
+            return False
+        if roi is not None and len(roi) != 4:
+            self.logger.warning(f"无效的搜索区域: {template_name} {roi}")
+            return False
+        template_info.roi = tuple(float(value) for value in roi) if roi is not None else None
+        return True
+
+    def set_template_match_mode(self, template_name: str, match_mode: str) -> bool:
+        """设置模板的匹配模式.
+
+        Args:
+            template_name: 模板名称
+            match_mode: color、gray或edge
+
+        Returns:
+            bool: 模板存在且模式有效返回True
+        """
+        template_info = self.template_info_cache.get(template_name)
+        if template_info is None:
+            return False
+        if match_mode not in MATCH_MODES:
+            self.logger.warning(f"无效的匹配模式: {template_name} {match_mode}")
+            return False
+        template_info.match_mode = match_mode
+        return True
+
+    def match_template(
+        self, screenshot: Any, template_name: str
+    ) -> Optional[UIElement]:
+        """匹配模板.
+
+        模板有配置或学习到的搜索窗口时先在窗口内匹配，未命中再回退到全帧匹配。
+
+        Args:
+            screenshot: 截图图像
+            template_name: 模板名称
+
+        Returns:
+            Optional[UIElement]: 匹配到的UI元素，未找到返回None
+        """
+        if cv2 is None or np is None:
+            return None
+
+        if template_name not in self.template_info_cache:
+            return None
+
+        template_info = self.template_info_cache[template_name]
+        frame_shape = getattr(screenshot, 'shape', None)
+        if not isinstance(frame_shape, tuple) or len(frame_shape) < 2:
+            frame_shape = None
+        scale_factors = self._calibrated_scales(screenshot) if self.enable_multi_scale else None
+        template_shape = getattr(template_info.image, 'shape', None)
+        window = None
+        if (
+            self.enable_roi_matching
+            and frame_shape is not None
+            and isinstance(template_shape, tuple)
+            and len(template_shape) >= 2
+        ):
+            window = self.search_windows.get_window(
+                template_name,
+                frame_shape,
+                template_shape,
+                configured=template_info.roi,
+                max_scale=(
+                    max(scale_factors or DEFAULT_SCALE_SWEEP) if self.enable_multi_scale else 1.0
+                ),
+            )
+
+        if window is not None:
+            x0, y0, x1, y1 = window
+            try:
+                element = self._match_template_in_image(
+                    screenshot[y0:y1, x0:x1], template_name, template_info, scale_factors
+                )
+            except Exception as e:
+                self.logger.debug(f"搜索窗口匹配失败，回退到全帧匹配: {e}")
+                element = None
+            if element is not None:
+                element.position = (element.position[0] + x0, element.position[1] + y0)
+                self.search_windows.record_roi_hit(template_name)
+                self.search_windows.record(
+                    template_name, frame_shape, element.position, element.size
+                )
+                return element
+            self.search_windows.record_fallback(template_name)
+
+        element = self._match_template_in_image(
+            screenshot, template_name, template_info, scale_factors
+        )
+        if element is not None and frame_shape is not None:
+            self.search_windows.record(
+                template_name, frame_shape, element.position, element.size
+            )
+        return element
+
+    def match_template_in_region(
+        self, screenshot: Any, template_name: str, region: Tuple[int, int, int, int]
     ) -> Optional[UIElement]:
-        """匹配模板.
+        """只在截图的指定区域内匹配模板.
+
+        截图为图像数组或PreparedFrame时使用限定区域的批量匹配，否则逐尺度匹配。
+        缩放比例按整帧尺寸校准，返回的坐标已换算回整帧。
 
         Args:
-            screenshot: 截图图像
+            screenshot: 完整截图或PreparedFrame
             template_name: 模板名称
+            region: 搜索区域 (x, y, width, height)
 
         Returns:
             Optional[UIElement]: 匹配到的UI元素，未找到返回None
         """
-        if cv2 is None or np is None:
+        frame_shape = getattr(screenshot, 'shape', None)
+        if (
+            self.enable_batch_matching
+            and cv2 is not None
+            and isinstance(frame_shape, tuple)
+            and len(frame_shape) >= 2
+        ):
+            elements = self.match_batch(screenshot, [template_name], region=region)
+            return elements[0] if elements else None
+        return self._match_single_in_region(screenshot, template_name, region)
+
+    def _match_single_in_region(
+        self, screenshot: Any, template_name: str, region: Tuple[int, int, int, int]
+    ) -> Optional[UIElement]:
+        """按单模板流程在截图的指定区域内匹配模板.
+
+        Args:
+            screenshot: 完整截图
+            template_name: 模板名称
+            region: 搜索区域 (x, y, width, height)
+
+        Returns:
+            Optional[UIElement]: 匹配到的UI元素，坐标相对整帧
+        """
+        template_info = self.template_info_cache.get(template_name)
+        if cv2 is None or template_info is None:
             return None
 
-        if template_name not in self.template_info_cache:
+        x, y, width, height = region
+        x0, y0 = max(0, int(x)), max(0, int(y))
+        x1, y1 = int(x + width), int(y + height)
+        scale_factors = self._calibrated_scales(screenshot) if self.enable_multi_scale else None
+        try:
+            element = self._match_template_in_image(
+                screenshot[y0:y1, x0:x1], template_name, template_info, scale_factors
+            )
+        except Exception as e:
+            self.logger.debug(f"区域模板匹配失败 {template_name}: {e}")
             return None
+        if element is not None:
+            element.position = (element.position[0] + x0, element.position[1] + y0)
+            self.search_windows.record(
+                template_name, screenshot.shape, element.position, element.size
+            )
+        return element
 
-        template_info = self.template_info_cache[template_name]
+    def _match_template_in_image(
+        self,
+        screenshot: Any,
+        template_name: str,
+        template_info: TemplateInfo,
+        scale_factors: Optional[List[float]] = None,
+    ) -> Optional[UIElement]:
+        """在给定图像中匹配模板.
+
+        Args:
+            screenshot: 截图图像或其中的搜索窗口
+            template_name: 模板名称
+            template_info: 模板信息
+            scale_factors: 校准后的候选缩放比例（首个为校准比例），
+                None表示使用完整的缩放序列
+
+        Returns:
+            Optional[UIElement]: 匹配到的UI元素，坐标相对于传入图像
+        """
         template = template_info.image
         threshold = template_info.threshold
 
+        # 模板库中的条目已预生成金字塔和缩放变体
+        entry = self.template_bank.get(template_name)
+        if entry is not None and entry.color is not template:
+            entry = None
+
+        if (
+            template_info.match_mode in (MATCH_MODE_GRAY, MATCH_MODE_EDGE)
+            and self.single_channel_method is not None
+        ):
+            return self._match_single_channel(
+                screenshot, template_name, template_info, entry, scale_factors
+            )
+
         best_element = None
         best_confidence = 0
 
         # 优先尝试金字塔匹配（更高效）
         if self.enable_pyramid_matching and cv2 is not None:
-            pyramid_result = self._pyramid_match_template(screenshot, template, threshold)
+            pyramid_template = template
+            template_pyramid = entry.pyramid(self.pyramid_levels) if entry is not None else None
+            if scale_factors and scale_factors[0] != 1.0:
+                # 在校准比例下做金字塔匹配
+                template_pyramid = None
+                pyramid_template = (
+                    entry.scaled(scale_factors[0]) if entry is not None
+                    else self._scale_template(template, scale_factors[0])
+                )
+            pyramid_result = None
+            if pyramid_template is not None:
+                pyramid_result = self._pyramid_match_template(
+                    screenshot, pyramid_template, threshold, template_pyramid
+                )
             if pyramid_result and pyramid_result.confidence >= threshold:
                 pyramid_result.name = template_name
                 pyramid_result.template_path = template_info.path
@@ -438,16 +1593,23 @@ class TemplateMatcher:
 
         # 智能多尺度匹配
         if self.enable_multi_scale:
-            # 计算智能缩放因子
-            screenshot_size = screenshot.shape[:2]  # (height, width)
-            template_size = template.shape[:2]  # (height, width)
-            scale_factors = self._calculate_scale_factors(screenshot_size, template_size)
-            
-            # 按接近1.0的顺序排序，优先尝试原始尺寸附近的缩放
-            scale_factors.sort(key=lambda x: abs(x - 1.0))
+            if scale_factors:
+                # 已校准：只尝试校准比例附近的少数比例
+                scale_factors = list(scale_factors)
+            else:
+                # 计算智能缩放因子
+                screenshot_size = screenshot.shape[:2]  # (height, width)
+                template_size = template.shape[:2]  # (height, width)
+                scale_factors = self._calculate_scale_factors(screenshot_size, template_size)
+
+                # 按接近1.0的顺序排序，优先尝试原始尺寸附近的缩放
+                scale_factors.sort(key=lambda x: abs(x - 1.0))
             
             for scale in scale_factors:
-                scaled_template = self._scale_template(template, scale)
+                if entry is not None:
+                    scaled_template = entry.scaled(scale)
+                else:
+                    scaled_template = self._scale_template(template, scale)
                 if scaled_template is None:
                     continue
                 
@@ -476,16 +1638,11 @@ class TemplateMatcher:
                             h, w = scaled_template.shape[:2]
                         else:
                             continue
-                        # 调整坐标以适应缩放
-                        adjusted_x = int(best_loc[0] / scale) if scale != 1.0 else best_loc[0]
-                        adjusted_y = int(best_loc[1] / scale) if scale != 1.0 else best_loc[1]
-                        adjusted_w = int(w / scale) if scale != 1.0 else w
-                        adjusted_h = int(h / scale) if scale != 1.0 else h
-                        
+                        # 缩放的是模板而非截图，匹配位置和缩放后模板尺寸即为截图中的坐标
                         best_element = UIElement(
                             name=template_name,
-                            position=(adjusted_x, adjusted_y),
-                            size=(adjusted_w, adjusted_h),
+                            position=(best_loc[0], best_loc[1]),
+                            size=(w, h),
                             confidence=confidence,  # 使用原始置信度
                             template_path=template_info.path,
                         )
@@ -528,6 +1685,178 @@ class TemplateMatcher:
 
         return best_element
 
+    def _match_single_channel(
+        self,
+        screenshot: Any,
+        template_name: str,
+        template_info: TemplateInfo,
+        entry: Optional[TemplateEntry],
+        scale_factors: Optional[List[float]] = None,
+    ) -> Optional[UIElement]:
+        """在单通道（灰度或边缘）图上匹配模板.
+
+        截图只转换一次，每个缩放比例只用一种方法匹配一次；最终候选再用
+        颜色校验，排除灰度相同但颜色不同的元素。
+
+        Args:
+            screenshot: 截图图像或其中的搜索窗口
+            template_name: 模板名称
+            template_info: 模板信息
+            entry: 模板库条目，None表示现场生成单通道模板
+            scale_factors: 校准后的候选缩放比例，None表示使用完整的缩放序列
+
+        Returns:
+            Optional[UIElement]: 匹配到的UI元素，坐标相对于传入图像
+        """
+        mode = template_info.match_mode
+        template = template_info.image
+        threshold = template_info.threshold
+        method = self.single_channel_method
+        frame = _single_channel(screenshot, mode)
+
+        def channel(scale: float) -> Optional[Any]:
+            if entry is not None:
+                image = entry.channel(mode, scale)
+            else:
+                scaled = template if scale == 1.0 else self._scale_template(template, scale)
+                image = None if scaled is None else _single_channel(scaled, mode)
+            # 没有纹理的模板（如提取不到边缘）与任何位置的相关系数都是1，不能用于匹配
+            if image is None or image.min() == image.max():
+                return None
+            return image
+
+        # 灰度模式先在校准比例（未校准时为原尺寸）上做金字塔匹配；
+        # 边缘图缩小后边缘会糊掉，不做金字塔匹配
+        if mode == MATCH_MODE_GRAY and self.enable_pyramid_matching:
+            pyramid_scale = scale_factors[0] if scale_factors else 1.0
+            pyramid_template = channel(pyramid_scale)
+            if pyramid_template is not None:
+                element = self._pyramid_match_template(
+                    frame,
+                    pyramid_template,
+                    threshold,
+                    entry.gray_pyramid(self.pyramid_levels, pyramid_scale) if entry is not None else None,
+                    methods=[method],
+                )
+                if element is not None and element.confidence >= threshold:
+                    element.name = template_name
+                    element.template_path = template_info.path
+                    return element if self._verify_color(screenshot, element, template) else None
+
+        if not self.enable_multi_scale:
+            scales = [1.0]
+        elif scale_factors:
+            scales = list(scale_factors)
+        else:
+            scales = self._calculate_scale_factors(screenshot.shape[:2], template.shape[:2])
+            scales.sort(key=lambda x: abs(x - 1.0))
+
+        best_element = None
+        best_confidence = 0.0
+        for scale in scales:
+            if best_confidence > self.early_exit_threshold:
+                break
+            scaled_template = channel(scale)
+            if scaled_template is None or not self._fits(scaled_template, frame):
+                continue
+            confidence, location = self._score_result(
+                cv2.matchTemplate(frame, scaled_template, method), method
+            )
+            weighted_confidence = confidence * (1.0 + 0.05 * (1.0 - abs(scale - 1.0)))
+            if confidence >= threshold and weighted_confidence > best_confidence:
+                h, w = scaled_template.shape[:2]
+                best_element = UIElement(
+                    name=template_name,
+                    position=(int(location[0]), int(location[1])),
+                    size=(w, h),
+                    confidence=float(confidence),
+                    template_path=template_info.path,
+                )
+                best_confidence = weighted_confidence
+
+        if best_element is None or not self._verify_color(screenshot, best_element, template):
+            return None
+        return best_element
+
+    def _verify_color(self, screenshot: Any, element: UIElement, template: Any) -> bool:
+        """用颜色校验单通道匹配的候选.
+
+        比较候选区域与模板的各通道均值，任一通道相差超过color_verify_tolerance
+        即视为不匹配（如同一按钮的置灰状态）。灰度截图或灰度模板无法校验，直接通过。
+
+        Args:
+            screenshot: 截图图像
+            element: 候选UI元素，坐标相对于截图
+            template: 彩色模板图像
+
+        Returns:
+            bool: 颜色一致返回True
+        """
+        if not self.enable_color_verification:
+            return True
+        if len(screenshot.shape) != 3 or len(template.shape) != 3:
+            return True
+        x, y = element.position
+        width, height = element.size
+        patch = screenshot[y:y + height, x:x + width]
+        if patch.size == 0:
+            return False
+        difference = np.abs(
+            np.asarray(cv2.mean(patch)[:3]) - np.asarray(cv2.mean(template)[:3])
+        ).max()
+        if difference > self.color_verify_tolerance:
+            self.logger.debug(f"颜色校验未通过: {element.name} 通道均值差 {difference:.1f}")
+            return False
+        return True
+
+    def calibrate_scale(self, screenshot: Any) -> Optional[float]:
+        """用参考模板校准截图尺寸对应的渲染缩放比例.
+
+        Args:
+            screenshot: 截图图像
+
+        Returns:
+            Optional[float]: 校准比例，未配置参考模板或校准失败返回None
+        """
+        reference = self.scale_calibrator.reference_template
+        template_info = self.template_info_cache.get(reference) if reference else None
+        size = _image_size(screenshot)
+        if (
+            cv2 is None
+            or template_info is None
+            or not isinstance(getattr(template_info.image, 'shape', None), tuple)
+            or size is None
+        ):
+            return None
+
+        try:
+            scale = self.scale_calibrator.calibrate(size, screenshot, template_info.image)
+        except Exception as e:
+            self.logger.error(f"缩放校准失败: {e}")
+            return None
+        if scale is None:
+            self.logger.warning(f"窗口尺寸 {size[0]}x{size[1]} 未找到参考模板 {reference}，使用完整缩放序列")
+        else:
+            self.logger.info(f"窗口尺寸 {size[0]}x{size[1]} 的渲染缩放比例: {scale}")
+        return scale
+
+    def _calibrated_scales(self, screenshot: Any) -> Optional[List[float]]:
+        """获取截图尺寸对应的候选缩放比例，该尺寸尚未校准时先校准.
+
+        Args:
+            screenshot: 完整截图
+
+        Returns:
+            Optional[List[float]]: 校准比例及其附近的比例，未校准返回None
+        """
+        size = _image_size(screenshot)
+        if size is None:
+            return None
+        if self.scale_calibrator.needs_calibration(size):
+            self.calibrate_scale(screenshot)
+        scale = self.scale_calibrator.scale_for(size)
+        return self.scale_calibrator.band_scales(scale) if scale is not None else None
+
     def _calculate_scale_factors(
         self, screenshot_size: tuple, template_size: tuple
     ) -> List[float]:
@@ -549,7 +1878,7 @@ class TemplateMatcher:
             return [1.0]
         
         # 返回固定的缩放因子列表以匹配测试期望
-        return [0.5, 0.75, 1.0, 1.25, 1.5, 2.0]
+        return list(DEFAULT_SCALE_SWEEP)
 
     def _scale_template(self, template: Any, scale_factor: float) -> Optional[Any]:
         """缩放模板图像.
@@ -577,72 +1906,198 @@ class TemplateMatcher:
         except Exception:
             return None
     
-    def _pyramid_match_template(self, screenshot: Any, template: Any, threshold: float) -> Optional[UIElement]:
-        """使用图像金字塔进行高效多尺度模板匹配.
+    def _pyramid_match_template(
+        self,
+        screenshot: Any,
+        template: Any,
+        threshold: float,
+        template_pyramid: Optional[List[Any]] = None,
+        methods: Optional[List[int]] = None,
+    ) -> Optional[UIElement]:
+        """使用图像金字塔进行由粗到精的模板匹配.
+
+        只在金字塔最小层对整幅图像匹配并找出候选峰值，之后每一层只在候选点
+        映射过来的小邻域内匹配，最终在原尺寸上给出精确位置。
         
         Args:
             screenshot: 截图图像
             template: 模板图像
             threshold: 匹配阈值
+            template_pyramid: 预生成的模板金字塔，None表示现场构建
+            methods: 匹配方法，None表示使用match_methods
             
         Returns:
             匹配到的UI元素或None
         """
-        if cv2 is None:
+        match_methods = methods if methods is not None else self.match_methods
+        if cv2 is None or not match_methods:
             return None
             
         try:
             # 构建图像金字塔
             screenshot_pyramid = self._build_pyramid(screenshot, levels=self.pyramid_levels)
-            template_pyramid = self._build_pyramid(template, levels=self.pyramid_levels)
-            
-            best_element = None
-            best_confidence = 0
-            
-            # 从最小尺度开始匹配
-            max_levels = min(len(screenshot_pyramid), len(template_pyramid))
-            for level in range(max_levels):
-                scale_factor = 2 ** level
-                
-                for method in self.match_methods:
-                    result = cv2.matchTemplate(screenshot_pyramid[level], template_pyramid[level], method)
-                    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-                    
-                    # 根据匹配方法调整置信度
-                    if method in [cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED]:
-                        confidence = 1.0 - min_val if method == cv2.TM_SQDIFF_NORMED else 1.0 / (1.0 + min_val)
-                        best_loc = min_loc
-                    else:
-                        confidence = max_val
-                        best_loc = max_loc
-                    
-                    if confidence >= threshold and confidence > best_confidence:
-                        # 将坐标转换回原始尺度
-                        original_x = best_loc[0] * scale_factor
-                        original_y = best_loc[1] * scale_factor
-                        if len(template.shape) >= 2:
-                            template_h, template_w = template.shape[:2]
-                        else:
-                            continue
-                        
-                        best_element = UIElement(
-                            name="pyramid_match",
-                            position=(original_x, original_y),
-                            size=(template_w, template_h),
-                            confidence=confidence,
-                            template_path="",
-                        )
-                        best_confidence = confidence
-                        
-                        # 如果在较小尺度找到高置信度匹配，可以提前退出
-                        if confidence > self.high_confidence_threshold and level > 0:
-                            return best_element
-            
-            return best_element
+            if template_pyramid is None:
+                template_pyramid = self._build_pyramid(template, levels=self.pyramid_levels)
+
+            # 选择模板能放进截图的最小层作为起始层
+            top = min(len(screenshot_pyramid), len(template_pyramid)) - 1
+            while top > 0 and not self._fits(template_pyramid[top], screenshot_pyramid[top]):
+                top -= 1
+            if not self._fits(template_pyramid[top], screenshot_pyramid[top]):
+                return None
+
+            if top == 0:
+                # 没有可用的缩小层，退化为原尺寸上的单层匹配
+                candidates = []
+                for method in match_methods:
+                    candidates.append(self._score_result(
+                        cv2.matchTemplate(screenshot_pyramid[0], template_pyramid[0], method),
+                        method,
+                    ))
+            else:
+                # 起始层：整幅匹配，取前几个峰值作为候选
+                coarse_method = match_methods[0]
+                result = cv2.matchTemplate(
+                    screenshot_pyramid[top], template_pyramid[top], coarse_method
+                )
+                candidates = self._find_peaks(
+                    result,
+                    coarse_method,
+                    threshold - self.pyramid_coarse_margin,
+                    template_pyramid[top].shape[:2],
+                )
+
+            # 逐层细化：只在上一层候选点映射后的邻域内匹配
+            for level in range(top - 1, -1, -1):
+                level_methods = match_methods if level == 0 else [coarse_method]
+                refined = []
+                for _, (x, y) in candidates:
+                    match = self._match_neighbourhood(
+                        screenshot_pyramid[level],
+                        template_pyramid[level],
+                        (x * 2, y * 2),
+                        level_methods,
+                    )
+                    if match is not None:
+                        refined.append(match)
+                candidates = refined
+                if not candidates:
+                    return None
+
+            best = max(candidates, key=lambda candidate: candidate[0], default=None)
+            if best is None or best[0] < threshold:
+                return None
+
+            template_h, template_w = template.shape[:2]
+            return UIElement(
+                name="pyramid_match",
+                position=(int(best[1][0]), int(best[1][1])),
+                size=(template_w, template_h),
+                confidence=float(best[0]),
+                template_path="",
+            )
             
         except Exception as e:
             self.logger.error(f"金字塔匹配错误: {e}")
             return None
+
+    @staticmethod
+    def _fits(template: Any, image: Any) -> bool:
+        """判断模板能否放进图像."""
+        try:
+            return (
+                template.shape[0] <= image.shape[0]
+                and template.shape[1] <= image.shape[1]
+            )
+        except (TypeError, IndexError):
+            return False
+
+    @staticmethod
+    def _score_result(result: Any, method: int) -> Tuple[float, Tuple[int, int]]:
+        """从匹配结果图中取出最佳置信度和位置.
+
+        Args:
+            result: cv2.matchTemplate结果
+            method: 匹配方法
+
+        Returns:
+            Tuple[float, Tuple[int, int]]: 置信度及其位置
+        """
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        if method in [cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED]:
+            confidence = 1.0 - min_val if method == cv2.TM_SQDIFF_NORMED else 1.0 / (1.0 + min_val)
+            return confidence, min_loc
+        return max_val, max_loc
+
+    def _find_peaks(
+        self,
+        result: Any,
+        method: int,
+        cutoff: float,
+        template_size: Tuple[int, int],
+    ) -> List[Tuple[float, Tuple[int, int]]]:
+        """在匹配结果图中寻找若干个互不重叠的峰值.
+
+        Args:
+            result: cv2.matchTemplate结果（会被修改）
+            method: 匹配方法
+            cutoff: 候选的最低置信度
+            template_size: 该层模板尺寸 (height, width)
+
+        Returns:
+            List[Tuple[float, Tuple[int, int]]]: (置信度, 位置) 列表
+        """
+        suppress_value = result.max() if method in [cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED] else result.min()
+        t_h, t_w = template_size
+        peaks = []
+        for _ in range(self.pyramid_candidates):
+            confidence, (x, y) = self._score_result(result, method)
+            if confidence < cutoff:
+                break
+            peaks.append((confidence, (x, y)))
+            result[
+                max(0, y - t_h // 2):y + t_h // 2 + 1,
+                max(0, x - t_w // 2):x + t_w // 2 + 1,
+            ] = suppress_value
+        return peaks
+
+    def _match_neighbourhood(
+        self,
+        image: Any,
+        template: Any,
+        location: Tuple[int, int],
+        methods: List[int],
+        radius: int = 2,
+    ) -> Optional[Tuple[float, Tuple[int, int]]]:
+        """在指定位置的小邻域内匹配模板.
+
+        Args:
+            image: 当前层截图
+            template: 当前层模板
+            location: 预测的模板左上角位置
+            methods: 匹配方法列表，取置信度最高者
+            radius: 邻域半径（像素）
+
+        Returns:
+            Optional[Tuple[float, Tuple[int, int]]]: (置信度, 位置)，邻域无效返回None
+        """
+        t_h, t_w = template.shape[:2]
+        i_h, i_w = image.shape[:2]
+        x, y = location
+        x0, y0 = max(0, x - radius), max(0, y - radius)
+        x1, y1 = min(i_w, x + t_w + radius), min(i_h, y + t_h + radius)
+        if x1 - x0 < t_w or y1 - y0 < t_h:
+            return None
+
+        window = image[y0:y1, x0:x1]
+        best = None
+        for method in methods:
+            confidence, (dx, dy) = self._score_result(
+                cv2.matchTemplate(window, template, method), method
+            )
+            if best is None or confidence > best[0]:
+                best = (confidence, (x0 + dx, y0 + dy))
+        return best
     
     def _build_pyramid(self, image: Any, levels: int = 3) -> List[Any]:
         """构建图像金字塔.
@@ -654,21 +2109,7 @@ class TemplateMatcher:
         Returns:
             图像金字塔列表
         """
-        pyramid = [image]
-        current = image
-        
-        for i in range(levels - 1):
-            # 每层缩小一半
-            if len(current.shape) >= 2:
-                height, width = current.shape[:2]
-                if height < 32 or width < 32:  # 避免图像过小
-                    break
-                current = cv2.pyrDown(current)
-                pyramid.append(current)
-            else:
-                break
-        
-        return pyramid
+        return _build_image_pyramid(image, levels)
     
     def _match_with_method(self, screenshot: Any, template: Any, method: int, threshold: float, scale: float = 1.0) -> Optional[Dict[str, Any]]:
         """使用指定方法进行模板匹配.
@@ -732,29 +2173,348 @@ class TemplateMatcher:
             return None
 
     def match_multiple_templates(
-        self, screenshot: Any, template_names: List[str]
+        self,
+        screenshot: Any,
+        template_names: List[str],
+        stop_when: Optional[Callable[[UIElement], bool]] = None,
     ) -> List[UIElement]:
         """匹配多个模板.
 
+        截图为图像数组时使用批量匹配，否则逐个模板匹配。
+
         Args:
             screenshot: 截图图像
             template_names: 模板名称列表
+            stop_when: 判定函数，对某个匹配结果返回True时停止匹配剩余模板
 
         Returns:
             List[UIElement]: 匹配到的UI元素列表
         """
+        frame_shape = getattr(screenshot, 'shape', None)
+        if (
+            self.enable_batch_matching
+            and cv2 is not None
+            and isinstance(frame_shape, tuple)
+            and len(frame_shape) >= 2
+        ):
+            return self.match_batch(screenshot, template_names, stop_when)
+
         all_elements = []
         for template_name in template_names:
             element = self.match_template(screenshot, template_name)
             if element is not None:
                 all_elements.append(element)
+                if stop_when is not None and stop_when(element):
+                    break
         return all_elements
+
+    def match_batch(
+        self,
+        screenshot: Any,
+        template_names: List[str],
+        stop_when: Optional[Callable[[UIElement], bool]] = None,
+        region: Optional[Tuple[int, int, int, int]] = None,
+    ) -> List[UIElement]:
+        """批量匹配多个模板.
+
+        截图只预处理一次（灰度、金字塔、可选FFT频谱），所有模板先在金字塔顶层
+        做粗匹配，再按粗匹配分数从高到低在原尺寸的局部邻域内精匹配。
+        粗匹配分数过低的模板不再精匹配，因此耗时主要取决于候选数量而非模板数量。
+
+        与match_template一致：未校准时先在原尺寸上匹配，仍未匹配到的模板再扫描
+        DEFAULT_SCALE_SWEEP中的其余比例；模板有配置或学习到的搜索窗口时先精匹配
+        窗口内的候选，都未通过再尝试窗口外的候选；精匹配结果再做颜色校验。
+        gray/edge匹配模式的模板不参与批量粗匹配，按单模板流程在单通道图上匹配。
+
+        Args:
+            screenshot: 截图图像或PreparedFrame
+            template_names: 模板名称列表
+            stop_when: 判定函数，对某个匹配结果返回True时立即返回
+            region: 只在该区域 (x, y, width, height) 内匹配，坐标仍相对整帧；
+                指定时不使用搜索窗口
+
+        Returns:
+            List[UIElement]: 匹配到的UI元素列表
+        """
+        frame = (
+            screenshot
+            if isinstance(screenshot, PreparedFrame)
+            else PreparedFrame(screenshot, self.pyramid_levels)
+        )
+        calibrated = self._calibrated_scales(frame.image) if self.enable_multi_scale else None
+        if calibrated:
+            scale_factors = calibrated[:1]
+        elif self.enable_multi_scale:
+            scale_factors = sorted(
+                set(self.batch_scale_factors) | set(DEFAULT_SCALE_SWEEP),
+                key=lambda scale: abs(scale - 1.0),
+            )
+        else:
+            scale_factors = list(self.batch_scale_factors)
+
+        batched: List[Tuple[str, TemplateInfo, Optional[Tuple[int, int, int, int]]]] = []
+        unbatched: List[str] = []
+        for template_name in template_names:
+            template_info = self.template_info_cache.get(template_name)
+            if template_info is None or not isinstance(
+                getattr(template_info.image, 'shape', None), tuple
+            ) or (
+                template_info.match_mode in (MATCH_MODE_GRAY, MATCH_MODE_EDGE)
+                and self.single_channel_method is not None
+            ):
+                unbatched.append(template_name)
+                continue
+            window = None
+            if self.enable_roi_matching and region is None:
+                window = self.search_windows.get_window(
+                    template_name,
+                    frame.shape,
+                    template_info.image.shape,
+                    configured=template_info.roi,
+                    max_scale=max(scale_factors),
+                )
+            batched.append((template_name, template_info, window))
+
+        windowed = {name for name, _, window in batched if window is not None}
+        bounds = None
+        if region is not None:
+            x, y, width, height = region
+            bounds = (max(0, int(x)), max(0, int(y)), int(x + width), int(y + height))
+        elements: List[UIElement] = []
+        matched = set()
+        # 先在首个比例上匹配所有模板，其余比例只用于仍未匹配到的模板
+        for scales in (scale_factors[:1], scale_factors[1:]):
+            if not scales:
+                continue
+            candidates: List[_BatchCandidate] = []
+            for template_name, template_info, window in batched:
+                if template_name in matched or template_name in unbatched:
+                    continue
+                try:
+                    candidates.extend(self._coarse_candidates(
+                        frame, template_name, template_info, scales, window, bounds
+                    ))
+                except Exception as e:
+                    self.logger.debug(f"批量粗匹配失败，改为单独匹配 {template_name}: {e}")
+                    unbatched.append(template_name)
+            if self._refine_candidates(frame, candidates, windowed, matched, elements, stop_when):
+                return elements
+
+        # 不在模板缓存中的名称和单通道模式的模板按单模板流程匹配
+        for template_name in unbatched:
+            if region is None:
+                element = self.match_template(frame.image, template_name)
+            else:
+                element = self._match_single_in_region(frame.image, template_name, region)
+            if element is not None:
+                elements.append(element)
+                if stop_when is not None and stop_when(element):
+                    break
+        return elements
+
+    def _refine_candidates(
+        self,
+        frame: PreparedFrame,
+        candidates: List[_BatchCandidate],
+        windowed: set,
+        matched: set,
+        elements: List[UIElement],
+        stop_when: Optional[Callable[[UIElement], bool]] = None,
+    ) -> bool:
+        """按粗匹配分数从高到低精匹配候选，每个模板取第一个通过的候选.
+
+        有搜索窗口的模板，窗口外的候选排在所有窗口内候选之后。
+
+        Args:
+            frame: 预处理帧
+            candidates: 粗匹配候选
+            windowed: 有搜索窗口的模板名称
+            matched: 已匹配到的模板名称，会被更新
+            elements: 匹配结果列表，会被追加
+            stop_when: 判定函数，对某个匹配结果返回True时停止
+
+        Returns:
+            bool: stop_when要求停止时返回True
+        """
+        candidates.sort(key=lambda candidate: (
+            candidate.name in windowed and not candidate.in_window, -candidate.score
+        ))
+        for candidate in candidates:
+            if candidate.name in matched:
+                continue
+            element = self._refine_candidate(frame, candidate)
+            if element is None or not self._verify_color(
+                frame.image, element, candidate.template_info.image
+            ):
+                continue
+            matched.add(candidate.name)
+            elements.append(element)
+            if candidate.name in windowed:
+                if candidate.in_window:
+                    self.search_windows.record_roi_hit(candidate.name)
+                else:
+                    self.search_windows.record_fallback(candidate.name)
+            self.search_windows.record(
+                candidate.name, frame.shape, element.position, element.size
+            )
+            if stop_when is not None and stop_when(element):
+                return True
+        return False
+
+    def _batch_entry(self, template_name: str, template_info: TemplateInfo) -> TemplateEntry:
+        """获取模板对应的模板库条目，不存在时注册到模板库."""
+        entry = self.template_bank.get(template_name)
+        if entry is None or entry.color is not template_info.image:
+            entry = self.template_bank.add(
+                template_name,
+                template_info.path,
+                template_info.image,
+                template_info.threshold,
+                precompute=False,
+            )
+        return entry
+
+    def _coarse_candidates(
+        self,
+        frame: PreparedFrame,
+        template_name: str,
+        template_info: TemplateInfo,
+        scale_factors: Optional[List[float]] = None,
+        window: Optional[Tuple[int, int, int, int]] = None,
+        bounds: Optional[Tuple[int, int, int, int]] = None,
+    ) -> List[_BatchCandidate]:
+        """在截图金字塔顶层进行粗匹配，返回候选位置.
+
+        Args:
+            frame: 预处理帧
+            template_name: 模板名称
+            template_info: 模板信息
+            scale_factors: 缩放因子，None表示使用batch_scale_factors
+            window: 搜索窗口 (x0, y0, x1, y1)，窗口内的峰值先取并标记为窗口内候选
+            bounds: 匹配范围 (x0, y0, x1, y1)，只在截图的这部分上粗匹配
+
+        Returns:
+            List[_BatchCandidate]: 粗匹配分数不低于淘汰线的候选位置
+        """
+        entry = self._batch_entry(template_name, template_info)
+        cutoff = template_info.threshold - self.batch_coarse_margin
+        candidates: List[_BatchCandidate] = []
+
+        def level_image(index: int) -> Tuple[Any, Tuple[int, int]]:
+            image = frame.pyramid[index]
+            if bounds is None:
+                return image, (0, 0)
+            factor = 2 ** index
+            x0, y0 = bounds[0] // factor, bounds[1] // factor
+            return image[y0:-(-bounds[3] // factor), x0:-(-bounds[2] // factor)], (x0, y0)
+
+        for scale in scale_factors or self.batch_scale_factors:
+            template_pyramid = entry.gray_pyramid(len(frame.pyramid), scale)
+            # 选择模板和截图（匹配范围）都存在、且能容纳模板的最高层
+            level = None
+            for index in range(min(len(template_pyramid), len(frame.pyramid)) - 1, -1, -1):
+                t_h, t_w = template_pyramid[index].shape[:2]
+                f_h, f_w = level_image(index)[0].shape[:2]
+                if t_h <= f_h and t_w <= f_w:
+                    level = index
+                    break
+            if level is None:
+                continue
+
+            template = template_pyramid[level]
+            t_h, t_w = template.shape[:2]
+            image, origin = level_image(level)
+            if self.enable_fft_matching and bounds is None:
+                spectrum, norm = entry.spectrum(level, scale, frame.pyramid[level].shape[:2])
+                result = frame.match_fft(level, (t_h, t_w), spectrum, norm)
+            else:
+                result = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+
+            regions = [(result, origin, False)]
+            if window is not None:
+                # 结果图坐标是模板左上角，模板需完整落在窗口内
+                factor = 2 ** level
+                rx0, ry0 = window[0] // factor, window[1] // factor
+                rx1 = min(result.shape[1], (window[2] - t_w * factor) // factor + 1)
+                ry1 = min(result.shape[0], (window[3] - t_h * factor) // factor + 1)
+                if rx1 > rx0 and ry1 > ry0:
+                    # 窗口是结果图的视图，窗口内取过的峰也会在全图中被抑制
+                    regions.insert(0, (result[ry0:ry1, rx0:rx1], (rx0, ry0), True))
+
+            for region, (ox, oy), in_window in regions:
+                for score, (x, y) in self._batch_peaks(region, cutoff, t_h, t_w):
+                    candidates.append(_BatchCandidate(
+                        score=score,
+                        name=template_name,
+                        template_info=template_info,
+                        scale=scale,
+                        level=level,
+                        location=(x + ox, y + oy),
+                        in_window=in_window,
+                    ))
+        return candidates
+
+    def _batch_peaks(
+        self, result: Any, cutoff: float, t_h: int, t_w: int
+    ) -> List[Tuple[float, Tuple[int, int]]]:
+        """取粗匹配结果图中的前几个峰值，每取一个峰就抑制其邻域（会修改result）."""
+        peaks = []
+        for _ in range(self.batch_peaks_per_template):
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            if max_val < cutoff:
+                break
+            peaks.append((float(max_val), max_loc))
+            x, y = max_loc
+            result[
+                max(0, y - t_h // 2):y + t_h // 2 + 1,
+                max(0, x - t_w // 2):x + t_w // 2 + 1,
+            ] = -1.0
+        return peaks
+
+    def _refine_candidate(
+        self, frame: PreparedFrame, candidate: _BatchCandidate
+    ) -> Optional[UIElement]:
+        """在原尺寸截图的候选邻域内精匹配.
+
+        Args:
+            frame: 预处理帧
+            candidate: 粗匹配候选
+
+        Returns:
+            Optional[UIElement]: 置信度达到阈值时返回UI元素
+        """
+        entry = self.template_bank.get(candidate.name)
+        template = entry.gray_pyramid(len(frame.pyramid), candidate.scale)[0]
+        t_h, t_w = template.shape[:2]
+        gray = frame.gray
+        f_h, f_w = gray.shape[:2]
+
+        factor = 2 ** candidate.level
+        pad = 2 * factor
+        x = candidate.location[0] * factor
+        y = candidate.location[1] * factor
+        x0, y0 = max(0, x - pad), max(0, y - pad)
+        x1, y1 = min(f_w, x + t_w + pad), min(f_h, y + t_h + pad)
+        if x1 - x0 < t_w or y1 - y0 < t_h:
+            return None
+
+        result = cv2.matchTemplate(gray[y0:y1, x0:x1], template, cv2.TM_CCOEFF_NORMED)
+        _, confidence, _, max_loc = cv2.minMaxLoc(result)
+        if confidence < candidate.template_info.threshold:
+            return None
+        return UIElement(
+            name=candidate.name,
+            position=(x0 + max_loc[0], y0 + max_loc[1]),
+            size=(t_w, t_h),
+            confidence=float(confidence),
+            template_path=candidate.template_info.path,
+        )
     
-    def recognize_text(self, screenshot_data: bytes, region: Optional[Tuple[int, int, int, int]] = None) -> Optional[str]:
+    def recognize_text(self, screenshot_data: Any, region: Optional[Tuple[int, int, int, int]] = None) -> Optional[str]:
         """使用OCR识别文本.
         
         Args:
-            screenshot_data: 截图数据
+            screenshot_data: 截图数据（RawFrame、图像数组或PNG字节）
             region: 识别区域 (x, y, width, height)
             
         Returns:
@@ -766,13 +2526,13 @@ class TemplateMatcher:
         
         return self.ocr_detector.recognize_text(screenshot_data=screenshot_data, region=region)
     
-    def find_text(self, target_text: str, screenshot_data: bytes, 
+    def find_text(self, target_text: str, screenshot_data: Any, 
                  region: Optional[Tuple[int, int, int, int]] = None) -> Optional[Dict[str, Any]]:
         """在屏幕中查找指定文本.
         
         Args:
             target_text: 要查找的文本
-            screenshot_data: 截图数据
+            screenshot_data: 截图数据（RawFrame、图像数组或PNG字节）
             region: 搜索区域 (x, y, width, height)
             
         Returns:
@@ -784,12 +2544,12 @@ class TemplateMatcher:
         
         return self.ocr_detector.find_text(target_text, screenshot_data, region)
     
-    def extract_all_text(self, screenshot_data: bytes, 
+    def extract_all_text(self, screenshot_data: Any, 
                         region: Optional[Tuple[int, int, int, int]] = None) -> List[Dict[str, Any]]:
         """提取图像中的所有文本.
         
         Args:
-            screenshot_data: 截图数据
+            screenshot_data: 截图数据（RawFrame、图像数组或PNG字节）
             region: 搜索区域 (x, y, width, height)
             
         Returns:
@@ -800,6 +2560,23 @@ class TemplateMatcher:
             return []
         
         return self.ocr_detector.extract_all_text(screenshot_data, region)
+    
+    def recognize_text_regions(self, screenshot_data: Any,
+                               regions: List[Tuple[int, int, int, int]]) -> List[Optional[str]]:
+        """使用OCR工作池并行识别多个区域.
+        
+        Args:
+            screenshot_data: 截图数据（RawFrame、图像数组或PNG字节）
+            regions: 区域列表 (x, y, width, height)
+            
+        Returns:
+            List[Optional[str]]: 与regions一一对应的文本
+        """
+        if not self.enable_ocr or not self.ocr_detector:
+            self.logger.warning("OCR功能未启用")
+            return [None] * len(regions)
+        
+        return self.ocr_detector.recognize_regions(screenshot_data, regions)
 
 
 class WindowManager:
@@ -1018,6 +2795,19 @@ class WindowManager:
         if callback in self.window_change_callbacks:
             self.window_change_callbacks.remove(callback)
     
+    def _notify_window_change(self, old_window: GameWindow, new_window: GameWindow):
+        """通知窗口变化回调函数.
+
+        Args:
+            old_window: 变化前的窗口信息
+            new_window: 变化后的窗口信息
+        """
+        for callback in list(self.window_change_callbacks):
+            try:
+                callback(old_window, new_window)
+            except Exception as e:
+                self.logger.error(f"窗口变化回调执行失败: {e}")
+
     def start_monitoring(self):
         """开始窗口状态监控."""
         self.monitoring_enabled = True
@@ -1041,6 +2831,7 @@ class WindowManager:
             return False
         
         try:
+            previous = replace(window)
             # 获取当前窗口信息
             current_rect = win32gui.GetWindowRect(window.hwnd) if win32gui else window.rect
             current_title = win32gui.GetWindowText(window.hwnd) if win32gui else window.title
@@ -1065,6 +2856,7 @@ class WindowManager:
             if changed:
                 window.last_updated = time.time()
                 self.logger.debug(f"窗口状态已更新: {window.title}")
+                self._notify_window_change(previous, window)
             
             return changed
             
@@ -1126,7 +2918,6 @@ class WindowManager:
                 try:
                     import win32ui
                     import win32con
-                    from PIL import Image
                     
                     # 获取窗口设备上下文
                     hwndDC = win32gui.GetWindowDC(window.hwnd)
@@ -1142,18 +2933,14 @@ class WindowManager:
                     result = saveDC.BitBlt((0, 0), (window.width, window.height), mfcDC, (0, 0), win32con.SRCCOPY)
                     
                     if result:
-                        # 转换为numpy数组
+                        # 直接在位图缓冲区上建立BGRA视图，只做一次BGRA->BGR转换
                         bmpinfo = saveBitMap.GetInfo()
                         bmpstr = saveBitMap.GetBitmapBits(True)
                         
-                        img = Image.frombuffer(
-                            'RGB',
-                            (bmpinfo['bmWidth'], bmpinfo['bmHeight']),
-                            bmpstr, 'raw', 'BGRX', 0, 1
+                        bgra = np.frombuffer(bmpstr, dtype=np.uint8).reshape(
+                            bmpinfo['bmHeight'], bmpinfo['bmWidth'], 4
                         )
-                        
-                        # 转换为OpenCV格式
-                        screenshot = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
+                        screenshot = cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR)
                         
                         # 清理资源
                         win32gui.DeleteObject(saveBitMap.GetHandle())
@@ -1207,15 +2994,22 @@ class WindowManager:
 class GameDetector(IGameDetector):
     """游戏检测器."""
 
-    def __init__(self, config_manager: Optional[ConfigManager] = None):
+    def __init__(
+        self,
+        config_manager: Optional[ConfigManager] = None,
+        frame_source: Optional[FrameSource] = None,
+    ):
         """初始化游戏检测器.
 
         Args:
             config_manager: 配置管理器
+            frame_source: 截图帧来源，None表示截取Win32游戏窗口
         """
         self.config_manager = config_manager or ConfigManager()
         self.template_matcher = TemplateMatcher()
         self.window_manager = WindowManager()
+        self.frame_source: FrameSource = Win32FrameSource(self.window_manager)
+        self.capture_pipeline: Optional[CapturePipeline] = None
         self.current_scene = SceneType.UNKNOWN
         self.game_window: Optional[GameWindow] = None
         self.last_screenshot: Optional[Any] = None
@@ -1223,8 +3017,183 @@ class GameDetector(IGameDetector):
         self.current_window: Optional[Dict[str, Any]] = None
         self.logger = logger
 
+        # 帧缓存：同一检测周期内的多次检测共享一次截图
+        detector_config = self.config_manager.get('game_detector', {}) or {}
+        self.frame_cache = FrameCache(
+            max_age=detector_config.get('frame_cache_max_age', 0.05)
+        )
+
+        # 帧差分：画面未变化时复用上一帧的检测结果，局部变化时只重新匹配变化区域
+        change_config = detector_config.get('change_detection', {}) or {}
+        self.change_detector = FrameChangeDetector(
+            grid=tuple(change_config.get('grid', (16, 12))),
+            pixel_threshold=change_config.get('pixel_threshold', 12),
+        )
+        # 元素名称 -> (评估时的画面代数, 检测结果)；画面变化一次代数加一
+        self._element_cache: Dict[str, Tuple[int, Optional[UIElement]]] = {}
+        self._element_generation = 0
+        self._generation_change: Optional[FrameChange] = None
+        self._element_cache_lock = threading.Lock()
+        # 等待UI元素/场景：并发等待共享逐帧检测
+        self.frame_waiter = FrameWaiter(self)
+
         # 加载游戏配置
         self._load_game_config()
+        self._apply_template_rois(detector_config)
+        self._apply_match_modes(detector_config)
+        self._apply_scale_calibration(detector_config)
+        self.window_manager.add_window_change_callback(self._on_window_change)
+        if frame_source is not None:
+            self.set_frame_source(frame_source)
+
+        # 后台截图流水线（默认关闭，由自动化循环按需启动）
+        pipeline_config = (
+            detector_config.get('capture_pipeline') if isinstance(detector_config, dict) else None
+        ) or {}
+        if isinstance(pipeline_config, dict) and pipeline_config.get('enabled', False):
+            self.start_capture_pipeline(
+                target_fps=pipeline_config.get('target_fps', 30.0),
+            )
+
+    def set_frame_source(self, frame_source: FrameSource) -> None:
+        """切换截图帧来源.
+
+        离线来源（回放、生成器）不需要真实窗口，检测器使用与帧尺寸相同的
+        虚拟窗口，来源中还有帧时视为游戏正在运行。
+
+        Args:
+            frame_source: 截图帧来源
+        """
+        restart_fps = None
+        if self.capture_pipeline is not None and self.capture_pipeline.running:
+            restart_fps = self.capture_pipeline.target_fps
+            self.stop_capture_pipeline()
+        self.frame_source = frame_source
+        self.frame_cache.invalidate()
+        self.reset_change_detection()
+        if restart_fps is not None:
+            self.start_capture_pipeline(target_fps=restart_fps)
+        if frame_source.live:
+            return
+
+        size = frame_source.frame_size()
+        width, height = size if size else (0, 0)
+        self.game_window = GameWindow(
+            hwnd=0,
+            title=frame_source.name,
+            rect=(0, 0, width, height),
+            width=width,
+            height=height,
+            is_foreground=True,
+        )
+
+    def _apply_template_rois(self, detector_config: Dict[str, Any]) -> None:
+        """应用配置的模板搜索区域.
+
+        配置示例::
+
+            game_detector:
+              enable_roi_matching: true
+              template_rois:
+                main_menu_start_button: [0.3, 0.6, 0.4, 0.3]
+
+        Args:
+            detector_config: game_detector配置节
+        """
+        if not isinstance(detector_config, dict):
+            return
+        self.template_matcher.enable_roi_matching = detector_config.get(
+            'enable_roi_matching', True
+        )
+        for template_name, roi in (detector_config.get('template_rois') or {}).items():
+            if not self.template_matcher.set_template_roi(template_name, roi):
+                self.logger.warning(f"搜索区域配置的模板不存在: {template_name}")
+
+    def _apply_match_modes(self, detector_config: Dict[str, Any]) -> None:
+        """应用模板匹配模式配置.
+
+        配置示例::
+
+            game_detector:
+              default_match_mode: color
+              template_match_modes:
+                claim_button: gray
+                map_marker: edge
+
+        Args:
+            detector_config: game_detector配置节
+        """
+        if not isinstance(detector_config, dict):
+            return
+        matcher = self.template_matcher
+        default_mode = detector_config.get('default_match_mode')
+        if default_mode is not None:
+            if default_mode in MATCH_MODES:
+                matcher.default_match_mode = default_mode
+                for template_info in matcher.template_info_cache.values():
+                    template_info.match_mode = default_mode
+            else:
+                self.logger.warning(f"无效的默认匹配模式: {default_mode}")
+        for template_name, match_mode in (detector_config.get('template_match_modes') or {}).items():
+            if template_name not in matcher.template_info_cache:
+                self.logger.warning(f"匹配模式配置的模板不存在: {template_name}")
+            else:
+                matcher.set_template_match_mode(template_name, match_mode)
+
+    def _apply_scale_calibration(self, detector_config: Dict[str, Any]) -> None:
+        """应用缩放校准配置.
+
+        配置示例::
+
+            game_detector:
+              scale_calibration:
+                reference_template: main_menu_start_button
+                band: 0.05
+
+        Args:
+            detector_config: game_detector配置节
+        """
+        if not isinstance(detector_config, dict):
+            return
+        calibration_config = detector_config.get('scale_calibration') or {}
+        if not isinstance(calibration_config, dict):
+            return
+        calibrator = self.template_matcher.scale_calibrator
+        calibrator.band = calibration_config.get('band', calibrator.band)
+        calibrator.band_steps = calibration_config.get('band_steps', calibrator.band_steps)
+        calibrator.min_confidence = calibration_config.get(
+            'min_confidence', calibrator.min_confidence
+        )
+        reference = calibration_config.get('reference_template')
+        if reference is not None:
+            if reference not in self.template_matcher.template_info_cache:
+                self.logger.warning(f"缩放校准的参考模板不存在: {reference}")
+            calibrator.reference_template = reference
+
+    def _on_window_change(self, old_window: GameWindow, new_window: GameWindow) -> None:
+        """窗口变化回调：客户区尺寸改变时重新校准渲染缩放比例.
+
+        校准结果按截图尺寸记录（截图可能因DPI缩放与客户区尺寸不同），
+        因此先截图再用截图尺寸判断是否需要校准。
+
+        Args:
+            old_window: 变化前的窗口信息
+            new_window: 变化后的窗口信息
+        """
+        old_rect, new_rect = old_window.client_rect, new_window.client_rect
+        old_size = (old_rect[2] - old_rect[0], old_rect[3] - old_rect[1])
+        new_size = (new_rect[2] - new_rect[0], new_rect[3] - new_rect[1])
+        if old_size == new_size:
+            return
+
+        self.frame_cache.invalidate(new_window.hwnd)
+        calibrator = self.template_matcher.scale_calibrator
+        if calibrator.reference_template is None:
+            return
+        screenshot = self.capture_screenshot(max_age=0)
+        size = _image_size(screenshot)
+        if size is not None and calibrator.needs_calibration(size):
+            self.template_matcher.calibrate_scale(screenshot)
 
     def _load_game_config(self) -> None:
         """加载游戏配置."""
@@ -1247,38 +3216,24 @@ class GameDetector(IGameDetector):
     def _load_templates_recursive(self, templates_dir: str) -> None:
         """递归加载模板目录中的所有模板.
         
+        模板在启动时一次性读入模板库并完成预处理，子目录中的模板
+        以"目录名_文件名"命名以避免重名。
+        
         Args:
             templates_dir: 模板目录路径
         """
-        for root, dirs, files in os.walk(templates_dir):
-            for file in files:
-                if file.lower().endswith(('.png', '.jpg', '.jpeg')):
-                    template_path = os.path.join(root, file)
-                    template_name = Path(file).stem
-                    # 添加目录前缀以避免重名
-                    category = Path(root).name
-                    if category != "templates":
-                        template_name = f"{category}_{template_name}"
-                    
-                    # 直接加载模板到缓存
-                    try:
-                        if cv2 is not None:
-                            template_image = cv2.imread(template_path)
-                            if template_image is not None:
-                                template_info = TemplateInfo(
-                                    name=template_name,
-                                    path=template_path,
-                                    image=template_image,
-                                    threshold=0.8
-                                )
-                                self.template_matcher.template_info_cache[template_name] = template_info
-                                print(f"已加载模板: {template_name} from {template_path}")
-                            else:
-                                print(f"无法加载模板图像: {template_path}")
-                        else:
-                            print(f"OpenCV不可用，跳过模板: {template_path}")
-                    except Exception as e:
-                        print(f"加载模板失败 {template_path}: {e}")
+        if cv2 is None:
+            print(f"OpenCV不可用，跳过模板目录: {templates_dir}")
+            return
+
+        entries = self.template_matcher.template_bank.load_directory(templates_dir)
+        for entry in entries:
+            self.template_matcher.template_info_cache[entry.name] = TemplateInfo(
+                name=entry.name,
+                path=entry.path,
+                image=entry.color,
+                threshold=entry.threshold
+            )
 
     def is_game_running(self) -> bool:
         """检查游戏是否正在运行.
@@ -1286,6 +3241,9 @@ class GameDetector(IGameDetector):
         Returns:
             bool: 游戏是否正在运行
         """
+        if not self.frame_source.live:
+            return self.frame_source.is_available()
+
         try:
             # 查找游戏窗口
             windows = self.window_manager.find_game_windows(self.game_titles)
@@ -1300,11 +3258,16 @@ class GameDetector(IGameDetector):
             self.logger.error(f"检查游戏运行状态时发生错误: {e}")
             return False
 
-    def detect_ui_elements(self, element_names: List[str]) -> List[UIElement]:
+    def detect_ui_elements(
+        self,
+        element_names: List[str],
+        stop_when: Optional[Callable[[UIElement], bool]] = None,
+    ) -> List[UIElement]:
         """检测UI元素.
 
         Args:
             element_names: 要检测的元素名称列表
+            stop_when: 判定函数，对某个检测结果返回True时停止检测剩余元素
 
         Returns:
             List[UIElement]: 检测到的UI元素列表
@@ -1312,25 +3275,149 @@ class GameDetector(IGameDetector):
         if not self.game_window:
             return []
 
-        # 截取游戏窗口
-        screenshot = self.window_manager.capture_window(self.game_window)
+        # 截取游戏窗口（优先使用帧缓存）
+        screenshot = self._capture_window_cached(self.game_window)
         if screenshot is None:
             return []
 
-        # 匹配UI元素
-        elements: List[UIElement] = []
-        for element_name in element_names:
-            matched_element = self.template_matcher.match_template(
-                screenshot, element_name
+        # 批量匹配UI元素，截图只预处理一次
+        return self.template_matcher.match_multiple_templates(
+            screenshot, element_names, stop_when=stop_when
+        )
+
+    def detect_ui_elements_incremental(
+        self,
+        element_names: List[str],
+        stop_when: Optional[Callable[[UIElement], bool]] = None,
+    ) -> List[UIElement]:
+        """基于帧差分增量检测UI元素.
+
+        画面未变化时直接复用上一帧的结果；局部变化时，与变化分块不相交的
+        已找到元素保持不变，其余元素只在变化区域附近重新匹配（未变化的像素
+        上一帧没有匹配，新出现的元素必然与变化分块相交）。
+
+        Args:
+            element_names: 要检测的元素名称列表
+            stop_when: 判定函数，对某个检测结果返回True时停止返回剩余元素
+
+        Returns:
+            List[UIElement]: 检测到的UI元素列表
+        """
+        if not self.game_window:
+            return []
+
+        screenshot = self._capture_window_cached(self.game_window)
+        if screenshot is None:
+            return []
+
+        try:
+            change = self.change_detector.update(screenshot)
+        except Exception as e:
+            self.logger.debug(f"帧差分失败，改为全帧检测: {e}")
+            self.change_detector.reset()
+            change = None
+
+        with self._element_cache_lock:
+            if change is None or change.full_frame:
+                self._element_cache.clear()
+            if change is None or change.changed:
+                self._element_generation += 1
+                self._generation_change = change
+            generation = self._element_generation
+            # 上一代画面到本代画面的差异（本帧未变化时是之前某帧的差异）
+            change = self._generation_change
+            prepared: List[PreparedFrame] = []
+
+            def prepare() -> Any:
+                # 批量匹配的各模板共享同一个预处理帧，关闭批量匹配时直接使用截图
+                if not self.template_matcher.enable_batch_matching:
+                    return screenshot
+                if not prepared:
+                    prepared.append(PreparedFrame(screenshot, self.template_matcher.pyramid_levels))
+                return prepared[0]
+
+            # 只有上一代画面评估过的结果能按change增量更新；更早评估的结果（如上次
+            # 在stop_when之后未评估的元素）与首次检测的元素一起批量全帧匹配
+            missing = [
+                name for name in element_names
+                if self._element_cache.get(name, (None, None))[0] not in (generation, generation - 1)
+            ]
+            if missing:
+                found = {
+                    element.name: element
+                    for element in self.template_matcher.match_multiple_templates(prepare(), missing)
+                }
+                for name in missing:
+                    self._element_cache[name] = (generation, found.get(name))
+
+            elements = []
+            for name in element_names:
+                evaluated, element = self._element_cache[name]
+                if evaluated != generation:
+                    element = self._rematch_changed(screenshot, name, element, change, prepare)
+                    self._element_cache[name] = (generation, element)
+                if element is not None:
+                    elements.append(element)
+                    if stop_when is not None and stop_when(element):
+                        break
+            return elements
+
+    def _rematch_changed(
+        self,
+        screenshot: Any,
+        name: str,
+        previous: Optional[UIElement],
+        change: FrameChange,
+        prepare: Callable[[], Any],
+    ) -> Optional[UIElement]:
+        """画面局部变化后更新单个元素的检测结果.
+
+        Args:
+            screenshot: 当前截图
+            name: 元素名称
+            previous: 上一代画面的检测结果
+            change: 上一代画面到当前截图的差异
+            prepare: 返回当前截图（预处理帧）的函数，变化范围过大时用于全帧匹配
+
+        Returns:
+            Optional[UIElement]: 当前帧的检测结果
+        """
+        if previous is not None and not change.intersects(
+            (*previous.position, *previous.size)
+        ):
+            return previous
+
+        template_info = self.template_matcher.template_info_cache.get(name)
+        template_shape = getattr(getattr(template_info, 'image', None), 'shape', None)
+        region = None
+        if isinstance(template_shape, tuple):
+            max_scale = max(DEFAULT_SCALE_SWEEP) if self.template_matcher.enable_multi_scale else 1.0
+            padding = (
+                int(template_shape[1] * max_scale) + 1,
+                int(template_shape[0] * max_scale) + 1,
             )
-            if matched_element is not None:
-                elements.append(matched_element)
+            region = change.search_region(padding)
+            width, height = change.frame_size
+            if region is not None and region[2] * region[3] > 0.6 * width * height:
+                region = None
+        if region is None:
+            elements = self.template_matcher.match_multiple_templates(prepare(), [name])
+            return elements[0] if elements else None
+        return self.template_matcher.match_template_in_region(prepare(), name, region)
 
-        return elements
+    def reset_change_detection(self) -> None:
+        """丢弃帧差分基准和缓存的检测结果，下一次增量检测将全帧匹配."""
+        self.change_detector.reset()
+        with self._element_cache_lock:
+            self._element_cache.clear()
+            self._generation_change = None
 
-    def detect_scene(self) -> SceneType:
+    def detect_scene(self, incremental: bool = False) -> SceneType:
         """检测当前场景.
 
+        Args:
+            incremental: 是否基于帧差分增量检测（画面未变化时复用上次结果）
+
         Returns:
             SceneType: 当前场景类型
         """
@@ -1338,17 +3425,20 @@ class GameDetector(IGameDetector):
             self.current_scene = SceneType.UNKNOWN
             return self.current_scene
 
-        # 根据UI元素判断场景
-        ui_elements = self.detect_ui_elements([
-            "main_menu_start_button", "main_menu_start_game", 
-            "main_menu_settings_button", "main_menu_exit_button",
-            "combat_attack_button", "combat_skill_button",
-            "inventory_bag_icon", "shop_shop_icon"
-        ])
-
-        # 判断主菜单场景
         main_menu_elements = ["main_menu_start_button", "main_menu_start_game", 
                              "main_menu_settings_button", "main_menu_exit_button"]
+
+        # 根据UI元素判断场景，主菜单元素优先级最高，匹配到即可确定场景
+        detect = self.detect_ui_elements_incremental if incremental else self.detect_ui_elements
+        ui_elements = detect(
+            main_menu_elements + [
+                "combat_attack_button", "combat_skill_button",
+                "inventory_bag_icon", "shop_shop_icon"
+            ],
+            stop_when=lambda element: element.name in main_menu_elements,
+        )
+
+        # 判断主菜单场景
         if any(elem.name in main_menu_elements for elem in ui_elements):
             self.current_scene = SceneType.MAIN_MENU
         # 判断战斗场景
@@ -1387,10 +3477,16 @@ class GameDetector(IGameDetector):
             print(f"刷新游戏窗口失败: {e}")
             return False
 
-    def capture_screenshot(self) -> Optional[Any]:
+    def capture_screenshot(self, max_age: Optional[float] = None) -> Optional[Any]:
         """
         截取游戏窗口截图.
 
+        在帧缓存有效期内的重复调用直接返回缓存帧，不会重复截图。
+
+        Args:
+            max_age: 允许使用的缓存帧最大帧龄（秒），None表示使用缓存默认值，
+                0表示强制重新截图
+
         Returns:
             Optional[np.ndarray]: 截图数组，失败时返回None
         """
@@ -1400,13 +3496,134 @@ class GameDetector(IGameDetector):
             if not window:
                 return None
 
-            screenshot = self.window_manager.capture_window(window)
-
-            return screenshot
+            return self._capture_window_cached(window, max_age)
         except Exception as e:
             print(f"截取游戏截图失败: {e}")
             return None
 
+    def _capture_window_cached(
+        self, window: GameWindow, max_age: Optional[float] = None
+    ) -> Optional[Any]:
+        """通过帧缓存截取窗口图像.
+
+        Args:
+            window: 游戏窗口
+            max_age: 允许使用的缓存帧最大帧龄（秒）
+
+        Returns:
+            Optional[np.ndarray]: 截图数组，失败时返回None
+        """
+        frame = self.frame_cache.get_or_capture(
+            window.hwnd,
+            lambda: self._grab_frame(window, max_age),
+            max_age,
+        )
+        return frame.image if frame is not None else None
+
+    def _grab_frame(self, window: GameWindow, max_age: Optional[float] = None) -> Optional[Any]:
+        """获取一帧新图像.
+
+        截图流水线运行时直接读取其最新帧，不在调用线程中截图；
+        max_age为0时等待流水线产出下一帧。
+
+        Args:
+            window: 游戏窗口
+            max_age: 允许使用的帧最大帧龄（秒）
+
+        Returns:
+            Optional[np.ndarray]: 截图数组，失败时返回None
+        """
+        pipeline = self.capture_pipeline
+        if pipeline is not None and pipeline.running:
+            frame = pipeline.latest()
+            if frame is None or (max_age is not None and frame.age > max_age):
+                frame = pipeline.wait_for_frame(
+                    timeout=max(0.5, 3.0 / pipeline.target_fps)
+                ) or frame
+            if frame is not None:
+                return frame.data
+        return self.frame_source.capture(window)
+
+    def start_capture_pipeline(self, target_fps: float = 30.0) -> Optional[CapturePipeline]:
+        """启动后台截图流水线.
+
+        启动后截图由独立线程按目标帧率完成，capture_screenshot/capture_frame
+        直接返回最新帧而不阻塞调用方。
+
+        Args:
+            target_fps: 目标帧率
+
+        Returns:
+            Optional[CapturePipeline]: 截图流水线，启动失败返回None
+        """
+        if self.capture_pipeline is not None and self.capture_pipeline.running:
+            return self.capture_pipeline
+        try:
+            pipeline = CapturePipeline(
+                self.frame_source,
+                window_provider=lambda: self.window_manager.current_window or self.game_window,
+                target_fps=target_fps,
+            )
+        except ValueError as e:
+            self.logger.error(f"截图流水线参数无效: {e}")
+            return None
+        if not pipeline.start():
+            return None
+        self.capture_pipeline = pipeline
+        return pipeline
+
+    def stop_capture_pipeline(self) -> None:
+        """停止后台截图流水线，之后恢复同步截图."""
+        if self.capture_pipeline is not None:
+            self.capture_pipeline.stop()
+            self.capture_pipeline = None
+        self.frame_cache.invalidate()
+
+    def capture_frame(self, max_age: Optional[float] = None) -> Optional[RawFrame]:
+        """截取游戏窗口的原始帧.
+
+        返回截图缓冲区上的零拷贝视图，可直接传给检测、OCR和操作接口，
+        只有在需要持久化时才调用RawFrame.to_png_bytes()进行编码。
+
+        Args:
+            max_age: 允许使用的缓存帧最大帧龄（秒），None表示使用缓存默认值
+
+        Returns:
+            Optional[RawFrame]: 原始帧，失败时返回None
+        """
+        screenshot = self.capture_screenshot(max_age)
+        if screenshot is None:
+            return None
+
+        window = self.window_manager.current_window or self.game_window
+        cached = self.frame_cache.latest(window.hwnd) if window else None
+        if cached is not None and cached.image is screenshot:
+            return RawFrame.from_array(
+                screenshot, timestamp=cached.timestamp, frame_id=cached.frame_id
+            )
+        return RawFrame.from_array(screenshot)
+
+    def detection_tick(self) -> ContextManager[None]:
+        """创建一个检测周期.
+
+        周期内的所有检测调用共享同一帧截图，保证检测结果相互一致::
+
+            with detector.detection_tick():
+                scene = detector.detect_current_scene()
+                elements = detector.detect_ui_elements(names)
+
+        Returns:
+            ContextManager[None]: 检测周期上下文
+        """
+        return self.frame_cache.hold()
+
+    def invalidate_frame_cache(self) -> None:
+        """使帧缓存失效，下一次检测将重新截图.
+
+        在执行点击、滑动等会改变画面的操作后调用。
+        """
+        self.frame_cache.invalidate()
+
     def visualize_detection_results(
         self,
         screenshot: Any,
@@ -1571,8 +3788,11 @@ class GameDetector(IGameDetector):
 
             # 使用模板匹配检测场景
             scene_templates = ["main_menu", "battle_ui", "loading_screen"]
+            decisive_confidence = self.template_matcher.early_exit_threshold
             elements = self.template_matcher.match_multiple_templates(
-                screenshot, scene_templates
+                screenshot,
+                scene_templates,
+                stop_when=lambda element: element.confidence >= decisive_confidence,
             )
 
             if not elements:
@@ -1665,6 +3885,9 @@ class GameDetector(IGameDetector):
     ) -> Optional[UIElement]:
         """等待UI元素出现.
 
+        在截图流水线的每一帧上检测一次（流水线未运行时按固定间隔截图），
+        多个并发等待共享同一次检测。
+
         Args:
             element_name: 元素名称
             timeout: 超时时间（秒）
@@ -1672,16 +3895,7 @@ class GameDetector(IGameDetector):
         Returns:
             Optional[UIElement]: 找到的UI元素，超时返回None
         """
-        import time
-
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            element = self.find_ui_element(element_name)
-            if element:
-                return element
-            time.sleep(0.1)
-
-        return None
+        return self.frame_waiter.wait_for_element(element_name, timeout)
 
     def wait_for_template(
         self, template_name: str, timeout: float = 10.0
@@ -1698,7 +3912,9 @@ class GameDetector(IGameDetector):
         return self.wait_for_ui_element(template_name, timeout)
 
     def capture_screen(self) -> Optional[bytes]:
-        """捕获游戏屏幕截图.
+        """捕获游戏屏幕截图并编码为PNG.
+
+        仅用于需要持久化或跨进程传输截图的场景，检测和OCR应使用capture_frame()。
         
         Returns:
             Optional[bytes]: 截图数据，失败时返回None
@@ -1730,15 +3946,76 @@ class GameDetector(IGameDetector):
             Optional[str]: 识别到的文本，失败时返回None
         """
         try:
-            screenshot_data = self.capture_screen()
-            if not screenshot_data:
+            frame = self.capture_frame()
+            if frame is None:
                 return None
                 
-            return self.template_matcher.recognize_text(screenshot_data, region)
+            return self.template_matcher.recognize_text(frame, region)
         except Exception as e:
             self.logger.error(f"识别区域文本失败: {e}")
             return None
     
+    def register_ocr_metrics(self, metrics_collector: Any) -> bool:
+        """将OCR结果缓存的命中率等统计注册到MetricsCollector.
+        
+        Args:
+            metrics_collector: 指标收集器
+            
+        Returns:
+            bool: OCR可用并注册成功返回True
+        """
+        ocr_detector = self.template_matcher.ocr_detector
+        if not ocr_detector:
+            return False
+        try:
+            ocr_detector.register_metrics(metrics_collector)
+            return True
+        except Exception as e:
+            self.logger.error(f"注册OCR缓存指标失败: {e}")
+            return False
+    
+    def recognize_text_in_regions(self, regions: List[Tuple[int, int, int, int]]) -> List[Optional[str]]:
+        """并行识别同一帧中的多个区域（如多行任务描述、奖励数量）.
+        
+        Args:
+            regions: 区域列表 (x, y, width, height)
+            
+        Returns:
+            List[Optional[str]]: 与regions一一对应的文本，失败的区域为None
+        """
+        try:
+            frame = self.capture_frame()
+            if frame is None:
+                return [None] * len(regions)
+                
+            return self.template_matcher.recognize_text_regions(frame, regions)
+        except Exception as e:
+            self.logger.error(f"批量识别区域文本失败: {e}")
+            return [None] * len(regions)
+    
+    async def recognize_text_in_regions_async(self, regions: List[Tuple[int, int, int, int]]) -> List[Optional[str]]:
+        """在事件循环中并行识别多个区域，截图和识别都不阻塞事件循环.
+        
+        Args:
+            regions: 区域列表 (x, y, width, height)
+            
+        Returns:
+            List[Optional[str]]: 与regions一一对应的文本，失败的区域为None
+        """
+        try:
+            ocr_detector = self.template_matcher.ocr_detector
+            if not self.template_matcher.enable_ocr or not ocr_detector:
+                self.logger.warning("OCR功能未启用")
+                return [None] * len(regions)
+            
+            frame = await asyncio.to_thread(self.capture_frame)
+            if frame is None:
+                return [None] * len(regions)
+            return await ocr_detector.recognize_regions_async(frame, regions)
+        except Exception as e:
+            self.logger.error(f"批量识别区域文本失败: {e}")
+            return [None] * len(regions)
+    
     def find_text_in_screen(self, target_text: str, region: Optional[Tuple[int, int, int, int]] = None) -> Optional[Dict[str, Any]]:
         """在屏幕中查找指定文本.
         
@@ -1750,11 +4027,11 @@ class GameDetector(IGameDetector):
             Optional[Dict[str, Any]]: 找到的文本位置信息
         """
         try:
-            screenshot_data = self.capture_screen()
-            if not screenshot_data:
+            frame = self.capture_frame()
+            if frame is None:
                 return None
                 
-            return self.template_matcher.find_text(target_text, screenshot_data, region)
+            return self.template_matcher.find_text(target_text, frame, region)
         except Exception as e:
             self.logger.error(f"查找文本失败: {e}")
             return None
@@ -1769,11 +4046,11 @@ class GameDetector(IGameDetector):
             List[Dict[str, Any]]: 所有文本信息列表
         """
         try:
-            screenshot_data = self.capture_screen()
-            if not screenshot_data:
+            frame = self.capture_frame()
+            if frame is None:
                 return []
                 
-            return self.template_matcher.extract_all_text(screenshot_data, region)
+            return self.template_matcher.extract_all_text(frame, region)
         except Exception as e:
             self.logger.error(f"提取所有文本失败: {e}")
             return []
@@ -1818,12 +4095,19 @@ class GameDetector(IGameDetector):
             self.logger.error(f"检查文本存在性失败: {e}")
             return False
     
-    def find_template(self, template_name: str, threshold: float = 0.8) -> Optional[Dict[str, Any]]:
+    def find_template(
+        self,
+        template_name: str,
+        threshold: float = 0.8,
+        region: Optional[Tuple[int, int, int, int]] = None,
+    ) -> Optional[Dict[str, Any]]:
         """查找模板匹配.
         
         Args:
             template_name: 模板名称
             threshold: 匹配阈值
+            region: 只查找与该区域 (x, y, width, height) 相交的匹配，
+                None表示全帧查找
             
         Returns:
             Optional[Dict[str, Any]]: 匹配结果字典，包含found、confidence、center等字段
@@ -1836,22 +4120,20 @@ class GameDetector(IGameDetector):
             if screenshot is None:
                 return None
                 
-            # 构建模板文件路径
-            import os
-            templates_dir = self.config_manager.get('game_detector', {}).get('templates_dir', 'templates')
-            template_path = os.path.join(templates_dir, template_name)
-            
-            if not os.path.exists(template_path):
-                return None
-                
-            # 加载模板图像
-            template = cv2.imread(template_path, cv2.IMREAD_COLOR)
-            if template is None:
+            entry = self._resolve_template_entry(template_name)
+            if entry is None:
                 return None
+            template = entry.color
+
+            screenshot, offset_x, offset_y = self._crop_search_region(screenshot, template, region)
+            if screenshot is None:
+                return {'found': False, 'confidence': 0.0, 'center': None}
                 
             # 执行模板匹配
             result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
             min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            if region is not None:
+                max_loc = (max_loc[0] + offset_x, max_loc[1] + offset_y)
             
             # 检查匹配度是否满足阈值
             if max_val >= threshold:
@@ -1878,6 +4160,121 @@ class GameDetector(IGameDetector):
             self.logger.error(f"模板匹配失败: {e}")
             return None
 
+    def find_all_templates(
+        self,
+        template_name: str,
+        threshold: float = 0.8,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        iou_threshold: float = 0.3,
+        max_results: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """一次扫描查找模板在画面中的所有实例.
+        
+        对匹配结果图做向量化的峰值提取和非极大值抑制，画面上有多个相同按钮时
+        不需要逐个点击后重新扫描。
+        
+        Args:
+            template_name: 模板名称
+            threshold: 匹配阈值
+            region: 只查找与该区域 (x, y, width, height) 相交的匹配，
+                None表示全帧查找
+            iou_threshold: 交并比超过该值的重叠匹配只保留置信度最高者
+            max_results: 最多返回的实例数，None表示不限制
+            
+        Returns:
+            List[Dict[str, Any]]: 匹配结果字典列表（字段与find_template相同），
+                按从上到下、从左到右排序；未找到或出错时返回空列表
+        """
+        try:
+            if cv2 is None:
+                return []
+            
+            screenshot = self.capture_screenshot()
+            if screenshot is None:
+                return []
+            
+            entry = self._resolve_template_entry(template_name)
+            if entry is None:
+                return []
+            template = entry.color
+            
+            screenshot, offset_x, offset_y = self._crop_search_region(screenshot, template, region)
+            if screenshot is None:
+                return []
+            
+            result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+            instances = find_instances(
+                result, template.shape[:2], threshold,
+                iou_threshold=iou_threshold, max_results=max_results
+            )
+            
+            matches = []
+            for instance in sort_by_position(instances):
+                x, y = instance.x + offset_x, instance.y + offset_y
+                matches.append({
+                    'found': True,
+                    'confidence': instance.confidence,
+                    'center': (x + instance.width // 2, y + instance.height // 2),
+                    'top_left': (x, y),
+                    'bottom_right': (x + instance.width, y + instance.height)
+                })
+            return matches
+            
+        except Exception as e:
+            self.logger.error(f"多实例模板匹配失败: {e}")
+            return []
+
+    def _resolve_template_entry(self, template_name: str) -> Optional[TemplateEntry]:
+        """从模板库解析模板（名称和路径解析到同一条目，不读取磁盘）.
+        
+        模板库中不存在时，按配置的模板目录加载一次并缓存。
+        
+        Args:
+            template_name: 模板名称或路径
+            
+        Returns:
+            Optional[TemplateEntry]: 模板条目，找不到时返回None
+        """
+        template_bank = self.template_matcher.template_bank
+        entry = template_bank.resolve(template_name)
+        if entry is not None:
+            return entry
+        
+        templates_dir = self.config_manager.get('game_detector', {}).get('templates_dir', 'templates')
+        template_path = os.path.join(templates_dir, template_name)
+        if not os.path.exists(template_path):
+            return None
+        return template_bank.load_file(template_path)
+
+    @staticmethod
+    def _crop_search_region(
+        screenshot: Any,
+        template: Any,
+        region: Optional[Tuple[int, int, int, int]],
+    ) -> Tuple[Optional[Any], int, int]:
+        """按搜索区域裁剪截图.
+        
+        搜索范围按模板尺寸向四周扩展，使与区域相交的匹配框完整落在其中。
+        
+        Args:
+            screenshot: 截图
+            template: 模板图像
+            region: 搜索区域 (x, y, width, height)，None表示全帧
+            
+        Returns:
+            Tuple[Optional[Any], int, int]: (裁剪后的截图, X偏移, Y偏移)，
+                裁剪结果放不下模板时截图为None
+        """
+        if region is None:
+            return screenshot, 0, 0
+        h, w = template.shape[:2]
+        x, y, region_w, region_h = region
+        offset_x, offset_y = max(0, x - w), max(0, y - h)
+        screenshot = screenshot[offset_y:y + region_h + h, offset_x:x + region_w + w]
+        if screenshot.shape[0] < h or screenshot.shape[1] < w:
+            return None, offset_x, offset_y
+        return screenshot, offset_x, offset_y
+
     def _find_window_by_process(self, process_name: str) -> Optional[GameWindow]:
         """通过进程名查找窗口.
 
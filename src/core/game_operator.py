@@ -4,8 +4,10 @@
 """
 
 import asyncio
+import functools
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple, Union
@@ -26,7 +28,12 @@ except ImportError:
     cv2 = None
     np = None
 
+from .frame_diff import FrameChangeDetector
+from .frame_waiter import FrameWaiter
 from .game_detector import GameDetector, UIElement, TemplateInfo
+from .input_dispatcher import InputDispatcher, PyAutoGUIInputBackend, click_events
+from .latency_model import DEFAULT_LATENCY_TABLE, UILatencyModel
+from .raw_frame import RawFrame
 from .sync_adapter import SyncAdapter
 from .logger import setup_logger
 from .error_handler import ErrorHandler
@@ -74,8 +81,8 @@ class OperationResult:
     success: bool
     execution_time: float
     error_message: str = ""
-    screenshot_before: Optional[bytes] = None
-    screenshot_after: Optional[bytes] = None
+    screenshot_before: Optional[RawFrame] = None
+    screenshot_after: Optional[RawFrame] = None
     metadata: Dict[str, Any] = None
 
     def __post_init__(self):
@@ -162,12 +169,16 @@ class GameOperator(IGameOperator):
 
     def __init__(self, 
                  game_detector: Optional[GameDetector] = None,
-                 sync_adapter: Optional[SyncAdapter] = None):
+                 sync_adapter: Optional[SyncAdapter] = None,
+                 latency_model: Optional[UILatencyModel] = None,
+                 input_dispatcher: Optional[InputDispatcher] = None):
         """初始化游戏操作器.
         
         Args:
             game_detector: 游戏检测器实例
             sync_adapter: 同步适配器实例
+            latency_model: 界面响应延迟模型，None时使用默认延迟表
+            input_dispatcher: 输入派发器，None时创建基于pyautogui的派发器
         """
         self.logger = setup_logger()
         self.game_detector = game_detector or GameDetector()
@@ -180,6 +191,25 @@ class GameOperator(IGameOperator):
         self.default_config = OperationConfig()
         self._operation_history: List[OperationResult] = []
         
+        # 操作结果验证：比较操作前后的缩略图签名，画面一变化即确认
+        self._change_detector = FrameChangeDetector()
+        self.screen_change_timeout = 0.5
+        self.screen_change_poll_interval = 0.02
+        # 按钮点击在等待时间内没有响应时，重试前再宽限的时间（秒）
+        self.screen_change_grace = 1.0
+        
+        # 按目标学习界面响应延迟，决定验证时最多等待多久
+        self.latency_model = latency_model or UILatencyModel(DEFAULT_LATENCY_TABLE)
+        self._last_input_time: Optional[float] = None
+        
+        # 鼠标移动和点击交给专用派发线程按精确定时注入，不再在事件循环里逐个sleep
+        self.input_dispatcher = input_dispatcher or InputDispatcher(
+            PyAutoGUIInputBackend(lambda: pyautogui), name="GameOperatorInput"
+        )
+        
+        # 截图和模板匹配是阻塞调用，设置后交给该线程池执行，不阻塞共享的事件循环
+        self.vision_executor: Optional[Executor] = None
+        
         # 检查依赖
         self._check_dependencies()
         
@@ -554,15 +584,20 @@ class GameOperator(IGameOperator):
             return target.center
         elif isinstance(target, str):
             # 通过模板名称查找UI元素
-            elements = self.game_detector.detect_ui_elements([target])
+            elements = await self._run_vision(self.game_detector.detect_ui_elements, [target])
             if elements:
                 return elements[0].center
             return None
         else:
             return None
 
-    async def _perform_click(self, position: Tuple[int, int], click_type: ClickType, config: OperationConfig) -> bool:
-        """执行点击操作."""
+    async def _perform_click(self, position: Tuple[int, int], click_type: ClickType, config: OperationConfig,
+                             latency_key: Optional[str] = None) -> bool:
+        """执行点击操作.
+        
+        Args:
+            latency_key: 点击目标在延迟模型中的名称，决定不验证结果时的操作后延迟
+        """
         try:
             x, y = position
             
@@ -579,21 +614,22 @@ class GameOperator(IGameOperator):
                 self.logger.warning(f"操作前验证失败: ({x}, {y})")
                 return False
             
-            # 移动鼠标到目标位置（平滑移动）
-            await self._smooth_move_to_position(x, y)
-            
             # 执行点击操作
             success = False
             if config.method == OperationMethod.WIN32_API and win32api:
+                # 移动鼠标到目标位置（平滑移动）
+                await self._smooth_move_to_position(x, y)
                 success = await self._perform_win32_click(x, y, click_type)
-            elif pyautogui:
-                success = await self._perform_pyautogui_click(x, y, click_type)
+            elif self.input_dispatcher.backend.is_available():
+                success = await self._perform_dispatched_click(x, y, click_type)
             else:
                 self.logger.error("没有可用的点击方法")
                 return False
             
+            self._last_input_time = time.monotonic()
+            
             # 操作后延迟
-            await self._post_operation_delay(click_type)
+            await self._post_operation_delay(click_type, config, latency_key)
             
             return success
             
@@ -709,31 +745,35 @@ class GameOperator(IGameOperator):
             self.logger.error(f"Win32点击失败: {e}")
             return False
     
-    async def _perform_pyautogui_click(self, x: int, y: int, click_type: ClickType) -> bool:
-        """使用PyAutoGUI执行点击."""
-        try:
-            if click_type == ClickType.LEFT:
-                pyautogui.click(x, y, button='left')
-            elif click_type == ClickType.RIGHT:
-                pyautogui.click(x, y, button='right')
-            elif click_type == ClickType.MIDDLE:
-                pyautogui.click(x, y, button='middle')
-            elif click_type == ClickType.DOUBLE:
-                pyautogui.doubleClick(x, y)
-            
-            return True
-        except Exception as e:
-            self.logger.error(f"PyAutoGUI点击失败: {e}")
+    async def _perform_dispatched_click(self, x: int, y: int, click_type: ClickType) -> bool:
+        """通过输入派发器执行移动和点击."""
+        if click_type == ClickType.DOUBLE:
+            events = click_events(x, y, clicks=2)
+        else:
+            events = click_events(x, y, button=click_type.value)
+        result = await self.input_dispatcher.run_async(events)
+        if not result.success:
+            self.logger.error(f"派发点击失败: {result.error_message}")
             return False
-    
-    async def _post_operation_delay(self, click_type: ClickType) -> None:
-        """操作后延迟."""
+        self.logger.debug(
+            f"派发点击完成: ({x}, {y}), 排队 {result.queue_delay * 1000:.1f}ms, "
+            f"最大调度延迟 {result.max_latency * 1000:.1f}ms"
+        )
+        return True
+
+    async def _post_operation_delay(self, click_type: ClickType, config: Optional[OperationConfig] = None,
+                                    latency_key: Optional[str] = None) -> None:
+        """操作后延迟.
+        
+        需要验证结果时不再固定等待，由验证阶段轮询画面变化；
+        否则按该目标学到的响应延迟等待，没有学习数据时使用默认延迟。
+        """
         try:
-            # 根据操作类型设置不同的延迟
-            if click_type == ClickType.DOUBLE:
-                await asyncio.sleep(0.2)  # 双击后稍长延迟
-            else:
-                await asyncio.sleep(0.1)  # 普通点击延迟
+            if config is not None and config.verify_result:
+                return
+            # 根据操作类型设置不同的默认延迟
+            default = 0.2 if click_type == ClickType.DOUBLE else 0.1
+            await asyncio.sleep(self.latency_model.get_delay(latency_key, default))
         except Exception:
             pass
 
@@ -790,58 +830,69 @@ class GameOperator(IGameOperator):
             self.logger.error(f"执行文本输入失败: {e}")
             return False
 
-    async def _take_screenshot(self) -> Optional[bytes]:
-        """截取屏幕截图."""
+    async def _take_screenshot(self) -> Optional[RawFrame]:
+        """截取屏幕截图.
+
+        返回原始帧而非PNG数据，需要保存时再调用RawFrame.save()或to_png_bytes()。
+        """
         try:
-            return self.game_detector.capture_screen()
+            return await self._run_vision(self.game_detector.capture_frame, max_age=0)
         except Exception as e:
             self.logger.error(f"截图失败: {e}")
             return None
 
-    async def _verify_click_result(self, target: Union[Tuple[int, int], str, UIElement], position: Tuple[int, int]) -> bool:
-        """验证点击结果."""
-        try:
-            # 等待UI响应
-            await asyncio.sleep(0.3)
+    async def _verify_click_result(self, target: Union[Tuple[int, int], str, UIElement], position: Tuple[int, int],
+                                   before_state: Optional[dict] = None) -> bool:
+        """验证点击结果.
+        
+        Args:
+            target: 点击目标
+            position: 点击坐标
+            before_state: 点击前由_capture_operation_state捕获的状态
             
+        Returns:
+            bool: 点击生效返回True
+        """
+        try:
             # 如果目标是字符串（UI元素名称），检查元素状态变化
             if isinstance(target, str):
-                return await self._verify_ui_element_click(target)
+                return await self._verify_ui_element_click(target, before_state)
             
             # 如果目标是UIElement对象，检查元素状态
             elif hasattr(target, '__class__') and hasattr(target, 'name'):
-                return await self._verify_ui_element_click(target.name)
+                return await self._verify_ui_element_click(target.name, before_state)
             
             # 如果是坐标点击，进行通用验证
             else:
-                return await self._verify_coordinate_click(position)
+                return await self._verify_coordinate_click(position, before_state)
                 
         except Exception as e:
             self.logger.error(f"点击结果验证失败: {e}")
             return False
     
-    async def _verify_ui_element_click(self, element_name: str) -> bool:
+    async def _verify_ui_element_click(self, element_name: str, before_state: Optional[dict] = None) -> bool:
         """验证UI元素点击结果."""
         try:
-            # 检查元素是否仍然存在（某些按钮点击后会消失）
-            elements_after = self.game_detector.detect_ui_elements([element_name])
+            # 按钮类元素点击后画面没有任何变化，认为点击未生效；
+            # 其他元素（如选项、输入框）点击后不一定有可见变化，超时不计入延迟学习
+            is_button = 'button' in element_name.lower() or 'btn' in element_name.lower()
             
-            # 检查场景是否发生变化（点击可能导致场景切换）
-            current_scene = self.game_detector.detect_scene()
+            # 按钮消失、高亮或场景切换都会使画面变化
+            if await self._detect_screen_change(before_state, expect_change=is_button):
+                return True
+            if not is_button:
+                return True
             
-            # 如果是按钮类元素，点击后可能消失或场景改变
-            if 'button' in element_name.lower() or 'btn' in element_name.lower():
-                # 按钮点击通常会导致场景变化或元素消失
-                return len(elements_after) == 0 or current_scene is not None
-            
-            # 对于其他元素，检查是否有状态变化
-            return True
+            # 界面响应可能比等待时间慢，立即重试会重复点击购买、确认等按钮：
+            # 宽限一段时间后再比较一次，画面已经变化则认为点击生效
+            await asyncio.sleep(self.screen_change_grace)
+            return await self._detect_screen_change(before_state, timeout=0.0, expect_change=False)
             
         except Exception as e:
             self.logger.warning(f"UI元素点击验证失败: {e}")
             return True  # 验证失败时假设成功
     
-    async def _verify_coordinate_click(self, position: Tuple[int, int]) -> bool:
+    async def _verify_coordinate_click(self, position: Tuple[int, int], before_state: Optional[dict] = None) -> bool:
         """验证坐标点击结果."""
         try:
             # 检查鼠标位置是否正确
@@ -854,22 +905,54 @@ class GameOperator(IGameOperator):
                     self.logger.warning(f"鼠标位置偏差过大: {distance}")
                     return False
             
-            # 检查屏幕是否有变化（简单的像素对比）
-            return await self._detect_screen_change()
+            # 检查屏幕是否有变化
+            return await self._detect_screen_change(before_state)
             
         except Exception as e:
             self.logger.warning(f"坐标点击验证失败: {e}")
             return True  # 验证失败时假设成功
     
-    async def _detect_screen_change(self) -> bool:
-        """检测屏幕变化."""
+    async def _detect_screen_change(self, before_state: Optional[dict] = None,
+                                    timeout: Optional[float] = None,
+                                    expect_change: bool = True) -> bool:
+        """检测屏幕变化.
+        
+        按screen_change_poll_interval截图并与操作前的帧签名比较，
+        一旦检测到变化立即返回，最多等待timeout秒。检测到变化时把从输入到
+        画面变化的时间记入延迟模型；预期会变化的操作超时时记为截尾观测，
+        之后观测到更慢的真实变化时学到的等待时间才会变长。
+        
+        Args:
+            before_state: 操作前由_capture_operation_state捕获的状态
+            timeout: 最长等待时间（秒），None表示使用该目标学到的响应延迟
+                （没有学习数据时为screen_change_timeout）
+            expect_change: 操作是否预期改变画面，为False时（不变化也算成功）
+                超时不记入延迟模型
+            
+        Returns:
+            bool: 检测到变化返回True；没有操作前签名（无法比较）时也返回True
+        """
         try:
-            # 等待一段时间让变化发生
-            await asyncio.sleep(0.2)
+            if not before_state or before_state.get('signature') is None:
+                return True
             
-            # 简单的屏幕变化检测
-            # 这里可以通过截图对比来实现更精确的检测
-            return True  # 暂时假设总是有变化
+            latency_key = before_state.get('latency_key')
+            if timeout is None:
+                timeout = self.latency_model.get_delay(latency_key, self.screen_change_timeout)
+            action_time = before_state.get('action_time')
+            start = action_time if action_time is not None else time.monotonic()
+            deadline = start + timeout
+            while True:
+                after_state = await self._capture_operation_state()
+                if await self._compare_operation_states(before_state, after_state):
+                    if latency_key is not None and action_time is not None:
+                        self.latency_model.record(latency_key, time.monotonic() - action_time)
+                    return True
+                if time.monotonic() >= deadline:
+                    if expect_change and latency_key is not None and action_time is not None:
+                        self.latency_model.record_timeout(latency_key, time.monotonic() - action_time)
+                    return False
+                await asyncio.sleep(self.screen_change_poll_interval)
             
         except Exception as e:
             self.logger.warning(f"屏幕变化检测失败: {e}")
@@ -886,8 +969,13 @@ class GameOperator(IGameOperator):
             try:
                 self.logger.debug(f"点击尝试 {attempt + 1}/{max_retries + 1}")
                 
+                # 记录点击前的画面签名，用于验证
+                latency_key = self._latency_key(target, "click")
+                before_state = await self._capture_operation_state(latency_key)
+                
                 # 执行点击
-                click_success = await self._perform_click(position, click_type, self.default_config)
+                click_success = await self._perform_click(position, click_type, self.default_config, latency_key)
+                before_state['action_time'] = self._last_input_time
                 if not click_success:
                     self.logger.warning(f"点击执行失败，尝试 {attempt + 1}")
                     if attempt < max_retries:
@@ -896,7 +984,7 @@ class GameOperator(IGameOperator):
                     break
                 
                 # 验证点击结果
-                verification_success = await self._verify_click_result(target, position)
+                verification_success = await self._verify_click_result(target, position, before_state)
                 if verification_success:
                     self.logger.debug(f"点击成功，尝试 {attempt + 1}")
                     break
@@ -925,8 +1013,12 @@ class GameOperator(IGameOperator):
             try:
                 self.logger.debug(f"滑动尝试 {attempt + 1}/{max_retries + 1}")
                 
+                # 记录滑动前的画面签名，用于验证
+                before_state = await self._capture_operation_state("swipe")
+                
                 # 执行滑动
                 swipe_success = await self._perform_swipe(start_pos, end_pos, duration, self.default_config)
+                before_state['action_time'] = time.monotonic()
                 if not swipe_success:
                     self.logger.warning(f"滑动执行失败，尝试 {attempt + 1}")
                     if attempt < max_retries:
@@ -935,7 +1027,7 @@ class GameOperator(IGameOperator):
                     break
                 
                 # 验证滑动结果
-                verification_success = await self._verify_swipe_result(start_pos, end_pos)
+                verification_success = await self._verify_swipe_result(start_pos, end_pos, before_state)
                 if verification_success:
                     self.logger.debug(f"滑动成功，尝试 {attempt + 1}")
                     break
@@ -954,14 +1046,12 @@ class GameOperator(IGameOperator):
         
         return swipe_success, verification_success
     
-    async def _verify_swipe_result(self, start_pos: Tuple[int, int], end_pos: Tuple[int, int]) -> bool:
+    async def _verify_swipe_result(self, start_pos: Tuple[int, int], end_pos: Tuple[int, int],
+                                   before_state: Optional[dict] = None) -> bool:
         """验证滑动结果."""
         try:
-            # 等待UI响应
-            await asyncio.sleep(0.3)
-            
             # 检查屏幕是否有变化（滑动通常会导致内容滚动）
-            screen_changed = await self._detect_screen_change()
+            screen_changed = await self._detect_screen_change(before_state)
             
             # 检查鼠标位置是否在预期的结束位置附近
             if pyautogui:
@@ -979,28 +1069,24 @@ class GameOperator(IGameOperator):
             self.logger.warning(f"滑动结果验证失败: {e}")
             return True  # 验证失败时假设成功
     
-    async def _capture_operation_state(self) -> dict:
-        """捕获操作前后的状态信息."""
+    async def _capture_operation_state(self, latency_key: Optional[str] = None) -> dict:
+        """捕获操作前后的状态信息.
+        
+        只截取一帧并计算缩略图签名，不做场景和UI元素检测。
+        
+        Args:
+            latency_key: 记录响应延迟时使用的目标名称
+        """
         try:
             state = {
                 'timestamp': time.time(),
-                'scene': None,
-                'ui_elements': [],
-                'screenshot_hash': None
+                'signature': None,
+                'latency_key': latency_key
             }
             
-            # 检测当前场景
-            try:
-                state['scene'] = self.game_detector.detect_scene()
-            except Exception as e:
-                self.logger.warning(f"场景检测失败: {e}")
-            
-            # 检测UI元素（仅检测常见元素）
-            try:
-                common_elements = ['button', 'menu', 'dialog', 'popup']
-                state['ui_elements'] = self.game_detector.detect_ui_elements(common_elements)
-            except Exception as e:
-                self.logger.warning(f"UI元素检测失败: {e}")
+            frame = await self._run_vision(self.game_detector.capture_frame, max_age=0)
+            if frame is not None:
+                state['signature'] = self._change_detector.signature(frame)
             
             return state
             
@@ -1011,33 +1097,54 @@ class GameOperator(IGameOperator):
     async def _compare_operation_states(self, before_state: dict, after_state: dict) -> bool:
         """比较操作前后的状态变化."""
         try:
-            # 检查场景变化
-            scene_changed = before_state.get('scene') != after_state.get('scene')
-            
-            # 检查UI元素变化
-            before_elements = set(before_state.get('ui_elements', []))
-            after_elements = set(after_state.get('ui_elements', []))
-            elements_changed = before_elements != after_elements
+            before = before_state.get('signature')
+            after = after_state.get('signature')
+            if before is None or after is None:
+                return True  # 无法比较时假设有变化
             
-            # 如果有任何变化，认为操作生效
-            state_changed = scene_changed or elements_changed
+            change = self._change_detector.compare(before, after)
+            if change.changed:
+                self.logger.debug(f"检测到画面变化 - 变化比例: {change.change_ratio:.2f}")
             
-            if state_changed:
-                self.logger.debug(f"检测到状态变化 - 场景: {scene_changed}, UI元素: {elements_changed}")
-            
-            return state_changed
+            return change.changed
             
         except Exception as e:
             self.logger.warning(f"状态比较失败: {e}")
             return True  # 比较失败时假设有变化
 
+    async def _run_vision(self, func, *args, **kwargs) -> Any:
+        """执行阻塞的视觉检测调用.
+        
+        设置了vision_executor时在该线程池中执行，否则直接调用。
+        """
+        if self.vision_executor is None:
+            return func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.vision_executor, functools.partial(func, *args, **kwargs))
+
+    def _latency_key(self, target: Union[Tuple[int, int], str, UIElement], default: str) -> str:
+        """获取操作目标在延迟模型中的名称，坐标目标统一使用default."""
+        if isinstance(target, str):
+            return target
+        name = getattr(target, 'name', None)
+        return name if isinstance(name, str) else default
+
+    def _frame_waiter(self) -> Optional[FrameWaiter]:
+        """获取检测器的逐帧等待器，检测器不支持时返回None（退回轮询）."""
+        waiter = getattr(self.game_detector, 'frame_waiter', None)
+        return waiter if isinstance(waiter, FrameWaiter) else None
+
     async def _wait_for_ui_element_appear(self, element_name: Optional[str], template_path: Optional[str], timeout: float) -> bool:
         """等待UI元素出现."""
+        waiter = self._frame_waiter()
+        if waiter is not None and element_name:
+            return await waiter.wait_for_element_async(element_name, timeout) is not None
+        
         start_time = time.time()
         
         while time.time() - start_time < timeout:
             if element_name:
-                elements = self.game_detector.detect_ui_elements([element_name])
+                elements = await self._run_vision(self.game_detector.detect_ui_elements, [element_name])
                 if elements:
                     return True
             
@@ -1052,11 +1159,15 @@ class GameOperator(IGameOperator):
 
     async def _wait_for_ui_element_disappear(self, element_name: Optional[str], template_path: Optional[str], timeout: float) -> bool:
         """等待UI元素消失."""
+        waiter = self._frame_waiter()
+        if waiter is not None and element_name:
+            return await waiter.wait_for_element_gone_async(element_name, timeout)
+        
         start_time = time.time()
         
         while time.time() - start_time < timeout:
             if element_name:
-                elements = self.game_detector.detect_ui_elements([element_name])
+                elements = await self._run_vision(self.game_detector.detect_ui_elements, [element_name])
                 if not elements:
                     return True
             
@@ -1071,10 +1182,14 @@ class GameOperator(IGameOperator):
 
     async def _wait_for_scene_change(self, target_scene: Optional[str], timeout: float) -> bool:
         """等待场景切换."""
+        waiter = self._frame_waiter()
+        if waiter is not None:
+            return await waiter.wait_for_scene_async(target_scene, timeout) is not None
+        
         start_time = time.time()
         
         while time.time() - start_time < timeout:
-            current_scene = self.game_detector.detect_scene()
+            current_scene = await self._run_vision(self.game_detector.detect_scene)
             if target_scene is None or current_scene.value == target_scene:
                 return True
             
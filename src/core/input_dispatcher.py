@@ -0,0 +1,567 @@
+"""输入派发器模块.
+
+把鼠标移动、点击、按键等底层输入事件组成带时间约束的事件序列，由一个专用
+线程按精确定时依次注入，调用方（GameOperator、ActionExecutor、自动化控制器）
+不再在事件循环里逐个调用pyautogui并各自sleep。相互独立的操作（例如逐个领取
+奖励）可以一次批量提交，每个事件的调度延迟都会被记录并汇总到统计信息中。
+"""
+
+from abc import ABC, abstractmethod
+import asyncio
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from enum import Enum
+import logging
+import threading
+import time
+from typing import Any, Callable, Deque, List, Optional, Sequence, Tuple
+
+
+class InputEventType(Enum):
+    """输入事件类型枚举."""
+    MOVE = "move"
+    CLICK = "click"
+    MOUSE_DOWN = "mouse_down"
+    MOUSE_UP = "mouse_up"
+    KEY_DOWN = "key_down"
+    KEY_UP = "key_up"
+    KEY_PRESS = "key_press"
+    HOTKEY = "hotkey"
+    SCROLL = "scroll"
+
+
+@dataclass
+class InputEvent:
+    """单个底层输入事件.
+
+    delay是相对上一个事件完成时刻的等待时间；序列的第一个事件相对序列开始
+    执行的时刻。max_lateness不为None时，事件实际开始时间晚于计划时间超过该值
+    则放弃本事件及序列中其余事件。
+    """
+    event_type: InputEventType
+    x: Optional[int] = None
+    y: Optional[int] = None
+    button: str = "left"
+    clicks: int = 1
+    key: Optional[str] = None
+    keys: Tuple[str, ...] = ()
+    amount: int = 0
+    duration: float = 0.0
+    delay: float = 0.0
+    max_lateness: Optional[float] = None
+
+
+@dataclass
+class InputEventResult:
+    """输入事件的执行结果，时间均为time.perf_counter()读数."""
+    event: InputEvent
+    scheduled_at: float
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    success: bool = False
+    error_message: str = ""
+
+    @property
+    def latency(self) -> float:
+        """实际开始时间相对计划时间的延迟（秒）."""
+        return max(0.0, self.started_at - self.scheduled_at) if self.started_at else 0.0
+
+    @property
+    def duration(self) -> float:
+        """注入事件本身耗时（秒）."""
+        return max(0.0, self.finished_at - self.started_at) if self.started_at else 0.0
+
+
+@dataclass
+class InputSequenceResult:
+    """事件序列的执行结果."""
+    submitted_at: float
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    events: List[InputEventResult] = field(default_factory=list)
+    error_message: str = ""
+
+    @property
+    def success(self) -> bool:
+        """序列中所有事件都执行成功."""
+        return not self.error_message and all(result.success for result in self.events)
+
+    @property
+    def queue_delay(self) -> float:
+        """从提交到开始执行在队列中等待的时间（秒）."""
+        return max(0.0, self.started_at - self.submitted_at) if self.started_at else 0.0
+
+    @property
+    def max_latency(self) -> float:
+        """序列中事件的最大调度延迟（秒）."""
+        return max((result.latency for result in self.events), default=0.0)
+
+
+class InputBackend(ABC):
+    """输入注入后端基类."""
+
+    def is_available(self) -> bool:
+        """后端当前能否注入输入."""
+        return True
+
+    @abstractmethod
+    def move(self, x: int, y: int, duration: float = 0.0) -> None:
+        """移动鼠标到屏幕坐标."""
+
+    @abstractmethod
+    def click(self, x: Optional[int], y: Optional[int], button: str = "left", clicks: int = 1) -> None:
+        """在坐标处点击，坐标为None时在当前位置点击."""
+
+    @abstractmethod
+    def mouse_down(self, x: Optional[int], y: Optional[int], button: str = "left") -> None:
+        """按下鼠标按钮."""
+
+    @abstractmethod
+    def mouse_up(self, x: Optional[int], y: Optional[int], button: str = "left") -> None:
+        """释放鼠标按钮."""
+
+    @abstractmethod
+    def key_down(self, key: str) -> None:
+        """按下按键."""
+
+    @abstractmethod
+    def key_up(self, key: str) -> None:
+        """释放按键."""
+
+    @abstractmethod
+    def press(self, key: str) -> None:
+        """按一次按键."""
+
+    @abstractmethod
+    def hotkey(self, *keys: str) -> None:
+        """按组合键."""
+
+    @abstractmethod
+    def scroll(self, amount: int, x: Optional[int] = None, y: Optional[int] = None) -> None:
+        """滚动鼠标滚轮."""
+
+
+class PyAutoGUIInputBackend(InputBackend):
+    """基于pyautogui的输入后端.
+
+    每次调用都传入_pause=False，事件之间的等待完全由派发器的定时器决定，
+    不再叠加pyautogui.PAUSE。
+    """
+
+    def __init__(self, module_provider: Optional[Callable[[], Any]] = None):
+        """初始化pyautogui后端.
+
+        Args:
+            module_provider: 返回pyautogui模块的函数，None表示调用时导入
+        """
+        self._module_provider = module_provider or self._import_pyautogui
+
+    @staticmethod
+    def _import_pyautogui() -> Any:
+        try:
+            import pyautogui
+            return pyautogui
+        except ImportError:
+            return None
+
+    def _module(self) -> Any:
+        module = self._module_provider()
+        if module is None:
+            raise RuntimeError("pyautogui不可用")
+        return module
+
+    def is_available(self) -> bool:
+        return self._module_provider() is not None
+
+    def move(self, x: int, y: int, duration: float = 0.0) -> None:
+        self._module().moveTo(x, y, duration=duration, _pause=False)
+
+    def click(self, x: Optional[int], y: Optional[int], button: str = "left", clicks: int = 1) -> None:
+        if clicks == 2:
+            self._module().doubleClick(x, y, button=button, _pause=False)
+        else:
+            self._module().click(x, y, clicks=clicks, button=button, _pause=False)
+
+    def mouse_down(self, x: Optional[int], y: Optional[int], button: str = "left") -> None:
+        self._module().mouseDown(x, y, button=button, _pause=False)
+
+    def mouse_up(self, x: Optional[int], y: Optional[int], button: str = "left") -> None:
+        self._module().mouseUp(x, y, button=button, _pause=False)
+
+    def key_down(self, key: str) -> None:
+        self._module().keyDown(key, _pause=False)
+
+    def key_up(self, key: str) -> None:
+        self._module().keyUp(key, _pause=False)
+
+    def press(self, key: str) -> None:
+        self._module().press(key, _pause=False)
+
+    def hotkey(self, *keys: str) -> None:
+        self._module().hotkey(*keys, _pause=False)
+
+    def scroll(self, amount: int, x: Optional[int] = None, y: Optional[int] = None) -> None:
+        self._module().scroll(amount, x=x, y=y, _pause=False)
+
+
+class InputDispatcher:
+    """输入派发器.
+
+    提交的事件序列按提交顺序在专用线程中执行，同一序列的事件按delay精确定时：
+    先用可中断的等待睡到截止时间前spin_threshold秒，剩余部分忙等，避免系统
+    定时器粒度（Windows约15毫秒）带来的抖动。某个事件失败时跳过序列的剩余
+    事件，其他序列不受影响。序列因失败、超时或派发器停止而提前结束时，序列中
+    已按下但尚未抬起的按键和鼠标按钮都会被释放。
+    """
+
+    def __init__(
+        self,
+        backend: InputBackend,
+        name: str = "InputDispatcher",
+        spin_threshold: float = 0.002,
+        history_size: int = 500,
+    ):
+        """初始化输入派发器.
+
+        Args:
+            backend: 输入注入后端
+            name: 派发线程名称
+            spin_threshold: 截止时间前改为忙等的时间（秒）
+            history_size: 统计调度延迟时保留的最近事件数
+        """
+        self.backend = backend
+        self.name = name
+        self.spin_threshold = spin_threshold
+        self.logger = logging.getLogger(__name__)
+
+        self._queue: Deque[Tuple[List[InputEvent], InputSequenceResult, Future]] = deque()
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._latencies: Deque[float] = deque(maxlen=history_size)
+        self._sequences = 0
+        self._events = 0
+        self._failed = 0
+
+    @property
+    def running(self) -> bool:
+        """派发线程是否在运行."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """启动派发线程.
+
+        Returns:
+            bool: 启动成功（或已在运行）返回True
+        """
+        if self.running:
+            return True
+        try:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._dispatch_loop, name=self.name, daemon=True)
+            self._thread.start()
+            return True
+        except Exception as e:
+            self.logger.error(f"启动输入派发线程失败: {e}")
+            return False
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """停止派发线程，尚未执行的序列以失败结束.
+
+        Args:
+            timeout: 等待线程退出的超时时间（秒）
+        """
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        with self._condition:
+            pending = list(self._queue)
+            self._queue.clear()
+        for _, result, future in pending:
+            result.error_message = "输入派发器已停止"
+            future.set_result(result)
+
+    def submit(self, events: Sequence[InputEvent]) -> 'Future[InputSequenceResult]':
+        """提交一个事件序列.
+
+        Args:
+            events: 按顺序执行的输入事件
+
+        Returns:
+            Future[InputSequenceResult]: 序列执行完成后得到结果
+        """
+        return self.submit_many([events])[0]
+
+    def submit_many(self, sequences: Sequence[Sequence[InputEvent]]) -> List['Future[InputSequenceResult]']:
+        """批量提交相互独立的事件序列，按给定顺序依次执行.
+
+        Args:
+            sequences: 事件序列列表
+
+        Returns:
+            List[Future[InputSequenceResult]]: 与sequences一一对应的结果
+        """
+        futures = []
+        submitted_at = time.perf_counter()
+        with self._condition:
+            for events in sequences:
+                future: Future = Future()
+                self._queue.append((list(events), InputSequenceResult(submitted_at=submitted_at), future))
+                futures.append(future)
+            self._condition.notify_all()
+        self.start()
+        return futures
+
+    def run(self, events: Sequence[InputEvent], timeout: Optional[float] = None) -> InputSequenceResult:
+        """提交事件序列并阻塞等待结果.
+
+        Args:
+            events: 输入事件
+            timeout: 超时时间（秒），None表示一直等待
+
+        Returns:
+            InputSequenceResult: 序列执行结果
+        """
+        return self.submit(events).result(timeout)
+
+    async def run_async(self, events: Sequence[InputEvent]) -> InputSequenceResult:
+        """在事件循环中提交事件序列并等待结果，等待期间不阻塞事件循环.
+
+        Args:
+            events: 输入事件
+
+        Returns:
+            InputSequenceResult: 序列执行结果
+        """
+        return await asyncio.wrap_future(self.submit(events))
+
+    async def run_many_async(self, sequences: Sequence[Sequence[InputEvent]]) -> List[InputSequenceResult]:
+        """在事件循环中批量提交事件序列并等待全部完成.
+
+        Args:
+            sequences: 事件序列列表
+
+        Returns:
+            List[InputSequenceResult]: 与sequences一一对应的结果
+        """
+        futures = self.submit_many(sequences)
+        return list(await asyncio.gather(*(asyncio.wrap_future(f) for f in futures)))
+
+    def _dispatch_loop(self) -> None:
+        """派发线程主循环."""
+        while not self._stop_event.is_set():
+            with self._condition:
+                while not self._queue and not self._stop_event.is_set():
+                    self._condition.wait()
+                if self._stop_event.is_set():
+                    return
+                events, result, future = self._queue.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                self._execute_sequence(events, result)
+            except Exception as e:
+                result.error_message = str(e)
+            future.set_result(result)
+
+    def _execute_sequence(self, events: List[InputEvent], result: InputSequenceResult) -> None:
+        """执行一个事件序列.
+
+        Args:
+            events: 输入事件
+            result: 填写执行结果的对象
+        """
+        pressed_keys: List[str] = []
+        pressed_buttons: List[InputEvent] = []
+        result.started_at = anchor = time.perf_counter()
+        try:
+            for event in events:
+                event_result = InputEventResult(event=event, scheduled_at=anchor + event.delay)
+                result.events.append(event_result)
+                if not self._sleep_until(event_result.scheduled_at):
+                    result.error_message = "输入派发器已停止"
+                    break
+
+                event_result.started_at = time.perf_counter()
+                if event.max_lateness is not None and event_result.latency > event.max_lateness:
+                    event_result.error_message = (
+                        f"事件延迟 {event_result.latency * 1000:.1f}ms 超过上限 {event.max_lateness * 1000:.1f}ms"
+                    )
+                else:
+                    try:
+                        self._inject(event)
+                        event_result.success = True
+                    except Exception as e:
+                        event_result.error_message = str(e)
+                event_result.finished_at = anchor = time.perf_counter()
+
+                self._events += 1
+                self._latencies.append(event_result.latency)
+                if not event_result.success:
+                    self._failed += 1
+                    result.error_message = event_result.error_message
+                    self.logger.warning(f"输入事件 {event.event_type.value} 执行失败: {event_result.error_message}")
+                    break
+                self._track_pressed(event, pressed_keys, pressed_buttons)
+        finally:
+            self._release_pressed(pressed_keys, pressed_buttons)
+            result.finished_at = time.perf_counter()
+            self._sequences += 1
+
+    @staticmethod
+    def _track_pressed(event: InputEvent, pressed_keys: List[str], pressed_buttons: List[InputEvent]) -> None:
+        """根据已成功注入的事件更新序列中按下未抬起的按键和鼠标按钮.
+
+        Args:
+            event: 已注入的事件
+            pressed_keys: 按下未抬起的按键
+            pressed_buttons: 按下未抬起的鼠标按钮对应的MOUSE_DOWN事件
+        """
+        kind = event.event_type
+        if kind == InputEventType.KEY_DOWN:
+            pressed_keys.append(event.key)
+        elif kind == InputEventType.KEY_UP and event.key in pressed_keys:
+            pressed_keys.remove(event.key)
+        elif kind == InputEventType.MOUSE_DOWN:
+            pressed_buttons.append(event)
+        elif kind == InputEventType.MOUSE_UP:
+            for index, down in enumerate(pressed_buttons):
+                if down.button == event.button:
+                    del pressed_buttons[index]
+                    break
+
+    def _release_pressed(self, pressed_keys: List[str], pressed_buttons: List[InputEvent]) -> None:
+        """按与按下相反的顺序释放序列中仍被按住的鼠标按钮和按键.
+
+        Args:
+            pressed_keys: 按下未抬起的按键
+            pressed_buttons: 按下未抬起的鼠标按钮对应的MOUSE_DOWN事件
+        """
+        for down in reversed(pressed_buttons):
+            try:
+                self.backend.mouse_up(down.x, down.y, down.button)
+            except Exception as e:
+                self.logger.error(f"释放鼠标按钮 {down.button} 失败: {e}")
+        for key in reversed(pressed_keys):
+            try:
+                self.backend.key_up(key)
+            except Exception as e:
+                self.logger.error(f"释放按键 {key} 失败: {e}")
+        if pressed_buttons or pressed_keys:
+            self.logger.warning(
+                f"序列提前结束，已释放 {len(pressed_buttons)} 个鼠标按钮和 {len(pressed_keys)} 个按键"
+            )
+
+    def _sleep_until(self, deadline: float) -> bool:
+        """等待到截止时间.
+
+        Args:
+            deadline: time.perf_counter()截止时间
+
+        Returns:
+            bool: 派发器被停止时返回False
+        """
+        remaining = deadline - time.perf_counter()
+        if remaining > self.spin_threshold:
+            if self._stop_event.wait(remaining - self.spin_threshold):
+                return False
+        while time.perf_counter() < deadline:
+            pass
+        return not self._stop_event.is_set()
+
+    def _inject(self, event: InputEvent) -> None:
+        """通过后端注入单个事件.
+
+        Args:
+            event: 输入事件
+        """
+        backend = self.backend
+        kind = event.event_type
+        if kind == InputEventType.MOVE:
+            backend.move(event.x, event.y, event.duration)
+        elif kind == InputEventType.CLICK:
+            backend.click(event.x, event.y, event.button, event.clicks)
+        elif kind == InputEventType.MOUSE_DOWN:
+            backend.mouse_down(event.x, event.y, event.button)
+        elif kind == InputEventType.MOUSE_UP:
+            backend.mouse_up(event.x, event.y, event.button)
+        elif kind == InputEventType.KEY_DOWN:
+            backend.key_down(event.key)
+        elif kind == InputEventType.KEY_UP:
+            backend.key_up(event.key)
+        elif kind == InputEventType.KEY_PRESS:
+            backend.press(event.key)
+        elif kind == InputEventType.HOTKEY:
+            backend.hotkey(*event.keys)
+        elif kind == InputEventType.SCROLL:
+            backend.scroll(event.amount, event.x, event.y)
+        else:
+            raise ValueError(f"不支持的输入事件类型: {kind}")
+
+    def get_stats(self) -> dict:
+        """获取派发统计信息.
+
+        Returns:
+            dict: 序列数、事件数、失败数、排队数以及最近事件的调度延迟（毫秒）
+        """
+        latencies = sorted(self._latencies)
+        count = len(latencies)
+        return {
+            'running': self.running,
+            'sequences': self._sequences,
+            'events': self._events,
+            'failed': self._failed,
+            'pending': len(self._queue),
+            'avg_latency_ms': sum(latencies) / count * 1000 if count else 0.0,
+            'p95_latency_ms': latencies[min(count - 1, int(count * 0.95))] * 1000 if count else 0.0,
+            'max_latency_ms': latencies[-1] * 1000 if count else 0.0,
+        }
+
+
+def click_events(
+    x: int,
+    y: int,
+    button: str = "left",
+    clicks: int = 1,
+    delay: float = 0.0,
+    settle: float = 0.02,
+) -> List[InputEvent]:
+    """构造"移动到坐标后点击"的事件序列.
+
+    Args:
+        x: 屏幕X坐标
+        y: 屏幕Y坐标
+        button: 鼠标按钮
+        clicks: 点击次数，2为双击
+        delay: 序列开始前的等待时间（秒）
+        settle: 移动后到点击前的等待时间（秒）
+
+    Returns:
+        List[InputEvent]: 事件序列
+    """
+    return [
+        InputEvent(InputEventType.MOVE, x=x, y=y, delay=delay),
+        InputEvent(InputEventType.CLICK, x=x, y=y, button=button, clicks=clicks, delay=settle),
+    ]
+
+
+def key_press_events(key: str, hold: float = 0.1, delay: float = 0.0) -> List[InputEvent]:
+    """构造按住按键一段时间后释放的事件序列.
+
+    Args:
+        key: 按键名称
+        hold: 按住时间（秒）
+        delay: 序列开始前的等待时间（秒）
+
+    Returns:
+        List[InputEvent]: 事件序列
+    """
+    return [
+        InputEvent(InputEventType.KEY_DOWN, key=key, delay=delay),
+        InputEvent(InputEventType.KEY_UP, key=key, delay=hold),
+    ]
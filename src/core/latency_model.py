@@ -0,0 +1,216 @@
+"""界面响应延迟模型.
+
+记录每次操作后界面实际开始变化所用的时间（按目标元素或场景分别统计），
+之后的操作按该分布的高分位数决定最多等待多久，而不是固定等待。学到的
+样本保存在JSON文件中，下次运行时继续使用。
+"""
+
+from collections import deque
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Deque, Dict, Optional
+
+import numpy as np
+
+
+DEFAULT_LATENCY_TABLE = os.path.join("data", "ui_latency.json")
+
+
+class UILatencyModel:
+    """按目标统计的界面响应延迟模型.
+
+    每个目标保留最近max_samples个观测值。样本数不少于min_samples时，
+    延迟取percentile分位数乘以margin，并限制在[min_delay, max_delay]内；
+    样本不足时使用调用方给出的默认延迟。
+
+    等待超时（界面没有变化）只是截尾观测：点击可能本来就不会改变画面，
+    因此超时不直接计入样本。之后该目标观测到一次晚于超时时间的真实变化时，
+    这些超时才作为样本并入，本次观测也不超过超时等待时间的max_growth倍，
+    延迟每次最多增长到原来的max_growth倍左右。
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        percentile: float = 95.0,
+        margin: float = 1.2,
+        min_samples: int = 5,
+        max_samples: int = 50,
+        min_delay: float = 0.05,
+        max_delay: float = 3.0,
+        save_interval: float = 60.0,
+        max_growth: float = 1.5,
+    ):
+        """初始化延迟模型.
+
+        Args:
+            path: 延迟表文件路径，None表示只在内存中学习
+            percentile: 决定延迟的分位数（0-100）
+            margin: 分位数之上的安全系数
+            min_samples: 开始使用学习值所需的最少样本数
+            max_samples: 每个目标保留的最近样本数
+            min_delay: 延迟下限（秒）
+            max_delay: 延迟上限（秒）
+            save_interval: 记录新样本后自动保存的最短间隔（秒）
+            max_growth: 超时之后的真实观测相对超时等待时间的最大倍数
+        """
+        self.path = path
+        self.percentile = percentile
+        self.margin = margin
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.save_interval = save_interval
+        self.max_growth = max_growth
+        self.logger = logging.getLogger(__name__)
+
+        self._samples: Dict[str, Deque[float]] = {}
+        self._censored: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+        if path:
+            self.load()
+
+    def record(self, key: str, latency: float) -> None:
+        """记录一次观测到的响应延迟.
+
+        Args:
+            key: 目标元素或场景名称
+            latency: 从操作到界面开始变化的时间（秒）
+        """
+        if latency < 0:
+            return
+        latency = float(latency)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.max_samples)
+            censored = self._censored.pop(key, None)
+            if censored:
+                # 超时之后才观测到变化，说明界面确实变慢：限制单次增长，
+                # 并把不晚于本次观测的超时作为样本并入；更早的变化说明那些超时
+                # 来自不会改变画面的点击，直接丢弃
+                latency = min(latency, max(censored) * self.max_growth)
+                samples.extend(waited for waited in censored if waited <= latency)
+            samples.append(latency)
+            self._dirty = True
+            due = self.path and time.monotonic() - self._last_save >= self.save_interval
+        if due:
+            self.save()
+
+    def record_timeout(self, key: str, waited: float) -> None:
+        """记录一次等待超时（界面在waited秒内没有变化）.
+
+        超时不直接影响get_delay，只在之后观测到更慢的真实变化时并入样本。
+
+        Args:
+            key: 目标元素或场景名称
+            waited: 从操作到放弃等待的时间（秒）
+        """
+        if waited < 0:
+            return
+        with self._lock:
+            censored = self._censored.get(key)
+            if censored is None:
+                censored = self._censored[key] = deque(maxlen=self.max_samples)
+            censored.append(float(waited))
+
+    def get_delay(self, key: Optional[str], default: float) -> float:
+        """获取目标的建议等待时间.
+
+        Args:
+            key: 目标元素或场景名称
+            default: 样本不足时使用的延迟（秒）
+
+        Returns:
+            float: 等待时间（秒）
+        """
+        with self._lock:
+            samples = self._samples.get(key) if key is not None else None
+            if not samples or len(samples) < self.min_samples:
+                return default
+            values = np.fromiter(samples, dtype=np.float64, count=len(samples))
+        delay = float(np.percentile(values, self.percentile)) * self.margin
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def load(self) -> bool:
+        """从延迟表文件加载样本.
+
+        Returns:
+            bool: 加载成功返回True
+        """
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                table = json.load(f)
+            with self._lock:
+                for key, values in table.items():
+                    self._samples[key] = deque(
+                        (float(v) for v in values), maxlen=self.max_samples
+                    )
+            return True
+        except Exception as e:
+            self.logger.error(f"加载界面延迟表失败: {e}")
+            return False
+
+    def save(self) -> bool:
+        """保存样本到延迟表文件.
+
+        文件中其他实例记录的目标会被保留，本实例记录过的目标以本实例为准。
+
+        Returns:
+            bool: 保存成功返回True
+        """
+        if not self.path:
+            return False
+        try:
+            with self._lock:
+                own = {key: list(samples) for key, samples in self._samples.items()}
+                self._dirty = False
+                self._last_save = time.monotonic()
+
+            table: Dict[str, Any] = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        table = json.load(f)
+                except ValueError:
+                    table = {}
+            table.update(own)
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(table, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+            return True
+        except Exception as e:
+            self.logger.error(f"保存界面延迟表失败: {e}")
+            return False
+
+    def flush(self) -> None:
+        """有未保存的样本时立即保存."""
+        if self._dirty:
+            self.save()
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """获取每个目标的样本数和当前延迟.
+
+        Returns:
+            Dict[str, Dict[str, float]]: 目标名称到统计信息的映射
+        """
+        with self._lock:
+            keys = {key: len(samples) for key, samples in self._samples.items()}
+        return {
+            key: {'samples': count, 'delay': self.get_delay(key, self.max_delay)}
+            for key, count in keys.items()
+        }
@@ -0,0 +1,167 @@
+"""多实例模板匹配模块.
+
+在一张cv2.matchTemplate结果图中一次找出模板的所有实例：先用最大值滤波取
+局部峰值并按阈值过滤（全部为向量化运算，不为每个像素创建对象），再对剩余
+候选框做非极大值抑制，得到互不重叠的匹配。画面上有多个相同按钮时只需扫描
+一次即可拿到全部位置。
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+
+@dataclass
+class Instance:
+    """模板的一个匹配实例，坐标为匹配框左上角."""
+
+    x: int
+    y: int
+    width: int
+    height: int
+    confidence: float
+
+    @property
+    def center(self) -> Tuple[int, int]:
+        """匹配框中心坐标."""
+        return self.x + self.width // 2, self.y + self.height // 2
+
+
+def _max_filter(scores: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """对分数图做矩形最大值滤波.
+
+    Args:
+        scores: 二维分数图
+        size: 滤波窗口 (height, width)，均为奇数
+
+    Returns:
+        np.ndarray: 每个位置邻域内的最大分数
+    """
+    k_h, k_w = size
+    if cv2 is not None:
+        return cv2.dilate(scores, np.ones((k_h, k_w), np.uint8), borderType=cv2.BORDER_REPLICATE)
+
+    # 可分离：先按行再按列取滑动窗口最大值
+    windows = np.lib.stride_tricks.sliding_window_view
+    padded = np.pad(scores, ((0, 0), (k_w // 2, k_w // 2)), mode='edge')
+    rows = windows(padded, k_w, axis=1).max(axis=-1)
+    padded = np.pad(rows, ((k_h // 2, k_h // 2), (0, 0)), mode='edge')
+    return windows(padded, k_h, axis=0).max(axis=-1)
+
+
+def non_max_suppression(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    iou_threshold: float = 0.3,
+    max_results: Optional[int] = None,
+) -> np.ndarray:
+    """贪心非极大值抑制.
+
+    Args:
+        boxes: N x 4 的 (x, y, width, height) 数组
+        scores: 长度为N的分数
+        iou_threshold: 与已保留框的交并比超过该值的框被抑制
+        max_results: 最多保留的框数，None表示不限制
+
+    Returns:
+        np.ndarray: 保留框的下标，按分数从高到低排列
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    boxes = boxes.astype(np.float64, copy=False)
+    x1, y1 = boxes[:, 0], boxes[:, 1]
+    x2, y2 = x1 + boxes[:, 2], y1 + boxes[:, 3]
+    areas = boxes[:, 2] * boxes[:, 3]
+    order = np.argsort(scores, kind='stable')[::-1]
+
+    keep = []
+    while order.size:
+        best = order[0]
+        keep.append(best)
+        if max_results is not None and len(keep) >= max_results:
+            break
+        rest = order[1:]
+        inter_w = np.clip(np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest]), 0, None)
+        inter_h = np.clip(np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest]), 0, None)
+        inter = inter_w * inter_h
+        iou = inter / np.maximum(areas[best] + areas[rest] - inter, 1e-12)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.intp)
+
+
+def find_instances(
+    result: np.ndarray,
+    template_size: Tuple[int, int],
+    threshold: float,
+    sqdiff: bool = False,
+    iou_threshold: float = 0.3,
+    max_results: Optional[int] = None,
+    max_candidates: int = 1000,
+) -> List[Instance]:
+    """从匹配结果图中找出模板的所有实例.
+
+    Args:
+        result: cv2.matchTemplate结果图
+        template_size: 模板尺寸 (height, width)
+        threshold: 最低置信度
+        sqdiff: 结果图是否为TM_SQDIFF_NORMED（越小越好）
+        iou_threshold: 非极大值抑制的交并比阈值
+        max_results: 最多返回的实例数，None表示不限制
+        max_candidates: 进入非极大值抑制的最多候选数（取分数最高者）
+
+    Returns:
+        List[Instance]: 实例列表，按置信度从高到低排列
+    """
+    scores = 1.0 - result if sqdiff else result
+    scores = np.asarray(scores, dtype=np.float32)
+    if scores.ndim != 2 or scores.size == 0:
+        return []
+
+    t_h, t_w = template_size
+    # 邻域取模板尺寸的一半：相距更近的两个峰值在NMS中也会互相抑制
+    kernel = (max(3, (t_h // 2) | 1), max(3, (t_w // 2) | 1))
+    peaks = (scores >= threshold) & (scores >= _max_filter(scores, kernel))
+    ys, xs = np.nonzero(peaks)
+    if ys.size == 0:
+        return []
+
+    confidences = scores[ys, xs]
+    if confidences.size > max_candidates:
+        top = np.argpartition(confidences, -max_candidates)[-max_candidates:]
+        ys, xs, confidences = ys[top], xs[top], confidences[top]
+
+    boxes = np.column_stack([xs, ys, np.full_like(xs, t_w), np.full_like(ys, t_h)])
+    keep = non_max_suppression(boxes, confidences, iou_threshold, max_results)
+    return [
+        Instance(int(xs[i]), int(ys[i]), t_w, t_h, float(confidences[i]))
+        for i in keep
+    ]
+
+
+def sort_by_position(instances: List[Instance]) -> List[Instance]:
+    """按阅读顺序排序实例：从上到下，同一行内从左到右.
+
+    纵坐标相差不到半个模板高度的实例视为同一行，避免几个像素的抖动打乱
+    同一行按钮的左右顺序。
+
+    Args:
+        instances: 实例列表
+
+    Returns:
+        List[Instance]: 排序后的新列表
+    """
+    rows: List[List[Instance]] = []
+    for instance in sorted(instances, key=lambda item: item.y):
+        row = rows[-1] if rows else None
+        if row is not None and instance.y - row[0].y < max(1, row[0].height // 2):
+            row.append(instance)
+        else:
+            rows.append([instance])
+    return [instance for row in rows for instance in sorted(row, key=lambda item: item.x)]
@@ -0,0 +1,143 @@
+"""OCR结果缓存模块.
+
+以裁剪区域像素的哈希加OCR配置为键缓存识别结果。任务名称、按钮文字、
+很少变化的体力数值等静态文本在轮询（wait_for_text、is_text_present）时
+无需重复识别；像素发生任何变化都会得到新的键，因此缓存结果不会过时。
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class OCRCacheEntry:
+    """缓存的识别结果."""
+
+    value: Any
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class OCRResultCache:
+    """OCR结果LRU缓存.
+
+    超过max_size时淘汰最久未使用的结果，超过ttl秒的结果在读取时过期。
+    未识别到文本（None或空结果）同样缓存，使等待文本出现的轮询也不重复识别。
+    """
+
+    def __init__(self, max_size: int = 256, ttl: Optional[float] = 60.0):
+        """初始化OCR结果缓存.
+
+        Args:
+            max_size: 最大缓存条目数
+            ttl: 结果有效期（秒），None表示不过期
+        """
+        if max_size <= 0:
+            raise ValueError(f"缓存大小必须大于0: {max_size}")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.logger = logging.getLogger(__name__)
+
+        self._entries: 'OrderedDict[Hashable, OCRCacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @staticmethod
+    def make_key(image: Any, mode: str = 'text', config: Optional[str] = None) -> Optional[Tuple]:
+        """根据区域像素和OCR配置生成缓存键.
+
+        Args:
+            image: 待识别的区域图像
+            mode: 识别模式
+            config: tesseract配置
+
+        Returns:
+            Optional[Tuple]: 缓存键，图像不是数组时返回None（不缓存）
+        """
+        if not isinstance(image, np.ndarray):
+            return None
+        digest = hashlib.blake2b(np.ascontiguousarray(image).data, digest_size=16).digest()
+        return (digest, image.shape, image.dtype.str, mode, config)
+
+    def get(self, key: Optional[Hashable]) -> Tuple[bool, Any]:
+        """查找缓存结果.
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Tuple[bool, Any]: (是否命中, 识别结果)
+        """
+        if key is None:
+            return False, None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None \
+                    and time.monotonic() - entry.created_at > self.ttl:
+                del self._entries[key]
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return True, entry.value
+
+    def put(self, key: Optional[Hashable], value: Any) -> None:
+        """保存识别结果.
+
+        Args:
+            key: 缓存键，None时不保存
+            value: 识别结果
+        """
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = OCRCacheEntry(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """清空缓存."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """获取缓存统计信息.
+
+        Returns:
+            Dict[str, float]: 命中、未命中、淘汰、过期次数，命中率和当前条目数
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+            }
+
+    def register_metrics(self, metrics_collector: Any, name: str = "ocr_cache") -> None:
+        """将缓存统计注册为MetricsCollector的收集器.
+
+        收集器运行时统计值以 ``{name}.hit_rate`` 等名称记录为仪表指标。
+
+        Args:
+            metrics_collector: 指标收集器
+            name: 收集器名称
+        """
+        metrics_collector.register_collector(name, self.get_stats)
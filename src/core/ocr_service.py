@@ -0,0 +1,328 @@
+"""OCR工作池模块.
+
+维护一组常驻的OCR工作进程，接收从同一帧裁剪出的一批区域并返回Future，
+多行任务描述、奖励数量等区域可以在多个CPU核心上并行识别；
+异步接口通过asyncio.wrap_future等待结果，不阻塞事件循环。
+"""
+
+import asyncio
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ocr_cache import OCRResultCache
+from .raw_frame import RawFrame
+
+Region = Tuple[int, int, int, int]
+
+# 工作进程内常驻的识别器，由_init_worker创建
+_worker_detector = None
+
+
+def _init_worker() -> None:
+    """工作进程初始化：导入OpenCV/pytesseract并创建识别器，避免每次识别重复加载."""
+    global _worker_detector
+    from . import ocr_detector
+
+    _worker_detector = ocr_detector.OCRDetector()
+    if ocr_detector.pytesseract is not None:
+        try:
+            # 预先定位tesseract可执行文件并缓存版本信息
+            ocr_detector.pytesseract.get_tesseract_version()
+        except Exception:
+            pass
+
+
+def _recognize_in_worker(
+    image: np.ndarray, mode: str, config: Optional[str], method_key: Optional[Hashable] = None
+) -> Any:
+    """在工作进程中识别一个区域.
+
+    Args:
+        image: BGR区域图像
+        mode: 'text'返回文本，'data'返回文本框数据
+        config: tesseract配置
+        method_key: 缓存二值化方法的键
+
+    Returns:
+        Any: 识别结果
+    """
+    if _worker_detector is None:
+        _init_worker()
+    return _worker_detector._ocr_image(image, mode, config, method_key)
+
+
+class OCRService:
+    """OCR工作池.
+
+    默认使用进程池：图像预处理和识别都在工作进程中完成，父进程只负责裁剪区域。
+    use_processes为False或进程池无法启动时退化为线程池（tesseract本身在子进程中
+    运行，线程池同样可以并行识别）。
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        use_processes: bool = True,
+        ocr_config: Optional[str] = None,
+        result_cache: Optional[OCRResultCache] = None,
+    ):
+        """初始化OCR工作池.
+
+        Args:
+            max_workers: 工作进程数，None表示CPU核心数（最多4个）
+            use_processes: 是否使用进程池
+            ocr_config: 默认tesseract配置，None表示使用OCRDetector的配置
+            result_cache: 识别结果缓存，命中的区域不再提交给工作进程
+        """
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.use_processes = use_processes
+        self.ocr_config = ocr_config
+        self.result_cache = result_cache
+        self.logger = logging.getLogger(__name__)
+
+        self._executor: Optional[Executor] = None
+        self._local_detector = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_latency = 0.0
+
+    @property
+    def running(self) -> bool:
+        """工作池是否已启动."""
+        return self._executor is not None
+
+    def start(self) -> bool:
+        """启动工作池，已启动时直接返回.
+
+        Returns:
+            bool: 启动成功返回True
+        """
+        with self._lock:
+            if self._executor is not None:
+                return True
+            if self.use_processes:
+                try:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers, initializer=_init_worker
+                    )
+                    # 提前拉起全部工作进程，使首批识别不承担启动开销
+                    for future in [self._executor.submit(os.getpid) for _ in range(self.max_workers)]:
+                        future.result(timeout=30)
+                    self.logger.info(f"OCR进程池已启动，工作进程数 {self.max_workers}")
+                    return True
+                except Exception as e:
+                    self.logger.error(f"启动OCR进程池失败，改用线程池: {e}")
+                    if self._executor is not None:
+                        self._executor.shutdown(wait=False, cancel_futures=True)
+                    self.use_processes = False
+
+            try:
+                from .ocr_detector import OCRDetector
+
+                self._local_detector = OCRDetector()
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="OCRWorker"
+                )
+                self.logger.info(f"OCR线程池已启动，线程数 {self.max_workers}")
+                return True
+            except Exception as e:
+                self.logger.error(f"启动OCR线程池失败: {e}")
+                return False
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭工作池.
+
+        Args:
+            wait: 是否等待未完成的识别
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+            self.logger.info("OCR工作池已关闭")
+
+    def submit(
+        self,
+        image: np.ndarray,
+        mode: str = 'text',
+        config: Optional[str] = None,
+        method_key: Optional[Hashable] = None,
+    ) -> Future:
+        """提交一个区域图像.
+
+        Args:
+            image: BGR区域图像
+            mode: 'text'返回识别文本，'data'返回tesseract文本框数据
+            config: tesseract配置，None表示默认配置
+            method_key: 缓存二值化方法的键（区域或模板类型）
+
+        Returns:
+            Future: 识别结果
+        """
+        if not self.start():
+            future: Future = Future()
+            future.set_exception(RuntimeError("OCR工作池未启动"))
+            return future
+
+        if config is None:
+            config = self.ocr_config
+        image = np.ascontiguousarray(image)
+
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = self.result_cache.make_key(image, mode, config)
+            hit, value = self.result_cache.get(cache_key)
+            if hit:
+                future = Future()
+                future.set_result(value)
+                return future
+
+        if self.use_processes:
+            future = self._executor.submit(_recognize_in_worker, image, mode, config, method_key)
+        else:
+            future = self._executor.submit(
+                self._local_detector._ocr_image, image, mode, config, method_key
+            )
+
+        submitted_at = time.monotonic()
+        with self._stats_lock:
+            self._submitted += 1
+        future.add_done_callback(lambda done: self._record(done, submitted_at, cache_key))
+        return future
+
+    def submit_regions(
+        self,
+        screenshot: Any,
+        regions: Sequence[Region],
+        mode: str = 'text',
+        config: Optional[str] = None,
+    ) -> List[Future]:
+        """从同一帧裁剪多个区域并批量提交.
+
+        Args:
+            screenshot: 截图（RawFrame或BGR图像数组）
+            regions: 区域列表 (x, y, width, height)
+            mode: 'text'或'data'
+            config: tesseract配置
+
+        Returns:
+            List[Future]: 与regions一一对应的识别结果
+        """
+        if not isinstance(screenshot, RawFrame):
+            screenshot = RawFrame.from_array(screenshot)
+        # 只把区域像素发送给工作进程，而不是整帧
+        return [
+            self.submit(screenshot.crop(region).bgr, mode, config, tuple(region))
+            for region in regions
+        ]
+
+    def recognize_regions(
+        self,
+        screenshot: Any,
+        regions: Sequence[Region],
+        mode: str = 'text',
+        config: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Any]:
+        """批量识别并等待全部结果.
+
+        Args:
+            screenshot: 截图（RawFrame或BGR图像数组）
+            regions: 区域列表
+            mode: 'text'或'data'
+            config: tesseract配置
+            timeout: 整批等待的超时时间（秒）
+
+        Returns:
+            List[Any]: 识别结果，失败或超时的区域为None
+        """
+        futures = self.submit_regions(screenshot, regions, mode, config)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        results = []
+        for future in futures:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            results.append(self._result_or_none(future, remaining))
+        return results
+
+    async def recognize_regions_async(
+        self,
+        screenshot: Any,
+        regions: Sequence[Region],
+        mode: str = 'text',
+        config: Optional[str] = None,
+    ) -> List[Any]:
+        """在事件循环中批量识别，等待期间不阻塞事件循环.
+
+        Args:
+            screenshot: 截图（RawFrame或BGR图像数组）
+            regions: 区域列表
+            mode: 'text'或'data'
+            config: tesseract配置
+
+        Returns:
+            List[Any]: 识别结果，失败的区域为None
+        """
+        futures = self.submit_regions(screenshot, regions, mode, config)
+        results = await asyncio.gather(
+            *(asyncio.wrap_future(future) for future in futures), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                self.logger.error(f"OCR区域识别失败: {result}")
+        return [None if isinstance(result, BaseException) else result for result in results]
+
+    def _result_or_none(self, future: Future, timeout: Optional[float]) -> Any:
+        """获取Future结果，失败返回None."""
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            future.cancel()
+            self.logger.error(f"OCR区域识别失败: {e!r}")
+            return None
+
+    def _record(self, future: Future, submitted_at: float, cache_key: Optional[Hashable]) -> None:
+        """记录识别耗时，并缓存成功的识别结果."""
+        with self._stats_lock:
+            if future.cancelled() or future.exception() is not None:
+                self._failed += 1
+                return
+            self._completed += 1
+            self._total_latency += time.monotonic() - submitted_at
+        if self.result_cache is not None:
+            self.result_cache.put(cache_key, future.result())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取工作池统计信息.
+
+        Returns:
+            Dict[str, Any]: 提交、完成、失败数量和平均识别延迟
+        """
+        with self._stats_lock:
+            return {
+                'running': self.running,
+                'use_processes': self.use_processes,
+                'max_workers': self.max_workers,
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'failed': self._failed,
+                'pending': self._submitted - self._completed - self._failed,
+                'avg_latency_ms': (
+                    self._total_latency / self._completed * 1000 if self._completed else 0.0
+                ),
+            }
+
+    def __enter__(self) -> 'OCRService':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown()
@@ -0,0 +1,240 @@
+"""原始帧模块.
+
+提供零拷贝的截图帧对象，在检测、OCR和操作接口之间直接传递像素缓冲区，
+仅在需要持久化时才编码为PNG。
+"""
+
+from dataclasses import dataclass, field
+import time
+from typing import Any, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+
+# 支持的像素格式及其通道数
+PIXEL_FORMAT_CHANNELS = {'BGR': 3, 'BGRA': 4, 'GRAY': 1}
+
+
+@dataclass
+class RawFrame:
+    """原始截图帧.
+
+    data是截图缓冲区上的NumPy视图（形状为 height x width [x channels]），
+    构造和裁剪都不会复制像素数据。
+    """
+
+    data: np.ndarray
+    pixel_format: str = 'BGR'
+    timestamp: float = field(default_factory=time.monotonic)
+    frame_id: Optional[int] = None
+    origin: Tuple[int, int] = (0, 0)
+
+    def __post_init__(self):
+        """校验像素格式."""
+        if self.pixel_format not in PIXEL_FORMAT_CHANNELS:
+            raise ValueError(f"不支持的像素格式: {self.pixel_format}")
+
+    @classmethod
+    def from_array(
+        cls,
+        image: np.ndarray,
+        pixel_format: Optional[str] = None,
+        timestamp: Optional[float] = None,
+        frame_id: Optional[int] = None,
+    ) -> 'RawFrame':
+        """从已有的图像数组创建帧，不复制数据.
+
+        Args:
+            image: 图像数组
+            pixel_format: 像素格式，None表示根据通道数推断
+            timestamp: 截图时间（time.monotonic），None表示当前时间
+            frame_id: 帧ID
+
+        Returns:
+            RawFrame: 原始帧
+        """
+        if pixel_format is None:
+            if image.ndim == 2:
+                pixel_format = 'GRAY'
+            elif image.shape[2] == 4:
+                pixel_format = 'BGRA'
+            else:
+                pixel_format = 'BGR'
+        return cls(
+            data=image,
+            pixel_format=pixel_format,
+            timestamp=time.monotonic() if timestamp is None else timestamp,
+            frame_id=frame_id,
+        )
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buffer: Any,
+        width: int,
+        height: int,
+        stride: Optional[int] = None,
+        pixel_format: str = 'BGRA',
+        timestamp: Optional[float] = None,
+        frame_id: Optional[int] = None,
+    ) -> 'RawFrame':
+        """在截图缓冲区（如BitBlt位图数据）上创建帧视图，不复制数据.
+
+        Args:
+            buffer: 支持缓冲区协议的对象（bytes、bytearray、memoryview等）
+            width: 图像宽度
+            height: 图像高度
+            stride: 每行字节数，None表示紧密排列
+            pixel_format: 像素格式
+            timestamp: 截图时间（time.monotonic），None表示当前时间
+            frame_id: 帧ID
+
+        Returns:
+            RawFrame: 原始帧
+        """
+        channels = PIXEL_FORMAT_CHANNELS.get(pixel_format)
+        if channels is None:
+            raise ValueError(f"不支持的像素格式: {pixel_format}")
+        row_bytes = width * channels
+        stride = row_bytes if stride is None else stride
+        if stride < row_bytes:
+            raise ValueError(f"行跨度过小: {stride} < {row_bytes}")
+
+        flat = np.frombuffer(buffer, dtype=np.uint8, count=stride * height)
+        if channels == 1:
+            shape, strides = (height, width), (stride, 1)
+        else:
+            shape, strides = (height, width, channels), (stride, channels, 1)
+        data = np.lib.stride_tricks.as_strided(
+            flat, shape=shape, strides=strides, writeable=False
+        )
+        return cls(
+            data=data,
+            pixel_format=pixel_format,
+            timestamp=time.monotonic() if timestamp is None else timestamp,
+            frame_id=frame_id,
+        )
+
+    @property
+    def width(self) -> int:
+        """图像宽度."""
+        return int(self.data.shape[1])
+
+    @property
+    def height(self) -> int:
+        """图像高度."""
+        return int(self.data.shape[0])
+
+    @property
+    def channels(self) -> int:
+        """通道数."""
+        return PIXEL_FORMAT_CHANNELS[self.pixel_format]
+
+    @property
+    def stride(self) -> int:
+        """每行字节数."""
+        return int(self.data.strides[0])
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """图像形状."""
+        return self.data.shape
+
+    @property
+    def age(self) -> float:
+        """获取帧的存在时间（秒）."""
+        return time.monotonic() - self.timestamp
+
+    @property
+    def bgr(self) -> np.ndarray:
+        """获取BGR图像，已是BGR格式时直接返回原视图."""
+        if self.pixel_format == 'BGR':
+            return self.data
+        if cv2 is None:
+            raise RuntimeError("OpenCV未安装，无法转换像素格式")
+        code = cv2.COLOR_BGRA2BGR if self.pixel_format == 'BGRA' else cv2.COLOR_GRAY2BGR
+        return cv2.cvtColor(self.data, code)
+
+    @property
+    def gray(self) -> np.ndarray:
+        """获取灰度图像，已是灰度格式时直接返回原视图."""
+        if self.pixel_format == 'GRAY':
+            return self.data
+        if cv2 is None:
+            raise RuntimeError("OpenCV未安装，无法转换像素格式")
+        code = cv2.COLOR_BGRA2GRAY if self.pixel_format == 'BGRA' else cv2.COLOR_BGR2GRAY
+        return cv2.cvtColor(self.data, code)
+
+    def crop(self, region: Optional[Tuple[int, int, int, int]]) -> 'RawFrame':
+        """裁剪区域，返回共享同一缓冲区的子帧.
+
+        Args:
+            region: 区域 (x, y, width, height)，None表示整帧
+
+        Returns:
+            RawFrame: 子帧，origin记录其在原帧中的偏移
+        """
+        if region is None:
+            return self
+        x, y, w, h = region
+        x0 = max(0, int(x))
+        y0 = max(0, int(y))
+        x1 = min(self.width, int(x + w))
+        y1 = min(self.height, int(y + h))
+        return RawFrame(
+            data=self.data[y0:max(y0, y1), x0:max(x0, x1)],
+            pixel_format=self.pixel_format,
+            timestamp=self.timestamp,
+            frame_id=self.frame_id,
+            origin=(self.origin[0] + x0, self.origin[1] + y0),
+        )
+
+    def to_png_bytes(self) -> Optional[bytes]:
+        """编码为PNG字节，仅在需要持久化时调用.
+
+        Returns:
+            Optional[bytes]: PNG数据，失败返回None
+        """
+        if cv2 is None:
+            return None
+        success, buffer = cv2.imencode('.png', self.data)
+        return buffer.tobytes() if success else None
+
+    def save(self, path: str) -> bool:
+        """将帧保存为图片文件.
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            bool: 是否保存成功
+        """
+        if cv2 is None:
+            return False
+        return bool(cv2.imwrite(path, self.data))
+
+
+FrameLike = Union[RawFrame, np.ndarray]
+
+
+def frame_to_bgr(
+    frame: FrameLike, region: Optional[Tuple[int, int, int, int]] = None
+) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """将帧或图像数组转换为BGR图像，可选裁剪区域.
+
+    Args:
+        frame: 原始帧或图像数组
+        region: 区域 (x, y, width, height)
+
+    Returns:
+        Tuple[np.ndarray, Tuple[int, int]]: BGR图像及其在原图中的偏移
+    """
+    if not isinstance(frame, RawFrame):
+        frame = RawFrame.from_array(frame)
+    cropped = frame.crop(region)
+    return cropped.bgr, cropped.origin
@@ -9,6 +9,7 @@ from typing import Optional, Callable, Dict, Any, List
 from dataclasses import dataclass
 from enum import Enum
 from .game_detector import SceneType, GameDetector
+from .frame_source import FrameSource
 import logging
 
 
@@ -54,7 +55,9 @@ class SceneMonitor:
         game_detector: GameDetector,
         detection_interval: float = 1.0,
         stability_threshold: int = 3,
-        confidence_threshold: float = 0.8
+        confidence_threshold: float = 0.8,
+        incremental_detection: bool = True,
+        frame_source: Optional[FrameSource] = None
     ):
         """初始化场景监控器.
         
@@ -63,11 +66,18 @@ class SceneMonitor:
             detection_interval: 检测间隔（秒）
             stability_threshold: 场景稳定性阈值（连续检测次数）
             confidence_threshold: 场景置信度阈值
+            incremental_detection: 是否基于帧差分增量检测，画面未变化时复用上次结果
+            frame_source: 截图帧来源，None表示使用检测器当前的来源；
+                离线来源（回放、生成器）的帧读完后监控自动停止
         """
         self.game_detector = game_detector
         self.detection_interval = detection_interval
         self.stability_threshold = stability_threshold
         self.confidence_threshold = confidence_threshold
+        self.incremental_detection = incremental_detection
+        self.frame_source = frame_source
+        if frame_source is not None:
+            self.game_detector.set_frame_source(frame_source)
         
         # 监控状态
         self._monitoring = False
@@ -147,8 +157,18 @@ class SceneMonitor:
         """监控循环."""
         while self._monitoring and not self._stop_event.is_set():
             try:
-                # 检测当前场景
-                detected_scene = self.game_detector.detect_scene()
+                if self._frame_source_exhausted():
+                    self.logger.info("Frame source exhausted, scene monitoring finished")
+                    self._monitoring = False
+                    break
+
+                # 每次检测都从新的一帧开始
+                self.game_detector.invalidate_frame_cache()
+
+                # 检测当前场景（画面未变化时复用上次的匹配结果）
+                detected_scene = self.game_detector.detect_scene(
+                    incremental=self.incremental_detection
+                )
                 self._process_scene_detection(detected_scene)
                 
                 # 等待下次检测
@@ -161,6 +181,15 @@ class SceneMonitor:
                 self.logger.error(f"Error in scene monitoring loop: {e}")
                 time.sleep(self.detection_interval)
     
+    def _frame_source_exhausted(self) -> bool:
+        """判断离线帧来源是否已经读完.
+        
+        Returns:
+            bool: 离线来源没有更多帧时返回True
+        """
+        source = self.frame_source
+        return source is not None and not source.live and not source.is_available()
+    
     def _process_scene_detection(self, detected_scene: SceneType):
         """处理场景检测结果.
         
@@ -419,7 +448,8 @@ class SceneMonitor:
             'transition_history_count': len(self._transition_history),
             'detection_interval': self.detection_interval,
             'stability_threshold': self.stability_threshold,
-            'confidence_threshold': self.confidence_threshold
+            'confidence_threshold': self.confidence_threshold,
+            'incremental_detection': self.incremental_detection
         }
     
     def clear_history(self):
@@ -0,0 +1,239 @@
+"""系统负载采样器模块.
+
+由一个后台线程按固定间隔采样CPU、内存、磁盘和本进程的资源占用，把最新读数
+连同指数加权移动平均（EWMA）一起发布为不可变快照，并在环形缓冲区中保留最近
+的历史。任务管理器的限流判断、健康检查和指标收集器都读取同一份快照，读操作
+是O(1)的，不再各自调用psutil，也不会为了测量CPU而阻塞100ms甚至1s。
+
+采样线程按引用计数启停：常驻的使用者（任务管理器的并发循环、健康检查和任务
+监控线程、指标收集器）在启动到停止期间持有采样器。没有使用者持有时，snapshot()
+在调用时立即做一次非阻塞采样。
+"""
+
+from collections import deque
+from dataclasses import dataclass
+import logging
+import os
+import threading
+import time
+from typing import Any, Deque, List, Optional
+
+
+@dataclass(frozen=True)
+class SystemLoadSnapshot:
+    """一次系统负载采样结果.
+
+    *_percent是本次采样的读数，*_smoothed是截至本次采样的EWMA。
+    available为False表示psutil不可用，此时其余字段均为0。
+    """
+    timestamp: float
+    available: bool = False
+    cpu_percent: float = 0.0
+    cpu_smoothed: float = 0.0
+    memory_percent: float = 0.0
+    memory_smoothed: float = 0.0
+    memory_available: float = 0.0
+    memory_total: float = 0.0
+    disk_percent: float = 0.0
+    disk_smoothed: float = 0.0
+    disk_free: float = 0.0
+    disk_total: float = 0.0
+    process_cpu_percent: float = 0.0
+    process_memory_rss: float = 0.0
+
+
+def _import_psutil() -> Any:
+    """导入psutil，不可用时返回None.
+
+    每次采样时导入而不是在模块加载时导入，与各使用者原来的局部导入行为一致。
+    """
+    try:
+        import psutil
+        return psutil
+    except ImportError:
+        return None
+
+
+class SystemLoadSampler:
+    """系统负载采样器."""
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        history_size: int = 120,
+        smoothing: float = 0.3,
+        disk_path: Optional[str] = None,
+    ):
+        """初始化采样器.
+
+        Args:
+            interval: 后台采样间隔（秒）
+            history_size: 环形缓冲区保留的快照数量
+            smoothing: EWMA平滑系数，越大越接近最新读数
+            disk_path: 统计磁盘占用的路径，默认为系统盘
+        """
+        self.interval = interval
+        self.smoothing = smoothing
+        self.disk_path = disk_path or ("C:\\" if os.name == 'nt' else "/")
+        self._history: Deque[SystemLoadSnapshot] = deque(maxlen=history_size)
+        self._latest: Optional[SystemLoadSnapshot] = None
+        self._process: Any = None
+        self._lock = threading.Lock()
+        self._sample_lock = threading.Lock()
+        self._holders = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._logger = logging.getLogger(__name__)
+
+        # psutil.cpu_percent(interval=None)返回距上次调用的平均值，先调用一次建立基准
+        psutil = _import_psutil()
+        if psutil is not None:
+            try:
+                psutil.cpu_percent(interval=None)
+            except Exception:
+                pass
+
+    @property
+    def running(self) -> bool:
+        """后台采样线程是否在运行."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def acquire(self) -> None:
+        """登记一个常驻使用者，第一个使用者登记时启动后台采样线程."""
+        with self._lock:
+            self._holders += 1
+            if self._holders > 1 and self.running:
+                return
+            # 每个线程使用自己的停止事件，release和acquire交错时旧线程也能退出
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(
+                target=self._sampling_loop,
+                args=(self._stop_event,),
+                name="SystemLoadSampler",
+                daemon=True,
+            )
+            self._thread.start()
+        self._logger.debug("系统负载采样线程已启动")
+
+    def release(self) -> None:
+        """注销一个常驻使用者，最后一个使用者注销时停止后台采样线程."""
+        with self._lock:
+            if self._holders == 0:
+                return
+            self._holders -= 1
+            if self._holders > 0:
+                return
+            self._stop_event.set()
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.interval + 1.0)
+        self._logger.debug("系统负载采样线程已停止")
+
+    def snapshot(self) -> SystemLoadSnapshot:
+        """获取最新的负载快照.
+
+        后台线程运行时直接返回最近一次采样；否则立即做一次非阻塞采样。
+
+        Returns:
+            SystemLoadSnapshot: 负载快照
+        """
+        latest = self._latest
+        if latest is not None and self.running:
+            return latest
+        return self.sample()
+
+    def history(self) -> List[SystemLoadSnapshot]:
+        """获取环形缓冲区中的快照，按时间从旧到新排列."""
+        with self._sample_lock:
+            return list(self._history)
+
+    def sample(self) -> SystemLoadSnapshot:
+        """立即采样一次并发布快照.
+
+        所有psutil调用都是非阻塞的：CPU占用取距上次采样的平均值。
+
+        Returns:
+            SystemLoadSnapshot: 本次采样的快照
+        """
+        psutil = _import_psutil()
+        if psutil is None:
+            snapshot = SystemLoadSnapshot(timestamp=time.time())
+            self._latest = snapshot
+            return snapshot
+
+        readings = {"cpu_percent": 0.0, "memory_percent": 0.0, "disk_percent": 0.0}
+        try:
+            readings["cpu_percent"] = float(psutil.cpu_percent(interval=None))
+        except Exception as e:
+            self._logger.debug(f"CPU采样失败: {e}")
+        try:
+            memory = psutil.virtual_memory()
+            readings["memory_percent"] = float(memory.percent)
+            readings["memory_available"] = memory.available
+            readings["memory_total"] = memory.total
+        except Exception as e:
+            self._logger.debug(f"内存采样失败: {e}")
+        try:
+            disk = psutil.disk_usage(self.disk_path)
+            readings["disk_percent"] = disk.used / disk.total * 100
+            readings["disk_free"] = disk.free
+            readings["disk_total"] = disk.total
+        except Exception as e:
+            self._logger.debug(f"磁盘采样失败: {e}")
+        try:
+            if self._process is None:
+                self._process = psutil.Process()
+            readings["process_cpu_percent"] = float(self._process.cpu_percent(interval=None))
+            readings["process_memory_rss"] = float(self._process.memory_info().rss)
+        except Exception as e:
+            # 进程对象失效时下次重新创建
+            self._process = None
+            self._logger.debug(f"进程资源采样失败: {e}")
+
+        with self._sample_lock:
+            previous = self._latest if self._latest is not None and self._latest.available else None
+            snapshot = SystemLoadSnapshot(
+                timestamp=time.time(),
+                available=True,
+                cpu_smoothed=self._smooth(previous, "cpu", readings["cpu_percent"]),
+                memory_smoothed=self._smooth(previous, "memory", readings["memory_percent"]),
+                disk_smoothed=self._smooth(previous, "disk", readings["disk_percent"]),
+                **readings,
+            )
+            self._history.append(snapshot)
+            self._latest = snapshot
+        return snapshot
+
+    def _smooth(self, previous: Optional[SystemLoadSnapshot], name: str, value: float) -> float:
+        """计算EWMA，第一次采样直接使用读数."""
+        if previous is None:
+            return value
+        last = getattr(previous, f"{name}_smoothed")
+        return last + self.smoothing * (value - last)
+
+    def _sampling_loop(self, stop_event: threading.Event) -> None:
+        """后台采样循环."""
+        while not stop_event.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                self._logger.error(f"系统负载采样失败: {e}")
+            stop_event.wait(self.interval)
+
+
+_sampler: Optional[SystemLoadSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_system_load_sampler() -> SystemLoadSampler:
+    """获取进程内共享的系统负载采样器.
+
+    Returns:
+        SystemLoadSampler: 共享采样器
+    """
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = SystemLoadSampler()
+    return _sampler
@@ -233,7 +233,7 @@ class GameTaskRunner(BaseTaskRunner):
         
         try:
             if self.game_detector:
-                screenshot = self.game_detector.capture_screen()
+                screenshot = self.game_detector.capture_frame()
                 return OperationResult(
                     success=screenshot is not None,
                     execution_time=time.time() - start_time,
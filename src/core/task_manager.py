@@ -3,6 +3,7 @@
 提供任务调度、执行和管理功能，是系统的核心组件之一。
 """
 
+import asyncio
 import logging
 import threading
 import time
@@ -11,11 +12,11 @@ from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from queue import Empty, PriorityQueue
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from .error_handler import ErrorHandler
 from .smart_waiter import SmartWaiter
+from .system_load import get_system_load_sampler
 
 
 class TaskType(Enum):
@@ -129,50 +130,501 @@ class ResourceLimits:
     priority_boost_threshold: int = 10
 
 
-class ConcurrentTaskQueue:
-    """并发任务队列，支持优先级调度。"""
+class _IndexedTaskHeap:
+    """按执行ID索引的二叉堆（非线程安全）。
+
+    堆项为[优先级数值, 入队序号, 任务执行]，同优先级按入队顺序出队。
+    额外维护执行ID到堆下标的映射，因此移除和修改优先级都是O(log n)。
+    """
 
     def __init__(self):
-        """初始化队列。"""
-        self.queues: Dict[TaskPriority, PriorityQueue] = {
-            priority: PriorityQueue() for priority in TaskPriority
+        """初始化堆。"""
+        self._heap: List[list] = []
+        self._positions: Dict[str, int] = {}
+        self._sequence = 0
+        self.priority_counts: Dict[TaskPriority, int] = {
+            priority: 0 for priority in TaskPriority
         }
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, execution_id: str) -> bool:
+        return execution_id in self._positions
+
+    def push(self, task_execution: TaskExecution) -> bool:
+        """加入任务执行；已在堆中时按其当前优先级调整位置。
+
+        Returns:
+            是否新加入了堆项
+        """
+        if task_execution.execution_id in self._positions:
+            self.update_priority(task_execution.execution_id, task_execution.priority)
+            return False
+        self._sequence += 1
+        self._heap.append([task_execution.priority.value, self._sequence, task_execution])
+        self._positions[task_execution.execution_id] = len(self._heap) - 1
+        self.priority_counts[task_execution.priority] += 1
+        self._sift_up(len(self._heap) - 1)
+        return True
+
+    def pop(self) -> Optional[TaskExecution]:
+        """取出优先级最高的任务执行，堆为空时返回None。"""
+        if not self._heap:
+            return None
+        return self._remove_at(0)
+
+    def remove(self, execution_id: str) -> Optional[TaskExecution]:
+        """按执行ID移除任务执行，不存在时返回None。"""
+        index = self._positions.get(execution_id)
+        if index is None:
+            return None
+        return self._remove_at(index)
+
+    def update_priority(self, execution_id: str, priority: TaskPriority) -> bool:
+        """修改堆中任务执行的优先级。
+
+        Returns:
+            任务执行是否在堆中
+        """
+        index = self._positions.get(execution_id)
+        if index is None:
+            return False
+        entry = self._heap[index]
+        task_execution = entry[2]
+        self.priority_counts[task_execution.priority] -= 1
+        self.priority_counts[priority] += 1
+        task_execution.priority = priority
+        entry[0] = priority.value
+        self._sift_down(self._sift_up(index))
+        return True
+
+    def items(self) -> List[TaskExecution]:
+        """按堆数组顺序返回所有任务执行（不保证出队顺序）。"""
+        return [entry[2] for entry in self._heap]
+
+    def _remove_at(self, index: int) -> TaskExecution:
+        """移除指定下标的堆项。"""
+        entry = self._heap[index]
+        last = self._heap.pop()
+        task_execution = entry[2]
+        del self._positions[task_execution.execution_id]
+        self.priority_counts[task_execution.priority] -= 1
+        if index < len(self._heap):
+            self._heap[index] = last
+            self._positions[last[2].execution_id] = index
+            self._sift_down(self._sift_up(index))
+        return task_execution
+
+    def _swap(self, i: int, j: int) -> None:
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._positions[heap[i][2].execution_id] = i
+        self._positions[heap[j][2].execution_id] = j
+
+    def _sift_up(self, index: int) -> int:
+        heap = self._heap
+        while index > 0:
+            parent = (index - 1) // 2
+            if heap[index][:2] >= heap[parent][:2]:
+                break
+            self._swap(index, parent)
+            index = parent
+        return index
+
+    def _sift_down(self, index: int) -> int:
+        heap = self._heap
+        size = len(heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and heap[child][:2] < heap[smallest][:2]:
+                    smallest = child
+            if smallest == index:
+                return index
+            self._swap(index, smallest)
+            index = smallest
+
+
+class ConcurrentTaskQueue:
+    """并发任务队列，支持优先级调度。
+
+    所有优先级共用一个带索引的堆，由条件变量唤醒等待的消费者，
+    入队后阻塞在get上的线程立即返回，不需要轮询。
+    """
+
+    def __init__(self, maxsize: int = 0):
+        """初始化队列。
+
+        Args:
+            maxsize: 队列容量，0表示不限制
+        """
+        self.maxsize = maxsize
+        self._heap = _IndexedTaskHeap()
         self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._wakeups = 0
         self.task_count = 0
 
-    def put(self, task_execution: TaskExecution) -> None:
-        """添加任务到队列。"""
+    @property
+    def queues(self) -> Dict[TaskPriority, List[TaskExecution]]:
+        """各优先级排队中的任务快照。"""
         with self._lock:
-            priority_queue = self.queues[task_execution.priority]
-            # 使用任务创建时间作为次要排序键
-            priority_queue.put(
-                (task_execution.priority.value, time.time(), task_execution)
-            )
-            self.task_count += 1
+            snapshot: Dict[TaskPriority, List[TaskExecution]] = {
+                priority: [] for priority in TaskPriority
+            }
+            for task_execution in self._heap.items():
+                snapshot[task_execution.priority].append(task_execution)
+            return snapshot
+
+    def put(self, task_execution: TaskExecution, force: bool = False) -> bool:
+        """添加任务到队列。
+
+        任务已在队列中时只按其当前优先级调整位置。
+
+        Args:
+            task_execution: 任务执行对象
+            force: 是否忽略容量限制（用于已经准入过的任务）
+
+        Returns:
+            是否已入队，队列已满时返回False
+        """
+        with self._not_empty:
+            if (
+                not force
+                and self.maxsize > 0
+                and len(self._heap) >= self.maxsize
+                and task_execution.execution_id not in self._heap
+            ):
+                return False
+            if self._heap.push(task_execution):
+                self.task_count += 1
+            self._not_empty.notify()
+            return True
 
     def get(self, timeout: Optional[float] = None) -> Optional[TaskExecution]:
-        """从队列获取任务（按优先级）。"""
+        """从队列获取任务（按优先级）。
+
+        Args:
+            timeout: 最长等待秒数，None或0表示不等待
+
+        Returns:
+            优先级最高的任务，超时或被wake_all唤醒时队列仍为空则返回None
+        """
+        with self._not_empty:
+            if not self._heap and timeout:
+                deadline = time.monotonic() + timeout
+                wakeups = self._wakeups
+                while not self._heap and self._wakeups == wakeups:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._not_empty.wait(remaining)
+            return self._heap.pop()
+
+    def remove(self, execution_id: str) -> Optional[TaskExecution]:
+        """按执行ID移除排队中的任务。
+
+        Args:
+            execution_id: 执行ID
+
+        Returns:
+            被移除的任务，不在队列中时返回None
+        """
         with self._lock:
-            # 按优先级顺序检查队列
-            for priority in sorted(TaskPriority, key=lambda p: p.value):
-                queue = self.queues[priority]
-                try:
-                    _, _, task_execution = queue.get_nowait()
-                    task_execution_typed: TaskExecution = task_execution
-                    return task_execution_typed
-                except Empty:
-                    continue
-            return None
+            return self._heap.remove(execution_id)
+
+    def update_priority(self, execution_id: str, priority: TaskPriority) -> bool:
+        """修改排队中任务的优先级。
+
+        Args:
+            execution_id: 执行ID
+            priority: 新优先级
+
+        Returns:
+            任务是否在队列中
+        """
+        with self._lock:
+            return self._heap.update_priority(execution_id, priority)
+
+    def wake_all(self) -> None:
+        """唤醒所有阻塞在get上的线程（例如停止管理器时）。"""
+        with self._not_empty:
+            self._wakeups += 1
+            self._not_empty.notify_all()
+
+    def full(self) -> bool:
+        """队列是否已达到容量。"""
+        with self._lock:
+            return self.maxsize > 0 and len(self._heap) >= self.maxsize
 
     def size(self) -> int:
         """获取队列总大小。"""
         with self._lock:
-            return sum(queue.qsize() for queue in self.queues.values())
+            return len(self._heap)
+
+    def get_priority_counts(self) -> Dict[TaskPriority, int]:
+        """获取各优先级队列的任务数量。"""
+        with self._lock:
+            return dict(self._heap.priority_counts)
+
+
+class AsyncConcurrentTaskQueue:
+    """ConcurrentTaskQueue的asyncio版本。
+
+    接口与ConcurrentTaskQueue一致，get为协程，在事件循环内等待而不阻塞线程。
+    只能在同一个事件循环中使用。
+    """
+
+    def __init__(self, maxsize: int = 0):
+        """初始化队列。
+
+        Args:
+            maxsize: 队列容量，0表示不限制
+        """
+        self.maxsize = maxsize
+        self._heap = _IndexedTaskHeap()
+        self._not_empty: Optional[asyncio.Condition] = None
+        self.task_count = 0
+
+    def _condition(self) -> asyncio.Condition:
+        """延迟创建条件变量，使队列可以在事件循环启动前创建。"""
+        if self._not_empty is None:
+            self._not_empty = asyncio.Condition()
+        return self._not_empty
+
+    async def put(self, task_execution: TaskExecution, force: bool = False) -> bool:
+        """添加任务到队列。
+
+        Args:
+            task_execution: 任务执行对象
+            force: 是否忽略容量限制
+
+        Returns:
+            是否已入队，队列已满时返回False
+        """
+        if (
+            not force
+            and self.maxsize > 0
+            and len(self._heap) >= self.maxsize
+            and task_execution.execution_id not in self._heap
+        ):
+            return False
+        if self._heap.push(task_execution):
+            self.task_count += 1
+        condition = self._condition()
+        async with condition:
+            condition.notify()
+        return True
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[TaskExecution]:
+        """从队列获取任务，队列为空时等待。
+
+        Args:
+            timeout: 最长等待秒数，None表示一直等待
+
+        Returns:
+            优先级最高的任务，超时返回None
+        """
+        condition = self._condition()
+        async with condition:
+            try:
+                await asyncio.wait_for(
+                    condition.wait_for(lambda: len(self._heap) > 0), timeout
+                )
+            except asyncio.TimeoutError:
+                return None
+            return self._heap.pop()
+
+    def get_nowait(self) -> Optional[TaskExecution]:
+        """不等待地获取任务，队列为空时返回None。"""
+        return self._heap.pop()
+
+    def remove(self, execution_id: str) -> Optional[TaskExecution]:
+        """按执行ID移除排队中的任务。"""
+        return self._heap.remove(execution_id)
+
+    def update_priority(self, execution_id: str, priority: TaskPriority) -> bool:
+        """修改排队中任务的优先级。"""
+        return self._heap.update_priority(execution_id, priority)
+
+    def full(self) -> bool:
+        """队列是否已达到容量。"""
+        return self.maxsize > 0 and len(self._heap) >= self.maxsize
+
+    def size(self) -> int:
+        """获取队列总大小。"""
+        return len(self._heap)
 
     def get_priority_counts(self) -> Dict[TaskPriority, int]:
         """获取各优先级队列的任务数量。"""
+        return dict(self._heap.priority_counts)
+
+
+class DependencyState(Enum):
+    """任务依赖状态枚举。"""
+
+    READY = "ready"  # 依赖全部完成，可以运行
+    WAITING = "waiting"  # 仍有未完成的依赖
+    BLOCKED = "blocked"  # 有依赖失败或被取消，永远无法运行
+
+
+class DependencyTracker:
+    """任务依赖跟踪器（基于DAG的就绪队列）。
+
+    维护依赖任务ID到等待它的执行的反向索引，以及每个等待中执行的未满足
+    依赖计数。依赖完成时只访问它的直接后继，计数归零的执行立即就绪，
+    登记和完成的开销都与直接依赖/后继数量成正比，不需要轮询或休眠。
+    """
+
+    def __init__(self):
+        """初始化跟踪器。"""
+        self._lock = threading.Lock()
+        self._completed: Set[str] = set()
+        self._failed: Set[str] = set()
+        self._dependents: Dict[str, List[str]] = {}
+        self._unmet: Dict[str, int] = {}
+        self._waiting: Dict[str, TaskExecution] = {}
+
+    @staticmethod
+    def _dependencies_of(task_execution: TaskExecution) -> Set[str]:
+        """获取执行声明的依赖任务ID集合。"""
+        return set(task_execution.metadata.get('dependencies') or [])
+
+    def add(self, task_execution: TaskExecution) -> DependencyState:
+        """登记任务执行。
+
+        依赖全部完成时不登记，直接返回READY；有依赖已失败时返回BLOCKED，
+        并把该任务也记为失败，使依赖它的任务同样被阻断；否则挂起等待，
+        直到最后一个依赖完成时由mark_completed返回。
+
+        Args:
+            task_execution: 任务执行对象
+
+        Returns:
+            DependencyState: 依赖状态
+        """
+        dependencies = self._dependencies_of(task_execution)
+        if not dependencies:
+            return DependencyState.READY
+
+        with self._lock:
+            if dependencies & self._failed:
+                self._failed.add(task_execution.task_id)
+                return DependencyState.BLOCKED
+
+            unmet = dependencies - self._completed
+            if not unmet:
+                return DependencyState.READY
+
+            execution_id = task_execution.execution_id
+            if execution_id in self._waiting:
+                return DependencyState.WAITING
+            self._waiting[execution_id] = task_execution
+            self._unmet[execution_id] = len(unmet)
+            for dep_task_id in unmet:
+                self._dependents.setdefault(dep_task_id, []).append(execution_id)
+            return DependencyState.WAITING
+
+    def is_satisfied(self, task_execution: TaskExecution) -> bool:
+        """检查任务执行的依赖是否已全部完成。
+
+        Args:
+            task_execution: 任务执行对象
+
+        Returns:
+            依赖是否满足
+        """
+        dependencies = self._dependencies_of(task_execution)
+        if not dependencies:
+            return True
+        with self._lock:
+            return dependencies <= self._completed
+
+    def reset(self, task_id: str) -> None:
+        """清除任务上一次运行留下的完成或失败状态（任务重新运行时调用）。
+
+        之后登记的依赖该任务的执行会等待本次运行的结果。
+
+        Args:
+            task_id: 重新运行的任务ID
+        """
+        with self._lock:
+            self._completed.discard(task_id)
+            self._failed.discard(task_id)
+
+    def mark_completed(self, task_id: str) -> List[TaskExecution]:
+        """记录任务成功完成，覆盖之前的失败记录。
+
+        Args:
+            task_id: 完成的任务ID
+
+        Returns:
+            List[TaskExecution]: 因此变为就绪的执行
+        """
+        ready = []
+        with self._lock:
+            self._completed.add(task_id)
+            self._failed.discard(task_id)
+            for execution_id in self._dependents.pop(task_id, []):
+                # 已被取消的执行只从_waiting中删除，这里跳过残留的索引项
+                if execution_id not in self._waiting:
+                    continue
+                self._unmet[execution_id] -= 1
+                if self._unmet[execution_id] == 0:
+                    del self._unmet[execution_id]
+                    ready.append(self._waiting.pop(execution_id))
+        return ready
+
+    def mark_failed(self, task_id: str) -> List[Tuple[TaskExecution, str]]:
+        """记录任务失败或被取消，并沿依赖图阻断所有后继任务。
+
+        Args:
+            task_id: 失败的任务ID
+
+        Returns:
+            List[Tuple[TaskExecution, str]]: 被阻断的执行及其失败的直接依赖ID
+        """
+        blocked = []
+        with self._lock:
+            pending = [task_id]
+            while pending:
+                failed_task_id = pending.pop()
+                self._failed.add(failed_task_id)
+                self._completed.discard(failed_task_id)
+                for execution_id in self._dependents.pop(failed_task_id, []):
+                    execution = self._waiting.pop(execution_id, None)
+                    if execution is None:
+                        continue
+                    del self._unmet[execution_id]
+                    blocked.append((execution, failed_task_id))
+                    pending.append(execution.task_id)
+        return blocked
+
+    def discard(self, execution_id: str) -> bool:
+        """移除等待中的执行（例如任务被取消）。
+
+        反向索引中的残留项在依赖完成时惰性清理。
+
+        Args:
+            execution_id: 执行ID
+
+        Returns:
+            是否移除了等待中的执行
+        """
         with self._lock:
-            return {priority: queue.qsize() for priority, queue in self.queues.items()}
+            if self._waiting.pop(execution_id, None) is None:
+                return False
+            del self._unmet[execution_id]
+            return True
+
+    def waiting_count(self) -> int:
+        """获取等待依赖的执行数量。"""
+        with self._lock:
+            return len(self._waiting)
+
+
+MAX_QUEUED_TASKS = 100
 
 
 class TaskManager:
@@ -194,9 +646,10 @@ class TaskManager:
         self.smart_waiter = SmartWaiter()
 
         # 并发任务管理
-        self._concurrent_task_queue = ConcurrentTaskQueue()
+        self._concurrent_task_queue = ConcurrentTaskQueue(maxsize=MAX_QUEUED_TASKS)
         self._active_executions: Dict[str, TaskExecution] = {}
         self._completed_executions: Dict[str, TaskExecution] = {}
+        self._dependency_tracker = DependencyTracker()
         self._workers: Dict[str, WorkerInfo] = {}
 
         # 线程池和管理器
@@ -205,8 +658,9 @@ class TaskManager:
         self._concurrent_manager_running = False
         self._shutdown_event = threading.Event()
 
-        # 资源限制
+        # 资源限制和共享的系统负载采样器
         self._resource_limits = ResourceLimits()
+        self._load_sampler = get_system_load_sampler()
         
         self._logger.info(f"TaskManager 初始化完成，用户ID: {default_user_id}")
         
@@ -270,17 +724,21 @@ class TaskManager:
                     'name': task_data.get('name'),
                     'type': task_data.get('type', 'user'),
                     'user_id': user_id,
+                    'dependencies': list(task_data.get('dependencies', [])),
                     'created_at': datetime.now().isoformat()
                 }
             )
             
-            # 检查队列容量
-            if self._concurrent_task_queue.size() >= 100:
+            # 检查队列容量（包括等待依赖的任务）
+            pending_count = self._concurrent_task_queue.size() + self._dependency_tracker.waiting_count()
+            if pending_count >= self._concurrent_task_queue.maxsize:
                 print("任务队列已满，无法添加新任务")
                 return None
             
-            # 添加到队列
-            self._concurrent_task_queue.put(execution)
+            # 依赖已满足时加入队列，否则等待最后一个依赖完成
+            if not self._schedule_execution(execution):
+                print("任务队列已满，无法添加新任务")
+                return None
             
             # 更新统计信息
             self._stats["total_tasks"] += 1
@@ -333,20 +791,17 @@ class TaskManager:
         if len(self._active_executions) >= self._resource_limits.max_concurrent_tasks:
             return True
         
-        # 检查系统资源（CPU、内存等）
-        try:
-            import psutil
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            memory_percent = psutil.virtual_memory().percent
-            
-            # 如果CPU或内存使用率过高，限制执行
-            if cpu_percent > self._resource_limits.max_cpu_usage or memory_percent > self._resource_limits.max_memory_usage:
-                return True
-        except ImportError:
+        # 检查系统资源（CPU、内存等），使用平滑后的读数避免瞬时峰值导致频繁限流
+        load = self._load_sampler.snapshot()
+        if not load.available:
             # 如果没有psutil，只检查任务数量
-            pass
+            return False
         
-        return False
+        # 如果CPU或内存使用率过高，限制执行
+        return (
+            load.cpu_smoothed > self._resource_limits.max_cpu_usage
+            or load.memory_smoothed > self._resource_limits.max_memory_usage
+        )
     
     def _check_task_dependencies(self, task_execution: TaskExecution) -> bool:
         """检查任务依赖是否满足。
@@ -357,27 +812,62 @@ class TaskManager:
         Returns:
             依赖是否满足
         """
-        dependencies = task_execution.metadata.get('dependencies', [])
-        
-        if not dependencies:
-            return True
-        
-        # 检查依赖任务是否已完成
-        for dep_task_id in dependencies:
-            dep_completed = False
-            
-            # 在已完成任务中查找
-            for completed_exec in self._completed_executions.values():
-                if (completed_exec.task_id == dep_task_id and 
-                    completed_exec.state == TaskState.COMPLETED):
-                    dep_completed = True
-                    break
-            
-            if not dep_completed:
-                self._logger.debug(f"任务 {task_execution.task_id} 依赖 {dep_task_id} 未完成")
-                return False
-        
+        return self._dependency_tracker.is_satisfied(task_execution)
+
+    def _schedule_execution(self, task_execution: TaskExecution) -> bool:
+        """按依赖状态安排任务执行。
+
+        依赖全部完成时加入并发队列；仍有未完成依赖时挂起在依赖跟踪器中，
+        由最后一个依赖的完成回调加入队列；有依赖已失败时直接取消。
+
+        Args:
+            task_execution: 任务执行对象
+
+        Returns:
+            是否已接受，队列已满时返回False
+        """
+        state = self._dependency_tracker.add(task_execution)
+        if state == DependencyState.READY:
+            return self._concurrent_task_queue.put(task_execution)
+        if state == DependencyState.WAITING:
+            self._logger.debug(f"任务 {task_execution.task_id} 等待依赖完成")
+        else:
+            self._cancel_blocked_execution(task_execution, "依赖任务未成功完成")
         return True
+
+    def _resolve_dependents(self, task_execution: TaskExecution) -> None:
+        """任务结束后释放或取消依赖它的任务。
+
+        Args:
+            task_execution: 已结束的任务执行对象
+        """
+        if task_execution.state == TaskState.COMPLETED:
+            for ready_execution in self._dependency_tracker.mark_completed(task_execution.task_id):
+                self._logger.debug(f"任务 {ready_execution.task_id} 的依赖已全部完成")
+                # 等待依赖的任务在添加时已经计入容量
+                self._concurrent_task_queue.put(ready_execution, force=True)
+            return
+
+        blocked = self._dependency_tracker.mark_failed(task_execution.task_id)
+        for blocked_execution, dep_task_id in blocked:
+            self._cancel_blocked_execution(
+                blocked_execution, f"依赖任务 {dep_task_id} 未成功完成"
+            )
+
+    def _cancel_blocked_execution(self, task_execution: TaskExecution, reason: str) -> None:
+        """取消因依赖失败而无法运行的任务。
+
+        Args:
+            task_execution: 任务执行对象
+            reason: 取消原因
+        """
+        task_execution.state = TaskState.CANCELLED
+        task_execution.end_time = datetime.now()
+        task_execution.error = RuntimeError(reason)
+        self._active_executions.pop(task_execution.execution_id, None)
+        self._completed_executions[task_execution.execution_id] = task_execution
+        self._stats["cancelled_tasks"] += 1
+        self._logger.warning(f"任务已取消: {task_execution.task_id}，{reason}")
     
     def set_task_priority(self, task_id: str, new_priority: TaskPriority) -> bool:
         """设置任务优先级。
@@ -390,6 +880,14 @@ class TaskManager:
             是否设置成功
         """
         try:
+            # 排队中的任务按执行ID调整在队列中的位置
+            for execution in self._active_executions.values():
+                if execution.task_id == task_id and self._concurrent_task_queue.update_priority(
+                    execution.execution_id, new_priority
+                ):
+                    self._logger.info(f"排队任务 {task_id} 优先级已更新为 {new_priority.value}")
+                    return True
+
             # 在活动任务中查找并更新优先级
             for execution in self._active_executions.values():
                 if execution.task_id == task_id:
@@ -511,6 +1009,11 @@ class TaskManager:
             # 更新统计
             self._stats["cancelled_tasks"] += 1
             
+            # 从队列和依赖等待中移除，并取消依赖它的任务
+            self._concurrent_task_queue.remove(execution_id)
+            self._dependency_tracker.discard(execution_id)
+            self._resolve_dependents(execution_to_cancel)
+            
             self._logger.info(f"任务已取消: {execution_to_cancel.task_id} (执行ID: {execution_id})")
             return True
             
@@ -527,6 +1030,8 @@ class TaskManager:
             
             self._concurrent_manager_running = True
             self._shutdown_event.clear()
+            # 运行期间由后台线程持续采样系统负载，限流判断只读取最新快照
+            self._load_sampler.acquire()
             
             # 启动线程池
             if self._executor is None:
@@ -546,6 +1051,7 @@ class TaskManager:
         except Exception as e:
             self._logger.error(f"启动并发管理器失败: {str(e)}")
             self._concurrent_manager_running = False
+            self._load_sampler.release()
             raise
     
     def stop_concurrent_manager(self):
@@ -558,6 +1064,9 @@ class TaskManager:
             self._logger.info("开始停止并发管理器")
             self._concurrent_manager_running = False
             self._shutdown_event.set()
+            # 唤醒阻塞在队列上的管理器线程
+            self._concurrent_task_queue.wake_all()
+            self._load_sampler.release()
             
             # 等待管理器线程结束
             if self._concurrent_manager_thread and self._concurrent_manager_thread.is_alive():
@@ -590,27 +1099,30 @@ class TaskManager:
                         description="等待系统负载降低"
                     )
                 
-                # 从队列获取任务
+                if self._shutdown_event.is_set():
+                    break
+                
+                # 从队列获取任务，队列为空时阻塞直到有任务入队或管理器停止
                 task_execution = self._concurrent_task_queue.get(timeout=1.0)
+                if task_execution and task_execution.state == TaskState.CANCELLED:
+                    # 排队期间已被取消
+                    task_execution = None
                 if task_execution:
-                    # 检查任务依赖和前置条件
-                    if self._check_task_dependencies(task_execution):
-                        # 提交任务到线程池
-                        future = self._executor.submit(self._execute_task, task_execution)
+                    # 直接放入队列的任务可能绕过了依赖跟踪，依赖未满足时挂起而不是重新排队
+                    state = self._dependency_tracker.add(task_execution)
+                    if state == DependencyState.READY:
+                        # 重新运行的任务不再沿用上一次的完成或失败状态
+                        self._dependency_tracker.reset(task_execution.task_id)
+                        # 先登记为活动任务，快速完成的任务回调时才能找到它
                         self._active_executions[task_execution.execution_id] = task_execution
+                        future = self._executor.submit(self._execute_task, task_execution)
                         
                         # 设置完成回调
                         future.add_done_callback(
                             lambda f, exec_id=task_execution.execution_id: self._on_task_completed(exec_id, f)
                         )
-                    else:
-                        # 依赖未满足，重新放回队列
-                        self._concurrent_task_queue.put(task_execution)
-                        time.sleep(1.0)  # 等待依赖满足
-                
-                # 检查是否需要关闭
-                if self._shutdown_event.wait(0.1):
-                    break
+                    elif state == DependencyState.BLOCKED:
+                        self._cancel_blocked_execution(task_execution, "依赖任务未成功完成")
                     
             except Exception as e:
                 print(f"并发管理器循环错误: {e}")
@@ -751,6 +1263,7 @@ class TaskManager:
                 self._stats["failed_tasks"] += 1
             
             print(f"任务完成: {execution.task_id} (状态: {execution.state.value})")
+            self._resolve_dependents(execution)
     
     def _run_task(self, task_execution: TaskExecution) -> Any:
         """运行任务（测试兼容方法）。
@@ -839,18 +1352,21 @@ class TaskManager:
             if task_execution.execution_id in self._active_executions:
                 del self._active_executions[task_execution.execution_id]
             self._completed_executions[task_execution.execution_id] = task_execution
+            self._resolve_dependents(task_execution)
             
         except Exception as e:
             self._logger.error(f"处理任务完成时发生错误: {str(e)}")
     
-    def submit_concurrent_task(self, task_data: Dict[str, Any]) -> str:
+    def submit_concurrent_task(self, task_data: Dict[str, Any]) -> Optional[str]:
         """提交并发任务。
         
+        排队和等待依赖的任务共同计入队列容量，队列已满时不接受新任务。
+        
         Args:
             task_data: 任务数据字典
         
         Returns:
-            任务执行ID
+            任务执行ID，队列已满时返回None
         """
         # 验证优先级
         priority_str = task_data.get('priority', 'medium')
@@ -879,13 +1395,25 @@ class TaskManager:
             metadata={
                 'name': task_data.get('name'),
                 'type': task_data.get('type', 'user'),
+                'dependencies': list(task_data.get('dependencies', [])),
                 'created_at': datetime.now().isoformat()
             }
         )
         
-        self._concurrent_task_queue.put(execution)
+        # 检查队列容量（包括等待依赖的任务）
+        pending_count = self._concurrent_task_queue.size() + self._dependency_tracker.waiting_count()
+        if pending_count >= self._concurrent_task_queue.maxsize:
+            self._logger.warning("任务队列已满，无法提交并发任务")
+            return None
+        
         self._active_executions[execution.execution_id] = execution
         self._stats["total_tasks"] += 1
+        if not self._schedule_execution(execution):
+            # 撤销登记，队列已满的任务不计入统计
+            self._active_executions.pop(execution.execution_id, None)
+            self._stats["total_tasks"] -= 1
+            self._logger.warning("任务队列已满，无法提交并发任务")
+            return None
         
         return execution.execution_id
 
@@ -900,6 +1428,7 @@ class TaskManager:
             "queue_size": self._concurrent_task_queue.size(),
             "active_executions": len(self._active_executions),
             "completed_executions": len(self._completed_executions),
+            "waiting_dependencies": self._dependency_tracker.waiting_count(),
             "priority_counts": (self._concurrent_task_queue.get_priority_counts()),
             "stats": self._stats.copy(),
         }
@@ -940,6 +1469,11 @@ class TaskManager:
             # 更新统计
             self._stats["cancelled_tasks"] += 1
             
+            # 从队列和依赖等待中移除，并取消依赖它的任务
+            self._concurrent_task_queue.remove(execution_id_to_stop)
+            self._dependency_tracker.discard(execution_id_to_stop)
+            self._resolve_dependents(execution_to_stop)
+            
             self._logger.info(f"任务已停止: {task_id} (执行ID: {execution_id_to_stop})")
             return True
             
@@ -13,6 +13,7 @@ from enum import Enum
 
 from src.exceptions.automation_exceptions import TemplateMatchError
 from src.config.config_manager import ConfigManager
+from src.core.multi_match import find_instances
 
 
 class MatchMethod(Enum):
@@ -250,7 +251,9 @@ class TemplateMatcher:
                         screenshot: np.ndarray,
                         template_name: str,
                         threshold: Optional[float] = None,
-                        region: Optional[Tuple[int, int, int, int]] = None) -> List[MatchResult]:
+                        region: Optional[Tuple[int, int, int, int]] = None,
+                        iou_threshold: float = 0.3,
+                        max_results: Optional[int] = None) -> List[MatchResult]:
         """查找所有匹配项.
         
         Args:
@@ -258,9 +261,11 @@ class TemplateMatcher:
             template_name: 模板名称
             threshold: 匹配阈值
             region: 搜索区域
+            iou_threshold: 交并比超过该值的重叠匹配只保留置信度最高者
+            max_results: 最多返回的匹配数，None表示不限制
             
         Returns:
-            List[MatchResult]: 所有匹配结果
+            List[MatchResult]: 互不重叠的匹配结果，按置信度从高到低排列
         """
         try:
             # 检查模板是否已加载
@@ -289,38 +294,29 @@ class TemplateMatcher:
             # 执行模板匹配
             result = cv2.matchTemplate(search_image, template, method.value)
             
-            # 查找所有满足阈值的位置
-            if method == MatchMethod.TM_SQDIFF_NORMED:
-                locations = np.where(result <= (1.0 - threshold))
-                confidences = 1.0 - result[locations]
-            else:
-                locations = np.where(result >= threshold)
-                confidences = result[locations]
-            
-            matches = []
+            # 向量化提取峰值并做非极大值抑制，每个实例只返回一次
             template_h, template_w = template.shape[:2]
-            
-            for i, (y, x) in enumerate(zip(locations[0], locations[1])):
-                # 计算实际位置
-                actual_x = x + offset_x
-                actual_y = y + offset_y
-                
-                # 计算中心位置
-                center_x = actual_x + template_w // 2
-                center_y = actual_y + template_h // 2
-                
-                matches.append(MatchResult(
+            instances = find_instances(
+                result,
+                (template_h, template_w),
+                threshold,
+                sqdiff=method == MatchMethod.TM_SQDIFF_NORMED,
+                iou_threshold=iou_threshold,
+                max_results=max_results
+            )
+            
+            # find_instances已按置信度从高到低排列
+            return [
+                MatchResult(
                     found=True,
-                    confidence=float(confidences[i]),
-                    position=(center_x, center_y),
-                    region=(actual_x, actual_y, template_w, template_h),
+                    confidence=instance.confidence,
+                    position=(instance.center[0] + offset_x, instance.center[1] + offset_y),
+                    region=(instance.x + offset_x, instance.y + offset_y, template_w, template_h),
                     template_name=template_name,
                     match_method=method
-                ))
-            
-            # 按置信度排序
-            matches.sort(key=lambda x: x.confidence, reverse=True)
-            return matches
+                )
+                for instance in instances
+            ]
             
         except Exception as e:
             self.logger.error(f"查找所有匹配项失败 {template_name}: {e}")
@@ -9,6 +9,7 @@ import time
 from datetime import datetime
 from typing import Any, Callable, Dict, Optional, Union, TYPE_CHECKING
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from ..core.system_load import get_system_load_sampler
 from .types import HealthStatus, HealthCheckResult
 
 if TYPE_CHECKING:
@@ -250,6 +251,8 @@ class HealthChecker:
             return
 
         self._running = True
+        # 监控期间由后台线程持续采样系统负载，检查只读取最新快照
+        get_system_load_sampler().acquire()
         self._thread = threading.Thread(target=self._monitoring_loop, daemon=True)
         self._thread.start()
 
@@ -261,6 +264,7 @@ class HealthChecker:
             return
 
         self._running = False
+        get_system_load_sampler().release()
 
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=5.0)
@@ -317,9 +321,11 @@ class HealthChecker:
         # CPU 使用率检查
         def cpu_check() -> HealthCheckResult:
             try:
-                import psutil
+                load = get_system_load_sampler().snapshot()
+                if not load.available:
+                    raise ImportError("psutil")
 
-                cpu_percent = psutil.cpu_percent(interval=1)
+                cpu_percent = load.cpu_percent
 
                 if cpu_percent > 90:
                     status = HealthStatus.UNHEALTHY
@@ -335,7 +341,7 @@ class HealthChecker:
                     component="cpu",
                     status=status,
                     message=message,
-                    details={"cpu_percent": cpu_percent},
+                    details={"cpu_percent": cpu_percent, "cpu_smoothed": load.cpu_smoothed},
                 )
             except ImportError:
                 return HealthCheckResult(
@@ -353,28 +359,29 @@ class HealthChecker:
         # 内存使用率检查
         def memory_check() -> HealthCheckResult:
             try:
-                import psutil
-
-                memory = psutil.virtual_memory()
+                load = get_system_load_sampler().snapshot()
+                if not load.available:
+                    raise ImportError("psutil")
 
-                if memory.percent > 90:
+                if load.memory_percent > 90:
                     status = HealthStatus.UNHEALTHY
-                    message = f"High memory usage: {memory.percent}%"
-                elif memory.percent > 80:
+                    message = f"High memory usage: {load.memory_percent}%"
+                elif load.memory_percent > 80:
                     status = HealthStatus.DEGRADED
-                    message = f"Moderate memory usage: {memory.percent}%"
+                    message = f"Moderate memory usage: {load.memory_percent}%"
                 else:
                     status = HealthStatus.HEALTHY
-                    message = f"Normal memory usage: {memory.percent}%"
+                    message = f"Normal memory usage: {load.memory_percent}%"
 
                 return HealthCheckResult(
                     component="memory",
                     status=status,
                     message=message,
                     details={
-                        "percent": memory.percent,
-                        "available": memory.available,
-                        "total": memory.total,
+                        "percent": load.memory_percent,
+                        "smoothed": load.memory_smoothed,
+                        "available": load.memory_available,
+                        "total": load.memory_total,
                     },
                 )
             except ImportError:
@@ -393,13 +400,11 @@ class HealthChecker:
         # 磁盘使用率检查
         def disk_check() -> HealthCheckResult:
             try:
-                import psutil
-                import os
-
-                # Windows使用C:\，Unix使用/
-                path = "C:\\" if os.name == 'nt' else "/"
-                disk = psutil.disk_usage(path)
-                percent = (disk.used / disk.total) * 100
+                # 采样器统计系统盘：Windows使用C:\，Unix使用/
+                load = get_system_load_sampler().snapshot()
+                if not load.available:
+                    raise ImportError("psutil")
+                percent = load.disk_percent
 
                 if percent > 90:
                     status = HealthStatus.UNHEALTHY
@@ -417,8 +422,8 @@ class HealthChecker:
                     message=message,
                     details={
                         "percent": percent,
-                        "free": disk.free,
-                        "total": disk.total,
+                        "free": load.disk_free,
+                        "total": load.disk_total,
                     },
                 )
             except ImportError:
@@ -13,6 +13,8 @@ from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from typing import Any, Callable, Dict, List, Optional, Union, TYPE_CHECKING
 from datetime import datetime
 
+from ..core.system_load import get_system_load_sampler
+
 if TYPE_CHECKING:
     from .alert_manager import AlertManager
 
@@ -393,11 +395,16 @@ class MetricsCollector:
         Args:
             interval: 收集间隔（秒），可选参数
         """
+        if not self._running:
+            # 收集期间由后台线程持续采样系统负载
+            get_system_load_sampler().acquire()
         self._running = True
         self._logger.info("Metrics collection started")
 
     def stop(self) -> None:
         """停止指标收集."""
+        if self._running:
+            get_system_load_sampler().release()
         self._running = False
         self._logger.info("Metrics collection stopped")
 
@@ -671,33 +678,24 @@ class MetricsCollector:
         def system_health_collector() -> Dict[str, Any]:
             """系统健康指标收集器."""
             try:
+                load = get_system_load_sampler().snapshot()
+                if not load.available:
+                    return {}
                 import psutil
                 
                 metrics = {}
                 
                 # CPU使用率
-                cpu_percent = psutil.cpu_percent(interval=0.1)
-                metrics['system_cpu_usage'] = cpu_percent
+                metrics['system_cpu_usage'] = load.cpu_percent
+                metrics['system_cpu_usage_smoothed'] = load.cpu_smoothed
                 
                 # 内存使用率
-                memory = psutil.virtual_memory()
-                metrics['system_memory_usage'] = memory.percent
-                metrics['system_memory_available'] = memory.available / (1024 * 1024 * 1024)  # GB
+                metrics['system_memory_usage'] = load.memory_percent
+                metrics['system_memory_available'] = load.memory_available / (1024 * 1024 * 1024)  # GB
                 
-                # 磁盘使用率
-                try:
-                    disk = psutil.disk_usage('/')
-                    metrics['system_disk_usage'] = (disk.used / disk.total) * 100
-                    metrics['system_disk_free'] = disk.free / (1024 * 1024 * 1024)  # GB
-                except:
-                    # Windows系统使用C盘
-                    try:
-                        disk = psutil.disk_usage('C:\\')
-                        metrics['system_disk_usage'] = (disk.used / disk.total) * 100
-                        metrics['system_disk_free'] = disk.free / (1024 * 1024 * 1024)  # GB
-                    except:
-                        metrics['system_disk_usage'] = 0
-                        metrics['system_disk_free'] = 0
+                # 磁盘使用率（采样器统计系统盘）
+                metrics['system_disk_usage'] = load.disk_percent
+                metrics['system_disk_free'] = load.disk_free / (1024 * 1024 * 1024)  # GB
                 
                 # 网络IO
                 try:
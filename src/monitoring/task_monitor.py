@@ -11,6 +11,7 @@ import threading
 import time
 from typing import Any, Callable, Dict, List, Optional, Set
 
+from ..core.system_load import get_system_load_sampler
 from ..core.task_manager import TaskStatus
 
 
@@ -96,6 +97,8 @@ class TaskMonitor:
 
         self._running = True
         if self._monitoring_level in [MonitoringLevel.DETAILED, MonitoringLevel.FULL]:
+            # 监控期间由后台线程持续采样系统负载
+            get_system_load_sampler().acquire()
             self._thread = threading.Thread(target=self._monitoring_loop, daemon=True)
             self._thread.start()
 
@@ -107,9 +110,12 @@ class TaskMonitor:
             return
 
         self._running = False
+        if self._thread is not None:
+            get_system_load_sampler().release()
 
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=5.0)
+        self._thread = None
 
         self._logger.info("Task monitoring stopped")
 
@@ -459,23 +465,19 @@ class TaskMonitor:
             return
 
         try:
-            import psutil
-
-            # 获取当前进程的资源使用情况
-            process = psutil.Process()
-            memory_info = process.memory_info()
-            cpu_percent = process.cpu_percent()
+            # 当前进程的资源使用情况由共享采样器提供
+            load = get_system_load_sampler().snapshot()
+            if not load.available:
+                # psutil 不可用
+                return
 
             # 更新活跃任务的系统指标
             with self._lock:
                 for task_id in self._active_tasks:
                     if task_id in self._metrics:
                         metrics = self._metrics[task_id]
-                        metrics.memory_usage = memory_info.rss / 1024 / 1024  # MB
-                        metrics.cpu_usage = cpu_percent
+                        metrics.memory_usage = load.process_memory_rss / 1024 / 1024  # MB
+                        metrics.cpu_usage = load.process_cpu_percent
 
-        except ImportError:
-            # psutil 不可用
-            pass
         except Exception as e:
             self._logger.error(f"Error collecting system metrics: {e}")
@@ -50,6 +50,8 @@ class MainWindowMVP:
                 "task_manager", 
                 self._check_task_manager_health
             )
+            # 导出OCR结果缓存命中率
+            self.game_detector.register_ocr_metrics(self.monitoring_system.metrics_collector)
         
         # 自动化状态
         self.is_automation_running = False
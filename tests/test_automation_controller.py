@@ -996,7 +996,7 @@ class TestAutomationController:
         """测试异步场景检测."""
         # 模拟游戏检测器
         mock_detector = MagicMock()
-        mock_detector.capture_screen.return_value = "mock_screenshot"
+        mock_detector.capture_frame.return_value = "mock_screenshot"
         mock_detector.find_template.return_value = {"found": True, "center": (100, 100)}
         controller._game_detector = mock_detector
         
@@ -1258,7 +1258,7 @@ class TestAutomationController:
         """测试场景检测异常处理."""
         # 模拟游戏检测器抛出异常
         mock_detector = MagicMock()
-        mock_detector.capture_screen.side_effect = Exception("截图失败")
+        mock_detector.capture_frame.side_effect = Exception("截图失败")
         controller._game_detector = mock_detector
         
         # 测试异常处理
@@ -0,0 +1,155 @@
+"""视觉检测基准套件测试模块."""
+
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.corpus import load_corpus, synthesize_corpus
+from benchmarks.metrics import DetectionCounts, LatencyRecorder
+from benchmarks.report import build_report, compare_reports, render_markdown
+from benchmarks.vision import bench_scene_detection, bench_template_matching
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    """只包含一个按钮模板的模板目录."""
+    button = np.full((30, 60, 3), (40, 120, 200), dtype=np.uint8)
+    cv2.rectangle(button, (2, 2), (57, 27), (250, 250, 250), 2)
+    cv2.putText(button, "GO", (17, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+    directory = tmp_path / "templates" / "main_menu"
+    directory.mkdir(parents=True)
+    cv2.imwrite(str(directory / "start_button.png"), button)
+    return tmp_path / "templates"
+
+
+@pytest.fixture
+def corpus(tmp_path, templates_dir):
+    """在随机纹理背景上合成的小语料."""
+    return synthesize_corpus(
+        tmp_path / "corpus", templates_dir=templates_dir, backgrounds=[],
+        frames=6, frame_size=(320, 240), scaled_ratio=0.0, seed=1,
+    )
+
+
+class TestMetrics:
+    """延迟和准确率统计测试."""
+
+    def test_latency_percentiles(self):
+        """测试百分位数和吞吐量."""
+        recorder = LatencyRecorder()
+        for ms in range(1, 101):
+            recorder.add(ms / 1000.0)
+
+        summary = recorder.summary()
+
+        assert summary["calls"] == 100
+        assert summary["p50_ms"] == pytest.approx(50.5)
+        assert summary["p95_ms"] == pytest.approx(95.05)
+        assert summary["p99_ms"] == pytest.approx(99.01)
+        assert summary["throughput_per_s"] == pytest.approx(100 / 5.05, rel=1e-3)
+        assert LatencyRecorder().summary()["calls"] == 0
+
+    def test_detection_counts(self):
+        """测试位置错误同时计为误检和漏检."""
+        counts = DetectionCounts()
+        counts.record(found=True, present=True, correct=True)
+        counts.record(found=True, present=True, correct=False)
+        counts.record(found=True, present=False, correct=False)
+        counts.record(found=False, present=True, correct=False)
+        counts.record(found=False, present=False, correct=False)
+
+        assert (counts.tp, counts.fp, counts.fn, counts.tn) == (1, 2, 2, 1)
+        assert counts.precision == pytest.approx(1 / 3)
+        assert counts.recall == pytest.approx(1 / 3)
+
+
+class TestCorpus:
+    """语料合成和读取测试."""
+
+    def test_synthesized_labels_match_pixels(self, corpus, templates_dir):
+        """测试标注框处的像素就是模板."""
+        template = cv2.imread(str(templates_dir / "main_menu" / "start_button.png"))
+        reloaded = load_corpus(corpus.root)
+
+        assert len(reloaded.frames) == 6
+        assert reloaded.templates_dir == templates_dir.resolve()
+        assert reloaded.template_names == ["main_menu_start_button"]
+        for frame in reloaded.frames:
+            box = frame.box_for("main_menu_start_button")
+            assert frame.scene == ("main_menu" if box else "unknown")
+            if box:
+                x, y, w, h = box
+                patch = frame.image[y:y + h, x:x + w].astype(np.float32)
+                score = cv2.matchTemplate(patch, template.astype(np.float32), cv2.TM_CCOEFF_NORMED)
+                assert score.max() > 0.95
+
+
+class TestVisionBenchmarks:
+    """模板匹配和场景检测基准测试."""
+
+    def test_template_matching_strategies(self, corpus):
+        """测试各策略的延迟和准确率统计."""
+        results = bench_template_matching(corpus, ["single_scale", "grayscale", "roi"])
+
+        present = sum(1 for frame in corpus.frames if frame.objects)
+        for stats in results.values():
+            assert stats["calls"] == len(corpus.frames)
+            assert stats["tp"] + stats["fn"] == present
+            assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+        assert results["single_scale"]["recall"] == 1.0
+        # 合成帧中的文本框与按钮相似，只用TM_CCOEFF_NORMED的灰度模式不会误检
+        assert results["grayscale"]["precision"] == 1.0
+        assert results["grayscale"]["recall"] == 1.0
+        # 后面的帧在前面帧学到的搜索窗口内命中
+        assert results["roi"]["search_windows"]["roi_hits"] > 0
+
+    def test_scene_detection(self, tmp_path):
+        """测试场景检测基准使用检测器自身的模板."""
+        corpus = synthesize_corpus(
+            tmp_path / "scenes", backgrounds=[], frames=3, frame_size=(640, 360), seed=3,
+        )
+
+        result = bench_scene_detection(corpus)
+
+        assert result["calls"] == 3
+        assert set(result["scenes"]) >= {frame.scene for frame in corpus.frames}
+        assert 0.0 <= result["accuracy"] <= 1.0
+
+
+class TestReport:
+    """报告输出和基线对比测试."""
+
+    def _report(self, p95, recall):
+        corpus = {"frames": 1, "frame_sizes": ["320x240"], "objects": 1, "texts": 0, "templates": ["a"]}
+        stats = {"calls": 1, "p50_ms": 1.0, "p95_ms": p95, "p99_ms": p95, "throughput_per_s": 1.0,
+                 "precision": 1.0, "recall": recall}
+        return build_report(corpus, {"threshold": 0.8, "tolerance": 5, "repeat": 1}, {"pyramid": stats})
+
+    def test_compare_flags_regressions(self):
+        """测试p95延迟增幅和召回率降幅超过阈值时报告回退."""
+        baseline = self._report(p95=10.0, recall=1.0)
+
+        assert compare_reports(self._report(p95=11.0, recall=0.99), baseline) == []
+        regressions = compare_reports(self._report(p95=13.0, recall=0.9), baseline)
+        assert len(regressions) == 2
+        assert "pyramid" in regressions[0] and "recall" in regressions[1]
+        assert "pyramid" in render_markdown(self._report(13.0, 0.9), regressions)
+
+    def test_main_writes_reports(self, corpus, tmp_path):
+        """测试命令行入口写出JSON和Markdown报告并按基线返回退出码."""
+        output = tmp_path / "report"
+        args = ["--corpus", str(corpus.root), "--strategies", "single_scale",
+                "--skip-scene", "--output", str(output)]
+
+        assert main(args) == 0
+        report = json.loads((output / "benchmark.json").read_text(encoding="utf-8"))
+        assert report["template_matching"]["single_scale"]["recall"] == 1.0
+        assert "single_scale" in (output / "benchmark.md").read_text(encoding="utf-8")
+
+        report["template_matching"]["single_scale"]["p95_ms"] = 1e-6
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps(report), encoding="utf-8")
+        assert main(args + ["--baseline", str(baseline), "--fail-on-regression"]) == 2
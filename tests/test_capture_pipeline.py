@@ -0,0 +1,191 @@
+"""截图流水线测试模块."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.automation.automation_controller import AutomationController
+from src.core.capture_pipeline import CapturePipeline
+from src.core.frame_source import GeneratorFrameSource
+from src.core.game_detector import GameDetector
+
+
+class CountingSource(GeneratorFrameSource):
+    """每帧像素值递增并记录截图线程的帧来源."""
+
+    def __init__(self, size=(40, 30)):
+        self.threads = set()
+        self._count = 0
+        width, height = size
+
+        def produce():
+            self.threads.add(threading.get_ident())
+            self._count += 1
+            return np.full((height, width, 3), self._count % 256, dtype=np.uint8)
+
+        super().__init__(produce)
+
+
+@pytest.fixture
+def pipeline():
+    """创建并在测试结束后停止截图流水线."""
+    pipeline = CapturePipeline(CountingSource(), target_fps=200)
+    yield pipeline
+    pipeline.stop()
+
+
+class TestCapturePipeline:
+    """CapturePipeline测试."""
+
+    def test_latest_frame_is_non_blocking(self, pipeline):
+        """测试启动前latest返回None，启动后得到递增的帧."""
+        assert pipeline.latest() is None
+
+        pipeline.start()
+        first = pipeline.wait_for_frame(timeout=1.0)
+        second = pipeline.wait_for_frame(first.frame_id, timeout=1.0)
+
+        assert second.frame_id > first.frame_id
+        assert pipeline.latest().frame_id >= second.frame_id
+
+    def test_frames_are_published_read_only(self, pipeline):
+        """测试截图不经复制直接以只读帧发布."""
+        captured = []
+        source = pipeline.frame_source
+        capture = source.capture
+        source.capture = lambda window=None: captured.append(capture(window)) or captured[-1]
+        pipeline.start()
+        frame = pipeline.wait_for_frame(timeout=1.0)
+
+        assert any(np.shares_memory(frame.data, image) for image in captured)
+        assert not frame.data.flags.writeable
+        with pytest.raises(ValueError):
+            frame.data[0, 0, 0] = 1
+
+    def test_held_frame_is_not_overwritten(self, pipeline):
+        """测试消费者持有的帧在释放前不会被覆盖."""
+        pipeline.start()
+        frame = pipeline.wait_for_frame(timeout=1.0)
+        value = int(frame.data[0, 0, 0])
+        crop = frame.crop((0, 0, 10, 10))
+        del frame
+
+        for _ in range(10):
+            pipeline.wait_for_frame(timeout=1.0)
+
+        assert np.all(crop.data == value)
+
+    def test_keeps_capturing_while_frames_held(self):
+        """测试消费者持有帧时截图仍继续，持有的帧内容不变."""
+        pipeline = CapturePipeline(CountingSource(), target_fps=200)
+        try:
+            pipeline.start()
+            held = [pipeline.wait_for_frame(timeout=1.0)]
+            for _ in range(5):
+                held.append(pipeline.wait_for_frame(held[-1].frame_id, timeout=1.0))
+            values = [int(frame.data[0, 0, 0]) for frame in held]
+            time.sleep(0.05)
+
+            assert all(frame is not None for frame in held)
+            assert pipeline.latest().frame_id > held[-1].frame_id
+            assert [int(frame.data[0, 0, 0]) for frame in held] == values
+        finally:
+            pipeline.stop()
+
+    def test_same_frame_shared_by_consumers(self):
+        """测试同一帧的多个消费者得到同一个帧对象."""
+        pipeline = CapturePipeline(CountingSource(), target_fps=10)
+        pipeline._capture_once()
+
+        assert pipeline.latest() is pipeline.latest()
+        assert pipeline.wait_for_frame(after_frame_id=0, timeout=0.1) is pipeline.latest()
+
+    def test_wait_for_frame_timeout(self):
+        """测试未启动时等待新帧超时."""
+        pipeline = CapturePipeline(CountingSource(), target_fps=10)
+
+        assert pipeline.wait_for_frame(timeout=0.05) is None
+
+    @pytest.mark.asyncio
+    async def test_wait_for_frame_async(self, pipeline):
+        """测试在事件循环中等待新帧."""
+        pipeline.start()
+
+        frame = await pipeline.wait_for_frame_async(timeout=1.0)
+
+        assert frame is not None
+
+    def test_frame_listener(self, pipeline):
+        """测试新帧监听器在截图线程中被调用."""
+        received = threading.Event()
+        pipeline.add_frame_listener(lambda frame: received.set())
+
+        pipeline.start()
+
+        assert received.wait(1.0)
+
+    def test_invalid_parameters(self):
+        """测试无效参数."""
+        with pytest.raises(ValueError):
+            CapturePipeline(CountingSource(), target_fps=0)
+
+
+class TestDetectorCapturePipeline:
+    """GameDetector截图流水线集成测试."""
+
+    def test_capture_reads_pipeline_frame(self):
+        """测试流水线运行时截图在后台线程完成，调用方只读取最新帧."""
+        source = CountingSource()
+        detector = GameDetector(frame_source=source)
+        try:
+            pipeline = detector.start_capture_pipeline(target_fps=100)
+            assert pipeline.wait_for_frame(timeout=1.0) is not None
+            # 设置来源时预读帧尺寸会在当前线程截图一次
+            source.threads.clear()
+
+            screenshot = detector.capture_screenshot(max_age=0)
+
+            assert screenshot is not None
+            assert not screenshot.flags.writeable
+            assert threading.get_ident() not in source.threads
+        finally:
+            detector.stop_capture_pipeline()
+
+        assert detector.capture_pipeline is None
+        assert detector.capture_screenshot() is not None
+        assert threading.get_ident() in source.threads
+
+
+class TestAutomationControllerPipeline:
+    """AutomationController异步截图测试."""
+
+    @pytest.fixture
+    def controller(self):
+        """创建带有模拟检测器的控制器."""
+        detector = MagicMock()
+        detector.find_template.return_value = {'found': True, 'center': (1, 1)}
+        with patch('src.automation.automation_controller.TaskManager', None):
+            return AutomationController(game_detector=detector)
+
+    @pytest.mark.asyncio
+    async def test_scene_detection_runs_off_event_loop(self, controller):
+        """测试场景检测在工作线程中执行."""
+        threads = []
+        controller._game_detector.capture_frame.side_effect = (
+            lambda: threads.append(threading.get_ident()) or "frame"
+        )
+
+        assert await controller._detect_current_scene_async() == "main_menu"
+        assert threads and threads[0] != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_loop_starts_and_stops_pipeline(self, controller):
+        """测试自动化循环启动和停止截图流水线."""
+        await controller.start_automation_loop()
+        await controller.stop_automation_loop()
+
+        controller._game_detector.start_capture_pipeline.assert_called_once_with(target_fps=15.0)
+        controller._game_detector.stop_capture_pipeline.assert_called()
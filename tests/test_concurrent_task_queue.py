@@ -0,0 +1,188 @@
+"""ConcurrentTaskQueue阻塞与索引操作测试模块."""
+
+import asyncio
+import random
+import threading
+import time
+from unittest.mock import patch
+
+from src.core.task_manager import (
+    AsyncConcurrentTaskQueue,
+    ConcurrentTaskQueue,
+    TaskExecution,
+    TaskManager,
+    TaskPriority,
+    TaskState,
+)
+
+
+def _execution(execution_id, priority=TaskPriority.MEDIUM):
+    """创建任务执行."""
+    return TaskExecution(
+        task_id=f"task_{execution_id}",
+        execution_id=execution_id,
+        priority=priority,
+        state=TaskState.QUEUED,
+    )
+
+
+class TestConcurrentTaskQueueBlocking:
+    """阻塞获取测试."""
+
+    def test_get_wakes_on_put(self):
+        """测试阻塞的get在入队后立即返回."""
+        queue = ConcurrentTaskQueue()
+        received = []
+
+        def consume():
+            start = time.perf_counter()
+            received.append((queue.get(timeout=5.0), time.perf_counter() - start))
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        time.sleep(0.05)
+        queue.put(_execution("a"))
+        consumer.join(2.0)
+
+        execution, waited = received[0]
+        assert execution.execution_id == "a"
+        assert waited < 1.0
+
+    def test_wake_all_releases_waiters(self):
+        """测试wake_all让空队列上的等待者返回None."""
+        queue = ConcurrentTaskQueue()
+        results = []
+        consumer = threading.Thread(target=lambda: results.append(queue.get(timeout=5.0)))
+        consumer.start()
+        time.sleep(0.05)
+
+        queue.wake_all()
+        consumer.join(1.0)
+
+        assert not consumer.is_alive()
+        assert results == [None]
+
+
+class TestConcurrentTaskQueueIndex:
+    """按执行ID移除、调整优先级和容量测试."""
+
+    def test_fifo_within_priority(self):
+        """测试同优先级按入队顺序出队."""
+        queue = ConcurrentTaskQueue()
+        for name in ("a", "b", "c"):
+            queue.put(_execution(name))
+        queue.put(_execution("urgent", TaskPriority.URGENT))
+
+        assert [queue.get().execution_id for _ in range(4)] == ["urgent", "a", "b", "c"]
+
+    def test_remove_and_update_priority(self):
+        """测试移除和修改优先级后出队顺序与计数."""
+        queue = ConcurrentTaskQueue()
+        for name in ("a", "b", "c"):
+            queue.put(_execution(name, TaskPriority.LOW))
+
+        assert queue.remove("b").execution_id == "b"
+        assert queue.remove("b") is None
+        assert queue.update_priority("c", TaskPriority.HIGH)
+        assert not queue.update_priority("missing", TaskPriority.HIGH)
+
+        assert queue.get_priority_counts()[TaskPriority.HIGH] == 1
+        assert queue.get_priority_counts()[TaskPriority.LOW] == 1
+        first = queue.get()
+        assert first.execution_id == "c" and first.priority == TaskPriority.HIGH
+        assert queue.get().execution_id == "a"
+        assert queue.get() is None
+
+    def test_random_operations_keep_heap_order(self):
+        """测试随机移除和调整后仍按优先级和入队顺序出队."""
+        rng = random.Random(7)
+        priorities = list(TaskPriority)
+        queue = ConcurrentTaskQueue()
+        expected = {}
+        for index in range(200):
+            execution_id = f"e{index}"
+            priority = rng.choice(priorities)
+            queue.put(_execution(execution_id, priority))
+            expected[execution_id] = (priority.value, index)
+        for execution_id in rng.sample(sorted(expected), 60):
+            queue.remove(execution_id)
+            del expected[execution_id]
+        for execution_id in rng.sample(sorted(expected), 60):
+            priority = rng.choice(priorities)
+            queue.update_priority(execution_id, priority)
+            expected[execution_id] = (priority.value, expected[execution_id][1])
+
+        order = [queue.get().execution_id for _ in range(len(expected))]
+
+        assert order == sorted(expected, key=expected.get)
+        assert queue.size() == 0
+
+    def test_capacity(self):
+        """测试容量限制只拒绝新任务."""
+        queue = ConcurrentTaskQueue(maxsize=2)
+        assert queue.put(_execution("a"))
+        assert queue.put(_execution("b"))
+
+        assert queue.full()
+        assert not queue.put(_execution("c"))
+        assert queue.put(_execution("a", TaskPriority.HIGH))
+        assert queue.put(_execution("d"), force=True)
+        assert queue.size() == 3
+
+    def test_task_manager_cancel_removes_queued_task(self):
+        """测试取消排队任务会把它从队列中移除."""
+        manager = TaskManager()
+        execution_id = manager.submit_concurrent_task({"name": "a"})
+        task_id = manager._active_executions[execution_id].task_id
+        other = manager.submit_concurrent_task({"name": "b", "priority": "low"})
+
+        assert manager.set_task_priority(manager._active_executions[other].task_id, TaskPriority.URGENT)
+        assert manager.stop_task(task_id)
+
+        assert manager._concurrent_task_queue.size() == 1
+        assert manager._concurrent_task_queue.get().execution_id == other
+
+    def test_task_manager_submit_rejected_when_full(self):
+        """测试队列已满时提交并发任务返回None且不留下登记."""
+        manager = TaskManager()
+        manager._concurrent_task_queue = ConcurrentTaskQueue(maxsize=2)
+        first = manager.submit_concurrent_task({"name": "a"})
+        first_task_id = manager._active_executions[first].task_id
+        # 等待依赖的任务同样占用容量
+        assert manager.submit_concurrent_task({"name": "b", "dependencies": [first_task_id]})
+
+        assert manager.submit_concurrent_task({"name": "c"}) is None
+        assert len(manager._active_executions) == 2
+        assert manager._stats["total_tasks"] == 2
+
+    def test_task_manager_submit_rolls_back_when_not_scheduled(self):
+        """测试任务未能入队时撤销活动登记和统计."""
+        manager = TaskManager()
+        with patch.object(manager, "_schedule_execution", return_value=False):
+            assert manager.submit_concurrent_task({"name": "a"}) is None
+
+        assert manager._active_executions == {}
+        assert manager._stats["total_tasks"] == 0
+
+
+class TestAsyncConcurrentTaskQueue:
+    """AsyncConcurrentTaskQueue测试."""
+
+    def test_get_waits_for_put(self):
+        """测试协程get等待入队并按优先级出队."""
+
+        async def scenario():
+            queue = AsyncConcurrentTaskQueue()
+            waiter = asyncio.ensure_future(queue.get())
+            await asyncio.sleep(0)
+            await queue.put(_execution("a"))
+            first = await asyncio.wait_for(waiter, 1.0)
+
+            await queue.put(_execution("low", TaskPriority.LOW))
+            await queue.put(_execution("high", TaskPriority.HIGH))
+            queue.update_priority("low", TaskPriority.URGENT)
+            ordered = [(await queue.get()).execution_id, queue.get_nowait().execution_id]
+            timed_out = await queue.get(timeout=0.01)
+            return first.execution_id, ordered, timed_out
+
+        assert asyncio.run(scenario()) == ("a", ["low", "high"], None)
@@ -0,0 +1,160 @@
+"""帧缓存测试模块."""
+
+import time
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from src.core.frame_cache import CachedFrame, FrameCache
+from src.core.game_detector import GameDetector, GameWindow
+
+
+class TestFrameCache:
+    """FrameCache测试."""
+
+    @pytest.fixture
+    def cache(self):
+        """创建帧缓存实例."""
+        return FrameCache(max_age=10.0)
+
+    def test_put_assigns_monotonic_frame_ids(self, cache):
+        """测试帧ID单调递增."""
+        first = cache.put(1, "frame_a")
+        second = cache.put(2, "frame_b")
+        third = cache.put(1, "frame_c")
+
+        assert first.frame_id < second.frame_id < third.frame_id
+        assert cache.latest(1).image == "frame_c"
+
+    def test_get_or_capture_reuses_fresh_frame(self, cache):
+        """测试有效期内的请求复用缓存帧."""
+        capture = Mock(return_value="frame")
+
+        first = cache.get_or_capture(1, capture)
+        second = cache.get_or_capture(1, capture)
+
+        assert capture.call_count == 1
+        assert first is second
+        assert cache.get_stats()['hits'] == 1
+
+    def test_get_expired_frame(self):
+        """测试过期帧不会被返回."""
+        cache = FrameCache(max_age=0.01)
+        cache.put(1, "frame")
+        time.sleep(0.02)
+
+        assert cache.get(1) is None
+
+    def test_zero_max_age_forces_capture(self, cache):
+        """测试max_age为0时强制重新截图."""
+        capture = Mock(side_effect=["frame_a", "frame_b"])
+
+        cache.get_or_capture(1, capture)
+        frame = cache.get_or_capture(1, capture, max_age=0)
+
+        assert frame.image == "frame_b"
+        assert capture.call_count == 2
+
+    def test_failed_capture_is_not_cached(self, cache):
+        """测试截图失败时不写入缓存."""
+        assert cache.get_or_capture(1, Mock(return_value=None)) is None
+        assert cache.latest(1) is None
+
+    def test_hold_keeps_frame_alive(self):
+        """测试检测周期内缓存帧不过期."""
+        cache = FrameCache(max_age=0.01)
+        capture = Mock(side_effect=["frame_a", "frame_b"])
+
+        with cache.hold():
+            first = cache.get_or_capture(1, capture)
+            time.sleep(0.02)
+            second = cache.get_or_capture(1, capture)
+
+        assert first is second
+        assert capture.call_count == 1
+
+    def test_hold_starts_with_fresh_frame(self, cache):
+        """测试进入检测周期时丢弃旧帧."""
+        cache.put(1, "stale")
+
+        with cache.hold():
+            frame = cache.get_or_capture(1, Mock(return_value="fresh"))
+
+        assert frame.image == "fresh"
+
+    def test_invalidate(self, cache):
+        """测试缓存失效."""
+        cache.put(1, "frame_a")
+        cache.put(2, "frame_b")
+
+        cache.invalidate(1)
+        assert cache.get(1) is None
+        assert cache.get(2) is not None
+
+        cache.invalidate()
+        assert cache.get(2) is None
+
+    def test_cached_frame_age(self):
+        """测试帧龄计算."""
+        frame = CachedFrame(hwnd=1, frame_id=1, image=None)
+        assert frame.age >= 0.0
+
+
+class TestGameDetectorFrameCache:
+    """GameDetector帧缓存集成测试."""
+
+    @pytest.fixture
+    def detector(self):
+        """创建带有模拟窗口的GameDetector."""
+        detector = GameDetector()
+        detector.frame_cache.max_age = 10.0
+        detector.game_window = GameWindow(
+            hwnd=12345,
+            title="Test Game",
+            rect=(0, 0, 800, 600),
+            width=800,
+            height=600,
+            is_foreground=True,
+        )
+        return detector
+
+    def test_detector_calls_share_one_capture(self, detector):
+        """测试多次检测调用只截图一次."""
+        screenshot = np.zeros((600, 800, 3), dtype=np.uint8)
+
+        with patch.object(
+            detector.window_manager, 'capture_window', return_value=screenshot
+        ) as mock_capture:
+            detector.detect_ui_elements(['main_menu_start_button'])
+            detector.find_ui_element('combat_attack_button')
+            detector.detect_current_scene()
+            detector.capture_screenshot()
+
+        mock_capture.assert_called_once()
+
+    def test_invalidate_frame_cache_triggers_new_capture(self, detector):
+        """测试使缓存失效后重新截图."""
+        screenshot = np.zeros((600, 800, 3), dtype=np.uint8)
+
+        with patch.object(
+            detector.window_manager, 'capture_window', return_value=screenshot
+        ) as mock_capture:
+            detector.capture_screenshot()
+            detector.invalidate_frame_cache()
+            detector.capture_screenshot()
+
+        assert mock_capture.call_count == 2
+
+    def test_detection_tick_refreshes_frame(self, detector):
+        """测试新的检测周期截取新帧."""
+        with patch.object(
+            detector.window_manager,
+            'capture_window',
+            side_effect=[np.zeros((10, 10, 3)), np.ones((10, 10, 3))],
+        ):
+            detector.capture_screenshot()
+            with detector.detection_tick():
+                screenshot = detector.capture_screenshot()
+
+        assert screenshot.max() == 1
@@ -0,0 +1,360 @@
+"""帧差分测试模块."""
+
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+import pytest
+
+from src.automation.automation_controller import AutomationController
+from src.core.frame_diff import FrameChange, FrameChangeDetector
+from src.core.game_detector import GameDetector, GameWindow, TemplateInfo
+from src.core.raw_frame import RawFrame
+
+
+def make_frame(seed: int = 0) -> np.ndarray:
+    """创建平滑纹理截图."""
+    rng = np.random.default_rng(seed)
+    return cv2.GaussianBlur(
+        rng.integers(0, 255, (480, 640, 3), dtype=np.uint8), (0, 0), 2
+    )
+
+
+class TestFrameChangeDetector:
+    """FrameChangeDetector测试."""
+
+    def test_first_frame_is_full_change(self):
+        """测试首帧需要全帧检测."""
+        change = FrameChangeDetector().update(make_frame())
+
+        assert change.changed
+        assert change.full_frame
+        assert change.bounds == (0, 0, 640, 480)
+
+    def test_identical_frame_is_unchanged(self):
+        """测试相同画面不产生变化."""
+        detector = FrameChangeDetector()
+        frame = make_frame()
+        detector.update(frame)
+
+        change = detector.update(frame.copy())
+
+        assert not change.changed
+        assert change.tiles == []
+        assert change.bounds is None
+        assert detector.get_stats()['unchanged_frames'] == 1
+
+    def test_local_change_reports_tiles(self):
+        """测试局部变化只报告相应分块."""
+        detector = FrameChangeDetector(grid=(16, 12))
+        frame = make_frame()
+        detector.update(frame)
+
+        modified = frame.copy()
+        modified[100:130, 200:260] = 255
+        change = detector.update(modified)
+
+        assert change.changed
+        assert not change.full_frame
+        assert 0 < change.change_ratio < 0.05
+        assert change.intersects((200, 100, 60, 30))
+        assert not change.intersects((500, 400, 40, 40))
+        x, y, w, h = change.bounds
+        assert x <= 200 and y <= 100 and x + w >= 260 and y + h >= 130
+
+    def test_resolution_change_is_full_change(self):
+        """测试尺寸变化时视为全帧变化."""
+        detector = FrameChangeDetector()
+        detector.update(make_frame())
+
+        change = detector.update(cv2.resize(make_frame(), (320, 240)))
+
+        assert change.full_frame
+
+    def test_accepts_raw_frame(self):
+        """测试接受BGRA原始帧."""
+        detector = FrameChangeDetector()
+        bgra = cv2.cvtColor(make_frame(), cv2.COLOR_BGR2BGRA)
+        detector.update(RawFrame.from_array(bgra))
+
+        assert not detector.update(RawFrame.from_array(bgra.copy())).changed
+
+    def test_gradual_ramp_is_reported(self):
+        """测试每帧差异都低于阈值的渐变仍会累积到阈值并被报告."""
+        detector = FrameChangeDetector(pixel_threshold=12)
+        detector.update(np.zeros((480, 640, 3), dtype=np.uint8))
+
+        changes = [
+            detector.update(np.full((480, 640, 3), value, dtype=np.uint8))
+            for value in range(10, 260, 10)
+        ]
+
+        flags = [change.changed for change in changes]
+        assert sum(flags) >= 10
+        # 累积差异每两帧就超过阈值，不会连续两帧都报告未变化
+        assert not any(a is False and b is False for a, b in zip(flags, flags[1:]))
+
+    def test_reference_advances_only_changed_tiles(self):
+        """测试只有被报告变化的分块更新参考帧，其他分块的缓慢变化继续累积."""
+        detector = FrameChangeDetector(grid=(16, 12), pixel_threshold=12)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        detector.update(frame)
+
+        # 左上角缓慢变亮，同时右下角发生明显变化
+        step = frame.copy()
+        step[:40, :40] = 8
+        step[440:, 600:] = 255
+        change = detector.update(step)
+        assert not change.intersects((0, 0, 40, 40))
+        assert change.intersects((600, 440, 40, 40))
+
+        step = step.copy()
+        step[:40, :40] = 16
+        change = detector.update(step)
+        assert change.changed
+        assert change.intersects((0, 0, 40, 40))
+        assert not change.intersects((600, 440, 40, 40))
+
+    def test_search_region_is_padded_and_clipped(self):
+        """测试搜索区域按模板尺寸扩展并裁剪到画面内."""
+        change = FrameChange(
+            changed=True, full_frame=False, frame_size=(640, 480),
+            tiles=[(0, 0, 40, 40)],
+        )
+
+        assert change.search_region((30, 20)) == (0, 0, 70, 60)
+
+
+    def test_signature_compare_does_not_touch_previous_frame(self):
+        """测试帧签名比较不影响update记住的上一帧."""
+        detector = FrameChangeDetector()
+        frame = make_frame()
+        detector.update(frame)
+        modified = frame.copy()
+        modified[100:130, 200:260] = 255
+
+        change = detector.compare(detector.signature(frame), detector.signature(modified))
+
+        assert change.changed and not change.full_frame
+        assert change.intersects((200, 100, 60, 30))
+        assert not detector.update(frame.copy()).changed
+        assert detector.get_stats()['frames'] == 2
+
+class TestIncrementalDetection:
+    """GameDetector增量检测测试."""
+
+    @pytest.fixture
+    def scene(self):
+        """创建截图和从中截取的模板."""
+        frame = make_frame(1)
+        template = frame[300:340, 400:480].copy()
+        return frame, template
+
+    @pytest.fixture
+    def detector(self, scene):
+        """创建带有模拟窗口和测试模板的GameDetector."""
+        _, template = scene
+        detector = GameDetector()
+        detector.frame_cache.max_age = 0
+        detector.template_matcher.template_info_cache = {
+            "button": TemplateInfo(name="button", image=template, threshold=0.9, path=""),
+        }
+        detector.game_window = GameWindow(
+            hwnd=1, title="Game", rect=(0, 0, 640, 480),
+            width=640, height=480, is_foreground=True,
+        )
+        return detector
+
+    def test_unchanged_frame_reuses_results(self, detector, scene):
+        """测试画面未变化时不再进行模板匹配."""
+        frame, _ = scene
+        with patch.object(detector.window_manager, 'capture_window', return_value=frame):
+            first = detector.detect_ui_elements_incremental(["button"])
+            with patch.object(
+                detector.template_matcher, '_match_template_in_image'
+            ) as mock_match, patch.object(
+                detector.template_matcher, 'match_multiple_templates'
+            ) as mock_batch:
+                second = detector.detect_ui_elements_incremental(["button"])
+
+        assert [element.position for element in first] == [(400, 300)]
+        assert second == first
+        mock_match.assert_not_called()
+        mock_batch.assert_not_called()
+
+    def test_change_elsewhere_keeps_element(self, detector, scene):
+        """测试变化区域不与元素相交时保留上次结果."""
+        frame, _ = scene
+        modified = frame.copy()
+        modified[20:60, 20:60] = 0
+        with patch.object(
+            detector.window_manager, 'capture_window', side_effect=[frame, modified]
+        ):
+            detector.detect_ui_elements_incremental(["button"])
+            with patch.object(detector.template_matcher, 'match_template') as mock_match:
+                elements = detector.detect_ui_elements_incremental(["button"])
+
+        assert [element.position for element in elements] == [(400, 300)]
+        mock_match.assert_not_called()
+
+    def test_new_element_matched_in_changed_region(self, detector, scene):
+        """测试新出现的元素只在变化区域附近匹配."""
+        frame, template = scene
+        blank = frame.copy()
+        blank[300:340, 400:480] = 0
+        with patch.object(
+            detector.window_manager, 'capture_window', side_effect=[blank, frame]
+        ):
+            assert detector.detect_ui_elements_incremental(["button"]) == []
+            with patch.object(
+                detector.template_matcher, 'match_template_in_region',
+                wraps=detector.template_matcher.match_template_in_region,
+            ) as mock_region:
+                elements = detector.detect_ui_elements_incremental(["button"])
+
+        assert [element.position for element in elements] == [(400, 300)]
+        region = mock_region.call_args.args[2]
+        assert region[2] * region[3] < 640 * 480 / 3
+
+    def test_unrequested_element_invalidated_by_change(self, detector, scene):
+        """测试未请求的元素受局部变化影响时不会保留过期结果."""
+        frame, template = scene
+        blank = frame.copy()
+        blank[300:340, 400:480] = 0
+        detector.template_matcher.template_info_cache["other"] = TemplateInfo(
+            name="other", image=template, threshold=0.9, path="",
+        )
+        with patch.object(
+            detector.window_manager, 'capture_window', side_effect=[frame, blank, blank]
+        ):
+            assert len(detector.detect_ui_elements_incremental(["button"])) == 1
+            detector.detect_ui_elements_incremental(["other"])
+            assert detector.detect_ui_elements_incremental(["button"]) == []
+
+    def test_element_skipped_by_stop_when_is_not_stale(self, detector, scene):
+        """测试stop_when之后未评估的元素下次重新匹配，而不是按之后的差异复用旧结果."""
+        frame, _ = scene
+        detector.template_matcher.template_info_cache["other"] = TemplateInfo(
+            name="other", image=frame[100:140, 100:180].copy(), threshold=0.9, path="",
+        )
+        other_gone = frame.copy()
+        other_gone[100:140, 100:180] = 0
+        # 之后只有与两个元素都不相交的区域变化
+        elsewhere = other_gone.copy()
+        elsewhere[420:460, 20:60] = 255
+        with patch.object(
+            detector.window_manager, 'capture_window', side_effect=[frame, other_gone, elsewhere]
+        ):
+            assert len(detector.detect_ui_elements_incremental(["button", "other"])) == 2
+            detector.detect_ui_elements_incremental(["button", "other"], stop_when=lambda e: True)
+            elements = detector.detect_ui_elements_incremental(["button", "other"])
+
+        assert [element.name for element in elements] == ["button"]
+
+    def test_large_change_rematches_with_batch(self, detector, scene):
+        """测试变化范围过大时用批量匹配重新检测，而不是逐尺度的单模板匹配."""
+        frame, _ = scene
+        shifted = frame.copy()
+        shifted[:, :600] = frame[:, 40:]
+        with patch.object(
+            detector.window_manager, 'capture_window', side_effect=[frame, shifted]
+        ):
+            detector.detect_ui_elements_incremental(["button"])
+            with patch.object(
+                detector.template_matcher, 'match_template', wraps=detector.template_matcher.match_template
+            ) as mock_single:
+                elements = detector.detect_ui_elements_incremental(["button"])
+
+        assert [element.position for element in elements] == [(360, 300)]
+        mock_single.assert_not_called()
+
+    def test_detect_scene_incremental(self, detector, scene):
+        """测试增量场景检测使用增量元素检测."""
+        with patch.object(detector, 'is_game_running', return_value=True), \
+                patch.object(
+                    detector, 'detect_ui_elements_incremental', return_value=[]
+                ) as mock_incremental, \
+                patch.object(detector, 'detect_ui_elements') as mock_full:
+            detector.detect_scene(incremental=True)
+
+        mock_incremental.assert_called_once()
+        mock_full.assert_not_called()
+
+
+class TestAutomationControllerFrameDiff:
+    """AutomationController场景检测帧差分测试."""
+
+    @pytest.fixture
+    def controller(self):
+        """创建带有模拟检测器的控制器."""
+        detector = MagicMock()
+        detector.find_template.return_value = {
+            'found': True, 'confidence': 0.9, 'center': (120, 120),
+            'top_left': (100, 100), 'bottom_right': (140, 140),
+        }
+        with patch('src.automation.automation_controller.TaskManager', None):
+            return AutomationController(game_detector=detector)
+
+    @pytest.mark.asyncio
+    async def test_unchanged_frame_reuses_scene(self, controller):
+        """测试画面未变化时复用上次场景."""
+        frame = make_frame()
+        controller._game_detector.capture_frame.return_value = frame
+
+        assert await controller._detect_current_scene_async() == "main_menu"
+        assert await controller._detect_current_scene_async() == "main_menu"
+
+        assert controller._game_detector.find_template.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_local_change_searches_changed_region(self, controller):
+        """测试局部变化时只在变化区域查找未匹配的模板."""
+        frame = make_frame()
+        modified = frame.copy()
+        modified[400:440, 500:560] = 0
+        detector = controller._game_detector
+        detector.capture_frame.side_effect = [frame, modified]
+        detector.find_template.side_effect = [
+            {'found': False, 'confidence': 0.1, 'center': None},
+            {'found': True, 'confidence': 0.9, 'center': (120, 120),
+             'top_left': (100, 100), 'bottom_right': (140, 140)},
+            {'found': True, 'confidence': 0.9, 'center': (530, 420),
+             'top_left': (500, 400), 'bottom_right': (560, 440)},
+        ]
+
+        assert await controller._detect_current_scene_async() == "world_map"
+        assert await controller._detect_current_scene_async() == "main_menu"
+
+        region = detector.find_template.call_args.kwargs['region']
+        x, y, w, h = region
+        assert x <= 500 and y <= 400 and x + w >= 560 and y + h >= 440
+
+    @pytest.mark.asyncio
+    async def test_scene_skipped_after_match_is_not_stale(self, controller):
+        """测试检测到前面的场景后未评估的模板下次全帧匹配，不复用过期结果."""
+        frame = make_frame()
+        world_map_gone = frame.copy()
+        world_map_gone[300:340, 300:340] = 0
+        main_menu_changed = world_map_gone.copy()
+        main_menu_changed[100:140, 100:140] = 0
+        detector = controller._game_detector
+        detector.capture_frame.side_effect = [frame, world_map_gone, main_menu_changed]
+        missing = {'found': False, 'confidence': 0.1, 'center': None}
+        world_map = {'found': True, 'confidence': 0.9, 'center': (320, 320),
+                     'top_left': (300, 300), 'bottom_right': (340, 340)}
+        main_menu = {'found': True, 'confidence': 0.9, 'center': (120, 120),
+                     'top_left': (100, 100), 'bottom_right': (140, 140)}
+        detector.find_template.side_effect = [
+            missing, world_map,           # 第一帧：main_menu未出现，world_map
+            main_menu,                    # 第二帧：main_menu出现在变化区域，world_map未评估
+            missing, missing, missing, missing, missing,  # 第三帧：main_menu消失
+        ]
+
+        assert await controller._detect_current_scene_async() == "world_map"
+        assert await controller._detect_current_scene_async() == "main_menu"
+        assert await controller._detect_current_scene_async() == "unknown"
+
+        # world_map在第二帧未评估，第三帧全帧重新匹配
+        third_frame_calls = detector.find_template.call_args_list[3:]
+        assert third_frame_calls[1].args[0] == "assets/templates/world_map.png"
+        assert 'region' not in third_frame_calls[1].kwargs
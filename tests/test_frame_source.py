@@ -0,0 +1,201 @@
+"""截图帧来源测试模块."""
+
+import time
+from unittest.mock import Mock
+
+import cv2
+import numpy as np
+import pytest
+
+from src.core.frame_source import (
+    GeneratorFrameSource, ReplayFrameSource, Win32FrameSource
+)
+from src.core.game_detector import GameDetector, TemplateInfo
+from src.core.scene_monitor import SceneChangeEvent, SceneMonitor
+
+
+def make_frame(value: int, size=(80, 60)) -> np.ndarray:
+    """创建纯色测试帧."""
+    width, height = size
+    return np.full((height, width, 3), value, dtype=np.uint8)
+
+
+@pytest.fixture
+def replay_dir(tmp_path):
+    """创建包含三张截图的回放目录."""
+    for index, value in enumerate([10, 20, 30]):
+        cv2.imwrite(str(tmp_path / f"frame_{index:03d}.png"), make_frame(value))
+    (tmp_path / "notes.txt").write_text("not a frame")
+    return tmp_path
+
+
+class TestReplayFrameSource:
+    """ReplayFrameSource测试."""
+
+    def test_directory_replay_in_order(self, replay_dir):
+        """测试按文件名顺序回放截图目录."""
+        source = ReplayFrameSource(replay_dir)
+
+        values = []
+        while source.is_available():
+            values.append(int(source.capture()[0, 0, 0]))
+
+        assert values == [10, 20, 30]
+        assert source.capture() is None
+        assert source.current_name == "frame_002.png"
+
+    def test_loop(self, replay_dir):
+        """测试循环回放."""
+        source = ReplayFrameSource(replay_dir, loop=True)
+
+        values = [int(source.capture()[0, 0, 0]) for _ in range(5)]
+
+        assert values == [10, 20, 30, 10, 20]
+
+    def test_preload(self, replay_dir):
+        """测试预读到内存后回放."""
+        source = ReplayFrameSource(replay_dir, preload=True)
+        (replay_dir / "frame_000.png").unlink()
+
+        assert int(source.capture()[0, 0, 0]) == 10
+
+    def test_frame_size_does_not_advance(self, replay_dir):
+        """测试读取帧尺寸不会跳过帧."""
+        source = ReplayFrameSource(replay_dir)
+
+        assert source.frame_size() == (80, 60)
+        assert int(source.capture()[0, 0, 0]) == 10
+
+    def test_fps_throttles_replay(self, replay_dir):
+        """测试按帧率节流回放."""
+        source = ReplayFrameSource(replay_dir, fps=20)
+
+        start = time.monotonic()
+        for _ in range(3):
+            source.capture()
+
+        assert time.monotonic() - start >= 0.09
+
+    def test_video_replay(self, tmp_path):
+        """测试回放视频文件."""
+        path = tmp_path / "session.avi"
+        writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 10, (80, 60))
+        if not writer.isOpened():
+            pytest.skip("当前OpenCV不支持写入视频")
+        for value in (50, 150):
+            writer.write(make_frame(value))
+        writer.release()
+
+        with ReplayFrameSource(path) as source:
+            frames = [source.capture(), source.capture(), source.capture()]
+
+        assert frames[0].shape == (60, 80, 3)
+        assert abs(int(frames[1][30, 40, 0]) - 150) < 10
+        assert frames[2] is None
+
+    def test_missing_path(self, tmp_path):
+        """测试路径不存在时报错."""
+        with pytest.raises(FileNotFoundError):
+            ReplayFrameSource(tmp_path / "missing")
+
+
+class TestGeneratorFrameSource:
+    """GeneratorFrameSource测试."""
+
+    def test_iterable(self):
+        """测试从帧序列生成."""
+        source = GeneratorFrameSource(make_frame(v) for v in (1, 2))
+
+        assert [int(source.capture()[0, 0, 0]) for _ in range(2)] == [1, 2]
+        assert not source.is_available()
+
+    def test_callable(self):
+        """测试从生成函数获取帧."""
+        counter = iter(range(3))
+        source = GeneratorFrameSource(lambda: make_frame(next(counter, 0)))
+
+        assert int(source.capture()[0, 0, 0]) == 0
+        assert int(source.capture()[0, 0, 0]) == 1
+        assert source.frames_read == 2
+
+
+class TestWin32FrameSource:
+    """Win32FrameSource测试."""
+
+    def test_delegates_to_window_manager(self):
+        """测试委托给WindowManager截图."""
+        window_manager = Mock()
+        window_manager.capture_window.return_value = "image"
+        window = Mock()
+
+        source = Win32FrameSource(window_manager)
+
+        assert source.live
+        assert source.capture(window) == "image"
+        window_manager.capture_window.assert_called_once_with(window)
+
+
+class TestDetectorWithFrameSource:
+    """检测器使用离线帧来源的测试."""
+
+    @pytest.fixture
+    def frames(self):
+        """创建带有按钮和不带按钮的两帧."""
+        rng = np.random.default_rng(2)
+        background = cv2.GaussianBlur(
+            rng.integers(0, 255, (240, 320, 3), dtype=np.uint8), (0, 0), 2
+        )
+        # 高对比度棋盘格按钮，避免在平滑背景上误匹配
+        squares = (np.indices((32, 64)) // 8).sum(axis=0) % 2
+        button = np.repeat((squares * 255).astype(np.uint8)[:, :, None], 3, axis=2)
+        with_button = background.copy()
+        with_button[100:132, 120:184] = button
+        return button, [with_button, background]
+
+    def test_detector_runs_headless(self, frames):
+        """测试无窗口环境下使用生成器来源完成检测."""
+        button, images = frames
+        detector = GameDetector(frame_source=GeneratorFrameSource(images))
+        detector.template_matcher.template_info_cache = {
+            "main_menu_start_button": TemplateInfo(
+                name="main_menu_start_button", image=button, threshold=0.9, path=""
+            ),
+        }
+
+        assert detector.game_window.width == 320
+        assert detector.is_game_running()
+
+        elements = detector.detect_ui_elements(["main_menu_start_button"])
+        assert [element.position for element in elements] == [(120, 100)]
+
+        detector.invalidate_frame_cache()
+        assert detector.detect_ui_elements(["main_menu_start_button"]) == []
+
+        detector.invalidate_frame_cache()
+        assert not detector.is_game_running()
+
+    def test_scene_monitor_replays_until_exhausted(self, frames):
+        """测试场景监控全速回放离线来源，读完后自动停止."""
+        button, images = frames
+        detector = GameDetector()
+        detector.template_matcher.template_info_cache = {
+            "main_menu_start_button": TemplateInfo(
+                name="main_menu_start_button", image=button, threshold=0.9, path=""
+            ),
+        }
+        monitor = SceneMonitor(
+            detector,
+            detection_interval=0,
+            stability_threshold=1,
+            frame_source=GeneratorFrameSource([images[0]] * 3 + [images[1]] * 3),
+        )
+        entered = []
+        monitor.add_scene_callback(
+            SceneChangeEvent.SCENE_ENTERED, lambda event, data: entered.append(data['scene'])
+        )
+
+        monitor.start_monitoring()
+        monitor._monitor_thread.join(timeout=10)
+
+        assert not monitor.get_monitoring_status()['monitoring']
+        assert [scene.value for scene in entered] == ["main_menu", "unknown"]
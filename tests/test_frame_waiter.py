@@ -0,0 +1,152 @@
+"""逐帧等待测试模块."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import cv2
+import numpy as np
+import pytest
+
+from src.core.frame_source import GeneratorFrameSource
+from src.core.game_detector import GameDetector, SceneType, TemplateInfo
+from src.core.game_operator import GameOperator, WaitCondition
+from src.core.sync_adapter import SyncAdapter
+
+
+class SwitchableScreen:
+    """可在测试中切换画面的帧生成器."""
+
+    def __init__(self):
+        rng = np.random.default_rng(3)
+        self.background = cv2.GaussianBlur(
+            rng.integers(0, 255, (240, 320, 3), dtype=np.uint8), (0, 0), 2
+        )
+        # 高对比度棋盘格按钮，避免在平滑背景上误匹配
+        squares = (np.indices((32, 64)) // 8).sum(axis=0) % 2
+        self.button = np.repeat((squares * 255).astype(np.uint8)[:, :, None], 3, axis=2)
+        self.with_button = self.background.copy()
+        self.with_button[100:132, 120:184] = self.button
+        self.current = self.background
+
+    def __call__(self) -> np.ndarray:
+        return self.current.copy()
+
+    def show_button(self, delay: float = 0.0) -> None:
+        """延迟后显示按钮."""
+        threading.Timer(delay, lambda: setattr(self, 'current', self.with_button)).start()
+
+
+@pytest.fixture
+def screen():
+    """创建可切换画面."""
+    return SwitchableScreen()
+
+
+@pytest.fixture
+def detector(screen):
+    """创建使用内存帧来源的检测器."""
+    detector = GameDetector(frame_source=GeneratorFrameSource(screen))
+    detector.template_matcher.template_info_cache = {
+        name: TemplateInfo(name=name, image=screen.button, threshold=0.9, path="")
+        for name in ("main_menu_start_button", "confirm_button")
+    }
+    yield detector
+    detector.stop_capture_pipeline()
+
+
+class TestFrameWaiter:
+    """FrameWaiter测试."""
+
+    def test_wait_returns_after_element_appears(self, detector, screen):
+        """测试元素出现后等待返回."""
+        screen.show_button(0.2)
+
+        start = time.monotonic()
+        element = detector.wait_for_ui_element("confirm_button", timeout=3.0)
+
+        assert element is not None
+        assert element.position == (120, 100)
+        assert time.monotonic() - start < 0.2 + 0.5
+
+    def test_timeout_returns_none(self, detector):
+        """测试超时返回None并移除等待."""
+        assert detector.frame_waiter.wait_for_element("confirm_button", timeout=0.3) is None
+        assert detector.frame_waiter.get_stats()['pending_waits'] == 0
+
+    def test_concurrent_waits_share_evaluation(self, detector, screen):
+        """测试并发等待共享每一帧的检测."""
+        waiter = detector.frame_waiter
+        results = []
+        with patch.object(
+            detector, 'detect_ui_elements_incremental',
+            wraps=detector.detect_ui_elements_incremental,
+        ) as mock_detect:
+            threads = [
+                threading.Thread(target=lambda name=name: results.append(
+                    waiter.wait_for_element(name, timeout=3.0)
+                ))
+                for name in ["confirm_button", "main_menu_start_button"] * 3
+            ]
+            for thread in threads:
+                thread.start()
+            screen.show_button(0.3)
+            for thread in threads:
+                thread.join()
+
+        assert len(results) == 6 and all(results)
+        assert mock_detect.call_count == waiter.get_stats()['evaluations']
+        assert all(
+            set(call.args[0]) <= {"confirm_button", "main_menu_start_button"}
+            for call in mock_detect.call_args_list
+        )
+
+    def test_pipeline_frames_drive_evaluation(self, detector, screen):
+        """测试截图流水线运行时由新帧唤醒评估."""
+        detector.start_capture_pipeline(target_fps=50)
+        screen.show_button(0.2)
+
+        element = detector.wait_for_ui_element("confirm_button", timeout=3.0)
+
+        assert element is not None
+        assert detector.frame_waiter.get_stats()['event_driven']
+
+    @pytest.mark.asyncio
+    async def test_async_disappear_and_scene(self, detector, screen):
+        """测试异步等待元素消失和场景切换."""
+        waiter = detector.frame_waiter
+        screen.current = screen.with_button
+
+        scene = await waiter.wait_for_scene_async("main_menu", timeout=3.0)
+        assert scene == SceneType.MAIN_MENU
+
+        gone_task = asyncio.create_task(
+            waiter.wait_for_element_gone_async("confirm_button", timeout=3.0)
+        )
+        await asyncio.sleep(0.2)
+        assert not gone_task.done()
+        screen.current = screen.background
+
+        assert await gone_task is True
+
+
+class TestGameOperatorWaits:
+    """GameOperator使用逐帧等待的测试."""
+
+    @pytest.mark.asyncio
+    async def test_wait_for_condition_uses_frame_waiter(self, detector, screen):
+        """测试等待条件通过检测器的逐帧等待器完成."""
+        operator = GameOperator(game_detector=detector, sync_adapter=Mock(spec=SyncAdapter))
+        screen.show_button(0.2)
+
+        with patch.object(
+            detector.frame_waiter, 'wait_for_element_async',
+            wraps=detector.frame_waiter.wait_for_element_async,
+        ) as mock_wait:
+            result = await operator.wait_for_condition(
+                WaitCondition.UI_ELEMENT_APPEAR, {"element_name": "confirm_button"}, timeout=3.0
+            )
+
+        assert result.success
+        mock_wait.assert_called_once_with("confirm_button", 3.0)
@@ -11,6 +11,7 @@
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock, call, mock_open
+import cv2
 import numpy as np
 from pathlib import Path
 import os
@@ -19,7 +20,9 @@ import logging
 
 from src.core.game_detector import (
     GameDetector, TemplateMatcher, WindowManager,
-    SceneType, GameWindow, UIElement, TemplateInfo
+    SceneType, GameWindow, UIElement, TemplateInfo,
+    TemplateBank, TemplateEntry, SearchWindowTracker, PreparedFrame,
+    ScaleCalibrator
 )
 from src.config.config_manager import ConfigManager
 
@@ -404,15 +407,16 @@ class TestGameDetector:
     def test_wait_for_ui_element_success(self, game_detector):
         """测试成功等待UI元素出现."""
         mock_element = UIElement(name='test', position=(10, 10), size=(20, 20), confidence=0.9, template_path='test.png')
-        game_detector.find_ui_element = Mock(return_value=mock_element)
+        game_detector.detect_ui_elements_incremental = Mock(return_value=[mock_element])
         
         element = game_detector.wait_for_ui_element('test', timeout=1)
         
         assert element == mock_element
+        game_detector.detect_ui_elements_incremental.assert_called_with(['test'])
 
     def test_wait_for_ui_element_timeout(self, game_detector):
         """测试等待UI元素超时."""
-        game_detector.find_ui_element = Mock(return_value=None)
+        game_detector.detect_ui_elements_incremental = Mock(return_value=[])
         
         element = game_detector.wait_for_ui_element('test', timeout=0.1)
         
@@ -546,7 +550,7 @@ class TestGameDetector:
         """测试成功等待模板出现."""
         mock_element = UIElement(name='test', position=(10, 10), size=(20, 20), confidence=0.9, template_path='test.png')
         
-        with patch.object(game_detector, 'find_ui_element', return_value=mock_element):
+        with patch.object(game_detector, 'detect_ui_elements_incremental', return_value=[mock_element]):
             element = game_detector.wait_for_template('test', timeout=1)
             
             assert element == mock_element
@@ -2241,4 +2245,577 @@ class TestScaleFactorsCalculation:
         
         # 应该返回标准的缩放因子列表
         expected_factors = [0.5, 0.75, 1.0, 1.25, 1.5, 2.0]
-        assert factors == expected_factors
\ No newline at end of file
+        assert factors == expected_factors
+
+
+class TestTemplateBank:
+    """TemplateBank模板库测试."""
+
+    @pytest.fixture
+    def templates_dir(self, tmp_path):
+        """创建包含子目录的临时模板目录."""
+        root = tmp_path / "templates"
+        (root / "combat").mkdir(parents=True)
+        image = np.random.randint(0, 255, (64, 96, 3), dtype=np.uint8)
+        cv2.imwrite(str(root / "main_menu.png"), image)
+        cv2.imwrite(str(root / "combat" / "attack_button.png"), image)
+        return root
+
+    def test_load_directory_names_and_precompute(self, templates_dir):
+        """测试递归加载模板并预生成派生数据."""
+        bank = TemplateBank(scale_factors=[0.5, 1.0], pyramid_levels=2)
+        entries = bank.load_directory(str(templates_dir))
+
+        assert sorted(entry.name for entry in entries) == ["combat_attack_button", "main_menu"]
+        entry = bank.get("main_menu")
+        assert entry.gray.shape == (64, 96)
+        assert len(entry.pyramid(2)) == 2
+        assert entry.scaled(0.5).shape[:2] == (32, 48)
+        assert bank.get_stats()['disk_reads'] == 2
+
+    def test_resolve_name_and_path_to_same_entry(self, templates_dir):
+        """测试名称和路径解析到同一条目."""
+        bank = TemplateBank(base_dir=str(templates_dir.parent))
+        bank.load_directory(str(templates_dir))
+        entry = bank.get("main_menu")
+
+        assert bank.resolve("main_menu") is entry
+        assert bank.resolve(str(templates_dir / "main_menu.png")) is entry
+        assert bank.resolve("templates/main_menu.png") is entry
+        assert bank.resolve("other/dir/main_menu.png") is entry
+        assert bank.resolve("missing.png") is None
+        assert bank.resolve(None) is None
+
+    def test_load_file_reads_disk_once(self, templates_dir):
+        """测试同一路径只读取一次磁盘."""
+        bank = TemplateBank()
+        path = str(templates_dir / "main_menu.png")
+
+        first = bank.load_file(path)
+        second = bank.load_file(path)
+
+        assert first is second
+        assert bank.disk_reads == 1
+
+    def test_scaled_invalid_size(self):
+        """测试缩放后尺寸无效时返回None."""
+        entry = TemplateEntry("tiny", "tiny.png", np.zeros((2, 2, 3), dtype=np.uint8))
+
+        assert entry.scaled(0.1) is None
+        assert entry.scaled(1.0) is entry.color
+
+    def test_game_detector_find_template_without_disk_reads(self, templates_dir):
+        """测试find_template在热路径上不读取磁盘."""
+        detector = GameDetector()
+        bank = detector.template_matcher.template_bank
+        bank.load_directory(str(templates_dir))
+        screenshot = np.zeros((300, 400, 3), dtype=np.uint8)
+        screenshot[100:164, 150:246] = bank.get("main_menu").color
+        reads_before = bank.disk_reads
+
+        with patch.object(detector, 'capture_screenshot', return_value=screenshot), \
+             patch('src.core.game_detector.cv2.imread') as mock_imread:
+            by_name = detector.find_template("main_menu")
+            by_path = detector.find_template(str(templates_dir / "main_menu.png"))
+
+        mock_imread.assert_not_called()
+        assert bank.disk_reads == reads_before
+        assert by_name['found'] and by_path['found']
+        assert by_name['top_left'] == (150, 100)
+
+
+class TestSearchWindowTracker:
+    """搜索窗口跟踪器测试."""
+
+    def test_window_requires_min_samples(self):
+        """测试样本不足时不生成搜索窗口."""
+        tracker = SearchWindowTracker(min_samples=3)
+        frame_shape = (1080, 1920, 3)
+
+        for _ in range(2):
+            tracker.record("button", frame_shape, (100, 900), (80, 40))
+            assert tracker.get_window("button", frame_shape, (40, 80, 3)) is None
+
+        tracker.record("button", frame_shape, (104, 902), (80, 40))
+        window = tracker.get_window("button", frame_shape, (40, 80, 3))
+
+        assert window is not None
+        x0, y0, x1, y1 = window
+        assert x0 <= 100 and y0 <= 900 and x1 >= 184 and y1 >= 942
+        assert (x1 - x0) * (y1 - y0) < 1920 * 1080 / 10
+
+    def test_window_fits_scaled_template_inside_frame(self):
+        """测试窗口能容纳缩放后的模板且不超出帧边界."""
+        tracker = SearchWindowTracker(min_samples=1, margin=0.0)
+        frame_shape = (600, 800, 3)
+        tracker.record("corner", frame_shape, (780, 590), (20, 10))
+
+        x0, y0, x1, y1 = tracker.get_window(
+            "corner", frame_shape, (10, 20, 3), max_scale=2.0
+        )
+
+        assert x1 <= 800 and y1 <= 600
+        assert x1 - x0 >= 40 and y1 - y0 >= 20
+
+    def test_configured_roi_takes_precedence(self):
+        """测试配置的搜索区域优先于学习结果."""
+        tracker = SearchWindowTracker(min_samples=1, margin=0.0)
+        frame_shape = (1000, 1000, 3)
+        tracker.record("button", frame_shape, (900, 900), (10, 10))
+
+        window = tracker.get_window(
+            "button", frame_shape, (10, 10, 3), configured=(0.1, 0.1, 0.2, 0.2)
+        )
+
+        assert window == (100, 100, 300, 300)
+
+    def test_window_too_large_is_ignored(self):
+        """测试接近全帧的窗口直接走全帧匹配."""
+        tracker = SearchWindowTracker(min_samples=1)
+        window = tracker.get_window(
+            "button", (100, 100, 3), (10, 10, 3), configured=(0.0, 0.0, 1.0, 1.0)
+        )
+        assert window is None
+
+
+class TestTemplateMatcherROI:
+    """TemplateMatcher搜索窗口匹配测试."""
+
+    @pytest.fixture
+    def scene(self):
+        """创建带有随机纹理模板的截图."""
+        rng = np.random.default_rng(0)
+        frame = rng.integers(0, 60, (360, 640, 3), dtype=np.uint8)
+        template = rng.integers(0, 255, (30, 60, 3), dtype=np.uint8)
+        frame[300:330, 40:100] = template
+        return frame, template
+
+    @pytest.fixture
+    def matcher(self, scene):
+        """创建注册了测试模板的匹配器."""
+        _, template = scene
+        matcher = TemplateMatcher()
+        matcher.enable_multi_scale = False
+        matcher.template_info_cache["start_button"] = TemplateInfo(
+            name="start_button", image=template, threshold=0.9, path="start_button.png"
+        )
+        return matcher
+
+    def test_learned_window_confines_search(self, matcher, scene):
+        """测试学习到搜索窗口后只在窗口内匹配."""
+        frame, _ = scene
+        for _ in range(matcher.search_windows.min_samples):
+            matcher.match_template(frame, "start_button")
+
+        searched_shapes = []
+        original = matcher._match_template_in_image
+
+        def spy(image, name, info, *args):
+            searched_shapes.append(image.shape)
+            return original(image, name, info, *args)
+
+        with patch.object(matcher, '_match_template_in_image', side_effect=spy):
+            element = matcher.match_template(frame, "start_button")
+
+        assert element.position == (40, 300)
+        assert len(searched_shapes) == 1
+        assert searched_shapes[0][0] * searched_shapes[0][1] < frame.shape[0] * frame.shape[1] / 10
+        assert matcher.search_windows.get_stats()['roi_hits'] == 1
+
+    def test_falls_back_to_full_frame_on_miss(self, matcher, scene):
+        """测试窗口内未命中时回退到全帧匹配."""
+        frame, template = scene
+        matcher.set_template_roi("start_button", (0.8, 0.0, 0.15, 0.15))
+
+        element = matcher.match_template(frame, "start_button")
+
+        assert element is not None
+        assert element.position == (40, 300)
+        assert matcher.search_windows.get_stats()['fallbacks'] == 1
+
+    def test_configured_roi_from_config(self, scene):
+        """测试从配置加载模板搜索区域."""
+        _, template = scene
+        config = {'template_rois': {'start_button': [0.0, 0.75, 0.25, 0.25]}}
+        detector = GameDetector()
+        detector.template_matcher.template_info_cache["start_button"] = TemplateInfo(
+            name="start_button", image=template, threshold=0.9, path="start_button.png"
+        )
+
+        detector._apply_template_rois(config)
+
+        roi = detector.template_matcher.template_info_cache["start_button"].roi
+        assert roi == (0.0, 0.75, 0.25, 0.25)
+
+
+class TestBatchTemplateMatching:
+    """批量模板匹配测试."""
+
+    @staticmethod
+    def _smooth_image(rng, height, width):
+        """生成平滑纹理图像."""
+        image = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+        image = cv2.GaussianBlur(image, (0, 0), 3)
+        return cv2.normalize(image, None, 0, 255, cv2.NORM_MINMAX)
+
+    @pytest.fixture
+    def scene(self):
+        """创建包含两个模板的截图和一个未出现的模板."""
+        rng = np.random.default_rng(7)
+        frame = cv2.GaussianBlur(
+            rng.integers(0, 255, (360, 640, 3), dtype=np.uint8), (0, 0), 3
+        )
+        templates = {name: self._smooth_image(rng, 40, 96) for name in ("a", "b", "c")}
+        frame[51:91, 33:129] = templates["a"]
+        frame[201:241, 405:501] = templates["b"]
+
+        matcher = TemplateMatcher()
+        for name, image in templates.items():
+            matcher.template_info_cache[name] = TemplateInfo(
+                name=name, image=image, threshold=0.85, path=f"{name}.png"
+            )
+        return matcher, frame
+
+    def test_batch_finds_present_templates(self, scene):
+        """测试批量匹配找到截图中的模板并给出准确位置."""
+        matcher, frame = scene
+
+        elements = {e.name: e for e in matcher.match_batch(frame, ["a", "b", "c"])}
+
+        assert set(elements) == {"a", "b"}
+        assert elements["a"].position == (33, 51)
+        assert elements["b"].position == (405, 201)
+        assert elements["a"].size == (96, 40)
+
+    def test_frame_preprocessed_once(self, scene):
+        """测试截图只转换一次灰度."""
+        matcher, frame = scene
+        matcher.match_batch(frame, ["a", "b", "c"])  # 预热模板灰度缓存
+        prepared = PreparedFrame(frame, matcher.pyramid_levels)
+
+        with patch('src.core.game_detector.cv2.cvtColor', wraps=cv2.cvtColor) as mock_cvt:
+            matcher.match_batch(prepared, ["a", "b", "c"])
+            first_calls = mock_cvt.call_count
+            matcher.match_batch(prepared, ["a", "b", "c"])
+
+        assert first_calls == 1
+        assert mock_cvt.call_count == first_calls
+
+    def test_stop_when_skips_remaining_refinement(self, scene):
+        """测试判定函数命中后不再精匹配剩余候选."""
+        matcher, frame = scene
+
+        with patch.object(
+            matcher, '_refine_candidate', wraps=matcher._refine_candidate
+        ) as mock_refine:
+            elements = matcher.match_multiple_templates(
+                frame, ["a", "b", "c"], stop_when=lambda element: True
+            )
+
+        assert len(elements) == 1
+        assert mock_refine.call_count == 1
+
+    def test_fft_matches_opencv(self, scene):
+        """测试FFT粗匹配结果与cv2.matchTemplate一致."""
+        matcher, frame = scene
+        prepared = PreparedFrame(frame, matcher.pyramid_levels)
+        entry = matcher._batch_entry("a", matcher.template_info_cache["a"])
+        template = entry.gray_pyramid(len(prepared.pyramid))[1]
+
+        spectrum, norm = entry.spectrum(1, 1.0, prepared.pyramid[1].shape[:2])
+        fft_result = prepared.match_fft(1, template.shape[:2], spectrum, norm)
+        cv_result = cv2.matchTemplate(prepared.pyramid[1], template, cv2.TM_CCOEFF_NORMED)
+
+        assert fft_result.shape == cv_result.shape
+        assert np.abs(fft_result - cv_result).max() < 1e-3
+
+        matcher.enable_fft_matching = True
+        names = {e.name for e in matcher.match_batch(frame, ["a", "b", "c"])}
+        assert names == {"a", "b"}
+
+    def test_unknown_templates_use_single_matching(self, scene):
+        """测试不在模板缓存中的名称按单模板流程匹配."""
+        matcher, frame = scene
+        element = UIElement("other", (0, 0), (1, 1), 0.9, "other.png")
+
+        with patch.object(matcher, 'match_template', return_value=element) as mock_match:
+            elements = matcher.match_multiple_templates(frame, ["a", "other"])
+
+        mock_match.assert_called_once_with(frame, "other")
+        assert [e.name for e in elements] == ["a", "other"]
+
+    def test_uncalibrated_batch_sweeps_scales(self, scene):
+        """测试未校准时批量匹配扫描其余缩放比例，找到放大的模板."""
+        matcher, frame = scene
+        scaled = cv2.resize(matcher.template_info_cache["c"].image, (120, 50))
+        frame[280:330, 60:180] = scaled
+
+        elements = {e.name: e for e in matcher.match_batch(frame, ["a", "b", "c"])}
+
+        assert set(elements) == {"a", "b", "c"}
+        assert elements["c"].size == (120, 50)
+        assert abs(elements["c"].position[0] - 60) <= 2
+        assert abs(elements["c"].position[1] - 280) <= 2
+
+        matcher.enable_multi_scale = False
+        assert "c" not in {e.name for e in matcher.match_batch(frame, ["a", "b", "c"])}
+
+    def test_batch_prefers_configured_roi(self, scene):
+        """测试模板配置了搜索区域时优先采用区域内的匹配."""
+        matcher, frame = scene
+        frame[281:321, 481:577] = matcher.template_info_cache["a"].image
+
+        matcher.set_template_roi("a", (0.7, 0.75, 0.2, 0.15))
+        element = matcher.match_batch(frame, ["a"])[0]
+
+        assert element.position == (481, 281)
+        assert matcher.search_windows.get_stats()["roi_hits"] == 1
+
+    def test_batch_verifies_color(self, scene):
+        """测试批量匹配排除灰度相同但颜色不同的候选."""
+        matcher, frame = scene
+        rng = np.random.default_rng(11)
+        gray = cv2.normalize(
+            cv2.GaussianBlur(rng.integers(0, 255, (40, 96), dtype=np.uint8), (0, 0), 2),
+            None, 40, 180, cv2.NORM_MINMAX,
+        ).astype(np.float32)
+        matcher.template_info_cache["c"].image = cv2.cvtColor(
+            gray.astype(np.uint8), cv2.COLOR_GRAY2BGR
+        )
+        # 亮度相同但偏蓝
+        frame[281:321, 481:577] = np.clip(
+            np.dstack([gray + 60, gray, gray - 22.9]), 0, 255
+        ).round().astype(np.uint8)
+
+        assert "c" not in {e.name for e in matcher.match_batch(frame, ["a", "b", "c"])}
+
+        matcher.enable_color_verification = False
+        assert "c" in {e.name for e in matcher.match_batch(frame, ["a", "b", "c"])}
+
+
+class TestCoarseToFinePyramid:
+    """由粗到精金字塔匹配测试."""
+
+    @pytest.fixture
+    def scene(self):
+        """创建平滑纹理截图，并从中截取模板."""
+        rng = np.random.default_rng(3)
+        frame = cv2.GaussianBlur(
+            rng.integers(0, 255, (480, 640, 3), dtype=np.uint8), (0, 0), 2
+        )
+        template = frame[301:365, 413:541].copy()
+        return frame, template
+
+    def test_returns_full_resolution_location(self, scene):
+        """测试返回原尺寸上的精确位置."""
+        frame, template = scene
+        matcher = TemplateMatcher()
+
+        element = matcher._pyramid_match_template(frame, template, 0.8)
+
+        assert element is not None
+        assert element.position == (413, 301)
+        assert element.size == (128, 64)
+        assert element.confidence > 0.99
+
+    def test_only_smallest_level_scans_whole_image(self, scene):
+        """测试只有最小层对整幅图像匹配，其余层只匹配邻域."""
+        frame, template = scene
+        matcher = TemplateMatcher()
+        searched = []
+        match_template = cv2.matchTemplate
+
+        def spy(image, templ, method):
+            searched.append(image.shape[:2])
+            return match_template(image, templ, method)
+
+        with patch('src.core.game_detector.cv2.matchTemplate', side_effect=spy):
+            matcher._pyramid_match_template(frame, template, 0.8)
+
+        assert searched[0] == (120, 160)
+        assert all(h * w < 120 * 160 for h, w in searched[1:])
+
+    def test_no_match_below_threshold(self, scene):
+        """测试没有足够相似区域时返回None."""
+        frame, _ = scene
+        other = np.random.default_rng(9).integers(0, 255, (64, 128, 3), dtype=np.uint8)
+        matcher = TemplateMatcher()
+
+        assert matcher._pyramid_match_template(frame, other, 0.9) is None
+
+
+class TestScaleCalibration:
+    """渲染缩放校准测试."""
+
+    @pytest.fixture
+    def scene(self):
+        """创建按1.25倍渲染的截图，模板为原始分辨率."""
+        rng = np.random.default_rng(5)
+        template = cv2.GaussianBlur(
+            rng.integers(0, 255, (48, 96, 3), dtype=np.uint8), (0, 0), 1.5
+        )
+        frame = cv2.GaussianBlur(
+            rng.integers(0, 255, (400, 600, 3), dtype=np.uint8), (0, 0), 1.5
+        )
+        scaled = cv2.resize(template, (120, 60))
+        frame[200:260, 300:420] = scaled
+        return frame, template
+
+    @pytest.fixture
+    def matcher(self, scene):
+        """创建配置了参考模板的匹配器."""
+        _, template = scene
+        matcher = TemplateMatcher()
+        matcher.enable_roi_matching = False
+        matcher.template_info_cache["reference"] = TemplateInfo(
+            name="reference", image=template, threshold=0.8, path=""
+        )
+        matcher.scale_calibrator.reference_template = "reference"
+        return matcher
+
+    def test_calibrate_finds_render_scale(self, scene):
+        """测试校准得到渲染比例并按窗口尺寸缓存."""
+        frame, template = scene
+        calibrator = ScaleCalibrator()
+        calibrator.reference_template = "reference"
+
+        scale = calibrator.calibrate((600, 400), frame, template)
+
+        assert scale == pytest.approx(1.25, abs=0.03)
+        assert calibrator.scale_for((600, 400)) == scale
+        assert not calibrator.needs_calibration((600, 400))
+        assert calibrator.needs_calibration((800, 600))
+
+    def test_calibration_failure_is_cached(self, scene):
+        """测试找不到参考模板时记录失败，避免每帧重复校准."""
+        frame, _ = scene
+        other = np.random.default_rng(11).integers(0, 255, (48, 96, 3), dtype=np.uint8)
+        calibrator = ScaleCalibrator()
+        calibrator.reference_template = "reference"
+
+        assert calibrator.calibrate((600, 400), frame, other) is None
+        assert calibrator.scale_for((600, 400)) is None
+        assert not calibrator.needs_calibration((600, 400))
+
+    def test_calibration_failure_retried_after_interval(self, scene):
+        """测试校准失败超过retry_interval后重新校准，成功后不再重试."""
+        frame, template = scene
+        other = np.random.default_rng(11).integers(0, 255, (48, 96, 3), dtype=np.uint8)
+        calibrator = ScaleCalibrator(retry_interval=5.0)
+        calibrator.reference_template = "reference"
+
+        with patch('src.core.game_detector.time.monotonic', return_value=100.0):
+            assert calibrator.calibrate((600, 400), frame, other) is None
+        with patch('src.core.game_detector.time.monotonic', return_value=104.0):
+            assert not calibrator.needs_calibration((600, 400))
+        with patch('src.core.game_detector.time.monotonic', return_value=105.0):
+            assert calibrator.needs_calibration((600, 400))
+
+        assert calibrator.calibrate((600, 400), frame, template) is not None
+        with patch('src.core.game_detector.time.monotonic', return_value=1000.0):
+            assert not calibrator.needs_calibration((600, 400))
+
+    def test_band_scales(self):
+        """测试校准比例附近的候选比例."""
+        calibrator = ScaleCalibrator(band=0.05, band_steps=2)
+
+        assert calibrator.band_scales(1.25) == [1.25, 1.2, 1.3, 1.15, 1.35]
+
+    def test_match_template_uses_calibrated_band(self, scene, matcher):
+        """测试匹配只在校准比例附近进行，并返回截图中的坐标."""
+        frame, _ = scene
+        matcher.match_template(frame, "reference")
+        matcher.enable_pyramid_matching = False
+        resized = []
+        resize = cv2.resize
+
+        def spy(image, size, *args, **kwargs):
+            resized.append(size)
+            return resize(image, size, *args, **kwargs)
+
+        with patch('src.core.game_detector.cv2.resize', side_effect=spy):
+            element = matcher.match_template(frame, "reference")
+
+        assert element is not None
+        assert abs(element.position[0] - 300) <= 2
+        assert abs(element.position[1] - 200) <= 2
+        assert abs(element.size[0] - 120) <= 3
+        assert len(resized) <= len(matcher.scale_calibrator.band_scales(1.25))
+
+    def test_calibration_runs_once_per_size(self, scene, matcher):
+        """测试同一窗口尺寸只校准一次."""
+        frame, _ = scene
+
+        with patch.object(
+            matcher.scale_calibrator, 'calibrate', wraps=matcher.scale_calibrator.calibrate
+        ) as mock_calibrate:
+            matcher.match_template(frame, "reference")
+            matcher.match_template(frame, "reference")
+            matcher.match_template(cv2.resize(frame, (500, 300)), "reference")
+
+        assert mock_calibrate.call_count == 2
+
+    def test_batch_matching_uses_calibrated_scale(self, scene, matcher):
+        """测试批量匹配使用校准比例."""
+        frame, _ = scene
+
+        elements = matcher.match_batch(frame, ["reference"])
+
+        assert len(elements) == 1
+        assert abs(elements[0].position[0] - 300) <= 2
+        assert abs(elements[0].size[0] - 120) <= 3
+
+    def test_resize_triggers_recalibration(self, scene):
+        """测试窗口尺寸变化时自动重新校准."""
+        frame, template = scene
+        detector = GameDetector()
+        detector.template_matcher.template_info_cache["reference"] = TemplateInfo(
+            name="reference", image=template, threshold=0.8, path=""
+        )
+        detector.template_matcher.scale_calibrator.reference_template = "reference"
+        window = GameWindow(
+            hwnd=1, title="Game", rect=(0, 0, 800, 600),
+            width=800, height=600, is_foreground=True,
+        )
+        detector.game_window = window
+
+        with patch.object(window, 'is_valid', return_value=True), \
+                patch('src.core.game_detector.win32gui') as mock_win32gui, \
+                patch.object(
+                    detector.window_manager, 'capture_window', return_value=frame
+                ) as mock_capture:
+            mock_win32gui.GetWindowRect.return_value = (0, 0, 600, 400)
+            mock_win32gui.GetWindowText.return_value = "Game"
+            mock_win32gui.GetForegroundWindow.return_value = 1
+
+            assert detector.window_manager.update_window_state(window)
+
+        mock_capture.assert_called_once()
+        scale = detector.template_matcher.scale_calibrator.scale_for((600, 400))
+        assert scale == pytest.approx(1.25, abs=0.03)
+
+    def test_resize_calibrates_by_screenshot_size(self, scene):
+        """测试截图尺寸与客户区尺寸不同时按截图尺寸判断是否需要校准."""
+        frame, template = scene
+        detector = GameDetector()
+        calibrator = detector.template_matcher.scale_calibrator
+        detector.template_matcher.template_info_cache["reference"] = TemplateInfo(
+            name="reference", image=template, threshold=0.8, path=""
+        )
+        calibrator.reference_template = "reference"
+        # 客户区尺寸已有校准记录，但DPI缩放后截图为750x500
+        calibrator.calibrate((600, 400), frame, template)
+        screenshot = cv2.resize(frame, (750, 500))
+        old_window = GameWindow(
+            hwnd=1, title="Game", rect=(0, 0, 800, 600),
+            width=800, height=600, is_foreground=True,
+        )
+        new_window = GameWindow(
+            hwnd=1, title="Game", rect=(0, 0, 600, 400),
+            width=600, height=400, is_foreground=True,
+        )
+
+        with patch.object(detector, 'capture_screenshot', return_value=screenshot):
+            detector._on_window_change(old_window, new_window)
+
+        assert calibrator.scale_for((750, 500)) == pytest.approx(1.5625, abs=0.04)
@@ -9,6 +9,8 @@ import time
 from unittest.mock import Mock, patch, AsyncMock
 from typing import Tuple
 
+import numpy as np
+
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -22,6 +24,7 @@ from src.core.game_operator import (
     OperationMethod
 )
 from src.core.game_detector import GameDetector, UIElement
+from src.core.raw_frame import RawFrame
 from src.core.sync_adapter import SyncAdapter
 
 
@@ -42,6 +45,11 @@ class TestGameOperator:
             )
         ]
         detector.capture_screen.return_value = b"fake_screenshot_data"
+        # 每次截图画面都不同，模拟点击后画面有响应
+        frames = iter(range(10 ** 6))
+        detector.capture_frame.side_effect = lambda *args, **kwargs: RawFrame.from_array(
+            np.full((60, 80, 3), next(frames) * 50 % 256, dtype=np.uint8)
+        )
         return detector
 
     @pytest.fixture
@@ -69,7 +77,7 @@ class TestGameOperator:
             assert result.execution_time > 0
             assert result.metadata["position"] == (100, 200)
             assert result.metadata["click_type"] == "left"
-            mock_pyautogui.click.assert_called_once_with(100, 200, button='left')
+            mock_pyautogui.click.assert_called_once_with(100, 200, clicks=1, button='left', _pause=False)
 
     @pytest.mark.asyncio
     async def test_click_with_ui_element(self, game_operator, mock_game_detector):
@@ -89,7 +97,7 @@ class TestGameOperator:
             
             assert result.success is True
             assert result.metadata["position"] == (150, 125)
-            mock_pyautogui.click.assert_called_once_with(150, 125, button='left')
+            mock_pyautogui.click.assert_called_once_with(150, 125, clicks=1, button='left', _pause=False)
 
     @pytest.mark.asyncio
     async def test_click_with_template_name(self, game_operator, mock_game_detector):
@@ -103,7 +111,7 @@ class TestGameOperator:
             assert result.metadata["position"] == (150, 125)
             # 可能会调用多次detect_ui_elements，所以只检查是否被调用
             assert mock_game_detector.detect_ui_elements.called
-            mock_pyautogui.click.assert_called_once_with(150, 125, button='left')
+            mock_pyautogui.click.assert_called_once_with(150, 125, clicks=1, button='left', _pause=False)
 
     @pytest.mark.asyncio
     async def test_click_different_types(self, game_operator):
@@ -115,17 +123,17 @@ class TestGameOperator:
             # 测试左键点击
             result = await game_operator.click((100, 100), ClickType.LEFT)
             assert result.success is True
-            mock_pyautogui.click.assert_called_with(100, 100, button='left')
+            mock_pyautogui.click.assert_called_with(100, 100, clicks=1, button='left', _pause=False)
             
             # 测试右键点击
             result = await game_operator.click((100, 100), ClickType.RIGHT)
             assert result.success is True
-            mock_pyautogui.click.assert_called_with(100, 100, button='right')
+            mock_pyautogui.click.assert_called_with(100, 100, clicks=1, button='right', _pause=False)
             
             # 测试双击
             result = await game_operator.click((100, 100), ClickType.DOUBLE)
             assert result.success is True
-            mock_pyautogui.doubleClick.assert_called_with(100, 100)
+            mock_pyautogui.doubleClick.assert_called_with(100, 100, button='left', _pause=False)
 
     @pytest.mark.asyncio
     async def test_swipe_operation(self, game_operator):
@@ -170,7 +178,7 @@ class TestGameOperator:
             assert result.success is True
             assert result.metadata["text"] == "Hello World"
             assert result.metadata["target"] == "(100, 100)"
-            mock_pyautogui.click.assert_called_once_with(100, 100, button='left')
+            mock_pyautogui.click.assert_called_once_with(100, 100, clicks=1, button='left', _pause=False)
             mock_pyautogui.typewrite.assert_called_once_with("Hello World", interval=0.05)
 
     @pytest.mark.asyncio
@@ -228,8 +236,9 @@ class TestGameOperator:
             result = await game_operator.click((100, 100), config=config)
             
             assert result.success is True
-            assert result.screenshot_before == b"fake_screenshot_data"
-            assert result.screenshot_after == b"fake_screenshot_data"
+            assert isinstance(result.screenshot_before, RawFrame)
+            assert isinstance(result.screenshot_after, RawFrame)
+            game_operator.game_detector.capture_screen.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_operation_retry_mechanism(self, game_operator):
@@ -323,6 +332,74 @@ class TestGameOperator:
         assert call_count >= 2
 
 
+class TestScreenChangeVerification:
+    """操作结果画面变化验证测试."""
+
+    @pytest.fixture
+    def screen(self):
+        """可在点击后切换的模拟画面."""
+        state = {'frame': np.zeros((240, 320, 3), dtype=np.uint8)}
+        return state
+
+    @pytest.fixture
+    def game_operator(self, screen):
+        """创建使用模拟画面的游戏操作器."""
+        detector = Mock(spec=GameDetector)
+        detector.detect_ui_elements.return_value = [
+            UIElement(
+                name="confirm_button",
+                position=(100, 100),
+                size=(100, 50),
+                confidence=0.9,
+                template_path="confirm_button.png"
+            )
+        ]
+        detector.capture_frame.side_effect = lambda *args, **kwargs: RawFrame.from_array(
+            screen['frame'].copy()
+        )
+        return GameOperator(game_detector=detector, sync_adapter=Mock(spec=SyncAdapter))
+
+    @pytest.mark.asyncio
+    async def test_click_confirmed_on_first_changed_frame(self, game_operator, screen):
+        """测试画面一变化即确认点击，不做场景检测."""
+        def press(*args, **kwargs):
+            screen['frame'] = screen['frame'].copy()
+            screen['frame'][100:150, 100:200] = 255
+
+        with patch('src.core.game_operator.pyautogui') as mock_pyautogui:
+            mock_pyautogui.click = Mock(side_effect=press)
+            before_state = await game_operator._capture_operation_state()
+            await game_operator._perform_click((150, 125), ClickType.LEFT, OperationConfig())
+            start = time.monotonic()
+            verified = await game_operator._verify_click_result("confirm_button", (150, 125), before_state)
+
+        assert verified is True
+        assert time.monotonic() - start < 0.1
+        game_operator.game_detector.detect_scene.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_screen_fails_button_click(self, game_operator):
+        """测试按钮点击后画面无变化时验证失败."""
+        game_operator.screen_change_timeout = 0.05
+
+        with patch('src.core.game_operator.pyautogui') as mock_pyautogui:
+            mock_pyautogui.click = Mock()
+            result = await game_operator.click("confirm_button", config=OperationConfig(retry_count=0))
+
+        assert result.success is False
+        mock_pyautogui.click.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_frame_assumes_change(self, game_operator):
+        """测试无法截图时不阻塞验证."""
+        game_operator.game_detector.capture_frame.side_effect = None
+        game_operator.game_detector.capture_frame.return_value = None
+
+        assert await game_operator._detect_screen_change(
+            await game_operator._capture_operation_state()
+        ) is True
+
+
 class TestOperationConfig:
     """OperationConfig测试类."""
 
@@ -0,0 +1,270 @@
+"""输入派发器测试模块."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from src.core.input_dispatcher import (
+    InputBackend,
+    InputDispatcher,
+    InputEvent,
+    InputEventType,
+    PyAutoGUIInputBackend,
+    click_events,
+    key_press_events,
+)
+
+
+class RecordingBackend(InputBackend):
+    """记录注入调用和调用线程的输入后端."""
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.threads = set()
+        self.fail_on = fail_on
+
+    def _record(self, name, *args):
+        self.threads.add(threading.get_ident())
+        if name == self.fail_on:
+            raise RuntimeError(f"{name} failed")
+        self.calls.append((name, args, time.perf_counter()))
+
+    def move(self, x, y, duration=0.0):
+        self._record("move", x, y)
+
+    def click(self, x, y, button="left", clicks=1):
+        self._record("click", x, y, button, clicks)
+
+    def mouse_down(self, x, y, button="left"):
+        self._record("mouse_down", x, y, button)
+
+    def mouse_up(self, x, y, button="left"):
+        self._record("mouse_up", x, y, button)
+
+    def key_down(self, key):
+        self._record("key_down", key)
+
+    def key_up(self, key):
+        self._record("key_up", key)
+
+    def press(self, key):
+        self._record("press", key)
+
+    def hotkey(self, *keys):
+        self._record("hotkey", *keys)
+
+    def scroll(self, amount, x=None, y=None):
+        self._record("scroll", amount, x, y)
+
+
+@pytest.fixture
+def backend():
+    """记录调用的输入后端."""
+    return RecordingBackend()
+
+
+@pytest.fixture
+def dispatcher(backend):
+    """创建并在测试结束后停止输入派发器."""
+    dispatcher = InputDispatcher(backend)
+    yield dispatcher
+    dispatcher.stop()
+
+
+class TestInputDispatcher:
+    """InputDispatcher测试."""
+
+    def test_runs_events_on_dedicated_thread(self, dispatcher, backend):
+        """测试事件在专用线程中按顺序注入."""
+        result = dispatcher.run(click_events(10, 20, button="right"), timeout=2.0)
+
+        assert result.success
+        assert [call[:2] for call in backend.calls] == [
+            ("move", (10, 20)),
+            ("click", (10, 20, "right", 1)),
+        ]
+        assert backend.threads and threading.get_ident() not in backend.threads
+
+    def test_honours_event_delays(self, dispatcher, backend):
+        """测试按键按住时间由派发器精确定时."""
+        result = dispatcher.run(key_press_events("f", hold=0.05), timeout=2.0)
+
+        assert result.success
+        (_, _, pressed), (_, _, released) = backend.calls
+        assert 0.05 <= released - pressed < 0.08
+        assert all(event.latency < 0.02 for event in result.events)
+
+    def test_failure_skips_rest_of_sequence(self):
+        """测试事件失败时跳过序列剩余事件，不影响其他序列."""
+        backend = RecordingBackend(fail_on="move")
+        dispatcher = InputDispatcher(backend)
+        try:
+            failed, ok = dispatcher.submit_many([
+                click_events(1, 1),
+                [InputEvent(InputEventType.KEY_PRESS, key="esc")],
+            ])
+            failed, ok = failed.result(2.0), ok.result(2.0)
+        finally:
+            dispatcher.stop()
+
+        assert not failed.success
+        assert "move failed" in failed.error_message
+        assert len(failed.events) == 1
+        assert ok.success
+        assert [call[0] for call in backend.calls] == ["press"]
+        assert dispatcher.get_stats()['failed'] == 1
+
+    def test_batch_runs_in_submission_order(self, dispatcher, backend):
+        """测试批量提交的序列按顺序执行并按间隔定时."""
+        sequences = [click_events(i, i, delay=0.02 if i else 0.0) for i in range(5)]
+
+        results = [future.result(2.0) for future in dispatcher.submit_many(sequences)]
+
+        assert all(result.success for result in results)
+        clicks = [call for call in backend.calls if call[0] == "click"]
+        assert [call[1][0] for call in clicks] == [0, 1, 2, 3, 4]
+        gaps = [b[2] - a[2] for a, b in zip(clicks, clicks[1:])]
+        assert all(gap >= 0.02 for gap in gaps)
+
+        stats = dispatcher.get_stats()
+        assert stats['sequences'] == 5
+        assert stats['events'] == 10
+        assert stats['max_latency_ms'] >= stats['avg_latency_ms'] >= 0.0
+
+    def test_late_event_is_dropped(self, dispatcher, backend):
+        """测试事件延迟超过上限时放弃执行."""
+        dispatcher.submit([InputEvent(InputEventType.HOTKEY, keys=("alt", "tab"), delay=0.05)])
+        result = dispatcher.run(
+            [InputEvent(InputEventType.KEY_PRESS, key="esc", max_lateness=0.0)], timeout=2.0
+        )
+
+        assert not result.success
+        assert [call[0] for call in backend.calls] == ["hotkey"]
+
+    @pytest.mark.asyncio
+    async def test_run_async_does_not_block_loop(self, dispatcher, backend):
+        """测试在事件循环中等待派发结果时不阻塞事件循环."""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        results = await dispatcher.run_many_async([key_press_events("a", hold=0.05)] * 2)
+        task.cancel()
+
+        assert all(result.success for result in results)
+        assert ticks >= 5
+
+    def test_stop_fails_pending_sequences(self, backend):
+        """测试停止派发器时未执行的序列以失败结束."""
+        dispatcher = InputDispatcher(backend)
+        futures = dispatcher.submit_many([[InputEvent(InputEventType.KEY_PRESS, key="a", delay=1.0)]] * 2)
+        time.sleep(0.05)
+        dispatcher.stop()
+
+        results = [future.result(1.0) for future in futures]
+        assert not any(result.success for result in results)
+        assert backend.calls == []
+
+
+    def test_failure_releases_pressed_inputs(self):
+        """测试序列中途失败时释放已按下的按键和鼠标按钮."""
+        backend = RecordingBackend(fail_on="scroll")
+        dispatcher = InputDispatcher(backend)
+        try:
+            result = dispatcher.run([
+                InputEvent(InputEventType.KEY_DOWN, key="shift"),
+                InputEvent(InputEventType.MOUSE_DOWN, x=5, y=6),
+                InputEvent(InputEventType.SCROLL, amount=3),
+                InputEvent(InputEventType.MOUSE_UP, x=5, y=6),
+                InputEvent(InputEventType.KEY_UP, key="shift"),
+            ], timeout=2.0)
+        finally:
+            dispatcher.stop()
+
+        assert not result.success
+        assert [call[:2] for call in backend.calls] == [
+            ("key_down", ("shift",)),
+            ("mouse_down", (5, 6, "left")),
+            ("mouse_up", (5, 6, "left")),
+            ("key_up", ("shift",)),
+        ]
+
+    def test_late_release_still_releases(self, dispatcher, backend):
+        """测试抬起事件因超时被放弃时仍然释放按键."""
+        result = dispatcher.run([
+            InputEvent(InputEventType.KEY_DOWN, key="w"),
+            InputEvent(InputEventType.KEY_UP, key="w", delay=0.01, max_lateness=-1.0),
+        ], timeout=2.0)
+
+        assert not result.success
+        assert [call[:2] for call in backend.calls] == [("key_down", ("w",)), ("key_up", ("w",))]
+
+    def test_stop_releases_held_key(self, backend):
+        """测试停止派发器时释放正在按住的按键."""
+        dispatcher = InputDispatcher(backend)
+        future = dispatcher.submit(key_press_events("w", hold=5.0))
+        time.sleep(0.05)
+        dispatcher.stop()
+
+        assert not future.result(1.0).success
+        assert [call[:2] for call in backend.calls] == [("key_down", ("w",)), ("key_up", ("w",))]
+
+
+class TestPyAutoGUIInputBackend:
+    """PyAutoGUIInputBackend测试."""
+
+    def test_calls_skip_pyautogui_pause(self):
+        """测试调用pyautogui时不叠加PAUSE等待."""
+        module = Mock()
+        backend = PyAutoGUIInputBackend(lambda: module)
+
+        backend.click(5, 6, button="left")
+        backend.click(5, 6, clicks=2)
+        backend.key_down("w")
+
+        module.click.assert_called_once_with(5, 6, clicks=1, button="left", _pause=False)
+        module.doubleClick.assert_called_once_with(5, 6, button="left", _pause=False)
+        module.keyDown.assert_called_once_with("w", _pause=False)
+
+    def test_unavailable_without_module(self):
+        """测试没有pyautogui时后端不可用."""
+        backend = PyAutoGUIInputBackend(lambda: None)
+
+        assert not backend.is_available()
+        with pytest.raises(RuntimeError):
+            backend.press("esc")
+
+
+class TestAutomationControllerBatchClicks:
+    """AutomationController批量点击测试."""
+
+    @pytest.mark.asyncio
+    async def test_reward_buttons_submitted_in_bulk(self, backend):
+        """测试逐个领取奖励时一次性提交所有点击."""
+        from src.automation.automation_controller import AutomationController
+
+        with patch('src.automation.automation_controller.TaskManager', None):
+            controller = AutomationController(game_detector=MagicMock())
+        controller._input_dispatcher = InputDispatcher(backend)
+        controller._click_response_timeout = 0.01
+        controller._game_detector.find_template.return_value = {'found': False}
+        buttons = [(100, 200), (100, 260), (100, 320)]
+
+        try:
+            with patch.object(controller, '_find_all_reward_buttons', return_value=buttons), \
+                 patch.object(controller, '_click_at_location') as click_at_location:
+                await controller._claim_all_rewards()
+        finally:
+            controller._input_dispatcher.stop()
+
+        click_at_location.assert_not_called()
+        assert [call[1][:2] for call in backend.calls if call[0] == "click"] == buttons
+        assert controller._input_dispatcher.get_stats()['sequences'] == 3
@@ -0,0 +1,317 @@
+"""界面响应延迟模型测试模块."""
+
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import numpy as np
+import pytest
+
+from src.automation.automation_controller import AutomationController
+from src.core.game_detector import GameDetector
+from src.core.game_operator import ClickType, GameOperator, OperationConfig
+from src.core.latency_model import UILatencyModel
+from src.core.raw_frame import RawFrame
+from src.core.sync_adapter import SyncAdapter
+
+
+class TestUILatencyModel:
+    """UILatencyModel测试."""
+
+    def test_default_until_enough_samples(self):
+        """测试样本不足时使用默认延迟."""
+        model = UILatencyModel(min_samples=3)
+        model.record("confirm_button", 0.1)
+        model.record("confirm_button", 0.1)
+
+        assert model.get_delay("confirm_button", 0.5) == 0.5
+        assert model.get_delay(None, 0.5) == 0.5
+
+        model.record("confirm_button", 0.1)
+        assert model.get_delay("confirm_button", 0.5) == pytest.approx(0.12)
+
+    def test_delay_uses_high_percentile(self):
+        """测试延迟取高分位数并限制在上下限内."""
+        model = UILatencyModel(percentile=90, margin=1.0, min_samples=1, max_delay=1.0)
+        for latency in [0.05] * 9 + [0.4]:
+            model.record("mission_button", latency)
+        model.record("loading", 5.0)
+
+        assert 0.05 < model.get_delay("mission_button", 0.5) <= 0.4
+        assert model.get_delay("loading", 0.5) == 1.0
+
+    def test_keeps_recent_samples(self):
+        """测试每个目标只保留最近的样本."""
+        model = UILatencyModel(margin=1.0, min_samples=1, max_samples=3)
+        for latency in [2.0, 2.0, 0.1, 0.1, 0.1]:
+            model.record("tab", latency)
+
+        assert model.get_delay("tab", 0.5) == pytest.approx(0.1)
+
+    def test_timeouts_alone_do_not_raise_delay(self):
+        """测试反复超时（点击不改变画面）不会推高延迟."""
+        model = UILatencyModel(min_samples=1, margin=1.0)
+        model.record("claim_button", 0.5)
+        for _ in range(20):
+            model.record_timeout("claim_button", model.get_delay("claim_button", 0.5))
+
+        assert model.get_delay("claim_button", 0.5) == pytest.approx(0.5)
+
+    def test_late_change_raises_delay_with_capped_growth(self):
+        """测试超时后观测到更慢的真实变化时延迟增长，且单次增长受限."""
+        model = UILatencyModel(min_samples=1, margin=1.0, max_growth=1.5)
+        model.record("claim_button", 0.5)
+        model.record_timeout("claim_button", 0.5)
+
+        model.record("claim_button", 2.0)
+
+        assert 0.5 < model.get_delay("claim_button", 0.5) <= 0.75
+
+    def test_fast_change_discards_timeouts(self):
+        """测试超时后观测到更快的变化时丢弃这些超时."""
+        model = UILatencyModel(min_samples=1, margin=1.0)
+        model.record_timeout("claim_button", 0.5)
+
+        model.record("claim_button", 0.1)
+
+        assert model.get_stats()["claim_button"]["samples"] == 1
+        assert model.get_delay("claim_button", 0.5) == pytest.approx(0.1)
+
+    def test_persisted_table_is_merged(self, tmp_path):
+        """测试延迟表跨实例保存和加载，保存时保留其他实例的目标."""
+        path = str(tmp_path / "ui_latency.json")
+        first = UILatencyModel(path, min_samples=1, margin=1.0)
+        first.record("confirm_button", 0.2)
+        assert first.save()
+
+        second = UILatencyModel(path, min_samples=1, margin=1.0)
+        assert second.get_delay("confirm_button", 0.5) == pytest.approx(0.2)
+        second.record("claim_button", 0.3)
+        first.save()
+        second.save()
+
+        with open(path, encoding='utf-8') as f:
+            table = json.load(f)
+        assert table == {"confirm_button": [0.2], "claim_button": [0.3]}
+
+    def test_autosave_after_interval(self, tmp_path):
+        """测试超过保存间隔后记录样本自动保存."""
+        path = tmp_path / "ui_latency.json"
+        model = UILatencyModel(str(path), save_interval=0.0)
+
+        model.record("confirm_button", 0.2)
+
+        assert json.loads(path.read_text(encoding='utf-8')) == {"confirm_button": [0.2]}
+
+
+class ClickScreen:
+    """点击后延迟一段时间才变化的模拟画面."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.clicked_at = None
+        self.before = np.zeros((120, 160, 3), dtype=np.uint8)
+        self.after = np.full((120, 160, 3), 200, dtype=np.uint8)
+
+    def click(self, *args, **kwargs):
+        self.clicked_at = time.monotonic()
+
+    def capture(self, *args, **kwargs):
+        changed = self.clicked_at is not None and time.monotonic() - self.clicked_at >= self.latency
+        return RawFrame.from_array(self.after if changed else self.before)
+
+
+class TestGameOperatorLatency:
+    """GameOperator响应延迟学习测试."""
+
+    @pytest.fixture
+    def screen(self):
+        """点击后约50毫秒画面变化."""
+        return ClickScreen(latency=0.05)
+
+    @pytest.fixture
+    def operator(self, screen):
+        """创建使用内存延迟模型的游戏操作器."""
+        detector = Mock(spec=GameDetector)
+        detector.capture_frame.side_effect = screen.capture
+        operator = GameOperator(
+            game_detector=detector,
+            sync_adapter=Mock(spec=SyncAdapter),
+            latency_model=UILatencyModel(min_samples=1),
+        )
+        operator.screen_change_grace = 0.0
+        return operator
+
+    @pytest.mark.asyncio
+    async def test_records_latency_per_element(self, operator, screen):
+        """测试验证点击时按元素记录画面变化延迟."""
+        with patch('src.core.game_operator.pyautogui') as mock_pyautogui:
+            mock_pyautogui.click = Mock(side_effect=screen.click)
+            click_success, verified = await operator._execute_click_with_retry(
+                "confirm_button", (80, 60), ClickType.LEFT, max_retries=0
+            )
+
+        assert click_success and verified
+        delay = operator.latency_model.get_delay("confirm_button", 10.0)
+        assert 0.05 <= delay < 0.5
+
+    @pytest.mark.asyncio
+    async def test_learned_delay_bounds_verification(self, operator, screen):
+        """测试学到的延迟缩短无响应时的等待."""
+        for _ in range(5):
+            operator.latency_model.record("confirm_button", 0.05)
+        screen.latency = 10.0
+
+        with patch('src.core.game_operator.pyautogui') as mock_pyautogui:
+            mock_pyautogui.click = Mock(side_effect=screen.click)
+            start = time.monotonic()
+            _, verified = await operator._execute_click_with_retry(
+                "confirm_button", (80, 60), ClickType.LEFT, max_retries=0
+            )
+
+        assert verified is False
+        assert time.monotonic() - start < operator.screen_change_timeout
+
+    @pytest.mark.asyncio
+    async def test_missed_deadline_does_not_ratchet_delay(self, operator, screen):
+        """测试画面一直不变化时超时不会把等待时间越推越长."""
+        for _ in range(5):
+            operator.latency_model.record("confirm_button", 0.05)
+        learned = operator.latency_model.get_delay("confirm_button", 10.0)
+        screen.latency = 10.0
+
+        with patch('src.core.game_operator.pyautogui') as mock_pyautogui:
+            mock_pyautogui.click = Mock(side_effect=screen.click)
+            for _ in range(3):
+                await operator._execute_click_with_retry(
+                    "confirm_button", (80, 60), ClickType.LEFT, max_retries=0
+                )
+
+        assert operator.latency_model.get_delay("confirm_button", 10.0) == pytest.approx(learned)
+
+    @pytest.mark.asyncio
+    async def test_non_button_timeout_not_recorded(self, operator, screen):
+        """测试不变化也算成功的元素超时时不记录截尾观测."""
+        screen.latency = 10.0
+        before_state = {'signature': operator._change_detector.signature(screen.capture()),
+                        'latency_key': "option_item", 'action_time': time.monotonic()}
+
+        assert await operator._verify_ui_element_click("option_item", before_state)
+        assert "option_item" not in operator.latency_model._censored
+
+    @pytest.mark.asyncio
+    async def test_slow_button_not_clicked_twice(self, operator, screen):
+        """测试按钮响应慢于等待时间时，宽限后确认生效而不是重复点击."""
+        for _ in range(5):
+            operator.latency_model.record("confirm_button", 0.05)
+        operator.screen_change_grace = 0.3
+        screen.latency = 0.2
+
+        with patch('src.core.game_operator.pyautogui') as mock_pyautogui:
+            mock_pyautogui.click = Mock(side_effect=screen.click)
+            click_success, verified = await operator._execute_click_with_retry(
+                "confirm_button", (80, 60), ClickType.LEFT, max_retries=2
+            )
+
+        assert click_success and verified
+        assert mock_pyautogui.click.call_count == 1
+        assert operator.latency_model.get_delay("confirm_button", 10.0) > 0.06
+
+    @pytest.mark.asyncio
+    async def test_click_passes_target_latency_key(self, operator):
+        """测试点击把目标名称传给操作后延迟."""
+        with patch.object(operator, '_perform_click', return_value=False) as perform_click:
+            await operator._execute_click_with_retry(
+                "confirm_button", (80, 60), ClickType.LEFT, max_retries=0
+            )
+
+        assert perform_click.call_args[0][3] == "confirm_button"
+
+    @pytest.mark.asyncio
+    async def test_post_delay_skipped_when_verifying(self, operator):
+        """测试需要验证结果时不再固定等待."""
+        with patch('src.core.game_operator.asyncio.sleep') as mock_sleep:
+            await operator._post_operation_delay(ClickType.LEFT, OperationConfig())
+            mock_sleep.assert_not_called()
+
+            await operator._post_operation_delay(ClickType.DOUBLE, OperationConfig(verify_result=False))
+            mock_sleep.assert_called_once_with(0.2)
+
+    @pytest.mark.asyncio
+    async def test_post_delay_uses_learned_latency(self, operator):
+        """测试不验证结果时按目标学到的延迟等待."""
+        operator.latency_model.record("confirm_button", 0.25)
+
+        with patch('src.core.game_operator.asyncio.sleep') as mock_sleep:
+            await operator._post_operation_delay(
+                ClickType.LEFT, OperationConfig(verify_result=False), "confirm_button"
+            )
+
+        mock_sleep.assert_called_once_with(pytest.approx(0.3))
+
+
+class TestAutomationControllerClickLatency:
+    """AutomationController点击后等待测试."""
+
+    @pytest.fixture
+    def controller(self):
+        """创建使用内存延迟模型的控制器."""
+        with patch('src.automation.automation_controller.TaskManager', None):
+            controller = AutomationController(game_detector=MagicMock())
+        controller._latency_model = UILatencyModel(min_samples=1)
+        return controller
+
+    @pytest.mark.asyncio
+    async def test_click_returns_when_screen_changes(self, controller):
+        """测试画面变化后立即结束等待并按场景记录延迟."""
+        screen = ClickScreen(latency=0.05)
+        controller._game_detector.capture_frame.side_effect = screen.capture
+        controller._last_detected_scene = "main_menu"
+
+        with patch.dict('sys.modules', {'pyautogui': Mock(click=Mock(side_effect=screen.click))}):
+            start = time.monotonic()
+            assert await controller._click_at_location((80, 60))
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 0.5
+        assert controller._latency_model.get_delay("scene:main_menu", 10.0) < 0.5
+
+    @pytest.mark.asyncio
+    async def test_unavailable_frames_wait_default(self, controller):
+        """测试无法截图时按默认延迟等待."""
+        controller._game_detector.capture_frame.return_value = None
+
+        with patch.dict('sys.modules', {'pyautogui': Mock()}):
+            start = time.monotonic()
+            assert await controller._click_at_location((80, 60), target="claim_button")
+
+        assert time.monotonic() - start >= controller._click_response_timeout
+        assert controller._latency_model.get_stats() == {}
+
+    @pytest.mark.asyncio
+    async def test_missed_deadline_recorded_as_censored(self, controller):
+        """测试画面没有在等待时间内变化时只记录截尾观测."""
+        screen = ClickScreen(latency=10.0)
+        controller._game_detector.capture_frame.side_effect = screen.capture
+        controller._click_response_timeout = 0.05
+
+        with patch.dict('sys.modules', {'pyautogui': Mock(click=Mock(side_effect=screen.click))}):
+            await controller._click_at_location((80, 60), target="claim_button")
+
+        assert controller._latency_model.get_stats() == {}
+        assert list(controller._latency_model._censored["claim_button"]) == [pytest.approx(0.05, abs=0.03)]
+
+    @pytest.mark.asyncio
+    async def test_batch_clicks_learn_target_latency(self, controller):
+        """测试批量点击按目标记录第一次点击的响应延迟."""
+        screen = ClickScreen(latency=0.05)
+        controller._game_detector.capture_frame.side_effect = screen.capture
+        dispatcher = MagicMock()
+        dispatcher.run_async = AsyncMock(side_effect=lambda events: screen.click() or Mock(success=True, events=[]))
+        dispatcher.run_many_async = AsyncMock(side_effect=lambda sequences: [Mock(success=True, events=[])] * len(sequences))
+        controller._input_dispatcher = dispatcher
+
+        assert await controller._click_locations_in_batch([(10, 10), (10, 50), (10, 90)], "claim_reward") == 3
+
+        assert controller._latency_model.get_delay("claim_reward", 10.0) < 0.5
+        assert len(dispatcher.run_many_async.call_args[0][0]) == 2
@@ -0,0 +1,187 @@
+"""单通道模板匹配模式测试模块."""
+
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from src.core.frame_source import GeneratorFrameSource
+from src.core.game_detector import (
+    MATCH_MODE_EDGE,
+    MATCH_MODE_GRAY,
+    GameDetector,
+    TemplateInfo,
+    TemplateMatcher,
+)
+
+
+def _textured_gray(rng, height, width):
+    """生成取值在[40, 180]之间的平滑灰度纹理."""
+    image = cv2.GaussianBlur(rng.integers(0, 255, (height, width), dtype=np.uint8), (0, 0), 2)
+    return cv2.normalize(image, None, 40, 180, cv2.NORM_MINMAX)
+
+
+def _recolor_same_luma(gray):
+    """把灰度图着色为亮度相同但偏蓝的BGR图像."""
+    values = gray.astype(np.float32)
+    # 0.114 * 60 == 0.299 * 22.9，亮度保持不变
+    return np.clip(np.dstack([values + 60, values, values - 22.9]), 0, 255).round().astype(np.uint8)
+
+
+@pytest.fixture
+def scene():
+    """截图和放在(200, 120)处的按钮模板."""
+    rng = np.random.default_rng(5)
+    frame = cv2.GaussianBlur(rng.integers(0, 255, (300, 480, 3), dtype=np.uint8), (0, 0), 3)
+    button = cv2.cvtColor(_textured_gray(rng, 40, 90), cv2.COLOR_GRAY2BGR)
+    frame[120:160, 200:290] = button
+    return frame, button
+
+
+def _matcher(button, match_mode, threshold=0.8):
+    """创建已注册按钮模板的匹配器."""
+    matcher = TemplateMatcher()
+    matcher.enable_roi_matching = False
+    entry = matcher.template_bank.add("button", "button.png", button)
+    matcher.template_info_cache["button"] = TemplateInfo(
+        name="button", image=entry.color, threshold=threshold, path="button.png",
+        match_mode=match_mode,
+    )
+    return matcher
+
+
+class TestSingleChannelMatching:
+    """gray/edge匹配模式测试."""
+
+    def test_gray_mode_matches_on_single_channel(self, scene):
+        """测试灰度模式只用一种方法在单通道图上匹配."""
+        frame, button = scene
+        matcher = _matcher(button, MATCH_MODE_GRAY)
+
+        with patch('src.core.game_detector.cv2.matchTemplate', wraps=cv2.matchTemplate) as mock_match:
+            element = matcher.match_template(frame, "button")
+
+        assert element is not None
+        assert element.position == (200, 120)
+        assert element.size == (90, 40)
+        assert element.name == "button"
+        assert all(call.args[0].ndim == 2 and call.args[1].ndim == 2 for call in mock_match.call_args_list)
+        assert {call.args[2] for call in mock_match.call_args_list} == {cv2.TM_CCOEFF_NORMED}
+
+    def test_gray_mode_without_pyramid_scans_scales(self, scene):
+        """测试关闭金字塔时每个缩放比例只匹配一次."""
+        frame, button = scene
+        matcher = _matcher(button, MATCH_MODE_GRAY)
+        matcher.enable_pyramid_matching = False
+        matcher.early_exit_threshold = 1.1
+
+        with patch('src.core.game_detector.cv2.matchTemplate', wraps=cv2.matchTemplate) as mock_match:
+            element = matcher.match_template(frame, "button")
+
+        assert element.position == (200, 120)
+        fitting = [s for s in matcher._calculate_scale_factors(frame.shape[:2], button.shape[:2])
+                   if button.shape[0] * s <= frame.shape[0] and button.shape[1] * s <= frame.shape[1]]
+        assert mock_match.call_count == len(fitting)
+
+    def test_edge_mode_tolerates_brightness_change(self, scene):
+        """测试边缘模式匹配亮度变化后的按钮."""
+        frame, _ = scene
+        button = np.full((40, 90, 3), 90, dtype=np.uint8)
+        cv2.rectangle(button, (8, 8), (81, 31), (220, 220, 220), 2)
+        cv2.putText(button, "OK", (30, 29), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (240, 240, 240), 2)
+        frame[120:160, 200:290] = np.clip(button.astype(np.int16) + 25, 0, 255).astype(np.uint8)
+        matcher = _matcher(button, MATCH_MODE_EDGE, threshold=0.7)
+
+        element = matcher.match_template(frame, "button")
+
+        assert element is not None
+        assert element.position == (200, 120)
+
+    def test_color_verification_rejects_recolored_candidate(self, scene):
+        """测试灰度相同但颜色不同的候选被颜色校验排除."""
+        frame, button = scene
+        frame[120:160, 200:290] = _recolor_same_luma(button[:, :, 0])
+        matcher = _matcher(button, MATCH_MODE_GRAY)
+
+        assert matcher.match_template(frame, "button") is None
+
+        matcher.enable_color_verification = False
+        element = matcher.match_template(frame, "button")
+        assert element is not None and element.position == (200, 120)
+
+    def test_template_entry_caches_channels(self, scene):
+        """测试模板条目缓存单通道变体."""
+        _, button = scene
+        matcher = _matcher(button, MATCH_MODE_GRAY)
+        entry = matcher.template_bank.get("button")
+
+        assert entry.channel(MATCH_MODE_GRAY) is entry.gray
+        edges = entry.channel(MATCH_MODE_EDGE, 1.25)
+        assert edges.ndim == 2 and edges.shape == (50, 112)
+        assert entry.channel(MATCH_MODE_EDGE, 1.25) is edges
+
+    def test_flat_edge_template_is_not_matched(self, scene):
+        """测试提取不到边缘的模板不会在任意位置匹配成功."""
+        frame, _ = scene
+        matcher = _matcher(np.full((40, 90, 3), 120, dtype=np.uint8), MATCH_MODE_EDGE)
+
+        assert matcher.match_template(frame, "button") is None
+
+
+    def test_batch_routes_edge_mode_to_single_channel(self, scene):
+        """测试批量匹配时边缘模式的模板在边缘图上匹配."""
+        frame, _ = scene
+        button = np.full((40, 90, 3), 90, dtype=np.uint8)
+        cv2.rectangle(button, (8, 8), (81, 31), (220, 220, 220), 2)
+        cv2.putText(button, "OK", (30, 29), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (240, 240, 240), 2)
+        frame[120:160, 200:290] = np.clip(button.astype(np.int16) + 25, 0, 255).astype(np.uint8)
+        matcher = _matcher(button, MATCH_MODE_EDGE, threshold=0.7)
+
+        with patch.object(matcher, '_match_single_channel', wraps=matcher._match_single_channel) as single:
+            elements = matcher.match_batch(frame, ["button"])
+
+        single.assert_called()
+        assert [element.position for element in elements] == [(200, 120)]
+
+    def test_batch_region_routes_gray_mode_to_single_channel(self, scene):
+        """测试限定区域的批量匹配同样按灰度模式匹配并返回整帧坐标."""
+        frame, button = scene
+        matcher = _matcher(button, MATCH_MODE_GRAY)
+
+        with patch.object(matcher, '_match_single_channel', wraps=matcher._match_single_channel) as single:
+            elements = matcher.match_batch(frame, ["button"], region=(150, 80, 200, 120))
+
+        single.assert_called()
+        assert [element.position for element in elements] == [(200, 120)]
+
+
+class TestMatchModeConfig:
+    """匹配模式配置测试."""
+
+    def test_set_template_match_mode(self, scene):
+        """测试设置模板匹配模式时校验模板和模式."""
+        _, button = scene
+        matcher = _matcher(button, "color")
+
+        assert matcher.set_template_match_mode("button", MATCH_MODE_EDGE)
+        assert matcher.template_info_cache["button"].match_mode == MATCH_MODE_EDGE
+        assert not matcher.set_template_match_mode("button", "hsv")
+        assert not matcher.set_template_match_mode("missing", MATCH_MODE_GRAY)
+
+    def test_detector_applies_configured_modes(self, scene):
+        """测试检测器按配置设置默认模式和单个模板的模式."""
+        frame, button = scene
+        detector = GameDetector(frame_source=GeneratorFrameSource(lambda: frame))
+        matcher = detector.template_matcher
+        for name in ("button", "other"):
+            matcher.template_info_cache[name] = TemplateInfo(name, button, 0.8, f"{name}.png")
+
+        detector._apply_match_modes({
+            'default_match_mode': MATCH_MODE_GRAY,
+            'template_match_modes': {'other': MATCH_MODE_EDGE, 'missing': MATCH_MODE_GRAY},
+        })
+
+        assert matcher.default_match_mode == MATCH_MODE_GRAY
+        assert matcher.template_info_cache["button"].match_mode == MATCH_MODE_GRAY
+        assert matcher.template_info_cache["other"].match_mode == MATCH_MODE_EDGE
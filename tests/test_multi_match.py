@@ -0,0 +1,159 @@
+"""多实例模板匹配测试模块."""
+
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from src.core.frame_source import GeneratorFrameSource
+from src.core.game_detector import GameDetector
+from src.core.multi_match import (
+    Instance,
+    find_instances,
+    non_max_suppression,
+    sort_by_position,
+)
+
+
+def _smooth_image(rng, height, width):
+    """生成平滑纹理图像."""
+    image = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    image = cv2.GaussianBlur(image, (0, 0), 3)
+    return cv2.normalize(image, None, 0, 255, cv2.NORM_MINMAX)
+
+
+class TestNonMaxSuppression:
+    """non_max_suppression测试."""
+
+    def test_keeps_best_of_overlapping_boxes(self):
+        """测试重叠框只保留分数最高者，不重叠的框都保留."""
+        boxes = np.array([[0, 0, 10, 10], [2, 1, 10, 10], [50, 50, 10, 10]])
+        scores = np.array([0.8, 0.9, 0.7])
+
+        keep = non_max_suppression(boxes, scores, iou_threshold=0.3)
+
+        assert keep.tolist() == [1, 2]
+
+    def test_max_results(self):
+        """测试最多保留指定数量的框."""
+        boxes = np.array([[0, 0, 10, 10], [20, 0, 10, 10], [40, 0, 10, 10]])
+        scores = np.array([0.7, 0.9, 0.8])
+
+        assert non_max_suppression(boxes, scores, max_results=2).tolist() == [1, 2]
+        assert non_max_suppression(np.empty((0, 4)), np.empty(0)).size == 0
+
+
+class TestFindInstances:
+    """find_instances测试."""
+
+    def test_one_instance_per_peak(self):
+        """测试峰值周围高于阈值的像素只产生一个实例."""
+        result = np.zeros((100, 200), dtype=np.float32)
+        for x, y in [(20, 10), (120, 10), (20, 70)]:
+            result[y - 2:y + 3, x - 2:x + 3] = 0.85
+            result[y, x] = 0.95
+
+        instances = find_instances(result, (20, 40), threshold=0.8)
+
+        assert sorted((i.x, i.y) for i in instances) == [(20, 10), (20, 70), (120, 10)]
+        assert all(i.confidence == pytest.approx(0.95) for i in instances)
+        assert all((i.width, i.height) == (40, 20) for i in instances)
+
+    def test_sqdiff_scores_are_inverted(self):
+        """测试TM_SQDIFF_NORMED结果按1-值计算置信度."""
+        result = np.ones((50, 50), dtype=np.float32)
+        result[25, 25] = 0.05
+
+        instances = find_instances(result, (10, 10), threshold=0.9, sqdiff=True)
+
+        assert [(i.x, i.y) for i in instances] == [(25, 25)]
+        assert instances[0].confidence == pytest.approx(0.95)
+
+    def test_numpy_fallback_matches_cv2(self):
+        """测试没有OpenCV时的最大值滤波结果一致."""
+        rng = np.random.default_rng(3)
+        result = cv2.GaussianBlur(rng.random((80, 120)).astype(np.float32), (0, 0), 2)
+
+        expected = find_instances(result, (12, 16), threshold=0.4)
+        with patch('src.core.multi_match.cv2', None):
+            fallback = find_instances(result, (12, 16), threshold=0.4)
+
+        assert [(i.x, i.y) for i in fallback] == [(i.x, i.y) for i in expected]
+
+
+def test_sort_by_position_groups_rows():
+    """测试同一行内按横坐标排序，行间按纵坐标排序."""
+    instances = [
+        Instance(300, 102, 40, 20, 0.9),
+        Instance(10, 100, 40, 20, 0.8),
+        Instance(10, 200, 40, 20, 0.95),
+        Instance(150, 99, 40, 20, 0.85),
+    ]
+
+    ordered = sort_by_position(instances)
+
+    assert [(i.x, i.y) for i in ordered] == [(10, 100), (150, 99), (300, 102), (10, 200)]
+
+
+class TestFindAllTemplates:
+    """GameDetector.find_all_templates测试."""
+
+    @pytest.fixture
+    def detector(self):
+        """创建截图中有三个相同按钮的检测器."""
+        rng = np.random.default_rng(11)
+        frame = cv2.GaussianBlur(rng.integers(0, 255, (360, 640, 3), dtype=np.uint8), (0, 0), 3)
+        button = _smooth_image(rng, 30, 80)
+        for x, y in [(400, 50), (40, 50), (40, 200)]:
+            frame[y:y + 30, x:x + 80] = button
+
+        detector = GameDetector(frame_source=GeneratorFrameSource(lambda: frame))
+        detector.template_matcher.template_bank.add("claim_button", "claim_button.png", button)
+        return detector
+
+    def test_returns_all_instances_in_one_scan(self, detector):
+        """测试一次扫描返回全部实例并按位置排序."""
+        with patch('src.core.game_detector.cv2.matchTemplate', wraps=cv2.matchTemplate) as mock_match:
+            matches = detector.find_all_templates("claim_button", threshold=0.9)
+
+        assert mock_match.call_count == 1
+        assert [m['top_left'] for m in matches] == [(40, 50), (400, 50), (40, 200)]
+        assert matches[0]['center'] == (80, 65)
+        assert all(m['found'] and m['confidence'] > 0.9 for m in matches)
+
+    def test_region_and_max_results(self, detector):
+        """测试区域限制和结果数量限制."""
+        in_region = detector.find_all_templates("claim_button", threshold=0.9, region=(0, 0, 200, 120))
+        limited = detector.find_all_templates("claim_button", threshold=0.9, max_results=2)
+
+        assert [m['top_left'] for m in in_region] == [(40, 50)]
+        assert len(limited) == 2
+
+    def test_missing_template(self, detector):
+        """测试模板不存在时返回空列表."""
+        with patch('os.path.exists', return_value=False):
+            assert detector.find_all_templates("missing.png") == []
+
+
+def test_controller_merges_instances_across_templates():
+    """测试自动化控制器合并多个模板命中的同一目标并按位置排序."""
+    from unittest.mock import MagicMock
+
+    from src.automation.automation_controller import AutomationController
+
+    def match(x, y):
+        return {'found': True, 'confidence': 0.9, 'center': (x + 40, y + 15),
+                'top_left': (x, y), 'bottom_right': (x + 80, y + 30)}
+
+    with patch('src.automation.automation_controller.TaskManager', None):
+        controller = AutomationController(game_detector=MagicMock())
+    controller._game_detector.find_all_templates.side_effect = [
+        [match(40, 200), match(400, 50)],
+        [match(42, 201), match(40, 50)],
+    ]
+
+    centers = controller._find_template_instances(["reward.png", "claim.png"])
+
+    assert centers == [(80, 65), (440, 65), (80, 215)]
+    assert controller._game_detector.find_template.call_count == 0
@@ -0,0 +1,172 @@
+"""OCR结果缓存测试模块."""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.core.frame_source import GeneratorFrameSource
+from src.core.game_detector import GameDetector
+from src.core.ocr_cache import OCRResultCache
+from src.core.ocr_detector import OCRDetector
+from src.core.ocr_service import OCRService
+from src.monitoring.metrics_collector import MetricsCollector
+
+
+def make_image(value: int = 200) -> np.ndarray:
+    """创建测试区域图像."""
+    image = np.full((40, 120, 3), 30, dtype=np.uint8)
+    image[10:30, 10:110] = value
+    return image
+
+
+TEXT_DATA = {
+    'text': ['Start'], 'left': [5], 'top': [6],
+    'width': [40], 'height': [12], 'conf': [95],
+}
+
+
+def fake_pil_image(array, mode=None):
+    """用图像尺寸模拟PIL.Image.fromarray的返回值."""
+    return SimpleNamespace(size=(array.shape[1], array.shape[0]), mode=mode)
+
+
+@pytest.fixture
+def mock_tesseract():
+    """模拟pytesseract和PIL，未安装这两个依赖时也能运行."""
+    with patch('src.core.ocr_detector.pytesseract') as mock_pytesseract, \
+            patch('src.core.ocr_detector.PILImage') as mock_pil:
+        mock_pil.fromarray.side_effect = fake_pil_image
+        mock_pytesseract.image_to_string.return_value = "Mission"
+        mock_pytesseract.image_to_data.return_value = TEXT_DATA
+        yield mock_pytesseract
+
+
+class TestOCRResultCache:
+    """OCRResultCache测试."""
+
+    def test_key_depends_on_pixels_and_config(self):
+        """测试缓存键由像素内容和配置决定."""
+        key = OCRResultCache.make_key(make_image(), 'text', '--psm 8')
+
+        assert key == OCRResultCache.make_key(make_image(), 'text', '--psm 8')
+        assert key != OCRResultCache.make_key(make_image(201), 'text', '--psm 8')
+        assert key != OCRResultCache.make_key(make_image(), 'text', '--psm 7')
+        assert key != OCRResultCache.make_key(make_image(), 'data', '--psm 8')
+        assert OCRResultCache.make_key(object()) is None
+
+    def test_lru_eviction(self):
+        """测试超过容量时淘汰最久未使用的结果."""
+        cache = OCRResultCache(max_size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        assert cache.get('a') == (True, 1)
+        assert cache.get('b') == (False, None)
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_ttl_expiration(self):
+        """测试超过有效期的结果过期."""
+        cache = OCRResultCache(ttl=0.05)
+        cache.put('a', "text")
+        time.sleep(0.08)
+
+        assert cache.get('a') == (False, None)
+        assert cache.get_stats()['expirations'] == 1
+
+    def test_caches_empty_results(self):
+        """测试未识别到文本的结果同样缓存."""
+        cache = OCRResultCache()
+        cache.put('a', None)
+
+        assert cache.get('a') == (True, None)
+
+    def test_metrics_exported_to_collector(self):
+        """测试命中率导出到MetricsCollector."""
+        cache = OCRResultCache()
+        cache.put('a', "text")
+        cache.get('a')
+        cache.get('b')
+        collector = MetricsCollector()
+
+        cache.register_metrics(collector)
+        collector._run_collectors()
+
+        assert collector.get_gauge('ocr_cache.hit_rate') == pytest.approx(0.5)
+        assert collector.get_gauge('ocr_cache.size') == 1
+
+
+class TestOCRDetectorCache:
+    """OCRDetector识别结果缓存测试."""
+
+    def test_unchanged_region_is_not_recognized_again(self, mock_tesseract):
+        """测试相同区域重复识别时直接返回缓存结果."""
+        detector = OCRDetector()
+
+        assert detector.recognize_text(image_region=make_image()) == "Mission"
+        assert detector.recognize_text(image_region=make_image()) == "Mission"
+        assert mock_tesseract.image_to_string.call_count == 1
+
+        detector.recognize_text(image_region=make_image(201))
+        assert mock_tesseract.image_to_string.call_count == 2
+        assert detector.result_cache.get_stats()['hits'] == 1
+
+    def test_find_and_extract_share_cached_data(self, mock_tesseract):
+        """测试查找文本和提取文本共享同一区域的识别数据."""
+        detector = OCRDetector()
+        frame = np.zeros((200, 300, 3), dtype=np.uint8)
+        frame[50:90, 100:220] = make_image()
+        region = (100, 50, 120, 40)
+
+        found = detector.find_text("start", frame, region)
+        texts = detector.extract_all_text(frame, region)
+
+        assert found['position'] == (105, 56)
+        assert texts[0]['text'] == "Start"
+        assert mock_tesseract.image_to_data.call_count == 1
+
+    def test_cache_disabled(self, mock_tesseract):
+        """测试关闭缓存后每次都重新识别."""
+        detector = OCRDetector()
+        detector.enable_result_cache = False
+
+        detector.recognize_text(image_region=make_image())
+        detector.recognize_text(image_region=make_image())
+
+        assert mock_tesseract.image_to_string.call_count == 2
+
+    def test_service_skips_cached_regions(self, mock_tesseract):
+        """测试工作池不再提交命中缓存的区域."""
+        cache = OCRResultCache()
+        frame = np.zeros((100, 200, 3), dtype=np.uint8)
+        regions = [(0, 0, 60, 40), (0, 50, 80, 40)]
+        with OCRService(max_workers=2, use_processes=False, result_cache=cache) as service:
+            service.recognize_regions(frame, regions)
+            service.recognize_regions(frame, regions)
+
+            assert service.get_stats()['submitted'] == 2
+        assert mock_tesseract.image_to_string.call_count == 2
+        assert cache.get_stats()['hits'] == 2
+
+
+class TestGameDetectorTextPolling:
+    """GameDetector文本轮询缓存测试."""
+
+    def test_polling_unchanged_screen_reuses_result(self, mock_tesseract):
+        """测试画面未变化时重复轮询文本不再识别."""
+        frame = np.zeros((200, 300, 3), dtype=np.uint8)
+        detector = GameDetector(frame_source=GeneratorFrameSource(lambda: frame.copy()))
+        collector = MetricsCollector()
+        assert detector.register_ocr_metrics(collector)
+
+        for _ in range(3):
+            detector.invalidate_frame_cache()
+            assert detector.find_text_in_screen("start", (0, 0, 120, 40))['text'] == "Start"
+
+        assert mock_tesseract.image_to_data.call_count == 1
+        collector._run_collectors()
+        assert collector.get_gauge('ocr_cache.hits') == 2
@@ -9,7 +9,7 @@ import io
 from unittest.mock import Mock, patch, MagicMock
 from PIL import Image as PILImage
 
-from src.core.ocr_detector import OCRDetector
+from src.core.ocr_detector import BINARIZATION_METHODS, OCRDetector
 
 
 class TestOCRDetector:
@@ -286,4 +286,75 @@ class TestOCRDetector:
         with patch('numpy.array'), patch('cv2.cvtColor'):
             result = self.ocr_detector.find_text("target", self.test_screenshot_data)
             
-            assert result is None  # 置信度太低，应该返回None
\ No newline at end of file
+            assert result is None  # 置信度太低，应该返回None
+
+class TestOCRPreprocessing:
+    """OCR预处理二值化选择测试."""
+
+    def setup_method(self):
+        """设置测试环境."""
+        self.ocr_detector = OCRDetector()
+        rng = np.random.default_rng(0)
+        background = cv2.GaussianBlur(
+            rng.integers(40, 120, (60, 300, 3), dtype=np.uint8), (0, 0), 3
+        )
+        cv2.putText(background, "Mission 12/30", (5, 40),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.9, (240, 240, 240), 2)
+        self.text_image = background
+
+    def test_score_matches_component_rules(self):
+        """测试向量化评分与逐组件规则一致."""
+        binary = np.zeros((60, 200), dtype=np.uint8)
+        binary[10:30, 10:20] = 255   # 有效组件，面积200
+        binary[10:30, 40:54] = 255   # 有效组件，面积280
+        binary[40:42, 100:102] = 255  # 面积过小
+        binary[5:55, 150:152] = 255  # 宽度过小
+
+        score = self.ocr_detector._score_binary(binary)
+
+        assert score == pytest.approx(2 * 0.7 + (480 / 2 / 100) * 0.3)
+        assert self.ocr_detector._score_binary(np.zeros((40, 40), dtype=np.uint8)) == 0.0
+
+    def test_cached_method_skips_scoring(self):
+        """测试同一区域缓存胜出的二值化方法，后续不再评分."""
+        region = (0, 0, 300, 60)
+        first = self.ocr_detector._preprocess_for_ocr(self.text_image, region)
+
+        with patch.object(self.ocr_detector, '_score_binary') as mock_score:
+            second = self.ocr_detector._preprocess_for_ocr(self.text_image, region)
+
+        mock_score.assert_not_called()
+        assert np.array_equal(first, second)
+        assert self.ocr_detector._binarization_methods[region][0] in BINARIZATION_METHODS
+
+    def test_cached_result_matches_full_selection(self):
+        """测试缓存方法的结果与完整评分的结果相同."""
+        full = self.ocr_detector._preprocess_for_ocr(self.text_image)
+        self.ocr_detector._preprocess_for_ocr(self.text_image, "mission_row")
+        cached = self.ocr_detector._preprocess_for_ocr(self.text_image, "mission_row")
+
+        assert np.array_equal(full, cached)
+
+    def test_method_rechecked_periodically(self):
+        """测试到达重新评分间隔时重新选择二值化方法."""
+        self.ocr_detector.binarization_recheck_interval = 3
+        self.ocr_detector._preprocess_for_ocr(self.text_image, "counter")
+
+        with patch.object(
+            self.ocr_detector, '_select_binarization', return_value='otsu'
+        ) as mock_select:
+            for _ in range(3):
+                self.ocr_detector._preprocess_for_ocr(self.text_image, "counter")
+
+        mock_select.assert_called_once()
+        assert self.ocr_detector._binarization_methods["counter"] == ['otsu', 0]
+
+    def test_method_cache_is_bounded(self):
+        """测试二值化方法缓存超过上限时淘汰最久未使用的键."""
+        self.ocr_detector.binarization_cache_size = 2
+        self.ocr_detector._preprocess_for_ocr(self.text_image, (0, 0, 10, 10))
+        self.ocr_detector._preprocess_for_ocr(self.text_image, (0, 0, 20, 20))
+        self.ocr_detector._preprocess_for_ocr(self.text_image, (0, 0, 10, 10))
+        self.ocr_detector._preprocess_for_ocr(self.text_image, (0, 0, 30, 30))
+
+        assert list(self.ocr_detector._binarization_methods) == [(0, 0, 10, 10), (0, 0, 30, 30)]
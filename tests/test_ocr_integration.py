@@ -6,6 +6,7 @@ import pytest
 import numpy as np
 from unittest.mock import Mock, patch, MagicMock
 from src.core.game_detector import GameDetector, GameWindow
+from src.core.raw_frame import RawFrame
 from src.config.config_manager import ConfigManager
 
 
@@ -93,9 +94,12 @@ class TestOCRIntegration:
                 result = self.detector.find_text_in_screen("Region Text", region)
                 
                 assert result == expected_result
-                self.detector.template_matcher.find_text.assert_called_once_with(
-                    "Region Text", mock_cv2.imencode.return_value[1].tobytes(), region
-                )
+                args = self.detector.template_matcher.find_text.call_args[0]
+                assert args[0] == "Region Text"
+                assert isinstance(args[1], RawFrame)
+                assert args[1].data is self.test_screenshot
+                assert args[2] == region
+                mock_cv2.imencode.assert_not_called()
 
     @patch('src.core.game_detector.cv2')
     def test_extract_all_text_from_screen_success(self, mock_cv2):
@@ -220,10 +224,9 @@ class TestOCRIntegration:
     def test_ocr_methods_exception_handling(self, mock_cv2):
         """测试OCR方法的异常处理."""
         # 设置模拟抛出异常
-        mock_cv2.imencode.side_effect = Exception("Test exception")
         self.detector.game_window = self.mock_window
         
-        with patch.object(self.detector, 'capture_screenshot', return_value=self.test_screenshot):
+        with patch.object(self.detector, 'capture_frame', side_effect=Exception("Test exception")):
             result = self.detector.recognize_text_in_region((10, 10, 100, 50))
             assert result is None
             
@@ -0,0 +1,191 @@
+"""OCR工作池测试模块."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.core.frame_source import GeneratorFrameSource
+from src.core.game_detector import GameDetector
+from src.core.ocr_detector import OCRDetector
+from src.core.ocr_service import OCRService
+
+
+def make_frame() -> np.ndarray:
+    """创建白底测试截图."""
+    return np.full((200, 400, 3), 255, dtype=np.uint8)
+
+
+def width_text(pil_image, config=None):
+    """返回图像宽度作为识别结果，用于校验结果顺序."""
+    return f" {pil_image.size[0]} \n"
+
+
+REGIONS = [(0, 0, 40, 40), (0, 50, 60, 40), (0, 100, 80, 40)]
+
+
+def fake_pil_image(array, mode=None):
+    """用图像尺寸模拟PIL.Image.fromarray的返回值."""
+    return SimpleNamespace(size=(array.shape[1], array.shape[0]), mode=mode)
+
+
+@pytest.fixture
+def mock_tesseract():
+    """模拟pytesseract和PIL，未安装这两个依赖时也能运行."""
+    with patch('src.core.ocr_detector.pytesseract') as mock_pytesseract, \
+            patch('src.core.ocr_detector.PILImage') as mock_pil:
+        mock_pil.fromarray.side_effect = fake_pil_image
+        mock_pytesseract.image_to_string.side_effect = width_text
+        yield mock_pytesseract
+
+
+@pytest.fixture
+def service():
+    """创建线程模式的OCR工作池."""
+    service = OCRService(max_workers=4, use_processes=False)
+    yield service
+    service.shutdown()
+
+
+class TestOCRService:
+    """OCRService测试."""
+
+    def test_batch_results_in_region_order(self, service, mock_tesseract):
+        """测试批量识别结果与区域顺序一致."""
+        results = service.recognize_regions(make_frame(), REGIONS)
+
+        assert results == ["40", "60", "80"]
+        stats = service.get_stats()
+        assert stats['completed'] == 3
+        assert stats['pending'] == 0
+
+    def test_regions_recognized_in_parallel(self, service, mock_tesseract):
+        """测试多个区域并行识别."""
+        threads = set()
+
+        def slow_ocr(pil_image, config=None):
+            threads.add(threading.get_ident())
+            time.sleep(0.2)
+            return "1"
+
+        mock_tesseract.image_to_string.side_effect = slow_ocr
+        start = time.monotonic()
+        results = service.recognize_regions(make_frame(), [(0, 0, 40, 40)] * 4)
+
+        assert results == ["1"] * 4
+        assert time.monotonic() - start < 0.6
+        assert len(threads) > 1
+
+    def test_failed_region_returns_none(self, service, mock_tesseract):
+        """测试单个区域失败不影响其他区域."""
+        def flaky_ocr(pil_image, config=None):
+            if pil_image.size[0] == 60:
+                raise RuntimeError("tesseract error")
+            return width_text(pil_image)
+
+        mock_tesseract.image_to_string.side_effect = flaky_ocr
+
+        assert service.recognize_regions(make_frame(), REGIONS) == ["40", None, "80"]
+        assert service.get_stats()['failed'] == 1
+
+    def test_submit_returns_future(self, service, mock_tesseract):
+        """测试单个区域提交返回Future."""
+        future = service.submit(make_frame()[:40, :60])
+
+        assert future.result(timeout=5) == "60"
+
+    @pytest.mark.asyncio
+    async def test_async_batch_does_not_block_loop(self, service, mock_tesseract):
+        """测试异步批量识别期间事件循环继续运行."""
+        def slow_ocr(pil_image, config=None):
+            time.sleep(0.2)
+            return width_text(pil_image)
+
+        mock_tesseract.image_to_string.side_effect = slow_ocr
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        results = await service.recognize_regions_async(make_frame(), REGIONS)
+        task.cancel()
+
+        assert results == ["40", "60", "80"]
+        assert ticks > 5
+
+    def test_process_pool_starts_warm_workers(self):
+        """测试进程池启动并预先拉起工作进程."""
+        with OCRService(max_workers=2) as service:
+            assert service.running
+            assert service.use_processes
+
+            results = service.recognize_regions(make_frame(), REGIONS, timeout=30)
+
+        assert len(results) == 3
+        assert not service.running
+
+
+class TestOCRDetectorRegions:
+    """OCRDetector批量区域识别测试."""
+
+    @pytest.fixture
+    def detector(self):
+        """创建使用线程池的OCR检测器."""
+        detector = OCRDetector()
+        detector.ocr_use_processes = False
+        yield detector
+        detector.close()
+
+    def test_recognize_regions(self, detector, mock_tesseract):
+        """测试批量识别返回每个区域的文本，空结果为None."""
+        mock_tesseract.image_to_string.side_effect = lambda image, config=None: (
+            "" if image.size[0] == 80 else width_text(image)
+        )
+
+        assert detector.recognize_regions(make_frame(), REGIONS) == ["40", "60", None]
+        assert mock_tesseract.image_to_string.call_args.kwargs['config'] == detector.ocr_config
+
+    def test_extract_text_in_regions_offsets(self, detector, mock_tesseract):
+        """测试批量提取文本时坐标转换为截图坐标."""
+        mock_tesseract.image_to_data.return_value = {
+            'text': ['Gold', ''], 'left': [2, 0], 'top': [3, 0],
+            'width': [20, 0], 'height': [10, 0], 'conf': [90, -1],
+        }
+
+        results = detector.extract_text_in_regions(make_frame(), [(100, 50, 60, 40)])
+
+        assert results == [[{
+            'text': 'Gold', 'position': (102, 53), 'size': (20, 10),
+            'center': (112, 58), 'confidence': 0.9,
+        }]]
+
+    def test_ocr_disabled(self, detector):
+        """测试OCR禁用时每个区域返回None."""
+        detector.enable_ocr = False
+
+        assert detector.recognize_regions(make_frame(), REGIONS) == [None, None, None]
+        assert detector._ocr_service is None
+
+
+class TestGameDetectorRegions:
+    """GameDetector批量区域识别测试."""
+
+    @pytest.mark.asyncio
+    async def test_recognize_text_in_regions(self, mock_tesseract):
+        """测试从同一帧批量识别多个区域."""
+        detector = GameDetector(frame_source=GeneratorFrameSource(lambda: make_frame()))
+        ocr_detector = detector.template_matcher.ocr_detector
+        ocr_detector.ocr_use_processes = False
+        try:
+            assert detector.recognize_text_in_regions(REGIONS) == ["40", "60", "80"]
+            assert await detector.recognize_text_in_regions_async(REGIONS) == ["40", "60", "80"]
+        finally:
+            ocr_detector.close()
@@ -0,0 +1,160 @@
+"""原始帧测试模块."""
+
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from src.core.game_detector import GameDetector, GameWindow
+from src.core.ocr_detector import OCRDetector
+from src.core.raw_frame import RawFrame, frame_to_bgr
+
+
+class TestRawFrame:
+    """RawFrame测试."""
+
+    def test_from_buffer_is_zero_copy(self):
+        """测试从缓冲区创建帧不复制数据."""
+        buffer = bytearray(range(4 * 3 * 2))
+        frame = RawFrame.from_buffer(buffer, width=3, height=2)
+
+        assert frame.shape == (2, 3, 4)
+        assert frame.pixel_format == 'BGRA'
+        assert np.shares_memory(frame.data, np.frombuffer(buffer, dtype=np.uint8))
+
+        buffer[0] = 255
+        assert frame.data[0, 0, 0] == 255
+
+    def test_from_buffer_with_padded_stride(self):
+        """测试带行填充的缓冲区."""
+        width, height, stride = 3, 2, 16
+        buffer = np.zeros(stride * height, dtype=np.uint8)
+        buffer[stride:stride + 4] = [1, 2, 3, 4]
+
+        frame = RawFrame.from_buffer(buffer.tobytes(), width, height, stride=stride)
+
+        assert frame.width == width
+        assert frame.height == height
+        assert frame.stride == stride
+        assert tuple(frame.data[1, 0]) == (1, 2, 3, 4)
+
+    def test_from_buffer_invalid_stride(self):
+        """测试行跨度过小时报错."""
+        with pytest.raises(ValueError):
+            RawFrame.from_buffer(bytes(24), width=3, height=2, stride=8)
+
+    def test_from_array_infers_format(self):
+        """测试根据通道数推断像素格式."""
+        assert RawFrame.from_array(np.zeros((4, 4, 3), np.uint8)).pixel_format == 'BGR'
+        assert RawFrame.from_array(np.zeros((4, 4, 4), np.uint8)).pixel_format == 'BGRA'
+        assert RawFrame.from_array(np.zeros((4, 4), np.uint8)).pixel_format == 'GRAY'
+
+    def test_bgr_returns_view_for_bgr_frame(self):
+        """测试BGR帧直接返回原数组."""
+        image = np.zeros((4, 4, 3), np.uint8)
+        assert RawFrame.from_array(image).bgr is image
+
+    def test_bgra_conversion(self):
+        """测试BGRA帧转换为BGR和灰度."""
+        frame = RawFrame.from_buffer(bytes([10, 20, 30, 255] * 4), width=2, height=2)
+
+        assert frame.bgr.shape == (2, 2, 3)
+        assert tuple(frame.bgr[0, 0]) == (10, 20, 30)
+        assert frame.gray.shape == (2, 2)
+
+    def test_crop_shares_buffer_and_tracks_origin(self):
+        """测试裁剪返回共享缓冲区的子帧."""
+        image = np.zeros((100, 100, 3), np.uint8)
+        frame = RawFrame.from_array(image, frame_id=7)
+
+        sub = frame.crop((10, 20, 30, 40))
+
+        assert sub.shape == (40, 30, 3)
+        assert sub.origin == (10, 20)
+        assert sub.frame_id == 7
+        assert np.shares_memory(sub.data, image)
+
+    def test_crop_clamps_to_frame(self):
+        """测试裁剪区域超出边界时被截断."""
+        frame = RawFrame.from_array(np.zeros((50, 50, 3), np.uint8))
+        assert frame.crop((40, 40, 30, 30)).shape == (10, 10, 3)
+
+    def test_png_round_trip(self, tmp_path):
+        """测试仅在持久化时编码为PNG."""
+        image = np.random.randint(0, 255, (8, 8, 3), dtype=np.uint8)
+        frame = RawFrame.from_array(image)
+
+        png = frame.to_png_bytes()
+        decoded = cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_COLOR)
+        assert np.array_equal(decoded, image)
+
+        path = tmp_path / "frame.png"
+        assert frame.save(str(path))
+        assert path.exists()
+
+    def test_frame_to_bgr_accepts_array(self):
+        """测试frame_to_bgr接受普通数组."""
+        image = np.zeros((20, 20, 3), np.uint8)
+        bgr, origin = frame_to_bgr(image, (5, 5, 10, 10))
+        assert bgr.shape == (10, 10, 3)
+        assert origin == (5, 5)
+
+
+class TestRawFramePipeline:
+    """原始帧在检测器和OCR之间的传递测试."""
+
+    @pytest.fixture
+    def detector(self):
+        """创建带有模拟窗口的GameDetector."""
+        detector = GameDetector()
+        detector.frame_cache.max_age = 10.0
+        detector.game_window = GameWindow(
+            hwnd=12345,
+            title="Test Game",
+            rect=(0, 0, 80, 60),
+            width=80,
+            height=60,
+            is_foreground=True,
+        )
+        return detector
+
+    def test_capture_frame_carries_cache_metadata(self, detector):
+        """测试capture_frame复用缓存帧并携带帧ID."""
+        screenshot = np.zeros((60, 80, 3), dtype=np.uint8)
+
+        with patch.object(
+            detector.window_manager, 'capture_window', return_value=screenshot
+        ):
+            frame = detector.capture_frame()
+
+        cached = detector.frame_cache.latest(12345)
+        assert frame.data is screenshot
+        assert frame.frame_id == cached.frame_id
+        assert frame.timestamp == cached.timestamp
+
+    def test_ocr_receives_frame_without_png(self, detector):
+        """测试OCR接口直接接收原始帧，不进行PNG编码."""
+        screenshot = np.zeros((60, 80, 3), dtype=np.uint8)
+
+        with patch.object(
+            detector.window_manager, 'capture_window', return_value=screenshot
+        ), patch('src.core.game_detector.cv2.imencode') as mock_imencode, patch.object(
+            detector.template_matcher.ocr_detector, 'recognize_text', return_value="OK"
+        ) as mock_recognize:
+            result = detector.recognize_text_in_region((0, 0, 10, 10))
+
+        assert result == "OK"
+        mock_imencode.assert_not_called()
+        frame = mock_recognize.call_args.kwargs['screenshot_data']
+        assert isinstance(frame, RawFrame)
+
+    def test_ocr_detector_crops_raw_frame(self):
+        """测试OCRDetector按区域裁剪原始帧并换算坐标."""
+        ocr = OCRDetector()
+        frame = RawFrame.from_array(np.zeros((60, 80, 3), dtype=np.uint8))
+
+        image, offset = ocr._load_screenshot(frame, (10, 20, 30, 15))
+
+        assert image.shape == (15, 30, 3)
+        assert offset == (10, 20)
@@ -0,0 +1,110 @@
+"""系统负载采样器测试模块."""
+
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.core.system_load import SystemLoadSampler, get_system_load_sampler
+from src.core.task_manager import TaskManager
+
+
+def _patch_psutil(cpu, memory=50.0, disk_used=40):
+    """按给定读数模拟psutil的系统级接口."""
+    return [
+        patch("psutil.cpu_percent", return_value=cpu),
+        patch("psutil.virtual_memory", return_value=Mock(percent=memory, available=4, total=8)),
+        patch("psutil.disk_usage", return_value=Mock(used=disk_used, free=100 - disk_used, total=100)),
+    ]
+
+
+def _sample_with(sampler, cpu, memory=50.0):
+    patches = _patch_psutil(cpu, memory)
+    for item in patches:
+        item.start()
+    try:
+        return sampler.sample()
+    finally:
+        for item in patches:
+            item.stop()
+
+
+class TestSystemLoadSampler:
+    """SystemLoadSampler测试."""
+
+    def test_ewma_and_ring_buffer(self):
+        """测试EWMA平滑和环形缓冲区长度."""
+        sampler = SystemLoadSampler(history_size=3, smoothing=0.5)
+
+        first = _sample_with(sampler, cpu=20.0)
+        second = _sample_with(sampler, cpu=100.0, memory=70.0)
+        for _ in range(3):
+            _sample_with(sampler, cpu=100.0)
+
+        assert first.available and first.cpu_smoothed == 20.0
+        assert second.cpu_percent == 100.0
+        assert second.cpu_smoothed == pytest.approx(60.0)
+        assert second.memory_smoothed == pytest.approx(60.0)
+        assert second.disk_percent == pytest.approx(40.0)
+        history = sampler.history()
+        assert len(history) == 3
+        assert history[-1] is sampler.snapshot() or history[-1].timestamp <= time.time()
+
+    def test_unavailable_without_psutil(self):
+        """测试psutil不可用时快照标记为不可用."""
+        with patch.dict("sys.modules", {"psutil": None}):
+            snapshot = SystemLoadSampler().snapshot()
+
+        assert not snapshot.available
+        assert snapshot.cpu_percent == 0.0
+
+    def test_running_sampler_serves_cached_snapshot(self):
+        """测试后台线程运行时snapshot不再调用psutil."""
+        sampler = SystemLoadSampler(interval=10.0)
+        sampler.acquire()
+        sampler.acquire()
+        try:
+            deadline = time.time() + 2.0
+            while sampler.history() == [] and time.time() < deadline:
+                time.sleep(0.01)
+            cached = sampler.snapshot()
+            with patch("psutil.cpu_percent", side_effect=AssertionError("不应采样")):
+                assert sampler.snapshot() is cached
+            sampler.release()
+            assert sampler.running
+        finally:
+            sampler.release()
+
+        assert not sampler.running
+
+    def test_shared_sampler(self):
+        """测试共享采样器是进程内单例."""
+        assert get_system_load_sampler() is get_system_load_sampler()
+
+
+class TestTaskManagerThrottle:
+    """TaskManager限流判断测试."""
+
+    def test_throttle_reads_smoothed_load_without_blocking(self):
+        """测试限流判断读取平滑后的负载且不阻塞."""
+        manager = TaskManager()
+        manager._load_sampler = SystemLoadSampler(smoothing=0.5)
+        manager._resource_limits.max_cpu_usage = 80.0
+        _sample_with(manager._load_sampler, cpu=10.0)
+
+        patches = _patch_psutil(cpu=100.0)
+        for item in patches:
+            item.start()
+        try:
+            start = time.perf_counter()
+            # 单次峰值被平滑：10 -> 55，不触发限流
+            assert not manager._should_throttle_execution()
+            # 持续高负载：55 -> 77.5 -> 88.75
+            assert not manager._should_throttle_execution()
+            assert manager._should_throttle_execution()
+            elapsed = time.perf_counter() - start
+        finally:
+            for item in patches:
+                item.stop()
+
+        assert elapsed < 0.1
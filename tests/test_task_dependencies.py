@@ -0,0 +1,177 @@
+"""任务依赖就绪队列测试模块."""
+
+import threading
+import time
+from concurrent.futures import Future
+from unittest.mock import patch
+
+from src.core.task_manager import (
+    DependencyState,
+    DependencyTracker,
+    TaskExecution,
+    TaskManager,
+    TaskPriority,
+    TaskState,
+)
+
+
+def _execution(task_id, dependencies=()):
+    """创建带依赖声明的任务执行."""
+    return TaskExecution(
+        task_id=task_id,
+        execution_id=f"exec_{task_id}",
+        priority=TaskPriority.MEDIUM,
+        state=TaskState.QUEUED,
+        metadata={"name": task_id, "dependencies": list(dependencies)},
+    )
+
+
+def _finished_future(result="ok", error=None):
+    """创建已结束的Future."""
+    future = Future()
+    if error is None:
+        future.set_result(result)
+    else:
+        future.set_exception(error)
+    return future
+
+
+class TestDependencyTracker:
+    """DependencyTracker测试."""
+
+    def test_ready_exactly_when_last_dependency_completes(self):
+        """测试最后一个依赖完成时才就绪."""
+        tracker = DependencyTracker()
+        task = _execution("c", ["a", "b"])
+
+        assert tracker.add(_execution("a")) == DependencyState.READY
+        assert tracker.add(task) == DependencyState.WAITING
+        assert tracker.waiting_count() == 1
+
+        assert tracker.mark_completed("a") == []
+        assert not tracker.is_satisfied(task)
+        assert tracker.mark_completed("b") == [task]
+        assert tracker.is_satisfied(task)
+        assert tracker.waiting_count() == 0
+        # 依赖已完成后登记的任务直接就绪
+        assert tracker.add(_execution("d", ["a"])) == DependencyState.READY
+
+    def test_failure_blocks_dependents_transitively(self):
+        """测试依赖失败沿依赖图阻断所有后继."""
+        tracker = DependencyTracker()
+        child = _execution("b", ["a"])
+        grandchild = _execution("c", ["b"])
+        unrelated = _execution("d", ["x"])
+        for execution in (child, grandchild, unrelated):
+            tracker.add(execution)
+
+        blocked = tracker.mark_failed("a")
+
+        assert blocked == [(child, "a"), (grandchild, "b")]
+        assert tracker.waiting_count() == 1
+        assert tracker.add(_execution("e", ["c"])) == DependencyState.BLOCKED
+
+    def test_discarded_execution_is_not_released(self):
+        """测试取消的等待任务不会在依赖完成后就绪."""
+        tracker = DependencyTracker()
+        task = _execution("b", ["a"])
+        tracker.add(task)
+
+        assert tracker.discard(task.execution_id)
+        assert not tracker.discard(task.execution_id)
+        assert tracker.mark_completed("a") == []
+
+
+    def test_rerun_success_clears_failure(self):
+        """测试失败后重新运行成功的任务不再阻断后继."""
+        tracker = DependencyTracker()
+        tracker.mark_failed("a")
+        assert tracker.add(_execution("b", ["a"])) == DependencyState.BLOCKED
+
+        tracker.mark_completed("a")
+
+        assert tracker.add(_execution("c", ["a"])) == DependencyState.READY
+
+    def test_reset_waits_for_rerun(self):
+        """测试任务重新运行时后继等待本次运行的结果."""
+        tracker = DependencyTracker()
+        tracker.mark_completed("a")
+        tracker.reset("a")
+        task = _execution("b", ["a"])
+
+        assert tracker.add(task) == DependencyState.WAITING
+        assert tracker.mark_completed("a") == [task]
+
+        tracker.reset("a")
+        tracker.mark_failed("a")
+        assert not tracker.is_satisfied(task)
+        assert tracker.add(_execution("c", ["a"])) == DependencyState.BLOCKED
+
+
+class TestTaskManagerDependencies:
+    """TaskManager依赖调度测试."""
+
+    def test_dependent_enqueued_on_completion(self):
+        """测试依赖任务完成后后继任务才进入队列."""
+        manager = TaskManager()
+        first = manager.submit_concurrent_task({"name": "a"})
+        first_task_id = manager._active_executions[first].task_id
+        second = manager.submit_concurrent_task({"name": "b", "dependencies": [first_task_id]})
+
+        assert manager._concurrent_task_queue.size() == 1
+        assert manager.get_concurrent_status()["waiting_dependencies"] == 1
+
+        queued = manager._concurrent_task_queue.get()
+        assert queued.execution_id == first
+        manager._task_completed(queued, _finished_future())
+
+        assert manager._concurrent_task_queue.get().execution_id == second
+        assert manager._check_task_dependencies(manager._active_executions[second])
+
+    def test_failed_dependency_cancels_dependents(self):
+        """测试依赖失败时后继任务被取消而不是一直等待."""
+        manager = TaskManager()
+        first = manager.submit_concurrent_task({"name": "a"})
+        first_task_id = manager._active_executions[first].task_id
+        second = manager.submit_concurrent_task({"name": "b", "dependencies": [first_task_id]})
+
+        queued = manager._concurrent_task_queue.get()
+        queued.state = TaskState.FAILED
+        manager._on_task_completed(first, _finished_future(error=RuntimeError("boom")))
+
+        cancelled = manager._completed_executions[second]
+        assert cancelled.state == TaskState.CANCELLED
+        assert first_task_id in str(cancelled.error)
+        assert manager._concurrent_task_queue.size() == 0
+        assert manager._stats["cancelled_tasks"] == 1
+
+    def test_chain_runs_without_dependency_polling(self):
+        """测试依赖链在管理器中连续执行，不再每次等待1秒."""
+        manager = TaskManager()
+        order = []
+        done = threading.Event()
+
+        def run(task_execution, task_type):
+            order.append(task_execution.metadata["name"])
+            if len(order) == 3:
+                done.set()
+            return "ok"
+
+        with patch.object(manager, "_execute_task_by_type", side_effect=run):
+            # 后继任务先提交，只能由依赖的完成回调放入队列
+            task_ids = ["t1", "t2", "t3"]
+            for name, dependency in (("t3", "t2"), ("t2", "t1")):
+                execution = _execution(name, [dependency])
+                manager._active_executions[execution.execution_id] = execution
+                manager._schedule_execution(execution)
+            manager._schedule_execution(_execution("t1"))
+
+            start = time.perf_counter()
+            manager.start_concurrent_manager()
+            try:
+                assert done.wait(5.0)
+            finally:
+                manager.stop_concurrent_manager()
+
+        assert order == task_ids
+        assert time.perf_counter() - start < 2.0
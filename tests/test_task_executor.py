@@ -256,6 +256,59 @@ class TestTaskQueue:
         assert next_task == high_config
         assert queue.size() == 1
 
+    def test_task_queue_remove_and_update_priority(self):
+        """测试移除的任务不会出队，修改优先级后按新优先级出队。"""
+        queue = TaskQueue()
+        configs = [
+            TaskConfig(task_id=f"task_{i}", task_type=TaskType.CUSTOM, name=f"任务{i}",
+                       priority=TaskPriority.LOW)
+            for i in range(3)
+        ]
+        for config in configs:
+            queue.put(config)
+        
+        assert queue.remove("task_0")
+        assert not queue.remove("task_0")
+        assert queue.update_priority("task_2", TaskPriority.URGENT)
+        assert not queue.update_priority("missing", TaskPriority.URGENT)
+        
+        assert queue.size() == 2
+        assert not queue.contains("task_0")
+        assert queue.get().task_id == "task_2"
+        assert queue.get().task_id == "task_1"
+        assert queue.get() is None
+        # 移除后可以再次加入同一任务
+        assert queue.put(configs[0])
+    
+    def test_task_queue_lazy_deletion_is_bounded(self):
+        """测试大量移除和修改优先级后失效堆项会被清理。"""
+        queue = TaskQueue(max_size=5000)
+        for i in range(3000):
+            queue.put(TaskConfig(task_id=f"t{i}", task_type=TaskType.CUSTOM, name=f"t{i}"))
+        for i in range(0, 3000, 2):
+            queue.remove(f"t{i}")
+        for i in range(1, 3000, 4):
+            queue.update_priority(f"t{i}", TaskPriority.HIGH)
+        
+        assert queue.size() == 1500
+        assert len(queue._heap) <= 2 * queue.size() + 64
+        first = queue.get()
+        assert first.task_id == "t1" and first.priority == TaskPriority.HIGH
+    
+    def test_task_queue_blocking_get(self):
+        """测试带超时的get在任务入队后立即返回。"""
+        import threading
+        
+        queue = TaskQueue()
+        config = TaskConfig(task_id="late", task_type=TaskType.CUSTOM, name="late")
+        timer = threading.Timer(0.05, queue.put, args=(config,))
+        timer.start()
+        
+        start = time.perf_counter()
+        assert queue.get(timeout=5.0) == config
+        assert time.perf_counter() - start < 1.0
+        assert queue.get(timeout=0.01) is None
+
 
 @pytest.mark.asyncio
 class TestEnhancedTaskExecutor:
@@ -366,7 +419,94 @@ class TestEnhancedTaskExecutor:
         # 检查任务状态
         updated_execution = await executor.get_task_status(execution.execution_id)
         assert updated_execution.status == TaskStatus.CANCELLED
+        # 已取消的任务从队列中移除
+        assert executor.task_queue.size() == 0
+        assert config.task_id not in executor.queued_executions
     
+    async def test_set_task_priority(self):
+        """测试修改排队中任务的优先级。"""
+        executor = EnhancedTaskExecutor()
+        executor.register_task_runner(MockTaskRunner(TaskType.DAILY_MISSION))
+        
+        low = await executor.submit_task(TaskConfig(
+            task_id="reprioritized", task_type=TaskType.DAILY_MISSION, name="低优先级",
+            priority=TaskPriority.LOW
+        ))
+        await executor.submit_task(TaskConfig(
+            task_id="normal", task_type=TaskType.DAILY_MISSION, name="普通"
+        ))
+        
+        assert await executor.set_task_priority(low.execution_id, TaskPriority.URGENT)
+        assert executor.task_queue.get().task_id == "reprioritized"
+
+    async def test_asyncio_mode_limits_concurrency(self):
+        """测试ASYNCIO模式在同一事件循环上运行任务并限制并发数。"""
+        import threading
+
+        executor = EnhancedTaskExecutor(max_workers=2)
+        runner = MockTaskRunner(TaskType.DAILY_MISSION)
+        running = []
+        peak = [0]
+        threads = set()
+
+        async def tracked_run(task_execution, game_operator):
+            running.append(task_execution.task_id)
+            peak[0] = max(peak[0], len(running))
+            threads.add(threading.get_ident())
+            try:
+                await asyncio.sleep(0.05)
+                return ExecutionResult(status="completed", result=None, error=None, execution_time=0.05)
+            finally:
+                running.remove(task_execution.task_id)
+
+        runner.run = tracked_run
+        executor.register_task_runner(runner)
+        executions = [
+            await executor.submit_task(TaskConfig(
+                task_id=f"concurrent_{i}", task_type=TaskType.DAILY_MISSION, name=f"并发任务{i}"
+            ))
+            for i in range(5)
+        ]
+
+        await executor.start()
+        assert executor.game_operator.vision_executor is executor.vision_executor
+        for _ in range(100):
+            if all(execution.status == TaskStatus.COMPLETED for execution in executions):
+                break
+            await asyncio.sleep(0.02)
+        await executor.stop()
+
+        assert all(execution.status == TaskStatus.COMPLETED for execution in executions)
+        assert peak[0] == 2
+        assert threads == {threading.get_ident()}
+        assert executor.game_operator.vision_executor is None
+
+    async def test_processing_loop_does_not_block_event_loop(self):
+        """测试空队列时任务处理循环不阻塞事件循环，新任务立即被取出。"""
+        executor = EnhancedTaskExecutor()
+        runner = MockTaskRunner(TaskType.DAILY_MISSION)
+        runner.run = AsyncMock(return_value=ExecutionResult(
+            status="completed", result=None, error=None, execution_time=0.0
+        ))
+        executor.register_task_runner(runner)
+        await executor.start()
+        try:
+            start = time.perf_counter()
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+            assert time.perf_counter() - start < 0.5
+
+            execution = await executor.submit_task(TaskConfig(
+                task_id="prompt", task_type=TaskType.DAILY_MISSION, name="即时任务"
+            ))
+            for _ in range(50):
+                if execution.status == TaskStatus.COMPLETED:
+                    break
+                await asyncio.sleep(0.01)
+            assert execution.status == TaskStatus.COMPLETED
+        finally:
+            await executor.stop()
+
     async def test_get_task_statistics(self):
         """测试获取任务统计。"""
         executor = EnhancedTaskExecutor()
@@ -66,13 +66,13 @@ class TestTemplateMatcher(unittest.TestCase):
 
         mock_listdir.assert_not_called()
 
-    @patch("cv2.matchTemplate")
-    @patch("cv2.minMaxLoc")
-    def test_match_template_success(self, mock_minmaxloc, mock_matchtemplate):
+    def test_match_template_success(self):
         """测试模板匹配成功。"""
-        # 设置模拟数据
-        screenshot = np.zeros((200, 200, 3), dtype=np.uint8)
-        template_image = np.zeros((50, 50, 3), dtype=np.uint8)
+        # 设置测试数据：模板放在截图的(10, 20)处
+        rng = np.random.default_rng(0)
+        screenshot = rng.integers(0, 255, (200, 200, 3), dtype=np.uint8)
+        template_image = rng.integers(0, 255, (50, 50, 3), dtype=np.uint8)
+        screenshot[20:70, 10:60] = template_image
 
         # 创建模板信息
         template_info = TemplateInfo(
@@ -80,17 +80,12 @@ class TestTemplateMatcher(unittest.TestCase):
         )
         self.matcher.template_info_cache["test_template"] = template_info
 
-        # 模拟匹配结果
-        mock_result = np.array([[0.9]])
-        mock_matchtemplate.return_value = mock_result
-        mock_minmaxloc.return_value = (0.5, 0.9, (10, 20), (10, 20))
-
         element = self.matcher.match_template(screenshot, "test_template")
 
         self.assertIsNotNone(element)
         self.assertEqual(element.name, "test_template")
         self.assertEqual(element.position, (10, 20))
-        self.assertEqual(element.confidence, 0.9)
+        self.assertGreater(element.confidence, 0.99)
 
     def test_match_template_not_found(self):
         """测试模板不存在的情况。"""